@@ -0,0 +1,128 @@
+"""
+Benchmark de la búsqueda de clientes: LIKE '%termino%' en todos los campos contra FULLTEXT.
+
+Mide la primera página de GET /clientes?search=... de un taller con:
+
+    - "LIKE": cada palabra con LIKE '%palabra%' sobre nombre, apellidos, correo y teléfono, como antes
+      del índice FULLTEXT; recorre todas las filas del taller.
+    - "FULLTEXT": ClientesRepository.listar_por_taller, es decir MATCH ... AGAINST sobre nombre,
+      apellidos y correo, y LIKE sobre el teléfono solo si el término tiene dígitos.
+
+Para cada término imprime cuántas filas encontró cada estrategia (deben coincidir salvo por la
+búsqueda por prefijo de FULLTEXT) y p50/p95/p99. Con --generar se insertan clientes sintéticos en el
+taller, marcados en notas_cliente para poder borrarlos después con --limpiar.
+
+Uso (con las variables DB_* del .env):
+
+    python -m app.comandos.benchmark_busqueda --taller <id_taller> --generar 100000
+    python -m app.comandos.benchmark_busqueda --taller <id_taller> --buscar "garcia" --buscar "5512"
+    python -m app.comandos.benchmark_busqueda --taller <id_taller> --limpiar
+"""
+from typing import Any, Callable, Dict, List
+import argparse
+import random
+import sys
+from app.comandos.medicion import ejecutar_con_hilos, imprimir_errores, imprimir_latencias, veredicto
+from app.core.transacciones import confirmar
+from app.dependencies.database import pool_conexiones
+from app.models.pagination import PaginationParams
+from app.repositories.clientes_repository import ClientesRepository
+
+MARCA = "benchmark_busqueda"
+TERMINOS = ["garcia", "maria jose", "lopez hernandez", "gmail", "5512", "de la", "al"]
+_NOMBRES = ["María", "José", "Juan", "Ana", "Luis", "Carmen", "Jorge", "Lucía", "Pedro", "Sofía", "Al", "Bo"]
+_APELLIDOS = ["García", "López", "Hernández", "Martínez", "González", "Pérez", "Sánchez", "Ramírez", "de la Cruz"]
+_DOMINIOS = ["gmail.com", "hotmail.com", "outlook.com", "empresa.mx"]
+_CAMPOS_LIKE = ["nombre_cliente", "apellidos_cliente", "correo_cliente", "telefono_cliente"]
+
+def _like(repositorio: ClientesRepository, pagination: PaginationParams, id_taller: str) -> int:
+    condiciones = []
+    params: List[Any] = [id_taller]
+    for palabra in (pagination.search or "").split():
+        condiciones.append("(" + " OR ".join(f"{campo} LIKE %s" for campo in _CAMPOS_LIKE) + ")")
+        params.extend(f"%{palabra}%" for _ in _CAMPOS_LIKE)
+    filtro = "".join(f" AND {condicion}" for condicion in condiciones)
+    repositorio.cursor.execute(
+        f"SELECT * FROM clientes WHERE id_taller = %s{filtro} ORDER BY fecha_creacion DESC LIMIT %s",
+        tuple(params) + (pagination.limit,),
+    )
+    return len(repositorio.cursor.fetchall())
+
+def _fulltext(repositorio: ClientesRepository, pagination: PaginationParams, id_taller: str) -> int:
+    filas, _ = repositorio.listar_por_taller(id_taller, pagination)
+    return len(filas)
+
+ESTRATEGIAS: Dict[str, Callable[[ClientesRepository, PaginationParams, str], int]] = {
+    "LIKE": _like,
+    "FULLTEXT": _fulltext,
+}
+
+def _generar(id_taller: str, total: int, lote: int = 1000) -> None:
+    aleatorio = random.Random(total)
+    with pool_conexiones.conexion() as conexion:
+        repositorio = ClientesRepository(conexion)
+        repositorio.execute("SELECT COUNT(*) AS total FROM clientes WHERE id_taller = %s AND notas_cliente = %s", (id_taller, MARCA))
+        inicio = repositorio.cursor.fetchone()["total"]
+        for desde in range(inicio, inicio + total, lote):
+            filas = []
+            for numero in range(desde, min(desde + lote, inicio + total)):
+                nombre = aleatorio.choice(_NOMBRES)
+                apellidos = f"{aleatorio.choice(_APELLIDOS)} {aleatorio.choice(_APELLIDOS)}"
+                filas.append({
+                    "id_taller": id_taller,
+                    "nombre_cliente": nombre,
+                    "apellidos_cliente": apellidos,
+                    "correo_cliente": f"{nombre.lower()}.{numero}@{aleatorio.choice(_DOMINIOS)}",
+                    "telefono_cliente": f"55{numero:08d}",
+                    "notas_cliente": MARCA,
+                })
+            repositorio.create_many(filas)
+            confirmar(conexion)
+    print(f"{total} clientes generados en {id_taller}")
+
+def _limpiar(id_taller: str) -> None:
+    with pool_conexiones.conexion() as conexion:
+        repositorio = ClientesRepository(conexion)
+        repositorio.execute("DELETE FROM clientes WHERE id_taller = %s AND notas_cliente = %s", (id_taller, MARCA))
+        print(f"{repositorio.cursor.rowcount} clientes sintéticos eliminados de {id_taller}")
+
+def main(argumentos: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--taller", required=True, help="id_taller existente (use uno de pruebas)")
+    parser.add_argument("--buscar", action="append", help="término a medir; se puede repetir (por defecto una lista fija)")
+    parser.add_argument("--generar", type=int, default=0, help="inserta N clientes sintéticos antes de medir")
+    parser.add_argument("--limpiar", action="store_true", help="borra los clientes sintéticos y termina")
+    parser.add_argument("--limite", type=int, default=20)
+    parser.add_argument("--repeticiones", type=int, default=30, help="consultas por estrategia y término")
+    parser.add_argument("--hilos", type=int, default=1, help="consultas simultáneas")
+    args = parser.parse_args(argumentos)
+
+    def _operacion(estrategia: Callable[[ClientesRepository, PaginationParams, str], int], pagination: PaginationParams) -> Callable[[], int]:
+        def _ejecutar() -> int:
+            with pool_conexiones.conexion() as conexion:
+                return estrategia(ClientesRepository(conexion), pagination, args.taller)
+        return _ejecutar
+
+    fallo = False
+    try:
+        if args.limpiar:
+            _limpiar(args.taller)
+            return veredicto(False)
+        if args.generar:
+            _generar(args.taller, args.generar)
+        for termino in args.buscar or TERMINOS:
+            print(f"búsqueda {termino!r}")
+            pagination = PaginationParams(limit=args.limite, search=termino, conteo="omitir")
+            for nombre, estrategia in ESTRATEGIAS.items():
+                resultado = ejecutar_con_hilos(_operacion(estrategia, pagination), args.repeticiones, args.hilos)
+                filas = resultado.resultados[0] if resultado.resultados else "-"
+                print(f"  {nombre}: {filas} filas, {resultado.por_segundo():.0f} consultas/s, errores: {len(resultado.errores)}")
+                imprimir_latencias(resultado.latencias, "    latencia")
+                imprimir_errores(resultado.errores)
+                fallo = fallo or bool(resultado.errores)
+    finally:
+        pool_conexiones.cerrar()
+    return veredicto(fallo)
+
+if __name__ == "__main__":
+    sys.exit(main())
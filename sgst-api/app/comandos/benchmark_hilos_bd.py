@@ -0,0 +1,90 @@
+"""
+Benchmark de latencia con consultas lentas concurrentes: event loop contra ejecutar_en_hilo.
+
+Lanza --lentas consultas de --lenta-ms (SELECT SLEEP) y, mientras corren, --rapidas consultas cortas
+(SELECT 1) que llegan una cada --intervalo-ms, dos veces:
+
+    - "event loop": las funciones bloqueantes se llaman directamente desde la corrutina, como lo hacían
+      las rutas antes de ejecutar_en_hilo; cada consulta lenta detiene a todas las demás.
+    - "hilos": se llaman con ejecutar_en_hilo, como las rutas actuales.
+
+Reporta p50/p95/p99 de las consultas cortas en cada modo, medidas desde su llegada programada (lo que
+vería el cliente, incluida la espera a que el event loop las atienda). En modo hilos solo deben esperar
+si las consultas lentas ocupan todo DB_THREADPOOL_SIZE o todo el pool de conexiones.
+
+Uso (con las variables DB_* del .env; solo ejecuta consultas de lectura):
+
+    python -m app.comandos.benchmark_hilos_bd --lentas 8 --lenta-ms 500 --rapidas 200
+    python -m app.comandos.benchmark_hilos_bd --simulado     # time.sleep en lugar de MySQL
+"""
+from typing import List
+import argparse
+import asyncio
+import sys
+import time
+from app.comandos.medicion import ResultadoCarga, ejecutar_con_corrutinas, imprimir_errores, imprimir_latencias, veredicto
+from app.core.concurrencia import ejecutar_en_hilo
+from app.dependencies.database import pool_conexiones
+
+def _consultar(segundos: float, simulado: bool) -> None:
+    if simulado:
+        time.sleep(segundos)
+        return
+    with pool_conexiones.conexion() as conexion:
+        cursor = conexion.cursor()
+        if segundos > 0:
+            cursor.execute("SELECT SLEEP(%s)", (segundos,))
+        else:
+            cursor.execute("SELECT 1")
+        cursor.fetchall()
+        cursor.close()
+
+async def _fase(en_hilo: bool, args: argparse.Namespace) -> ResultadoCarga:
+    async def _llamar(segundos: float) -> None:
+        if en_hilo:
+            await ejecutar_en_hilo(_consultar, segundos, args.simulado)
+        else:
+            _consultar(segundos, args.simulado)
+
+    async def _rapida(indice: int) -> float:
+        llegada = inicio + indice * args.intervalo_ms / 1000
+        await asyncio.sleep(max(llegada - time.perf_counter(), 0))
+        await _llamar(args.rapida_ms / 1000)
+        return time.perf_counter() - llegada
+
+    inicio = time.perf_counter()
+    lentas = [asyncio.create_task(_llamar(args.lenta_ms / 1000)) for _ in range(args.lentas)]
+    rapidas = await ejecutar_con_corrutinas(_rapida, args.rapidas, args.rapidas)
+    await asyncio.gather(*lentas)
+    # La latencia de ejecutar_con_corrutinas empieza cuando la corrutina corre; la que importa empieza en la llegada.
+    rapidas.latencias = sorted(rapidas.resultados)
+    return rapidas
+
+async def _comparar(args: argparse.Namespace) -> List[ResultadoCarga]:
+    # Ambas fases en el mismo event loop: el limitador de ejecutar_en_hilo queda ligado al primero que lo usa.
+    return [await _fase(False, args), await _fase(True, args)]
+
+def main(argumentos: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lentas", type=int, default=8, help="consultas lentas simultáneas")
+    parser.add_argument("--lenta-ms", type=int, default=500, help="duración de cada consulta lenta")
+    parser.add_argument("--rapidas", type=int, default=200, help="consultas cortas a medir")
+    parser.add_argument("--rapida-ms", type=int, default=0, help="duración de las consultas cortas (0 = SELECT 1)")
+    parser.add_argument("--intervalo-ms", type=float, default=5, help="tiempo entre llegadas de consultas cortas")
+    parser.add_argument("--simulado", action="store_true", help="usa time.sleep en lugar de la base de datos")
+    args = parser.parse_args(argumentos)
+
+    try:
+        en_loop, en_hilos = asyncio.run(_comparar(args))
+    finally:
+        pool_conexiones.cerrar()
+
+    print(f"{args.lentas} consultas lentas de {args.lenta_ms} ms y {args.rapidas} cortas ({'simulado' if args.simulado else 'MySQL'})")
+    for nombre, resultado in (("event loop", en_loop), ("hilos", en_hilos)):
+        print(f"{nombre}: {resultado.exitosas} cortas en {resultado.duracion:.2f} s, errores: {len(resultado.errores)}")
+        imprimir_latencias(resultado.latencias, f"  latencia {nombre}")
+        imprimir_errores(resultado.errores)
+    return veredicto(bool(en_loop.errores or en_hilos.errores))
+
+if __name__ == "__main__":
+    sys.exit(main())
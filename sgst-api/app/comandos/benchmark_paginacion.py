@@ -0,0 +1,92 @@
+"""
+Benchmark de las estrategias para obtener una página de clientes y su total.
+
+Mide la misma página del listado de clientes de un taller (GET /clientes) con:
+
+    - "pagina + COUNT": la página y un COUNT(*) aparte, como antes de paginate_con_total.
+    - "COUNT(*) OVER()": la página con el total como función de ventana; MySQL debe materializar todo
+      el resultado filtrado antes de aplicar el LIMIT.
+    - "LIMIT n+1 estimado" / "exacto" / "omitir": paginate_con_total con cada valor de `conteo`.
+
+Reporta p50/p95/p99 por estrategia. Las diferencias crecen con el número de filas del taller y con la
+búsqueda; para verlas use un taller de pruebas con decenas de miles de clientes.
+
+Uso (con las variables DB_* del .env; solo ejecuta consultas de lectura):
+
+    python -m app.comandos.benchmark_paginacion --taller <id_taller> --repeticiones 50
+    python -m app.comandos.benchmark_paginacion --taller <id_taller> --buscar "garcia" --pagina 3
+"""
+from typing import Any, Callable, Dict, List
+import argparse
+import sys
+from app.comandos.medicion import ejecutar_con_hilos, imprimir_errores, imprimir_latencias, veredicto
+from app.dependencies.database import pool_conexiones
+from app.models.pagination import PaginationParams
+from app.repositories.clientes_repository import ClientesRepository
+
+_ORDEN = "ORDER BY fecha_creacion DESC LIMIT %s OFFSET %s"
+
+def _consulta_base(repositorio: ClientesRepository, id_taller: str, buscar: str | None) -> tuple:
+    clausula, parametros = repositorio._build_search_clause(buscar)
+    return f"SELECT * FROM clientes WHERE id_taller = %s{clausula}", (id_taller, *parametros)
+
+def _pagina_mas_count(repositorio: ClientesRepository, pagination: PaginationParams, id_taller: str) -> int:
+    query, params = _consulta_base(repositorio, id_taller, pagination.search)
+    repositorio.cursor.execute(f"{query} {_ORDEN}", params + (pagination.limit, pagination.offset))
+    repositorio.cursor.fetchall()
+    repositorio.cursor.execute(f"SELECT COUNT(*) AS total FROM ({query}) AS sub", params)
+    return repositorio.cursor.fetchone()["total"]
+
+def _ventana(repositorio: ClientesRepository, pagination: PaginationParams, id_taller: str) -> int:
+    query, params = _consulta_base(repositorio, id_taller, pagination.search)
+    query = query.replace("SELECT *", "SELECT *, COUNT(*) OVER() AS _total_filas", 1)
+    repositorio.cursor.execute(f"{query} {_ORDEN}", params + (pagination.limit, pagination.offset))
+    filas = repositorio.cursor.fetchall()
+    return filas[0]["_total_filas"] if filas else 0
+
+def _paginate_con_total(conteo: str) -> Callable[[ClientesRepository, PaginationParams, str], Any]:
+    def _medir(repositorio: ClientesRepository, pagination: PaginationParams, id_taller: str) -> Any:
+        _, total = repositorio.listar_por_taller(id_taller, pagination.model_copy(update={"conteo": conteo}))
+        return total
+    return _medir
+
+ESTRATEGIAS: Dict[str, Callable[[ClientesRepository, PaginationParams, str], Any]] = {
+    "pagina + COUNT": _pagina_mas_count,
+    "COUNT(*) OVER()": _ventana,
+    "LIMIT n+1 estimado": _paginate_con_total("estimado"),
+    "LIMIT n+1 exacto": _paginate_con_total("exacto"),
+    "LIMIT n+1 omitir": _paginate_con_total("omitir"),
+}
+
+def main(argumentos: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--taller", required=True, help="id_taller existente")
+    parser.add_argument("--buscar", help="término de búsqueda (opcional)")
+    parser.add_argument("--pagina", type=int, default=1)
+    parser.add_argument("--limite", type=int, default=20)
+    parser.add_argument("--repeticiones", type=int, default=50, help="consultas por estrategia")
+    parser.add_argument("--hilos", type=int, default=1, help="consultas simultáneas")
+    args = parser.parse_args(argumentos)
+    pagination = PaginationParams(page=args.pagina, limit=args.limite, search=args.buscar)
+
+    def _operacion(estrategia: Callable[[ClientesRepository, PaginationParams, str], Any]) -> Callable[[], Any]:
+        def _ejecutar() -> Any:
+            with pool_conexiones.conexion() as conexion:
+                return estrategia(ClientesRepository(conexion), pagination, args.taller)
+        return _ejecutar
+
+    fallo = False
+    try:
+        for nombre, estrategia in ESTRATEGIAS.items():
+            resultado = ejecutar_con_hilos(_operacion(estrategia), args.repeticiones, args.hilos)
+            total = resultado.resultados[0] if resultado.resultados else "-"
+            print(f"{nombre}: total {total}, {resultado.por_segundo():.0f} páginas/s, errores: {len(resultado.errores)}")
+            imprimir_latencias(resultado.latencias, "  latencia")
+            imprimir_errores(resultado.errores)
+            fallo = fallo or bool(resultado.errores)
+    finally:
+        pool_conexiones.cerrar()
+    return veredicto(fallo)
+
+if __name__ == "__main__":
+    sys.exit(main())
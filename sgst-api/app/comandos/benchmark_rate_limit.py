@@ -0,0 +1,152 @@
+"""
+Benchmark del costo del rate limit por petición y prueba de sus claves.
+
+Monta una aplicación mínima con el mismo Limiter que usa la API (misma clave, estrategia y
+almacenamiento RATE_LIMIT_STORAGE, o el de --storage) y la llama directamente por ASGI, sin red:
+
+    - "sin límite": una ruta sin @limiter.limit, la referencia.
+    - "con límite": la misma ruta con un límite que nunca se alcanza; la diferencia es lo que cuesta
+      contar la petición en el almacenamiento (memoria o un viaje a Redis).
+
+Después comprueba las claves: una ruta limitada a --limite peticiones debe responder 429 a la
+siguiente desde la misma IP aunque cada petición traiga una cookie access_token distinta, y seguir
+respondiendo a otra IP. Una ruta con clave_por_usuario debe llevar un contador por usuario autenticado:
+dos usuarios desde la misma IP tienen --limite peticiones cada uno.
+
+Uso (no necesita la base de datos):
+
+    python -m app.comandos.benchmark_rate_limit --peticiones 5000 --concurrencia 50
+    python -m app.comandos.benchmark_rate_limit --storage redis://localhost:6379/0
+"""
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+import argparse
+import asyncio
+import sys
+from fastapi import Depends, FastAPI, Request
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from app.comandos.medicion import ejecutar_con_corrutinas, imprimir_errores, imprimir_latencias, veredicto
+from app.core.config import settings
+from app.core.rate_limit import clave_por_usuario, obtener_clave_rate_limit
+
+def _crear_app(storage: str, limite: int) -> FastAPI:
+    limiter = Limiter(
+        key_func=obtener_clave_rate_limit,
+        storage_uri=storage,
+        strategy=settings.RATE_LIMIT_ESTRATEGIA,
+        key_prefix="sgst-benchmark",
+    )
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    @app.get("/libre")
+    async def libre(request: Request):
+        return {"ok": True}
+
+    @app.get("/limitado")
+    @limiter.limit("1000000/minute")
+    async def limitado(request: Request):
+        return {"ok": True}
+
+    @app.get("/estricto")
+    @limiter.limit(f"{limite}/minute")
+    async def estricto(request: Request):
+        return {"ok": True}
+
+    # Hace las veces de las dependencias de autenticación: deja el contexto en request.state.
+    def _autenticar(request: Request) -> None:
+        id_usuario = request.headers.get("x-usuario")
+        if id_usuario:
+            request.state.contexto_auth = SimpleNamespace(usuario=SimpleNamespace(id_usuario=id_usuario))
+
+    @app.get("/por-usuario")
+    @limiter.limit(f"{limite}/minute", key_func=clave_por_usuario)
+    async def por_usuario(request: Request, _=Depends(_autenticar)):
+        return {"ok": True}
+
+    limiter.reset()
+    return app
+
+async def _llamar(app: FastAPI, ruta: str, ip: str = "10.0.0.1", cookie: str | None = None, usuario: str | None = None) -> int:
+    """Hace un GET por ASGI y regresa el código de estado."""
+    headers: List[Tuple[bytes, bytes]] = [(b"host", b"benchmark")]
+    if cookie:
+        headers.append((b"cookie", f"access_token={cookie}".encode()))
+    if usuario:
+        headers.append((b"x-usuario", usuario.encode()))
+    scope: Dict[str, Any] = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": ruta, "raw_path": ruta.encode(), "query_string": b"", "root_path": "",
+        "headers": headers, "client": (ip, 40000), "server": ("benchmark", 80),
+    }
+    estado = 0
+
+    async def _recibir() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def _enviar(mensaje: Dict[str, Any]) -> None:
+        nonlocal estado
+        if mensaje["type"] == "http.response.start":
+            estado = mensaje["status"]
+
+    await app(scope, _recibir, _enviar)
+    return estado
+
+async def _medir(app: FastAPI, ruta: str, args: argparse.Namespace):
+    async def _operacion(indice: int) -> int:
+        estado = await _llamar(app, ruta, ip=f"10.1.{indice % 250}.{indice % 200}")
+        if estado != 200:
+            raise RuntimeError(f"{ruta} respondió {estado}")
+        return estado
+    return await ejecutar_con_corrutinas(_operacion, args.peticiones, args.concurrencia)
+
+async def _probar_claves(app: FastAPI, limite: int) -> List[str]:
+    fallas = []
+    estados = [await _llamar(app, "/estricto", ip="10.9.9.9", cookie=f"token-{n}") for n in range(limite + 1)]
+    if estados[:limite] != [200] * limite:
+        fallas.append(f"las primeras {limite} peticiones debían responder 200: {estados[:limite]}")
+    if estados[limite] != 429:
+        fallas.append(f"la petición {limite + 1} con otra cookie debía responder 429, respondió {estados[limite]}")
+    otra_ip = await _llamar(app, "/estricto", ip="10.9.9.10")
+    if otra_ip != 200:
+        fallas.append(f"otra IP debía responder 200, respondió {otra_ip}")
+
+    for usuario in ("usuario-a", "usuario-b"):
+        estados = [await _llamar(app, "/por-usuario", ip="10.9.9.20", usuario=usuario) for _ in range(limite + 1)]
+        if estados != [200] * limite + [429]:
+            fallas.append(f"{usuario} debía tener {limite} peticiones propias desde la IP compartida: {estados}")
+    return fallas
+
+async def _ejecutar(args: argparse.Namespace):
+    app = _crear_app(args.storage, args.limite)
+    # Calentamiento: la primera petición de cada ruta construye dependencias y el cliente del almacenamiento.
+    for ruta in ("/libre", "/limitado"):
+        await _llamar(app, ruta, ip="10.255.255.255")
+    libre = await _medir(app, "/libre", args)
+    limitado = await _medir(app, "/limitado", args)
+    fallas = await _probar_claves(app, args.limite)
+    return libre, limitado, fallas
+
+def main(argumentos: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--storage", default=settings.RATE_LIMIT_STORAGE, help="URI de almacenamiento (por defecto RATE_LIMIT_STORAGE)")
+    parser.add_argument("--peticiones", type=int, default=2000, help="peticiones por ruta")
+    parser.add_argument("--concurrencia", type=int, default=20, help="peticiones simultáneas")
+    parser.add_argument("--limite", type=int, default=5, help="límite por minuto de la ruta de prueba de claves")
+    args = parser.parse_args(argumentos)
+
+    libre, limitado, fallas = asyncio.run(_ejecutar(args))
+
+    print(f"almacenamiento {args.storage}, estrategia {settings.RATE_LIMIT_ESTRATEGIA}")
+    for nombre, resultado in (("sin límite", libre), ("con límite", limitado)):
+        print(f"{nombre}: {resultado.por_segundo():.0f} peticiones/s, errores: {len(resultado.errores)}")
+        imprimir_latencias(resultado.latencias, "  latencia")
+        imprimir_errores(resultado.errores)
+    for falla in fallas:
+        print(f"claves: {falla}", file=sys.stderr)
+    return veredicto(bool(libre.errores or limitado.errores or fallas))
+
+if __name__ == "__main__":
+    sys.exit(main())
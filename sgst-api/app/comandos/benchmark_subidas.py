@@ -0,0 +1,131 @@
+"""
+Benchmark de subidas de imágenes al almacenamiento local.
+
+Pasa formularios multipart con imágenes de --tamano-mb por AlmacenamientoLocal.recibir, entregando el
+cuerpo en bloques de 64 KB como lo hace uvicorn, con --concurrencia subidas simultáneas. Reporta el
+rendimiento en MB/s y cuánto crece la memoria residual máxima (ru_maxrss) del proceso: como los archivos
+se escriben a disco por bloques, debe mantenerse muy por debajo de concurrencia × tamaño.
+
+Con Pillow instalado las imágenes son JPEG reales (ruido, que no se comprime) y al final se generan sus
+miniaturas; sin Pillow se usa una cabecera JPEG seguida de bytes aleatorios y las miniaturas se omiten.
+No usa la base de datos; escribe en un directorio temporal que se borra al terminar.
+
+    python -m app.comandos.benchmark_subidas --archivos 30 --tamano-mb 10 --concurrencia 6
+"""
+from typing import List
+import argparse
+import asyncio
+import importlib.util
+import io
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from starlette.requests import Request
+from app.comandos.medicion import ResultadoCarga, ejecutar_con_corrutinas, imprimir_errores, imprimir_latencias, veredicto
+from app.core.almacenamiento import TIPOS_IMAGEN, AlmacenamientoLocal
+from app.core.config import settings
+
+_BLOQUE_RED = 64 * 1024
+_FRONTERA = b"----sgst-benchmark"
+
+def _generar_imagen(tamano_bytes: int) -> bytes:
+    try:
+        from PIL import Image
+    except ImportError:
+        return b"\xff\xd8\xff\xe0" + os.urandom(tamano_bytes - 4)
+    # Un JPEG de ruido con calidad 95 ocupa ~3 bytes por píxel.
+    lado = max(int((tamano_bytes / 3) ** 0.5), 16)
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (lado, lado), os.urandom(lado * lado * 3)).save(buffer, "JPEG", quality=95)
+    return buffer.getvalue()
+
+def _formulario(imagen: bytes, indice: int) -> bytes:
+    # Cada subida cambia el último byte para que ninguna se deduplique y todas se escriban a disco.
+    return (
+        b"--" + _FRONTERA + b"\r\n"
+        + f'Content-Disposition: form-data; name="imagenes"; filename="foto_{indice}.jpg"\r\n'.encode()
+        + b"Content-Type: image/jpeg\r\n\r\n"
+        + imagen[:-4] + indice.to_bytes(4, "big") + b"\r\n"
+        + b"--" + _FRONTERA + b"--\r\n"
+    )
+
+def _peticion(cuerpo: bytes) -> Request:
+    posicion = 0
+
+    async def receive():
+        nonlocal posicion
+        bloque = cuerpo[posicion:posicion + _BLOQUE_RED]
+        posicion += len(bloque)
+        return {"type": "http.request", "body": bloque, "more_body": posicion < len(cuerpo)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=" + _FRONTERA)],
+    }
+    return Request(scope, receive)
+
+def _rss_mb() -> float:
+    # En Linux ru_maxrss está en KB.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def _subir(almacenamiento: AlmacenamientoLocal, imagen: bytes, total: int, concurrencia: int) -> ResultadoCarga:
+    async def _una(indice: int) -> str:
+        # El cuerpo se arma dentro de cada operación: solo hay `concurrencia` cuerpos en memoria a la vez,
+        # igual que en un servidor donde cada cuerpo llega por la red.
+        archivos, _ = await almacenamiento.recibir(_peticion(_formulario(imagen, indice)), {"imagenes": 1}, TIPOS_IMAGEN)
+        return archivos[0].ruta
+
+    return await ejecutar_con_corrutinas(_una, total, concurrencia)
+
+def main(argumentos: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archivos", type=int, default=30, help="imágenes a subir")
+    parser.add_argument("--tamano-mb", type=float, default=10, help="tamaño de cada imagen")
+    parser.add_argument("--concurrencia", type=int, default=6, help="subidas simultáneas")
+    args = parser.parse_args(argumentos)
+
+    imagen = _generar_imagen(int(args.tamano_mb * 1024 * 1024))
+    raiz = tempfile.mkdtemp(prefix="sgst-subidas-")
+    almacenamiento = AlmacenamientoLocal(
+        raiz=raiz,
+        max_bytes=max(settings.ALMACENAMIENTO_MAX_MB * 1024 * 1024, len(imagen) + 1024),
+        bloque_bytes=settings.ALMACENAMIENTO_BLOQUE_KB * 1024,
+        ancho_miniatura=settings.MINIATURAS_ANCHO,
+        hilos_miniaturas=settings.MINIATURAS_HILOS,
+    )
+    try:
+        rss_inicial = _rss_mb()
+        resultado = asyncio.run(_subir(almacenamiento, imagen, args.archivos, args.concurrencia))
+        rss_final = _rss_mb()
+        rutas: List[str] = resultado.resultados
+
+        mb_totales = len(imagen) * len(rutas) / (1024 * 1024)
+        print(f"subidas: {len(rutas)} de {len(imagen) / (1024 * 1024):.1f} MB, concurrencia {args.concurrencia}, "
+              f"errores: {len(resultado.errores)}")
+        print(f"duración: {resultado.duracion:.2f} s, {mb_totales / resultado.duracion:.1f} MB/s")
+        imprimir_latencias(resultado.latencias, "latencia por subida")
+        imprimir_errores(resultado.errores)
+        print(f"memoria máxima: {rss_final:.1f} MB (creció {rss_final - rss_inicial:.1f} MB; "
+              f"la imagen de prueba en memoria ocupa {len(imagen) / (1024 * 1024):.1f} MB)")
+
+        if importlib.util.find_spec("PIL") is None:
+            print("miniaturas: omitidas (Pillow no está instalado)")
+            return veredicto(bool(resultado.errores))
+        inicio = time.perf_counter()
+        for futuro in [almacenamiento.programar_miniatura(ruta) for ruta in rutas]:
+            if futuro is not None:
+                futuro.result()
+        estadisticas = almacenamiento.estadisticas()
+        print(f"miniaturas: {estadisticas['miniaturas']} en {time.perf_counter() - inicio:.2f} s "
+              f"({settings.MINIATURAS_HILOS} hilos, {estadisticas['miniatura_promedio_ms']:.0f} ms promedio)")
+    finally:
+        almacenamiento.cerrar()
+        shutil.rmtree(raiz, ignore_errors=True)
+    return veredicto(bool(resultado.errores))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Benchmark de ventas de mostrador en ráfaga.
+
+Registra ventas concurrentes con VentasService, cada una en su propia transacción como lo haría
+POST /ventas, eligiendo al azar varias líneas entre los productos indicados. Al compartir productos,
+las ventas compiten por las mismas filas de stock: el resultado esperado es cero deadlocks y que
+ninguna venta deje un stock negativo (las que no alcanzan se rechazan completas).
+
+Uso (con las variables DB_* del .env apuntando a una base de datos de pruebas; las ventas se
+confirman y descuentan stock real):
+
+    python -m app.comandos.benchmark_ventas --taller <id_taller> --productos 1,2,3,4,5 --total 500 --hilos 30
+"""
+from typing import List
+import argparse
+import random
+import sys
+from mysql.connector import errorcode
+import mysql.connector
+from app.comandos.medicion import ejecutar_con_hilos, imprimir_errores, imprimir_latencias, veredicto
+from app.core.exceptions import StockInsuficienteException
+from app.core.transacciones import confirmar, revertir
+from app.dependencies.database import conectar_bd
+from app.models.venta import CrearVentaDTO, LineaVentaDTO
+from app.services.ventas_service import VentasService
+
+def _vender(id_taller: str, id_usuario: str | None, productos: List[int], lineas: int, cantidad_maxima: int) -> None:
+    datos = CrearVentaDTO(lineas=[
+        LineaVentaDTO(id_producto=id_producto, cantidad=random.randint(1, cantidad_maxima))
+        for id_producto in random.sample(productos, min(lineas, len(productos)))
+    ])
+    conexion = conectar_bd()
+    try:
+        VentasService(conexion).registrar_venta(datos, id_taller, id_usuario)
+        confirmar(conexion)
+    except BaseException:
+        revertir(conexion)
+        raise
+    finally:
+        conexion.close()
+
+def main(argumentos: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--taller", required=True, help="id_taller existente")
+    parser.add_argument("--usuario", help="id_usuario registrado como creado_por (opcional)")
+    parser.add_argument("--productos", required=True, help="ids de productos_venta del taller, separados por comas")
+    parser.add_argument("--total", type=int, default=500, help="ventas a registrar")
+    parser.add_argument("--hilos", type=int, default=30, help="ventas simultáneas")
+    parser.add_argument("--lineas", type=int, default=5, help="líneas por venta")
+    parser.add_argument("--cantidad-maxima", type=int, default=3, help="unidades máximas por línea")
+    args = parser.parse_args(argumentos)
+    productos = [int(id_producto) for id_producto in args.productos.split(",") if id_producto.strip()]
+
+    def _clasificar(error: BaseException) -> str | None:
+        if isinstance(error, StockInsuficienteException):
+            return "rechazadas"
+        if isinstance(error, mysql.connector.Error) and error.errno == errorcode.ER_LOCK_DEADLOCK:
+            return "deadlocks"
+        return None
+
+    resultado = ejecutar_con_hilos(
+        lambda: _vender(args.taller, args.usuario, productos, args.lineas, args.cantidad_maxima),
+        args.total, args.hilos, _clasificar,
+    )
+    deadlocks = resultado.conteos.get("deadlocks", 0)
+
+    print(f"ventas: {resultado.exitosas} registradas, {resultado.conteos.get('rechazadas', 0)} rechazadas por stock, "
+          f"{deadlocks} deadlocks, {len(resultado.errores)} errores")
+    print(f"duración: {resultado.duracion:.2f} s, {resultado.por_segundo():.0f} ventas/s")
+    imprimir_latencias(resultado.latencias)
+    imprimir_errores(resultado.errores)
+    return veredicto(bool(resultado.errores) or deadlocks > 0)
+
+if __name__ == "__main__":
+    sys.exit(main())
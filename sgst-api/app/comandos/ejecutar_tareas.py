@@ -0,0 +1,39 @@
+"""
+Ejecuta una o todas las tareas de mantenimiento una sola vez y muestra su duración.
+
+Sirve para correrlas desde cron cuando la API se despliega con TAREAS_ACTIVAS=false, o para purgar
+de inmediato después de una carga grande. No toma el candado de tareas: si un worker de la API está
+ejecutando la misma tarea, ambas procesan lotes distintos sin conflicto.
+
+Uso:
+
+    python -m app.comandos.ejecutar_tareas                         # todas las tareas
+    python -m app.comandos.ejecutar_tareas --tarea purgar_refresh_tokens
+"""
+from typing import List
+import argparse
+import sys
+from app.dependencies.database import pool_conexiones
+from app.services.mantenimiento_service import ejecutor_tareas
+
+def main(argumentos: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tarea", choices=ejecutor_tareas.nombres(), help="tarea a ejecutar (por defecto todas)")
+    args = parser.parse_args(argumentos)
+
+    codigo = 0
+    for nombre in [args.tarea] if args.tarea else ejecutor_tareas.nombres():
+        try:
+            filas = ejecutor_tareas.ejecutar(nombre)
+        except Exception as e:
+            print(f"{nombre}: error {e!r}", file=sys.stderr)
+            codigo = 1
+            continue
+        duracion = ejecutor_tareas.estadisticas()["tareas"][nombre]["duracion_ultima_ms"]
+        print(f"{nombre}: {filas} filas en {duracion:.0f} ms")
+
+    pool_conexiones.cerrar()
+    return codigo
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Prueba de estrés de los consecutivos por taller.
+
+Lanza cientos de transacciones concurrentes que piden números de la misma secuencia y el mismo
+taller, igual que lo harían las creaciones de órdenes o ventas, y comprueba que no haya números
+repetidos. Con un bloque de 1 también comprueba que los números confirmados no tengan huecos,
+incluso cuando parte de las transacciones se revierten.
+
+Uso (con las variables DB_* del .env apuntando a una base de datos de pruebas):
+
+    python -m app.comandos.estres_secuencias --taller <id_taller> --total 500 --hilos 50
+"""
+from typing import List, Tuple
+import argparse
+import random
+import sys
+import time
+from app.comandos.medicion import ejecutar_con_hilos, imprimir_errores, imprimir_latencias, veredicto
+from app.core.transacciones import confirmar, revertir
+from app.dependencies.database import conectar_bd
+from app.repositories.secuencias_repository import SecuenciasRepository
+from app.services.secuencias_service import bloques_secuencias
+
+def _crear(id_taller: str, secuencia: str, bloque: int, espera_ms: int, porcentaje_rollback: int) -> Tuple[int, bool]:
+    conexion = conectar_bd()
+    try:
+        if bloque > 1:
+            numero = bloques_secuencias.siguiente(id_taller, secuencia, bloque)
+        else:
+            numero = SecuenciasRepository(conexion).siguiente(id_taller, secuencia)
+        # Simula el INSERT del registro mientras la fila del consecutivo sigue bloqueada.
+        time.sleep(espera_ms / 1000)
+        confirmada = random.randint(1, 100) > porcentaje_rollback
+        if confirmada:
+            confirmar(conexion)
+        else:
+            revertir(conexion)
+        return numero, confirmada
+    finally:
+        conexion.close()
+
+def main(argumentos: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--taller", required=True, help="id_taller existente (se modifica su consecutivo)")
+    parser.add_argument("--secuencia", default="ordenes", choices=sorted(SecuenciasRepository.secuencias))
+    parser.add_argument("--total", type=int, default=500, help="transacciones a ejecutar")
+    parser.add_argument("--hilos", type=int, default=50, help="transacciones simultáneas")
+    parser.add_argument("--bloque", type=int, default=1, help="números reservados por bloque (1 = sin huecos)")
+    parser.add_argument("--espera-ms", type=int, default=5, help="duración simulada del INSERT")
+    parser.add_argument("--rollback", type=int, default=10, help="porcentaje de transacciones revertidas")
+    args = parser.parse_args(argumentos)
+
+    # Con bloques un rollback no devuelve el número (ya se reservó en otra transacción), así que solo se prueba sin bloques.
+    porcentaje_rollback = args.rollback if args.bloque == 1 else 0
+    try:
+        resultado = ejecutar_con_hilos(
+            lambda: _crear(args.taller, args.secuencia, args.bloque, args.espera_ms, porcentaje_rollback),
+            args.total, args.hilos,
+        )
+    finally:
+        bloques_secuencias.cerrar()
+
+    confirmados = sorted(numero for numero, confirmada in resultado.resultados if confirmada)
+    repetidos = len(confirmados) - len(set(confirmados))
+    huecos = (confirmados[-1] - confirmados[0] + 1 - len(confirmados)) if confirmados else 0
+
+    print(f"transacciones: {resultado.exitosas} ({len(confirmados)} confirmadas), errores: {len(resultado.errores)}")
+    print(f"duración: {resultado.duracion:.2f} s, {resultado.por_segundo():.0f} transacciones/s")
+    imprimir_latencias(resultado.latencias)
+    print(f"números: {confirmados[0] if confirmados else '-'} a {confirmados[-1] if confirmados else '-'}, "
+          f"repetidos: {repetidos}, huecos: {huecos}")
+    imprimir_errores(resultado.errores)
+    return veredicto(bool(resultado.errores) or repetidos > 0 or (args.bloque == 1 and huecos > 0))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Utilidades compartidas por los benchmarks y pruebas de estrés de app.comandos (no es un comando).
+
+Cada comando define solo la operación a medir; aquí se ejecuta concurrentemente (con hilos o con
+corrutinas), se recogen latencias y errores y se imprime el resumen con el mismo formato en todos.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List
+import asyncio
+import statistics
+import sys
+import threading
+import time
+
+class ResultadoCarga:
+    def __init__(self):
+        self.latencias: List[float] = [] # Segundos de cada operación exitosa, ordenadas al terminar.
+        self.resultados: List[Any] = [] # Lo que regresó cada operación exitosa.
+        self.conteos: Dict[str, int] = {} # Excepciones esperadas, por la etiqueta que les dio `clasificar`.
+        self.errores: List[BaseException] = []
+        self.duracion = 0.0
+        self._candado = threading.Lock()
+
+    @property
+    def exitosas(self) -> int:
+        return len(self.latencias)
+
+    def por_segundo(self) -> float:
+        return self.exitosas / self.duracion if self.duracion else 0.0
+
+    def _registrar(self, inicio: float, resultado: Any) -> None:
+        latencia = time.perf_counter() - inicio
+        with self._candado:
+            self.latencias.append(latencia)
+            self.resultados.append(resultado)
+
+    def _registrar_error(self, error: BaseException, clasificar: Callable[[BaseException], str | None] | None) -> None:
+        etiqueta = clasificar(error) if clasificar is not None else None
+        with self._candado:
+            if etiqueta is None:
+                self.errores.append(error)
+            else:
+                self.conteos[etiqueta] = self.conteos.get(etiqueta, 0) + 1
+
+def ejecutar_con_hilos(
+    operacion: Callable[[], Any],
+    total: int,
+    hilos: int,
+    clasificar: Callable[[BaseException], str | None] | None = None,
+) -> ResultadoCarga:
+    """
+    Ejecuta `operacion` `total` veces con `hilos` simultáneos. Las excepciones a las que `clasificar` da una
+    etiqueta (rechazos esperados, deadlocks, ...) solo se cuentan; las demás se guardan como errores.
+    """
+    resultado = ResultadoCarga()
+
+    def _una() -> None:
+        inicio = time.perf_counter()
+        try:
+            valor = operacion()
+        except BaseException as e:
+            resultado._registrar_error(e, clasificar)
+            return
+        resultado._registrar(inicio, valor)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        for _ in range(total):
+            ejecutor.submit(_una)
+    resultado.duracion = time.perf_counter() - inicio
+    resultado.latencias.sort()
+    return resultado
+
+async def ejecutar_con_corrutinas(
+    operacion: Callable[[int], Awaitable[Any]],
+    total: int,
+    concurrencia: int,
+    clasificar: Callable[[BaseException], str | None] | None = None,
+) -> ResultadoCarga:
+    """Igual que ejecutar_con_hilos, para operaciones asíncronas; `operacion` recibe el índice de la ejecución."""
+    resultado = ResultadoCarga()
+    semaforo = asyncio.Semaphore(concurrencia)
+
+    async def _una(indice: int) -> None:
+        async with semaforo:
+            inicio = time.perf_counter()
+            try:
+                valor = await operacion(indice)
+            except Exception as e:
+                resultado._registrar_error(e, clasificar)
+                return
+            resultado._registrar(inicio, valor)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_una(indice) for indice in range(total)))
+    resultado.duracion = time.perf_counter() - inicio
+    resultado.latencias.sort()
+    return resultado
+
+def percentil(ordenadas: List[float], fraccion: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not ordenadas:
+        return 0.0
+    posicion = max(int(len(ordenadas) * fraccion + 0.999999) - 1, 0)
+    return ordenadas[min(posicion, len(ordenadas) - 1)]
+
+def imprimir_latencias(latencias: List[float], etiqueta: str = "latencia") -> None:
+    if not latencias:
+        print(f"{etiqueta}: sin operaciones exitosas")
+        return
+    print(f"{etiqueta}: p50 {statistics.median(latencias) * 1000:.2f} ms, p95 {percentil(latencias, 0.95) * 1000:.2f} ms, "
+          f"p99 {percentil(latencias, 0.99) * 1000:.2f} ms, máx {latencias[-1] * 1000:.2f} ms")
+
+def imprimir_errores(errores: List[BaseException], maximo: int = 5) -> None:
+    for error in errores[:maximo]:
+        print(f"error: {error!r}", file=sys.stderr)
+
+def veredicto(fallo: bool) -> int:
+    """Imprime el resultado final y regresa el código de salida del comando."""
+    print("FALLO" if fallo else "OK")
+    return 1 if fallo else 0
@@ -0,0 +1,53 @@
+"""
+Recalcula ordenes.monto_pagado (y con él saldo_pendiente) a partir de los pagos no anulados.
+
+PagosService mantiene los saldos al día; este comando sirve después de cargar o corregir pagos
+directamente en la base de datos, o para comprobar que los saldos cuadran. Cada taller se procesa
+en su propia transacción.
+
+Uso:
+
+    python -m app.comandos.reconciliar_saldos                          # todos los talleres
+    python -m app.comandos.reconciliar_saldos --taller <id>            # solo un taller
+    python -m app.comandos.reconciliar_saldos --solo-verificar         # muestra diferencias sin corregir
+"""
+from typing import List
+import argparse
+import sys
+import time
+from app.dependencies.database import pool_conexiones
+from app.repositories.ordenes_repository import OrdenesRepository
+
+def main(argumentos: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--taller", help="id_taller a reconciliar (por defecto todos los que tienen órdenes)")
+    parser.add_argument("--solo-verificar", action="store_true", help="solo lista las órdenes que no cuadran")
+    args = parser.parse_args(argumentos)
+
+    if args.taller:
+        talleres = [args.taller]
+    else:
+        with pool_conexiones.conexion() as conexion:
+            talleres = OrdenesRepository(conexion).listar_talleres_con_ordenes()
+
+    diferencias_totales = 0
+    for id_taller in talleres:
+        inicio = time.perf_counter()
+        with pool_conexiones.conexion() as conexion:
+            repositorio = OrdenesRepository(conexion)
+            if args.solo_verificar:
+                diferencias = repositorio.diferencias_saldo(id_taller)
+                for fila in diferencias[:20]:
+                    print(f"  orden {fila['num_orden']}: monto_pagado {fila['monto_pagado']}, pagos {fila['pagado_real']}")
+                corregidas = len(diferencias)
+            else:
+                corregidas = repositorio.reconciliar_saldos(id_taller)
+        diferencias_totales += corregidas
+        accion = "con diferencias" if args.solo_verificar else "corregidas"
+        print(f"{id_taller}: {corregidas} órdenes {accion} en {time.perf_counter() - inicio:.2f} s")
+
+    pool_conexiones.cerrar()
+    return 1 if args.solo_verificar and diferencias_totales else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
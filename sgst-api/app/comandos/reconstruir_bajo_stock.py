@@ -0,0 +1,42 @@
+"""
+Reconstruye inventario_bajo_stock a partir de refacciones y productos_venta.
+
+Los triggers trg_bajo_stock_* mantienen la tabla al día desde que existen, pero no ven el inventario
+que ya estaba cargado: después de migrar una base existente hay que ejecutar este comando una vez.
+También sirve después de cargar inventario con los triggers desactivados. Se puede repetir; no envía
+notificaciones. Cada taller se procesa en su propia transacción.
+
+Uso:
+
+    python -m app.comandos.reconstruir_bajo_stock                # todos los talleres
+    python -m app.comandos.reconstruir_bajo_stock --taller <id>  # solo un taller
+"""
+from typing import List
+import argparse
+import sys
+import time
+from app.dependencies.database import pool_conexiones
+from app.repositories.inventario_repository import InventarioRepository
+
+def main(argumentos: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--taller", help="id_taller a reconstruir (por defecto todos)")
+    args = parser.parse_args(argumentos)
+
+    if args.taller:
+        talleres = [args.taller]
+    else:
+        with pool_conexiones.conexion() as conexion:
+            talleres = InventarioRepository(conexion).listar_talleres()
+
+    for id_taller in talleres:
+        inicio = time.perf_counter()
+        with pool_conexiones.conexion() as conexion:
+            agregados, quitados = InventarioRepository(conexion).reconstruir(id_taller)
+        print(f"{id_taller}: {agregados} agregados, {quitados} quitados en {time.perf_counter() - inicio:.2f} s")
+
+    pool_conexiones.cerrar()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
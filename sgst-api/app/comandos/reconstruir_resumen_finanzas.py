@@ -0,0 +1,41 @@
+"""
+Reconstruye finanzas_resumen_diario a partir de finanzas_movimientos.
+
+Los triggers mantienen los totales al día; este comando sirve después de cargar movimientos con
+los triggers desactivados, de corregir datos a mano o si se sospecha que los totales no cuadran.
+Cada taller se procesa en su propia transacción.
+
+Uso:
+
+    python -m app.comandos.reconstruir_resumen_finanzas                # todos los talleres
+    python -m app.comandos.reconstruir_resumen_finanzas --taller <id>  # solo un taller
+"""
+from typing import List
+import argparse
+import sys
+import time
+from app.dependencies.database import pool_conexiones
+from app.repositories.finanzas_repository import FinanzasRepository
+
+def main(argumentos: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--taller", help="id_taller a reconstruir (por defecto todos los que tienen movimientos)")
+    args = parser.parse_args(argumentos)
+
+    if args.taller:
+        talleres = [args.taller]
+    else:
+        with pool_conexiones.conexion() as conexion:
+            talleres = FinanzasRepository(conexion).listar_talleres_con_movimientos()
+
+    for id_taller in talleres:
+        inicio = time.perf_counter()
+        with pool_conexiones.conexion() as conexion:
+            renglones = FinanzasRepository(conexion).reconstruir(id_taller)
+        print(f"{id_taller}: {renglones} renglones diarios en {time.perf_counter() - inicio:.2f} s")
+
+    pool_conexiones.cerrar()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import logging
+from anyio.to_thread import run_sync
+from fastapi import Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+from app.core.config import settings
+from app.core.exceptions import (
+    ArchivoDemasiadoGrandeException,
+    ArchivoNoEncontradoException,
+    SubidaInvalidaException,
+    TipoArchivoNoPermitidoException,
+)
+
+logger = logging.getLogger(__name__)
+
+TIPOS_IMAGEN = frozenset({"image/jpeg", "image/png", "image/webp", "image/heic"})
+TIPOS_ARCHIVO = TIPOS_IMAGEN | {"application/pdf"}
+
+# Los campos de texto de un formulario con archivos (descripción, etc.) son cortos.
+_MAX_BYTES_CAMPO_TEXTO = 64 * 1024
+
+def detectar_tipo(cabecera: bytes) -> str | None:
+    """
+    Identifica el tipo del archivo por sus primeros bytes. No se confía en el Content-Type que manda el
+    navegador ni en la extensión del nombre, que el cliente puede poner a su gusto.
+    """
+    if cabecera.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if cabecera.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if cabecera[:4] == b"RIFF" and cabecera[8:12] == b"WEBP":
+        return "image/webp"
+    if cabecera[4:8] == b"ftyp" and cabecera[8:12] in (b"heic", b"heix", b"mif1", b"hevc"):
+        return "image/heic" # Fotos de iPhone.
+    if cabecera.startswith(b"%PDF-"):
+        return "application/pdf"
+    return None
+
+class ArchivoSubido:
+    def __init__(self, campo: str, nombre_original: str | None, tipo_contenido: str, hash_contenido: str, tamano: int, ruta: str, nuevo: bool):
+        self.campo = campo
+        self.nombre_original = nombre_original
+        self.tipo_contenido = tipo_contenido
+        self.hash_contenido = hash_contenido
+        self.tamano = tamano
+        self.ruta = ruta # Relativa a la raíz del almacenamiento; es lo que se guarda en la base de datos.
+        self.nuevo = nuevo # False si el contenido ya existía y no se escribió de nuevo.
+
+class _Parte:
+    def __init__(self, campo: str, nombre_archivo: str | None):
+        self.campo = campo
+        self.nombre_archivo = nombre_archivo
+        self.pendiente: List[bytes] = []
+        self.bytes_pendientes = 0
+        self.tamano = 0
+        self.tipo: str | None = None
+        self.hash = hashlib.sha256()
+        self.archivo: Any = None
+        self.ruta_temporal: str | None = None
+
+class AlmacenamientoLocal:
+    """
+    Almacenamiento de archivos en disco local, direccionado por contenido.
+
+    Las subidas multipart se leen del stream de la petición y se escriben a disco por bloques de
+    `bloque_bytes` mientras se calcula su SHA-256, sin pasar por el archivo temporal de Starlette ni
+    tener el archivo completo en memoria; una subida que excede `max_bytes` se corta en cuanto lo
+    rebasa. Al terminar, cada archivo se mueve (rename atómico) a objetos/<2 primeros>/<sha256>: si
+    ese contenido ya existía, no se guarda otra copia.
+
+    Las miniaturas se generan en un pool de `hilos_miniaturas` hilos (Pillow libera el GIL al decodificar
+    y escalar) y se guardan junto a los objetos, así que cada una se calcula una sola vez.
+    """
+
+    def __init__(self, raiz: str, max_bytes: int, bloque_bytes: int, ancho_miniatura: int, hilos_miniaturas: int):
+        self.raiz = Path(raiz).resolve()
+        self.max_bytes = max_bytes
+        self.bloque_bytes = max(bloque_bytes, 64 * 1024)
+        self.ancho_miniatura = ancho_miniatura
+        self.hilos_miniaturas = max(hilos_miniaturas, 1)
+        self._ejecutor: ThreadPoolExecutor | None = None
+        self._candado = threading.Lock()
+        self._en_proceso: Dict[str, Future] = {}
+
+        self._subidas = 0
+        self._bytes_recibidos = 0
+        self._duplicados = 0
+        self._rechazos = 0
+        self._miniaturas = 0
+        self._miniaturas_fallidas = 0
+        self._tiempo_miniaturas = 0.0
+
+    async def recibir(self, request: Request, campos_archivo: Dict[str, int], tipos_permitidos: Set[str]) -> Tuple[List[ArchivoSubido], Dict[str, str]]:
+        """
+        Recibe un formulario multipart guardando sus archivos en el almacenamiento.
+
+        :param campos_archivo: Campos que pueden traer archivos y cuántos archivos admite cada uno.
+        :param tipos_permitidos: Tipos (detectados por contenido) que se aceptan.
+        :return: (archivos guardados, campos de texto del formulario)
+        """
+        tipo_contenido, parametros = parse_options_header(request.headers.get("content-type", ""))
+        frontera = parametros.get(b"boundary")
+        if tipo_contenido != b"multipart/form-data" or not frontera:
+            raise SubidaInvalidaException("se esperaba un formulario multipart/form-data.")
+
+        eventos: List[Tuple[str, Any]] = []
+        encabezado: Dict[str, bytes] = {"campo": b"", "valor": b""}
+        encabezados: Dict[bytes, bytes] = {}
+
+        def on_part_begin() -> None:
+            encabezados.clear()
+
+        def on_header_field(datos: bytes, inicio: int, fin: int) -> None:
+            encabezado["campo"] += datos[inicio:fin]
+
+        def on_header_value(datos: bytes, inicio: int, fin: int) -> None:
+            encabezado["valor"] += datos[inicio:fin]
+
+        def on_header_end() -> None:
+            encabezados[encabezado["campo"].lower()] = encabezado["valor"]
+            encabezado["campo"], encabezado["valor"] = b"", b""
+
+        def on_headers_finished() -> None:
+            eventos.append(("inicio", dict(encabezados)))
+
+        def on_part_data(datos: bytes, inicio: int, fin: int) -> None:
+            eventos.append(("datos", bytes(datos[inicio:fin])))
+
+        def on_part_end() -> None:
+            eventos.append(("fin", None))
+
+        parser = MultipartParser(frontera, {
+            "on_part_begin": on_part_begin,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        })
+
+        recibidos: List[_Parte] = []
+        textos: Dict[str, str] = {}
+        conteo: Dict[str, int] = {}
+        parte: _Parte | None = None
+        texto: List[bytes] | None = None
+        try:
+            # Los callbacks del parser son síncronos: solo registran eventos, y la escritura a disco
+            # (bloqueante) se hace aquí en un hilo para no detener el event loop.
+            async for bloque in request.stream():
+                try:
+                    parser.write(bloque)
+                except Exception as e:
+                    raise SubidaInvalidaException(f"formulario mal formado ({e}).")
+
+                for evento, valor in eventos:
+                    if evento == "inicio":
+                        campo, nombre_archivo = self._campo_y_nombre(valor)
+                        if nombre_archivo is None:
+                            parte, texto = None, []
+                            texto_campo = campo
+                            continue
+                        if campo not in campos_archivo:
+                            raise SubidaInvalidaException(f"el campo '{campo}' no admite archivos.")
+                        conteo[campo] = conteo.get(campo, 0) + 1
+                        if conteo[campo] > campos_archivo[campo]:
+                            raise SubidaInvalidaException(f"el campo '{campo}' admite máximo {campos_archivo[campo]} archivos.")
+                        parte, texto = _Parte(campo, nombre_archivo), None
+                        await run_sync(self._abrir_temporal, parte)
+                        recibidos.append(parte)
+                    elif evento == "datos":
+                        if texto is not None:
+                            texto.append(valor)
+                            if sum(len(fragmento) for fragmento in texto) > _MAX_BYTES_CAMPO_TEXTO:
+                                raise SubidaInvalidaException(f"el campo '{texto_campo}' es demasiado largo.")
+                            continue
+                        parte.pendiente.append(valor)
+                        parte.bytes_pendientes += len(valor)
+                        parte.tamano += len(valor)
+                        if parte.tamano > self.max_bytes:
+                            raise ArchivoDemasiadoGrandeException(self.max_bytes // (1024 * 1024))
+                        if parte.tipo is None and parte.bytes_pendientes >= 16:
+                            self._validar_tipo(parte, tipos_permitidos)
+                        if parte.bytes_pendientes >= self.bloque_bytes:
+                            await run_sync(self._volcar, parte)
+                    elif evento == "fin":
+                        if texto is not None:
+                            textos[texto_campo] = b"".join(texto).decode("utf-8", errors="replace")
+                            texto = None
+                            continue
+                        if parte.tamano == 0:
+                            raise SubidaInvalidaException(f"el archivo '{parte.nombre_archivo}' está vacío.")
+                        if parte.tipo is None:
+                            self._validar_tipo(parte, tipos_permitidos)
+                        await run_sync(self._cerrar_temporal, parte)
+                        parte = None
+                eventos.clear()
+            parser.finalize()
+
+            if not recibidos:
+                raise SubidaInvalidaException("no se recibió ningún archivo.")
+            if parte is not None:
+                raise SubidaInvalidaException("el formulario terminó antes de completar el archivo.")
+
+            # Solo cuando todo el formulario llegó bien se mueven los archivos a su lugar definitivo.
+            archivos = [await run_sync(self._guardar, recibido) for recibido in recibidos]
+        except BaseException:
+            with self._candado:
+                self._rechazos += 1
+            await run_sync(self._descartar, recibidos)
+            raise
+
+        with self._candado:
+            self._subidas += len(archivos)
+            self._bytes_recibidos += sum(archivo.tamano for archivo in archivos)
+            self._duplicados += sum(1 for archivo in archivos if not archivo.nuevo)
+        return archivos, textos
+
+    def ruta_absoluta(self, ruta: str) -> Path:
+        # La ruta viene de la base de datos, pero se valida que no salga de la raíz por si acaso.
+        absoluta = (self.raiz / ruta).resolve()
+        if not absoluta.is_relative_to(self.raiz) or not absoluta.is_file():
+            raise ArchivoNoEncontradoException()
+        return absoluta
+
+    def etag(self, ruta: str) -> str:
+        # El nombre del archivo es el hash de su contenido, así que sirve como ETag fuerte sin leer el archivo.
+        return f'"{Path(ruta).name}"'
+
+    def programar_miniatura(self, ruta: str) -> Future | None:
+        """Pide la miniatura de una imagen al pool sin esperarla. Regresa None si ya existe."""
+        if (self.raiz / self._ruta_miniatura(ruta)).is_file():
+            return None
+        with self._candado:
+            futuro = self._en_proceso.get(ruta)
+            if futuro is not None:
+                return futuro
+            if self._ejecutor is None:
+                self._ejecutor = ThreadPoolExecutor(max_workers=self.hilos_miniaturas, thread_name_prefix="miniaturas")
+            futuro = self._ejecutor.submit(self._generar_miniatura, ruta)
+            self._en_proceso[ruta] = futuro
+        futuro.add_done_callback(lambda _: self._terminar_miniatura(ruta))
+        return futuro
+
+    def obtener_miniatura(self, ruta: str, timeout: float) -> str | None:
+        """
+        Ruta de la miniatura de una imagen, generándola si hace falta (espera hasta `timeout` segundos).
+        Regresa None si no se puede generar (Pillow no instalado o formato que Pillow no lee).
+        """
+        futuro = self.programar_miniatura(ruta)
+        if futuro is not None:
+            try:
+                futuro.result(timeout=timeout)
+            except Exception:
+                return None
+        ruta_miniatura = self._ruta_miniatura(ruta)
+        return ruta_miniatura if (self.raiz / ruta_miniatura).is_file() else None
+
+    def cerrar(self) -> None:
+        with self._candado:
+            ejecutor, self._ejecutor = self._ejecutor, None
+        if ejecutor is not None:
+            ejecutor.shutdown(wait=False, cancel_futures=True)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._candado:
+            return {
+                "subidas": self._subidas,
+                "mb_recibidos": round(self._bytes_recibidos / (1024 * 1024), 2),
+                "duplicados": self._duplicados,
+                "rechazos": self._rechazos,
+                "miniaturas": self._miniaturas,
+                "miniaturas_fallidas": self._miniaturas_fallidas,
+                "miniaturas_pendientes": len(self._en_proceso),
+                "miniatura_promedio_ms": round(self._tiempo_miniaturas / self._miniaturas * 1000, 3) if self._miniaturas else 0.0,
+            }
+
+    def _campo_y_nombre(self, encabezados: Dict[bytes, bytes]) -> Tuple[str, str | None]:
+        _, parametros = parse_options_header(encabezados.get(b"content-disposition", b""))
+        if b"name" not in parametros:
+            raise SubidaInvalidaException("una parte del formulario no tiene nombre de campo.")
+        nombre_archivo = parametros.get(b"filename")
+        return parametros[b"name"].decode("utf-8", errors="replace"), nombre_archivo.decode("utf-8", errors="replace") if nombre_archivo is not None else None
+
+    def _validar_tipo(self, parte: _Parte, tipos_permitidos: Set[str]) -> None:
+        parte.tipo = detectar_tipo(b"".join(parte.pendiente)[:16])
+        if parte.tipo not in tipos_permitidos:
+            raise TipoArchivoNoPermitidoException(sorted(tipos_permitidos))
+
+    def _abrir_temporal(self, parte: _Parte) -> None:
+        # Los temporales van dentro de la raíz para que el rename final no cambie de sistema de archivos.
+        directorio = self.raiz / "tmp"
+        directorio.mkdir(parents=True, exist_ok=True)
+        descriptor, parte.ruta_temporal = tempfile.mkstemp(dir=directorio, prefix="subida-")
+        parte.archivo = os.fdopen(descriptor, "wb")
+
+    def _volcar(self, parte: _Parte) -> None:
+        datos = b"".join(parte.pendiente)
+        parte.pendiente.clear()
+        parte.bytes_pendientes = 0
+        parte.hash.update(datos) # hashlib libera el GIL con bloques grandes.
+        parte.archivo.write(datos)
+
+    def _cerrar_temporal(self, parte: _Parte) -> None:
+        self._volcar(parte)
+        parte.archivo.close()
+        parte.archivo = None
+
+    def _guardar(self, parte: _Parte) -> ArchivoSubido:
+        hash_contenido = parte.hash.hexdigest()
+        ruta = f"objetos/{hash_contenido[:2]}/{hash_contenido}"
+        destino = self.raiz / ruta
+        nuevo = not destino.exists()
+        if nuevo:
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            # Si dos subidas del mismo contenido llegan a la vez, ambas reemplazan el archivo con bytes idénticos.
+            os.replace(parte.ruta_temporal, destino)
+        else:
+            os.remove(parte.ruta_temporal)
+        parte.ruta_temporal = None
+        return ArchivoSubido(parte.campo, parte.nombre_archivo, parte.tipo, hash_contenido, parte.tamano, ruta, nuevo)
+
+    def _descartar(self, partes: List[_Parte]) -> None:
+        for parte in partes:
+            try:
+                if parte.archivo is not None:
+                    parte.archivo.close()
+                if parte.ruta_temporal is not None:
+                    os.remove(parte.ruta_temporal)
+            except OSError:
+                pass
+
+    def _ruta_miniatura(self, ruta: str) -> str:
+        nombre = Path(ruta).name
+        return f"miniaturas/{nombre[:2]}/{nombre}_{self.ancho_miniatura}.jpg"
+
+    def _generar_miniatura(self, ruta: str) -> None:
+        try:
+            from PIL import Image, ImageOps
+        except ImportError:
+            raise RuntimeError("Pillow no está instalado; no se generan miniaturas.")
+
+        inicio = time.perf_counter()
+        origen = self.ruta_absoluta(ruta)
+        destino = self.raiz / self._ruta_miniatura(ruta)
+        if destino.is_file():
+            return
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        temporal = destino.with_name(f"{destino.name}.{threading.get_ident()}.tmp")
+        try:
+            with Image.open(origen) as imagen:
+                # En JPEG, draft() hace que el decodificador reduzca la imagen mientras la lee (1/2, 1/4, 1/8),
+                # así una foto de 12 MP no se expande completa en memoria solo para hacer una miniatura.
+                imagen.draft("RGB", (self.ancho_miniatura, self.ancho_miniatura))
+                miniatura = ImageOps.exif_transpose(imagen)
+                miniatura.thumbnail((self.ancho_miniatura, self.ancho_miniatura))
+                miniatura.convert("RGB").save(temporal, "JPEG", quality=80, optimize=True)
+            os.replace(temporal, destino)
+        except Exception:
+            with self._candado:
+                self._miniaturas_fallidas += 1
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+            raise
+        with self._candado:
+            self._miniaturas += 1
+            self._tiempo_miniaturas += time.perf_counter() - inicio
+
+    def _terminar_miniatura(self, ruta: str) -> None:
+        with self._candado:
+            futuro = self._en_proceso.pop(ruta, None)
+        if futuro is not None and not futuro.cancelled() and futuro.exception() is not None:
+            logger.warning(f"No se pudo generar la miniatura de {ruta}: {futuro.exception()}")
+
+almacenamiento = AlmacenamientoLocal(
+    raiz=settings.ALMACENAMIENTO_RUTA,
+    max_bytes=settings.ALMACENAMIENTO_MAX_MB * 1024 * 1024,
+    bloque_bytes=settings.ALMACENAMIENTO_BLOQUE_KB * 1024,
+    ancho_miniatura=settings.MINIATURAS_ANCHO,
+    hilos_miniaturas=settings.MINIATURAS_HILOS,
+)
@@ -0,0 +1,52 @@
+from typing import List, Tuple
+import re
+import unicodedata
+from app.core.config import settings
+
+# Palabras vacías por defecto de InnoDB. No se indexan, así que exigirlas con "+" en modo booleano
+# haría que la búsqueda nunca encontrara nada.
+PALABRAS_VACIAS_INNODB = frozenset[str]({
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for", "from", "how",
+    "i", "in", "is", "it", "la", "of", "on", "or", "that", "the", "this", "to", "was", "what",
+    "when", "where", "who", "will", "with", "und", "www",
+})
+
+# Mismo criterio que el analizador de InnoDB: todo lo que no sea letra, número o guion bajo separa palabras.
+# Esto también elimina los operadores del modo booleano (+ - < > ( ) ~ * " @).
+_SEPARADORES = re.compile(r"[^\w]+")
+
+def quitar_acentos(texto: str) -> str:
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+def preparar_busqueda(texto: str | None) -> Tuple[List[str], List[str]]:
+    """
+    Divide el texto de búsqueda en palabras listas para MATCH ... AGAINST.
+
+    :return: Tupla con (palabras indexables, palabras fuera del índice).
+             Las que no están en el índice FULLTEXT (más cortas que el mínimo de InnoDB o
+             palabras vacías) se buscan con LIKE.
+    """
+    if not texto:
+        return [], []
+
+    indexables: List[str] = []
+    no_indexadas: List[str] = []
+    for palabra in _SEPARADORES.split(quitar_acentos(texto).lower()):
+        if not palabra:
+            continue
+        if len(palabra) < settings.BUSQUEDA_LONGITUD_MINIMA or palabra in PALABRAS_VACIAS_INNODB:
+            destino = no_indexadas
+        else:
+            destino = indexables
+        if palabra not in destino:
+            destino.append(palabra)
+
+    maximo = settings.BUSQUEDA_MAX_PALABRAS
+    return indexables[:maximo], no_indexadas[:maximo]
+
+def expresion_booleana(palabras: List[str]) -> str:
+    """
+    Exige cada palabra como prefijo ("+jos* +perez*"): así "jos" encuentra a "José".
+    """
+    return " ".join(f"+{palabra}*" for palabra in palabras)
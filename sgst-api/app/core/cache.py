@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+import threading
+import time
+from app.core.config import settings
+
+class CacheTTL:
+    """
+    Caché en memoria del proceso con expiración por tiempo (TTL) y desalojo LRU.
+
+    Guarda como máximo `max_entradas` valores; al llenarse se descarta el menos usado recientemente,
+    así que la memoria queda acotada sin importar cuántas claves distintas se consulten.
+    Es segura para hilos, ya que los servicios se ejecutan en el pool de hilos de la base de datos.
+
+    Las escrituras invalidan con al_confirmar (después del COMMIT). Una lectura que empezó antes de la
+    invalidación pudo obtener el valor anterior; por eso quien lee de la base de datos toma `generacion()`
+    antes de consultar y la pasa a `guardar`, que descarta el valor si hubo una invalidación en medio.
+
+    Cada proceso tiene su propia caché y solo se invalida la del proceso que escribió: con varios workers
+    de uvicorn los demás pueden servir el valor anterior hasta que venza su TTL.
+    """
+
+    def __init__(self, nombre: str, ttl_segundos: int, max_entradas: int):
+        self.nombre = nombre
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max(max_entradas, 1)
+        self._datos: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._candado = threading.Lock()
+        self._aciertos = 0
+        self._fallos = 0
+        self._desalojos = 0
+        self._invalidaciones = 0
+        _caches[nombre] = self
+
+    def obtener(self, clave: Hashable) -> Any | None:
+        with self._candado:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self._fallos += 1
+                return None
+
+            expira_en, valor = entrada
+            if expira_en < time.monotonic():
+                del self._datos[clave]
+                self._fallos += 1
+                return None
+
+            self._datos.move_to_end(clave)
+            self._aciertos += 1
+            return valor
+
+    def generacion(self) -> int:
+        with self._candado:
+            return self._invalidaciones
+
+    def guardar(self, clave: Hashable, valor: Any, generacion: int | None = None) -> None:
+        if self.ttl_segundos <= 0:
+            return
+        with self._candado:
+            if generacion is not None and generacion != self._invalidaciones:
+                return
+            self._datos[clave] = (time.monotonic() + self.ttl_segundos, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self._desalojos += 1
+
+    def invalidar(self, *claves: Hashable) -> None:
+        with self._candado:
+            self._invalidaciones += 1
+            for clave in claves:
+                self._datos.pop(clave, None)
+
+    def limpiar(self) -> None:
+        with self._candado:
+            self._invalidaciones += 1
+            self._datos.clear()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._candado:
+            consultas = self._aciertos + self._fallos
+            return {
+                "entradas": len(self._datos),
+                "max_entradas": self.max_entradas,
+                "ttl_segundos": self.ttl_segundos,
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "desalojos": self._desalojos,
+                "invalidaciones": self._invalidaciones,
+                "tasa_aciertos": round(self._aciertos / consultas, 4) if consultas else 0.0,
+            }
+
+_caches: Dict[str, CacheTTL] = {}
+
+def estadisticas_caches() -> Dict[str, Dict[str, Any]]:
+    return {nombre: cache.estadisticas() for nombre, cache in _caches.items()}
+
+# Suscripciones activas y límites de licencia por empresa. Se invalidan al confirmar una suscripción nueva o su
+# vencimiento.
+cache_suscripciones = CacheTTL("suscripciones", settings.CACHE_SUSCRIPCIONES_TTL, settings.CACHE_SUSCRIPCIONES_MAX)
+
+# Contexto de autenticación de cada petición por (id_usuario, id_taller): usuario, rol en el taller y
+# suscripciones. Cualquier cambio de empresa, rol o suscripción la limpia completa al confirmarse (son
+# escrituras raras); en los demás workers el cambio se ve cuando vence CACHE_CONTEXTO_AUTH_TTL.
+cache_contexto_auth = CacheTTL("contexto_auth", settings.CACHE_CONTEXTO_AUTH_TTL, settings.CACHE_CONTEXTO_AUTH_MAX)
+
+# Catálogos pequeños que casi nunca cambian (licencias, estados, prioridades, etc.).
+cache_catalogos = CacheTTL("catalogos", settings.CACHE_CATALOGOS_TTL, settings.CACHE_CATALOGOS_MAX)
@@ -0,0 +1,32 @@
+from functools import partial
+from typing import Any, Callable, TypeVar
+from anyio import CapacityLimiter
+from anyio.to_thread import run_sync
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_limitador_bd: CapacityLimiter | None = None
+
+def _obtener_limitador() -> CapacityLimiter:
+    # Se crea de forma perezosa para que quede ligado al event loop que atiende las peticiones.
+    global _limitador_bd
+    if _limitador_bd is None:
+        _limitador_bd = CapacityLimiter(settings.DB_THREADPOOL_SIZE)
+    return _limitador_bd
+
+async def ejecutar_en_hilo(funcion: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Ejecuta una función bloqueante (servicios y repositorios sobre mysql.connector) en un hilo
+    del pool dedicado a la base de datos, para que una consulta lenta no detenga el event loop
+    ni al resto de peticiones que atiende el worker.
+    """
+    return await run_sync(partial(funcion, *args, **kwargs), limiter=_obtener_limitador())
+
+def estadisticas_hilos() -> dict:
+    limitador = _obtener_limitador()
+    return {
+        "capacidad": limitador.total_tokens,
+        "ocupados": limitador.borrowed_tokens,
+        "en_espera": limitador.statistics().tasks_waiting,
+    }
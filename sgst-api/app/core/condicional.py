@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict
+import hashlib
+from fastapi import Request, Response, status
+from app.core.versiones import VersionesTaller
+
+class VersionDatos:
+    """
+    Versión de un conjunto de datos (los clientes de un taller, el catálogo de licencias, ...) que se obtiene sin
+    leer sus filas. De ella salen el ETag y el Last-Modified de los listados: mientras no cambie, el cliente puede
+    reutilizar su copia y el listado responde 304 sin consultar ni serializar las filas.
+    """
+
+    def __init__(self, partes: tuple, ultima_modificacion: datetime | None = None):
+        self.partes = partes
+        self.ultima_modificacion = ultima_modificacion
+
+    def etag(self, *variantes: Any) -> str:
+        """ETag débil de la versión combinada con lo que cambia la respuesta (taller, página, filtros, ...)."""
+        resumen = hashlib.blake2b(repr((self.partes, variantes)).encode("utf-8"), digest_size=16).hexdigest()
+        return f'W/"{resumen}"'
+
+def version_de_contadores(versiones: VersionesTaller) -> VersionDatos:
+    """
+    Versión de uno o varios contadores de taller_versiones. Cada alta, cambio o baja los incrementa en su misma
+    transacción, así que la versión leída corresponde exactamente a las filas confirmadas.
+    """
+    fechas = [actualizado_en for _, actualizado_en in versiones.values() if actualizado_en is not None]
+    partes = tuple(sorted((entidad, version) for entidad, (version, _) in versiones.items()))
+    return VersionDatos(partes, max(fechas) if fechas else None)
+
+def _como_utc(fecha: datetime) -> datetime:
+    # Las fechas de la base de datos llegan sin zona horaria, en UTC (la zona de la sesión, igual que _ahora()).
+    return fecha.replace(tzinfo=timezone.utc) if fecha.tzinfo is None else fecha
+
+def _fecha_http(fecha: datetime) -> str:
+    return format_datetime(_como_utc(fecha).replace(microsecond=0), usegmt=True)
+
+def encabezados_validacion(version: VersionDatos, etag: str) -> Dict[str, str]:
+    encabezados = {
+        "etag": etag,
+        # El navegador guarda la respuesta pero la revalida siempre; la respuesta depende del taller de la cookie.
+        "cache-control": "private, no-cache",
+        "vary": "Cookie",
+    }
+    if version.ultima_modificacion is not None:
+        encabezados["last-modified"] = _fecha_http(version.ultima_modificacion)
+    return encabezados
+
+def no_modificado(request: Request, version: VersionDatos, etag: str) -> bool:
+    """
+    Evalúa If-None-Match y, solo si no viene, If-Modified-Since (RFC 9110 §13.2.2). El ETag se compara en forma
+    débil: basta con que la versión sea la misma. If-Modified-Since tiene precisión de segundos, así que solo da
+    304 si la fecha enviada es posterior al segundo del último cambio.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etiquetas = {etiqueta.strip().removeprefix("W/") for etiqueta in if_none_match.split(",")}
+        return etag.removeprefix("W/") in etiquetas or "*" in etiquetas
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and version.ultima_modificacion is not None:
+        try:
+            desde = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if desde.tzinfo is None:
+            return False
+        # Last-Modified se envía truncado a segundos (_fecha_http), así que se compara con la misma precisión. Un
+        # cambio confirmado en el mismo segundo que la respuesta anterior tiene la misma fecha truncada: con <= se
+        # respondería 304 con datos viejos. Solo una fecha posterior a ese segundo prueba que no hubo cambios; en
+        # el empate se responde completo y el ETag (la versión exacta) es el que ahorra la respuesta.
+        return _como_utc(version.ultima_modificacion).replace(microsecond=0) < desde
+    return False
+
+def respuesta_no_modificado(version: VersionDatos, etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=encabezados_validacion(version, etag))
@@ -12,6 +12,19 @@ def _obtener_algoritmo_jwt() -> str:
         return "HS256"
     return valor
 
+def _obtener_entero(nombre: str, defecto: int) -> int:
+    valor = os.getenv(nombre)
+    try:
+        return int(valor) if valor else defecto
+    except ValueError:
+        return defecto
+
+def _obtener_booleano(nombre: str, defecto: bool) -> bool:
+    valor = os.getenv(nombre)
+    if not valor:
+        return defecto
+    return valor.lower() in ("true", "1", "yes")
+
 class Settings:
     PROJECT_NAME: str = "Sistema de Gestión de Servicios Técnicos"
     API_V1_PREFIX: str = "/api/v1"
@@ -32,4 +45,118 @@ class Settings:
 
     COOKIES_SECURE: bool = os.getenv("COOKIES_SECURE", "false").lower() in ("true", "1", "yes")
 
+    # Segundos tras una rotación en los que el refresh token anterior se rechaza sin revocar la sesión
+    # (pestañas que piden /auth/refresh al mismo tiempo). Pasado ese tiempo su uso se trata como robo.
+    REFRESH_TOKEN_GRACIA_SEGUNDOS: int = _obtener_entero("REFRESH_TOKEN_GRACIA_SEGUNDOS", 10)
+
+    # Pool de conexiones a MySQL.
+    DB_POOL_SIZE: int = _obtener_entero("DB_POOL_SIZE", 10)
+    DB_POOL_MAX_OVERFLOW: int = _obtener_entero("DB_POOL_MAX_OVERFLOW", 5)
+    DB_POOL_TIMEOUT: int = _obtener_entero("DB_POOL_TIMEOUT", 10) # Segundos máximos esperando una conexión libre.
+    DB_POOL_RECYCLE: int = _obtener_entero("DB_POOL_RECYCLE", 1800) # Segundos de vida de una conexión antes de reemplazarla.
+    DB_POOL_PRE_PING: bool = _obtener_booleano("DB_POOL_PRE_PING", True)
+    DB_POOL_PING_INACTIVIDAD: int = _obtener_entero("DB_POOL_PING_INACTIVIDAD", 30) # Solo se hace ping si la conexión lleva este tiempo sin usarse.
+    # Segundos entre revisiones de las conexiones libres del pool (ping y descarte de las caídas) en cada worker.
+    # Requiere TAREAS_ACTIVAS; 0 la desactiva.
+    DB_POOL_VERIFICACION_INTERVALO: int = _obtener_entero("DB_POOL_VERIFICACION_INTERVALO", 300)
+
+    # Hilos dedicados a ejecutar servicios que acceden a la base de datos. Por defecto coincide con el
+    # máximo de conexiones del pool para que ningún hilo se quede esperando una conexión.
+    DB_THREADPOOL_SIZE: int = _obtener_entero("DB_THREADPOOL_SIZE", DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW)
+
+    # Workers de uvicorn (la misma variable que lee uvicorn para --workers). Las cachés son de cada proceso y
+    # una escritura solo invalida la del worker que la hizo: con más de un worker los demás pueden servir el
+    # valor anterior hasta que venza su TTL. Al iniciar se avisa en el log si hay varios workers y cachés activas.
+    WEB_CONCURRENCY: int = _obtener_entero("WEB_CONCURRENCY", 1)
+
+    # Cachés en memoria (segundos de vida y número máximo de entradas). Un TTL de 0 desactiva la caché.
+    CACHE_SUSCRIPCIONES_TTL: int = _obtener_entero("CACHE_SUSCRIPCIONES_TTL", 300)
+    CACHE_SUSCRIPCIONES_MAX: int = _obtener_entero("CACHE_SUSCRIPCIONES_MAX", 2048)
+    CACHE_CATALOGOS_TTL: int = _obtener_entero("CACHE_CATALOGOS_TTL", 3600)
+    CACHE_CATALOGOS_MAX: int = _obtener_entero("CACHE_CATALOGOS_MAX", 64)
+    # Contexto de autenticación por usuario y taller (usuario, rol y suscripciones). El TTL es corto porque
+    # acota cuánto tarda otro worker en ver un cambio de rol o de suscripción.
+    CACHE_CONTEXTO_AUTH_TTL: int = _obtener_entero("CACHE_CONTEXTO_AUTH_TTL", 30)
+    CACHE_CONTEXTO_AUTH_MAX: int = _obtener_entero("CACHE_CONTEXTO_AUTH_MAX", 4096)
+    # Milisegundos que se recuerdan las versiones de datos de un taller (taller_versiones). Con 0 cada ETag
+    # consulta la versión confirmada; más alto ahorra consultas a cambio de ese atraso entre workers.
+    VERSIONES_MAX_EDAD_MS: int = _obtener_entero("VERSIONES_MAX_EDAD_MS", 0)
+
+    # Zona horaria del negocio (nombre IANA, p. ej. "America/Mexico_City") para las fechas sin hora: fecha de
+    # venta, de compra, de cada pago en finanzas y de las suscripciones. Las sesiones de MySQL trabajan en UTC,
+    # así que esas fechas las calcula la aplicación con app.core.fechas.hoy(). Vacía usa la zona del host.
+    ZONA_HORARIA: str = os.getenv("ZONA_HORARIA") or ""
+
+    # Clave para ver el detalle de /sistema/salud (encabezado X-Token-Salud). Sin ella el endpoint solo
+    # responde el estado, sin estadísticas internas.
+    SALUD_TOKEN: str = os.getenv("SALUD_TOKEN") or ""
+
+    # Hashing de contraseñas. Cambiar BCRYPT_ROUNDS hace que los hashes existentes se regeneren
+    # con el nuevo costo la próxima vez que cada usuario inicie sesión.
+    BCRYPT_ROUNDS: int = _obtener_entero("BCRYPT_ROUNDS", 12)
+    HASH_HILOS: int = _obtener_entero("HASH_HILOS", 2) # Hashes calculados en paralelo.
+    HASH_MAX_COLA: int = _obtener_entero("HASH_MAX_COLA", 32) # Operaciones que pueden esperar turno antes de responder 503.
+    HASH_TIMEOUT: int = _obtener_entero("HASH_TIMEOUT", 10) # Segundos máximos esperando un hash.
+
+    # Almacenamiento de los contadores del rate limit (URI de la librería limits):
+    #   - "memory://" (por defecto): cada worker de uvicorn lleva sus propios contadores, así que con
+    #     WEB_CONCURRENCY=N el límite efectivo es N veces el configurado.
+    #   - "redis://host:6379/0" o "redis+unix:///var/run/redis/redis.sock": contadores compartidos entre
+    #     workers y hosts (usa el paquete redis de requirements.txt).
+    # RATE_LIMIT_STORAGE_URI se acepta como nombre anterior de la variable.
+    RATE_LIMIT_STORAGE: str = os.getenv("RATE_LIMIT_STORAGE") or os.getenv("RATE_LIMIT_STORAGE_URI") or "memory://"
+    RATE_LIMIT_ESTRATEGIA: str = os.getenv("RATE_LIMIT_ESTRATEGIA") or "fixed-window"
+    # Si el almacenamiento compartido no responde se usan contadores en memoria en lugar de fallar la petición.
+    RATE_LIMIT_FALLBACK_MEMORIA: bool = _obtener_booleano("RATE_LIMIT_FALLBACK_MEMORIA", True)
+
+    # Importación masiva de clientes y equipos.
+    IMPORTACION_TAMANO_LOTE: int = _obtener_entero("IMPORTACION_TAMANO_LOTE", 500) # Filas por INSERT de múltiples filas.
+    IMPORTACION_MAX_ERRORES: int = _obtener_entero("IMPORTACION_MAX_ERRORES", 100) # Errores por fila detallados en la respuesta.
+
+    EXPORTACION_TAMANO_LOTE: int = _obtener_entero("EXPORTACION_TAMANO_LOTE", 1000) # Filas leídas y enviadas por bloque al exportar.
+    # Exportaciones simultáneas por worker. Cada una abre su propia conexión fuera del pool durante toda la
+    # descarga; las que pasen de este número responden 503.
+    EXPORTACION_MAX_CONCURRENTES: int = _obtener_entero("EXPORTACION_MAX_CONCURRENTES", 4)
+
+    # Números reservados por adelantado para num_orden y num_venta. Con 1 cada número se toma dentro de la
+    # transacción que crea el registro y la numeración no tiene huecos; con un bloque mayor (p. ej. 20) las
+    # creaciones del mismo taller ya no se esperan entre sí, pero se pueden perder números al reiniciar.
+    SECUENCIA_BLOQUE_ORDENES: int = _obtener_entero("SECUENCIA_BLOQUE_ORDENES", 1)
+    SECUENCIA_BLOQUE_VENTAS: int = _obtener_entero("SECUENCIA_BLOQUE_VENTAS", 1)
+    SECUENCIA_POOL_SIZE: int = _obtener_entero("SECUENCIA_POOL_SIZE", 2) # Conexiones propias para reservar bloques.
+
+    FINANZAS_RESUMEN_MAX_DIAS: int = _obtener_entero("FINANZAS_RESUMEN_MAX_DIAS", 1096) # Rango máximo de /finanzas/resumen.
+
+    # Tareas de mantenimiento en segundo plano. Con varios workers solo las ejecuta uno a la vez (ver EjecutorTareas).
+    # Un intervalo de 0 desactiva la tarea.
+    TAREAS_ACTIVAS: bool = _obtener_booleano("TAREAS_ACTIVAS", True)
+    TAREAS_REVISION_SEGUNDOS: int = _obtener_entero("TAREAS_REVISION_SEGUNDOS", 30) # Cada cuánto se revisan las tareas pendientes.
+    TAREA_PURGA_TOKENS_INTERVALO: int = _obtener_entero("TAREA_PURGA_TOKENS_INTERVALO", 3600)
+    TAREA_PURGA_TOKENS_LOTE: int = _obtener_entero("TAREA_PURGA_TOKENS_LOTE", 1000) # Filas por DELETE.
+    TAREA_PURGA_TOKENS_PAUSA_MS: int = _obtener_entero("TAREA_PURGA_TOKENS_PAUSA_MS", 50) # Pausa entre lotes.
+    TAREA_SUSCRIPCIONES_INTERVALO: int = _obtener_entero("TAREA_SUSCRIPCIONES_INTERVALO", 900)
+    TAREA_PURGA_ELIMINACIONES_INTERVALO: int = _obtener_entero("TAREA_PURGA_ELIMINACIONES_INTERVALO", 86400)
+    TAREA_PURGA_ELIMINACIONES_LOTE: int = _obtener_entero("TAREA_PURGA_ELIMINACIONES_LOTE", 1000)
+    TAREA_PURGA_ELIMINACIONES_PAUSA_MS: int = _obtener_entero("TAREA_PURGA_ELIMINACIONES_PAUSA_MS", 50)
+
+    # Sincronización incremental (GET /sync). Las eliminaciones se conservan SYNC_RETENCION_DIAS; un cliente
+    # con una marca más vieja debe descargar todo de nuevo. SYNC_MARGEN_SEGUNDOS debe superar la duración de la
+    # transacción de escritura más larga: los cambios de ese lapso se reenvían por si alguno se confirmó tarde.
+    SYNC_LOTE: int = _obtener_entero("SYNC_LOTE", 500) # Filas máximas por entidad en cada respuesta.
+    SYNC_MARGEN_SEGUNDOS: int = _obtener_entero("SYNC_MARGEN_SEGUNDOS", 30)
+    SYNC_RETENCION_DIAS: int = _obtener_entero("SYNC_RETENCION_DIAS", 30)
+
+    # Archivos e imágenes de órdenes en disco local. Se guardan por su SHA-256, así que un mismo archivo
+    # subido varias veces ocupa espacio una sola vez.
+    ALMACENAMIENTO_RUTA: str = os.getenv("ALMACENAMIENTO_RUTA") or "almacenamiento"
+    ALMACENAMIENTO_MAX_MB: int = _obtener_entero("ALMACENAMIENTO_MAX_MB", 15) # Tamaño máximo por archivo.
+    ALMACENAMIENTO_BLOQUE_KB: int = _obtener_entero("ALMACENAMIENTO_BLOQUE_KB", 1024) # Datos acumulados por escritura a disco.
+    MINIATURAS_ANCHO: int = _obtener_entero("MINIATURAS_ANCHO", 320) # Lado mayor de las miniaturas, en píxeles.
+    MINIATURAS_HILOS: int = _obtener_entero("MINIATURAS_HILOS", 2)
+    MINIATURAS_TIMEOUT: int = _obtener_entero("MINIATURAS_TIMEOUT", 15) # Segundos máximos esperando una miniatura al servirla.
+
+    # Búsqueda de texto completo. La longitud mínima debe coincidir con innodb_ft_min_token_size del servidor.
+    BUSQUEDA_LONGITUD_MINIMA: int = _obtener_entero("BUSQUEDA_LONGITUD_MINIMA", 3)
+    BUSQUEDA_MAX_PALABRAS: int = _obtener_entero("BUSQUEDA_MAX_PALABRAS", 8)
+
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,50 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Tuple
+import base64
+import json
+from app.core.exceptions import CursorInvalidoException
+
+def codificar_cursor(datos: Dict[str, Any]) -> str:
+    """
+    Convierte los datos de posición de una página en un cursor opaco (JSON en base64 url-safe).
+    """
+    crudo = json.dumps(datos, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(crudo).decode("ascii").rstrip("=")
+
+def decodificar_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (ValueError, TypeError):
+        raise CursorInvalidoException()
+
+    if not isinstance(datos, dict):
+        raise CursorInvalidoException()
+    return datos
+
+def serializar_valor(valor: Any) -> Tuple[Any, str | None]:
+    """
+    Regresa el valor en un formato compatible con JSON junto con una etiqueta de tipo para reconstruirlo.
+    """
+    if isinstance(valor, datetime):
+        return valor.isoformat(), "dt"
+    if isinstance(valor, date):
+        return valor.isoformat(), "d"
+    if isinstance(valor, Decimal):
+        return str(valor), "dec"
+    return valor, None
+
+def deserializar_valor(valor: Any, tipo: str | None) -> Any:
+    if valor is None:
+        return None
+    try:
+        if tipo == "dt":
+            return datetime.fromisoformat(valor)
+        if tipo == "d":
+            return date.fromisoformat(valor)
+        if tipo == "dec":
+            return Decimal(valor)
+    except (ValueError, TypeError, ArithmeticError):
+        raise CursorInvalidoException()
+    return valor
@@ -300,6 +300,42 @@ class TipoEquipoDuplicadoException(AppException):
             details={"campo": campo}
         )
 
+class OrdenNoEncontradaException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=404,
+            code="ORDEN_NO_ENCONTRADA",
+            message="La orden de servicio no existe o no pertenece a este taller.",
+            details={}
+        )
+
+class EstadoOrdenNoEncontradoException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=404,
+            code="ESTADO_ORDEN_NO_ENCONTRADO",
+            message="El estado seleccionado para la orden no existe.",
+            details={}
+        )
+
+class PrioridadNoEncontradaException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=404,
+            code="PRIORIDAD_NO_ENCONTRADA",
+            message="La prioridad seleccionada para la orden no existe.",
+            details={}
+        )
+
+class TecnicoNoEncontradoException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=404,
+            code="TECNICO_NO_ENCONTRADO",
+            message="El técnico asignado no existe o no pertenece a este taller.",
+            details={}
+        )
+
 class NoEsAdministradorDelTallerException(AppException):
     def __init__(self):
         super().__init__(
@@ -343,4 +379,201 @@ class NoTienesPermisoParaAccederARecursoException(AppException):
             code="NO_TIENES_PERMISO_PARA_ACCEDER_A_RECURSO",
             message="No tienes permisos para acceder a este recurso.",
             details={}
-        )
\ No newline at end of file
+        )
+
+class ServidorOcupadoException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=503,
+            code="SERVIDOR_OCUPADO",
+            message="El servidor está ocupado en este momento, por favor intente nuevamente en unos segundos.",
+            details={}
+        )
+
+class CursorInvalidoException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=400,
+            code="CURSOR_INVALIDO",
+            message="El cursor de paginación no es válido para esta consulta, vuelva a cargar la primera página.",
+            details={}
+        )
+class ArchivoImportacionInvalidoException(AppException):
+    def __init__(self, detalle: str = "No se pudo leer el archivo."):
+        super().__init__(
+            status_code=400,
+            code="ARCHIVO_IMPORTACION_INVALIDO",
+            message=f"El archivo de importación no es válido: {detalle}",
+            details={"detalle": detalle}
+        )
+
+class RangoFechasInvalidoException(AppException):
+    def __init__(self, detalle: str = "La fecha inicial debe ser anterior o igual a la fecha final."):
+        super().__init__(
+            status_code=400,
+            code="RANGO_FECHAS_INVALIDO",
+            message=f"El rango de fechas no es válido: {detalle}",
+            details={"detalle": detalle}
+        )
+
+class ProductoNoEncontradoException(AppException):
+    def __init__(self, ids: list | None = None):
+        super().__init__(
+            status_code=404,
+            code="PRODUCTO_NO_ENCONTRADO",
+            message="Uno o más productos no existen, están inactivos o no pertenecen a este taller.",
+            details={"ids": ids or []}
+        )
+
+class RefaccionNoEncontradaException(AppException):
+    def __init__(self, ids: list | None = None):
+        super().__init__(
+            status_code=404,
+            code="REFACCION_NO_ENCONTRADA",
+            message="Una o más refacciones no existen, están inactivas o no pertenecen a este taller.",
+            details={"ids": ids or []}
+        )
+
+class StockInsuficienteException(AppException):
+    def __init__(self, articulos: list | None = None):
+        super().__init__(
+            status_code=409,
+            code="STOCK_INSUFICIENTE",
+            message="No hay stock suficiente para uno o más artículos, no se registró ningún movimiento.",
+            details={"articulos": articulos or []}
+        )
+
+class MetodoPagoNoEncontradoException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=404,
+            code="METODO_PAGO_NO_ENCONTRADO",
+            message="El método de pago seleccionado no existe o no está disponible.",
+            details={}
+        )
+
+class ProveedorNoEncontradoException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=404,
+            code="PROVEEDOR_NO_ENCONTRADO",
+            message="El proveedor no existe o no pertenece a este taller.",
+            details={}
+        )
+
+class CompraNoEncontradaException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=404,
+            code="COMPRA_NO_ENCONTRADA",
+            message="La compra no existe o no pertenece a este taller.",
+            details={}
+        )
+
+class CompraNoPendienteException(AppException):
+    def __init__(self, estado: str):
+        super().__init__(
+            status_code=409,
+            code="COMPRA_NO_PENDIENTE",
+            message=f"Solo se pueden confirmar compras pendientes, esta compra está {estado}.",
+            details={"estado": estado}
+        )
+
+class PagoNoEncontradoException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=404,
+            code="PAGO_NO_ENCONTRADO",
+            message="El pago no existe o no pertenece a este taller.",
+            details={}
+        )
+
+class PagoYaAnuladoException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=409,
+            code="PAGO_YA_ANULADO",
+            message="El pago ya se encuentra anulado.",
+            details={}
+        )
+
+class SubidaInvalidaException(AppException):
+    def __init__(self, detalle: str):
+        super().__init__(
+            status_code=400,
+            code="SUBIDA_INVALIDA",
+            message=f"No se pudo procesar la subida: {detalle}",
+            details={"detalle": detalle}
+        )
+
+class ArchivoDemasiadoGrandeException(AppException):
+    def __init__(self, max_mb: int):
+        super().__init__(
+            status_code=413,
+            code="ARCHIVO_DEMASIADO_GRANDE",
+            message=f"El archivo supera el tamaño máximo de {max_mb} MB.",
+            details={"max_mb": max_mb}
+        )
+
+class TipoArchivoNoPermitidoException(AppException):
+    def __init__(self, permitidos: list):
+        super().__init__(
+            status_code=415,
+            code="TIPO_ARCHIVO_NO_PERMITIDO",
+            message="El tipo de archivo no está permitido.",
+            details={"permitidos": permitidos}
+        )
+
+class ArchivoNoEncontradoException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=404,
+            code="ARCHIVO_NO_ENCONTRADO",
+            message="El archivo no existe o no pertenece a este taller.",
+            details={}
+        )
+
+class MiniaturaNoDisponibleException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=404,
+            code="MINIATURA_NO_DISPONIBLE",
+            message="No hay miniatura disponible para este archivo.",
+            details={}
+        )
+
+class LimiteImagenesRecepcionException(AppException):
+    def __init__(self, disponibles: int):
+        super().__init__(
+            status_code=409,
+            code="LIMITE_IMAGENES_RECEPCION",
+            message=f"Cada orden admite máximo 3 imágenes de recepción; quedan {disponibles} lugares.",
+            details={"disponibles": disponibles}
+        )
+
+class MarcaSincronizacionInvalidaException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=400,
+            code="MARCA_SINCRONIZACION_INVALIDA",
+            message="La marca de sincronización no es válida; descargue los datos de nuevo sin marca.",
+            details={}
+        )
+
+class RegistroDuplicadoException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=409,
+            code="REGISTRO_DUPLICADO",
+            message="Ya existe un registro con esos datos.",
+            details={}
+        )
+
+class ExportacionesOcupadasException(AppException):
+    def __init__(self, maximo: int):
+        super().__init__(
+            status_code=503,
+            code="EXPORTACIONES_OCUPADAS",
+            message="Hay demasiadas exportaciones en curso, por favor intente nuevamente en unos minutos.",
+            details={"maximo": maximo}
+        )
@@ -0,0 +1,69 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List
+import csv
+import io
+import json
+
+FORMATOS_EXPORTACION = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+def generar_csv(columnas: List[str], filas: Iterable[Dict[str, Any]], filas_por_bloque: int) -> Iterator[bytes]:
+    """
+    Convierte las filas a CSV y las entrega en bloques de bytes, empezando por los encabezados.
+    El BOM inicial hace que Excel reconozca el UTF-8 (acentos y ñ) al abrir el archivo.
+    """
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    buffer.write("\ufeff")
+    escritor.writerow(columnas)
+
+    pendientes = 0
+    for fila in filas:
+        escritor.writerow([_valor_csv(fila.get(columna)) for columna in columnas])
+        pendientes += 1
+        if pendientes >= filas_por_bloque:
+            yield _vaciar(buffer)
+            pendientes = 0
+
+    yield _vaciar(buffer)
+
+def generar_ndjson(columnas: List[str], filas: Iterable[Dict[str, Any]], filas_por_bloque: int) -> Iterator[bytes]:
+    """
+    Convierte las filas a JSON delimitado por saltos de línea (un objeto por línea).
+    """
+    buffer = io.StringIO()
+    pendientes = 0
+    for fila in filas:
+        buffer.write(json.dumps({columna: fila.get(columna) for columna in columnas}, default=_valor_json, ensure_ascii=False))
+        buffer.write("\n")
+        pendientes += 1
+        if pendientes >= filas_por_bloque:
+            yield _vaciar(buffer)
+            pendientes = 0
+
+    contenido = _vaciar(buffer)
+    if contenido:
+        yield contenido
+
+def _vaciar(buffer: io.StringIO) -> bytes:
+    contenido = buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate(0)
+    return contenido
+
+def _valor_csv(valor: Any) -> Any:
+    if valor is None:
+        return ""
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return valor
+
+def _valor_json(valor: Any) -> Any:
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
@@ -0,0 +1,18 @@
+from datetime import date, datetime, tzinfo
+from zoneinfo import ZoneInfo
+from app.core.config import settings
+
+def _zona_negocio() -> tzinfo | None:
+    # None hace que datetime.now() use la zona del host, igual que date.today().
+    return ZoneInfo(settings.ZONA_HORARIA) if settings.ZONA_HORARIA else None
+
+def hoy() -> date:
+    """
+    Fecha actual en la zona horaria del negocio (ZONA_HORARIA).
+
+    Las sesiones de MySQL trabajan en UTC, así que CURRENT_DATE o DATE() de un TIMESTAMP darían la fecha de UTC:
+    una venta o un pago de la noche quedaría en el día siguiente. Las columnas DATE que se agrupan por día
+    (fecha_venta, fecha_compra, fecha_contable de pagos, fecha_inicio y fecha_fin de suscripciones) se llenan
+    con esta fecha desde la aplicación.
+    """
+    return datetime.now(_zona_negocio()).date()
@@ -0,0 +1,145 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, TypeVar
+import threading
+import time
+import logging
+import bcrypt
+from app.core.config import settings
+from app.core.exceptions import ServidorOcupadoException
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class PoolHashing:
+    """
+    Ejecuta bcrypt en un número acotado de hilos dedicados.
+
+    bcrypt libera el GIL mientras calcula el hash, así que los hilos sí se reparten entre núcleos;
+    limitarlos evita que una ráfaga de logins ocupe todos los hilos de la base de datos y sature la CPU.
+    Como máximo `max_cola` operaciones esperan turno; más allá de eso (o si la espera supera
+    `timeout` segundos) se lanza ServidorOcupadoException en lugar de acumular peticiones.
+    """
+
+    def __init__(self, hilos: int, max_cola: int, timeout: int):
+        self.hilos = max(hilos, 1)
+        self.max_cola = max(max_cola, 0)
+        self.timeout = timeout
+        self._ejecutor: ThreadPoolExecutor | None = None
+        self._candado = threading.Lock()
+        self._pendientes = 0
+
+        self._operaciones: Dict[str, int] = {}
+        self._tiempo_total: Dict[str, float] = {}
+        self._tiempo_max: Dict[str, float] = {}
+        self._espera_total = 0.0
+        self._rechazos = 0
+        self._timeouts = 0
+        self._rehashes = 0
+
+    def ejecutar(self, operacion: str, funcion: Callable[..., T], *args: Any) -> T:
+        with self._candado:
+            if self._pendientes >= self.hilos + self.max_cola:
+                self._rechazos += 1
+                logger.warning("Cola de hashing llena (%s pendientes)", self._pendientes)
+                raise ServidorOcupadoException()
+            self._pendientes += 1
+            if self._ejecutor is None:
+                self._ejecutor = ThreadPoolExecutor(max_workers=self.hilos, thread_name_prefix="hashing")
+            ejecutor = self._ejecutor
+
+        encolado_en = time.monotonic()
+
+        def _medir() -> T:
+            inicio = time.monotonic()
+            try:
+                return funcion(*args)
+            finally:
+                self._registrar(operacion, inicio - encolado_en, time.monotonic() - inicio)
+
+        try:
+            futuro = ejecutor.submit(_medir)
+        except Exception:
+            self._liberar()
+            raise
+        # La operación deja de estar pendiente cuando termina (o se cancela antes de empezar), no cuando el
+        # llamador deja de esperarla: un hash que ya corre sigue ocupando su hilo después del timeout.
+        futuro.add_done_callback(lambda _: self._liberar())
+        try:
+            return futuro.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            futuro.cancel()
+            with self._candado:
+                self._timeouts += 1
+            raise ServidorOcupadoException()
+
+    def _liberar(self) -> None:
+        with self._candado:
+            self._pendientes -= 1
+
+    def registrar_rehash(self) -> None:
+        with self._candado:
+            self._rehashes += 1
+
+    def cerrar(self) -> None:
+        with self._candado:
+            ejecutor, self._ejecutor = self._ejecutor, None
+        if ejecutor is not None:
+            ejecutor.shutdown(wait=False, cancel_futures=True)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._candado:
+            total = sum(self._operaciones.values())
+            return {
+                "hilos": self.hilos,
+                "max_cola": self.max_cola,
+                "pendientes": self._pendientes,
+                "rondas_bcrypt": settings.BCRYPT_ROUNDS,
+                "operaciones": {
+                    operacion: {
+                        "total": cantidad,
+                        "promedio_ms": round(self._tiempo_total[operacion] / cantidad * 1000, 3),
+                        "max_ms": round(self._tiempo_max[operacion] * 1000, 3),
+                    }
+                    for operacion, cantidad in self._operaciones.items()
+                },
+                "espera_promedio_ms": round(self._espera_total / total * 1000, 3) if total else 0.0,
+                "rechazos": self._rechazos,
+                "timeouts": self._timeouts,
+                "rehashes": self._rehashes,
+            }
+
+    def _registrar(self, operacion: str, espera: float, duracion: float) -> None:
+        with self._candado:
+            self._operaciones[operacion] = self._operaciones.get(operacion, 0) + 1
+            self._tiempo_total[operacion] = self._tiempo_total.get(operacion, 0.0) + duracion
+            if duracion > self._tiempo_max.get(operacion, 0.0):
+                self._tiempo_max[operacion] = duracion
+            self._espera_total += espera
+
+pool_hashing = PoolHashing(
+    hilos=settings.HASH_HILOS,
+    max_cola=settings.HASH_MAX_COLA,
+    timeout=settings.HASH_TIMEOUT,
+)
+
+def _hashear(password: str) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode("utf-8")
+
+def _verificar(password: str, hash_password: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hash_password.encode("utf-8"))
+
+def hashear_password(password: str) -> str:
+    return pool_hashing.ejecutar("hashear", _hashear, password)
+
+def verificar_password(password: str, hash_password: str) -> bool:
+    return pool_hashing.ejecutar("verificar", _verificar, password, hash_password)
+
+def necesita_rehash(hash_password: str) -> bool:
+    """
+    Indica si el hash se generó con un costo distinto a BCRYPT_ROUNDS (formato $2b$<costo>$...).
+    """
+    partes = hash_password.split("$")
+    if len(partes) < 4 or not partes[2].isdigit():
+        return True
+    return int(partes[2]) != settings.BCRYPT_ROUNDS
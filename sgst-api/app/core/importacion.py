@@ -0,0 +1,92 @@
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+import csv
+import io
+import zipfile
+from app.core.exceptions import ArchivoImportacionInvalidoException
+
+FilaImportacion = Tuple[int, Dict[str, Any]]
+
+def leer_filas(archivo: BinaryIO, nombre_archivo: str | None) -> Iterator[FilaImportacion]:
+    """
+    Recorre un archivo CSV o XLSX fila por fila sin cargarlo completo en memoria.
+
+    La primera fila debe contener los nombres de las columnas (sin importar mayúsculas ni espacios).
+    Las celdas vacías se entregan como None y los números como texto, igual que llegarían en un JSON.
+
+    :return: Iterador de tuplas (número de fila en el archivo, diccionario columna -> valor).
+    :raises ArchivoImportacionInvalidoException: Si el formato no es soportado o el archivo no se puede leer.
+    """
+    nombre = (nombre_archivo or "").lower()
+    if nombre.endswith(".csv"):
+        return _leer_csv(archivo)
+    if nombre.endswith(".xlsx"):
+        return _leer_xlsx(archivo)
+    raise ArchivoImportacionInvalidoException("solo se aceptan archivos .csv o .xlsx.")
+
+def _leer_csv(archivo: BinaryIO) -> Iterator[FilaImportacion]:
+    texto = io.TextIOWrapper(archivo, encoding="utf-8-sig", newline="")
+    try:
+        muestra = texto.read(4096)
+        texto.seek(0)
+        try:
+            # Excel en español guarda los CSV separados por ";".
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+
+        lector = csv.reader(texto, dialecto)
+        encabezados = _encabezados(next(lector, None))
+        for numero_fila, valores in enumerate(lector, start=2):
+            fila = _armar_fila(encabezados, valores)
+            if fila:
+                yield numero_fila, fila
+    except UnicodeDecodeError:
+        raise ArchivoImportacionInvalidoException("el CSV debe estar codificado en UTF-8.")
+    except csv.Error as e:
+        raise ArchivoImportacionInvalidoException(f"CSV mal formado ({e}).")
+    finally:
+        # Se separa el envoltorio para que al destruirse no cierre el archivo subido.
+        texto.detach()
+
+def _leer_xlsx(archivo: BinaryIO) -> Iterator[FilaImportacion]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ArchivoImportacionInvalidoException("la lectura de archivos .xlsx no está disponible en el servidor, use .csv.")
+
+    try:
+        # read_only recorre la hoja en streaming en lugar de construir todas las celdas en memoria.
+        libro = load_workbook(archivo, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, KeyError, ValueError, OSError):
+        raise ArchivoImportacionInvalidoException("el archivo .xlsx está dañado o no es un libro de Excel.")
+
+    try:
+        filas = libro.active.iter_rows(values_only=True)
+        encabezados = _encabezados(next(filas, None))
+        for numero_fila, valores in enumerate(filas, start=2):
+            fila = _armar_fila(encabezados, valores)
+            if fila:
+                yield numero_fila, fila
+    finally:
+        libro.close()
+
+def _encabezados(valores: Any) -> List[str]:
+    if not valores:
+        raise ArchivoImportacionInvalidoException("el archivo está vacío o no tiene fila de encabezados.")
+    return [str(valor).strip().lower() if valor is not None else "" for valor in valores]
+
+def _armar_fila(encabezados: List[str], valores: Any) -> Dict[str, Any] | None:
+    fila = {}
+    for encabezado, valor in zip(encabezados, valores):
+        if encabezado:
+            fila[encabezado] = _normalizar_valor(valor)
+    return fila if any(valor is not None for valor in fila.values()) else None
+
+def _normalizar_valor(valor: Any) -> str | None:
+    if valor is None:
+        return None
+    # Excel guarda teléfonos y números de serie numéricos como float (5512345678.0).
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    texto = str(valor).strip()
+    return texto or None
@@ -0,0 +1,243 @@
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Generator, Tuple
+import threading
+import time
+import logging
+import mysql.connector
+from app.core.exceptions import ServidorOcupadoException
+from app.core.transacciones import confirmar, descartar, revertir
+
+logger = logging.getLogger(__name__)
+
+class PoolConexiones:
+    """
+    Pool de conexiones MySQL seguro para hilos.
+
+    Mantiene hasta `tamano` conexiones reutilizables y permite abrir `max_overflow` conexiones
+    extra en picos de carga, las cuales se cierran al liberarse en lugar de volver al pool.
+    Si todas las conexiones están ocupadas, la petición espera hasta `timeout` segundos
+    antes de lanzar ServidorOcupadoException.
+
+    Antes de entregar una conexión se valida:
+        - Que no haya superado `reciclar_segundos` de vida (si es así, se reemplaza).
+        - Que siga viva con un ping si `pre_ping` está activo y lleva más de
+          `ping_inactividad` segundos sin usarse.
+    """
+
+    def __init__(
+        self,
+        crear_conexion: Callable[[], mysql.connector.connection.MySQLConnection],
+        tamano: int,
+        max_overflow: int,
+        timeout: int,
+        reciclar_segundos: int,
+        pre_ping: bool,
+        ping_inactividad: int,
+    ):
+        self._crear_conexion = crear_conexion
+        self.tamano = max(tamano, 1)
+        self.max_overflow = max(max_overflow, 0)
+        self.timeout = timeout
+        self.reciclar_segundos = reciclar_segundos
+        self.pre_ping = pre_ping
+        self.ping_inactividad = ping_inactividad
+
+        self._condicion = threading.Condition(threading.Lock())
+        # Cada elemento es (conexión, momento de creación, momento del último uso).
+        self._libres: Deque[Tuple[Any, float, float]] = deque()
+        self._creadas_en: Dict[int, float] = {}
+        self._abiertas = 0
+        self._en_uso = 0
+        self._cerrado = False
+
+        self._esperas_totales = 0
+        self._tiempo_espera_total = 0.0
+        self._tiempo_espera_max = 0.0
+        self._timeouts = 0
+        self._reciclajes = 0
+        self._pings_fallidos = 0
+
+    def obtener_conexion(self) -> mysql.connector.connection.MySQLConnection:
+        inicio = time.monotonic()
+        limite = inicio + self.timeout
+
+        with self._condicion:
+            while True:
+                if self._cerrado:
+                    raise ServidorOcupadoException()
+
+                if self._libres:
+                    conexion, creada_en, ultimo_uso = self._libres.pop()
+                    self._en_uso += 1
+                    break
+
+                if self._abiertas < self.tamano + self.max_overflow:
+                    # Se reserva el lugar antes de soltar el candado para no sobrepasar el límite.
+                    self._abiertas += 1
+                    self._en_uso += 1
+                    conexion = None
+                    break
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    self._timeouts += 1
+                    self._registrar_espera(time.monotonic() - inicio)
+                    logger.warning("Pool de conexiones agotado tras %ss de espera", self.timeout)
+                    raise ServidorOcupadoException()
+                self._condicion.wait(restante)
+
+            self._registrar_espera(time.monotonic() - inicio)
+
+        try:
+            if conexion is None:
+                return self._abrir()
+            return self._validar(conexion, creada_en, ultimo_uso)
+        except Exception:
+            with self._condicion:
+                self._abiertas -= 1
+                self._en_uso -= 1
+                self._condicion.notify()
+            raise
+
+    def liberar_conexion(self, conexion: mysql.connector.connection.MySQLConnection) -> None:
+        creada_en = self._creadas_en.get(id(conexion), time.monotonic())
+        descartar(conexion) # Lo que no se confirmó antes de devolverla ya no se confirmará.
+        reutilizable = self._limpiar(conexion)
+
+        with self._condicion:
+            self._en_uso -= 1
+            if reutilizable and not self._cerrado and len(self._libres) < self.tamano:
+                self._libres.append((conexion, creada_en, time.monotonic()))
+                self._condicion.notify()
+                return
+            self._abiertas -= 1
+            self._condicion.notify()
+
+        self._cerrar(conexion)
+
+    @contextmanager
+    def conexion(self) -> Generator[mysql.connector.connection.MySQLConnection, None, None]:
+        """
+        Presta una conexión fuera del ciclo de una petición (tareas, exportaciones, comandos).
+        Se confirma al terminar sin errores y se revierte si ocurre una excepción.
+        """
+        conexion = self.obtener_conexion()
+        try:
+            yield conexion
+            confirmar(conexion)
+        except Exception:
+            revertir(conexion)
+            raise
+        finally:
+            self.liberar_conexion(conexion)
+
+    def verificar_salud(self) -> int:
+        """
+        Hace ping a las conexiones libres y descarta las que ya no respondan. Se ejecuta cada
+        DB_POOL_VERIFICACION_INTERVALO en cada worker (tarea local de ejecutor_tareas).
+        :return: Número de conexiones descartadas.
+        """
+        with self._condicion:
+            revisar = list(self._libres)
+            self._libres.clear()
+            self._en_uso += len(revisar)
+
+        descartadas = 0
+        for conexion, creada_en, _ in revisar:
+            if self._esta_viva(conexion):
+                self.liberar_conexion(conexion)
+                continue
+            descartadas += 1
+            with self._condicion:
+                self._pings_fallidos += 1
+                self._en_uso -= 1
+                self._abiertas -= 1
+                self._condicion.notify()
+            self._cerrar(conexion)
+        return descartadas
+
+    def cerrar(self) -> None:
+        with self._condicion:
+            self._cerrado = True
+            libres = list(self._libres)
+            self._libres.clear()
+            self._abiertas -= len(libres)
+            self._condicion.notify_all()
+
+        for conexion, _, _ in libres:
+            self._cerrar(conexion)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._condicion:
+            return {
+                "tamano": self.tamano,
+                "max_overflow": self.max_overflow,
+                "abiertas": self._abiertas,
+                "en_uso": self._en_uso,
+                "libres": len(self._libres),
+                "overflow": max(self._abiertas - self.tamano, 0),
+                "esperas": self._esperas_totales,
+                "espera_promedio_ms": round(self._tiempo_espera_total / self._esperas_totales * 1000, 3) if self._esperas_totales else 0.0,
+                "espera_max_ms": round(self._tiempo_espera_max * 1000, 3),
+                "timeouts": self._timeouts,
+                "reciclajes": self._reciclajes,
+                "pings_fallidos": self._pings_fallidos,
+            }
+
+    def _registrar_espera(self, segundos: float) -> None:
+        self._esperas_totales += 1
+        self._tiempo_espera_total += segundos
+        if segundos > self._tiempo_espera_max:
+            self._tiempo_espera_max = segundos
+
+    def _abrir(self) -> mysql.connector.connection.MySQLConnection:
+        conexion = self._crear_conexion()
+        self._creadas_en[id(conexion)] = time.monotonic()
+        return conexion
+
+    def _validar(self, conexion, creada_en: float, ultimo_uso: float) -> mysql.connector.connection.MySQLConnection:
+        ahora = time.monotonic()
+
+        if self.reciclar_segundos > 0 and ahora - creada_en > self.reciclar_segundos:
+            with self._condicion:
+                self._reciclajes += 1
+            self._cerrar(conexion)
+            return self._abrir()
+
+        if self.pre_ping and ahora - ultimo_uso > self.ping_inactividad and not self._esta_viva(conexion):
+            with self._condicion:
+                self._pings_fallidos += 1
+            self._cerrar(conexion)
+            return self._abrir()
+
+        return conexion
+
+    def _esta_viva(self, conexion) -> bool:
+        try:
+            conexion.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _limpiar(self, conexion) -> bool:
+        # Una conexión que regresa con una transacción abierta (por ejemplo, tras un error en la
+        # dependencia) se revierte para que el siguiente usuario no herede su estado.
+        # Si quedaron filas sin leer de un cursor sin buffer (una exportación interrumpida), se descarta:
+        # leerlas todas para reutilizarla costaría más que abrir una conexión nueva.
+        try:
+            if conexion.unread_result:
+                return False
+            if conexion.in_transaction:
+                conexion.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Conexión descartada al liberarla: {e}")
+            return False
+
+    def _cerrar(self, conexion) -> None:
+        self._creadas_en.pop(id(conexion), None)
+        try:
+            conexion.close()
+        except Exception:
+            pass
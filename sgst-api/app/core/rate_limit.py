@@ -1,4 +1,33 @@
+from fastapi import Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from app.core.config import settings
 
-limiter = Limiter(key_func=get_remote_address)
+def obtener_clave_rate_limit(request: Request) -> str:
+    """
+    Clave por defecto: la IP del cliente. Se usa en /auth/login, /auth/registro, /auth/refresh y en
+    cualquier ruta sin autenticación; la cookie de sesión no cuenta aquí porque quien la envía todavía
+    no ha sido autenticado, y basta una firma válida (o un token expirado) para cambiar de contador.
+    """
+    return f"ip:{get_remote_address(request)}"
+
+def clave_por_usuario(request: Request) -> str:
+    """
+    Clave para rutas autenticadas (@limiter.limit(..., key_func=clave_por_usuario)), como importar,
+    exportar, subir archivos y /sync: el usuario que ya validaron las dependencias de autenticación, así
+    varios usuarios detrás de la misma IP no comparten el límite. slowapi revisa los límites de la ruta
+    después de resolver sus dependencias, así que request.state.contexto_auth ya existe; si la ruta no lo
+    resolvió se cuenta por IP.
+    """
+    contexto = getattr(request.state, "contexto_auth", None)
+    if contexto is not None:
+        return f"usuario:{contexto.usuario.id_usuario}"
+    return obtener_clave_rate_limit(request)
+
+limiter = Limiter(
+    key_func=obtener_clave_rate_limit,
+    storage_uri=settings.RATE_LIMIT_STORAGE,
+    strategy=settings.RATE_LIMIT_ESTRATEGIA,
+    in_memory_fallback_enabled=settings.RATE_LIMIT_FALLBACK_MEMORIA,
+    key_prefix="sgst",
+)
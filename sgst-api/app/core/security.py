@@ -3,6 +3,10 @@ from app.core.config import settings
 from app.core.exceptions import ConfigError, TokenExpiradoException, TokenInvalidoException
 from jwt import ExpiredSignatureError, PyJWTError
 from app.models.usuarios import UsuarioDTO
+import base64
+import binascii
+import hashlib
+import secrets
 import jwt
 
 SECRET_KEY = settings.JWT_SECRET_KEY
@@ -42,3 +46,40 @@ def decodificar_token(token: str) -> dict:
 
     except PyJWTError:
         raise TokenInvalidoException()
+
+# Refresh tokens con formato "<selector>.<validador>" (ambos en base64url). El selector identifica la fila y se
+# guarda tal cual como llave primaria BINARY(16); del validador solo se guarda su SHA-256, así que una copia
+# de la tabla no sirve para suplantar sesiones.
+BYTES_SELECTOR = 16
+BYTES_VALIDADOR = 32
+
+def _b64(valor: bytes) -> str:
+    return base64.urlsafe_b64encode(valor).rstrip(b"=").decode("ascii")
+
+def hash_validador(validador: bytes) -> bytes:
+    return hashlib.sha256(validador).digest()
+
+def generar_refresh_token(selector: bytes | None = None) -> tuple[str, bytes, bytes]:
+    """
+    Genera un refresh token nuevo. Si se da `selector`, conserva la sesión (rotación) y solo cambia el validador.
+    :return: (token para la cookie, selector, hash del validador)
+    """
+    selector = selector or secrets.token_bytes(BYTES_SELECTOR)
+    validador = secrets.token_bytes(BYTES_VALIDADOR)
+    return f"{_b64(selector)}.{_b64(validador)}", selector, hash_validador(validador)
+
+def separar_refresh_token(token: str) -> tuple[bytes, bytes] | None:
+    """
+    Separa un refresh token en (selector, hash del validador) sin tocar la base de datos.
+    Regresa None si el token no tiene el formato esperado (incluidos los tokens del formato anterior).
+    """
+    partes = token.split(".")
+    if len(partes) != 2:
+        return None
+    try:
+        selector, validador = (base64.urlsafe_b64decode(parte + "=" * (-len(parte) % 4)) for parte in partes)
+    except (binascii.Error, ValueError):
+        return None
+    if len(selector) != BYTES_SELECTOR or len(validador) != BYTES_VALIDADOR:
+        return None
+    return selector, hash_validador(validador)
@@ -0,0 +1,196 @@
+from typing import Any, Callable, Dict, List
+import threading
+import time
+import logging
+import mysql.connector
+
+logger = logging.getLogger(__name__)
+
+class _Tarea:
+    def __init__(self, nombre: str, intervalo_segundos: int, funcion: Callable[[], int], local: bool):
+        self.nombre = nombre
+        self.intervalo_segundos = intervalo_segundos
+        self.funcion = funcion
+        self.local = local
+        self.candado = threading.Lock()
+        self.siguiente_ejecucion = 0.0
+        self.ejecuciones = 0
+        self.errores = 0
+        self.filas_total = 0
+        self.ultimo_resultado: int | None = None
+        self.ultimo_error: str | None = None
+        self.ultima_ejecucion: float | None = None # Hora del reloj (time.time) en que terminó la última ejecución.
+        self.duracion_ultima = 0.0
+        self.duracion_total = 0.0
+        self.duracion_max = 0.0
+
+class EjecutorTareas:
+    """
+    Ejecuta tareas de mantenimiento periódicas en un hilo de fondo del proceso.
+
+    Con varios workers de uvicorn cada proceso tiene su propio ejecutor, pero solo uno ejecuta las
+    tareas: el que obtiene el candado de MySQL `nombre_candado` (GET_LOCK) en una conexión dedicada
+    que mantiene abierta mientras vive. Si ese proceso termina o pierde la conexión, MySQL libera el
+    candado y otro worker lo toma en su siguiente revisión, sin necesidad de una tabla de control.
+
+    Cada tarea es una función sin argumentos que abre sus propias conexiones y regresa el número de
+    filas procesadas; un error en una tarea se registra y no detiene a las demás. Las tareas `local`
+    cuidan el estado del propio proceso (su pool de conexiones) y se ejecutan en todos los workers,
+    tengan o no el candado.
+    """
+
+    def __init__(self, crear_conexion: Callable[[], mysql.connector.connection.MySQLConnection], nombre_candado: str, revision_segundos: int):
+        self._crear_conexion = crear_conexion
+        self.nombre_candado = nombre_candado
+        self.revision_segundos = max(revision_segundos, 1)
+        self._tareas: Dict[str, _Tarea] = {}
+        self._detener = threading.Event()
+        self._hilo: threading.Thread | None = None
+        self._conexion_candado = None
+        self._es_lider = False
+
+    def registrar(self, nombre: str, intervalo_segundos: int, funcion: Callable[[], int], local: bool = False) -> None:
+        """Registra una tarea. Un intervalo de 0 o menor la desactiva."""
+        if intervalo_segundos <= 0:
+            return
+        self._tareas[nombre] = _Tarea(nombre=nombre, intervalo_segundos=intervalo_segundos, funcion=funcion, local=local)
+
+    def iniciar(self) -> None:
+        if self._hilo is not None or not self._tareas:
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ciclo, name="tareas", daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout: float = 10) -> None:
+        self._detener.set()
+        hilo, self._hilo = self._hilo, None
+        if hilo is not None:
+            hilo.join(timeout)
+        self._soltar_candado()
+
+    def ejecutar(self, nombre: str) -> int:
+        """
+        Ejecuta una tarea de inmediato en el hilo actual, sin revisar el candado (lo usan los comandos).
+        Si la misma tarea ya se está ejecutando en este proceso, espera a que termine.
+        """
+        tarea = self._tareas[nombre]
+        with tarea.candado:
+            inicio = time.perf_counter()
+            try:
+                resultado = tarea.funcion()
+            except Exception as e:
+                self._registrar(tarea, time.perf_counter() - inicio, None, repr(e))
+                raise
+            self._registrar(tarea, time.perf_counter() - inicio, resultado, None)
+            return resultado
+
+    def nombres(self) -> List[str]:
+        return sorted(self._tareas)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        return {
+            "activo": self._hilo is not None,
+            "lider": self._es_lider,
+            "tareas": {nombre: self._estadisticas_tarea(tarea) for nombre, tarea in self._tareas.items()},
+        }
+
+    def _ciclo(self) -> None:
+        while not self._detener.is_set():
+            es_lider = self._tomar_candado() if any(not tarea.local for tarea in self._tareas.values()) else False
+            ahora = time.monotonic()
+            for tarea in self._tareas.values():
+                if self._detener.is_set():
+                    break
+                if not (es_lider or tarea.local) or tarea.siguiente_ejecucion > ahora:
+                    continue
+                try:
+                    self.ejecutar(tarea.nombre)
+                except Exception as e:
+                    logger.error(f"Error en la tarea {tarea.nombre}: {e}")
+                # El intervalo se cuenta desde que terminó para que una tarea lenta no se encime consigo misma.
+                tarea.siguiente_ejecucion = time.monotonic() + tarea.intervalo_segundos
+            self._detener.wait(self.revision_segundos)
+
+    def _tomar_candado(self) -> bool:
+        if self._conexion_candado is not None:
+            try:
+                self._conexion_candado.ping(reconnect=False)
+                return True
+            except Exception:
+                # Al perder la conexión MySQL ya liberó el candado; puede que otro worker lo tenga.
+                logger.warning("Se perdió la conexión del candado de tareas")
+                self._soltar_candado()
+
+        conexion = None
+        try:
+            conexion = self._crear_conexion()
+            cursor = conexion.cursor()
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (self.nombre_candado,))
+            (obtenido,) = cursor.fetchone()
+            cursor.close()
+        except Exception as e:
+            logger.warning(f"No se pudo solicitar el candado de tareas: {e}")
+            obtenido = 0
+
+        if obtenido == 1:
+            self._conexion_candado = conexion
+            self._es_lider = True
+            # Al volverse líder se ejecutan las tareas pendientes de inmediato.
+            for tarea in self._tareas.values():
+                if not tarea.local:
+                    tarea.siguiente_ejecucion = 0.0
+            return True
+
+        if conexion is not None:
+            try:
+                conexion.close()
+            except Exception:
+                pass
+        return False
+
+    def _soltar_candado(self) -> None:
+        conexion, self._conexion_candado = self._conexion_candado, None
+        self._es_lider = False
+        if conexion is None:
+            return
+        try:
+            # Cerrar la conexión también libera el candado; el RELEASE_LOCK solo lo hace explícito.
+            cursor = conexion.cursor()
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (self.nombre_candado,))
+            cursor.fetchall()
+            cursor.close()
+        except Exception:
+            pass
+        try:
+            conexion.close()
+        except Exception:
+            pass
+
+    def _registrar(self, tarea: _Tarea, duracion: float, resultado: int | None, error: str | None) -> None:
+        tarea.ejecuciones += 1
+        tarea.ultima_ejecucion = time.time()
+        tarea.duracion_ultima = duracion
+        tarea.duracion_total += duracion
+        tarea.duracion_max = max(tarea.duracion_max, duracion)
+        if error is not None:
+            tarea.errores += 1
+            tarea.ultimo_error = error
+            return
+        tarea.ultimo_resultado = resultado
+        tarea.filas_total += resultado or 0
+
+    def _estadisticas_tarea(self, tarea: _Tarea) -> Dict[str, Any]:
+        return {
+            "intervalo_segundos": tarea.intervalo_segundos,
+            "local": tarea.local,
+            "ejecuciones": tarea.ejecuciones,
+            "errores": tarea.errores,
+            "ultimo_error": tarea.ultimo_error,
+            "ultima_ejecucion": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(tarea.ultima_ejecucion)) if tarea.ultima_ejecucion else None,
+            "ultimo_resultado": tarea.ultimo_resultado,
+            "filas_total": tarea.filas_total,
+            "duracion_ultima_ms": round(tarea.duracion_ultima * 1000, 3),
+            "duracion_promedio_ms": round(tarea.duracion_total / tarea.ejecuciones * 1000, 3) if tarea.ejecuciones else 0.0,
+            "duracion_max_ms": round(tarea.duracion_max * 1000, 3),
+        }
@@ -0,0 +1,39 @@
+from typing import Callable, Dict, List
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Acciones pendientes por conexión (id del objeto), a ejecutar cuando su transacción se confirme.
+_pendientes: Dict[int, List[Callable[[], None]]] = {}
+_candado = threading.Lock()
+
+def al_confirmar(conexion, accion: Callable[[], None]) -> None:
+    """
+    Programa `accion` para después del COMMIT de la transacción actual de `conexion`; si la transacción se
+    revierte, se descarta. Sirve para invalidar cachés en memoria: invalidar antes de confirmar deja una
+    ventana en la que otra petición vuelve a guardar en caché el valor anterior.
+    """
+    with _candado:
+        _pendientes.setdefault(id(conexion), []).append(accion)
+
+def confirmar(conexion) -> None:
+    """COMMIT de `conexion` seguido de las acciones programadas con al_confirmar."""
+    conexion.commit()
+    with _candado:
+        acciones = _pendientes.pop(id(conexion), [])
+    for accion in acciones:
+        try:
+            accion()
+        except Exception as e:
+            # El COMMIT ya ocurrió; un error aquí no debe convertir la petición en un error.
+            logger.error(f"Error en una acción posterior al commit: {e}")
+
+def revertir(conexion) -> None:
+    """ROLLBACK de `conexion`, descartando las acciones programadas."""
+    descartar(conexion)
+    conexion.rollback()
+
+def descartar(conexion) -> None:
+    with _candado:
+        _pendientes.pop(id(conexion), None)
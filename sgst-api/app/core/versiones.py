@@ -0,0 +1,64 @@
+from typing import Any, Callable, Dict, Tuple
+import threading
+import time
+from app.core.config import settings
+
+# entidad -> (versión, momento del último cambio)
+VersionesTaller = Dict[str, Tuple[int, Any]]
+
+class LectorVersiones:
+    """
+    Lectura en proceso de los contadores de taller_versiones (ver BaseRepository.versionada).
+
+    Cada lectura es una búsqueda por llave primaria (id_taller, entidad) de unas cuantas filas, así que
+    consultar la versión en cada petición cuesta menos que cualquier consulta del listado que protege.
+    Con `max_edad_ms` > 0 además se recuerdan las versiones de cada taller ese tiempo, para quien
+    consulte con mucha frecuencia y tolere ese atraso: otro worker puede haber escrito en ese lapso.
+    Con 0 (el valor por defecto) cada lectura va a la base de datos y refleja exactamente lo confirmado.
+
+    Las escrituras de este proceso olvidan lo recordado del taller después del commit que incrementa la
+    versión. Igual que en CacheTTL, una lectura que empezó antes de olvidar no guarda su resultado.
+    """
+
+    def __init__(self, max_edad_ms: int):
+        self.max_edad_ms = max(max_edad_ms, 0)
+        self._memoria: Dict[str, Tuple[float, VersionesTaller]] = {}
+        self._candado = threading.Lock()
+        self._generacion = 0
+        self._lecturas_bd = 0
+        self._aciertos = 0
+        self._incrementos = 0
+
+    def leer(self, id_taller: str, consultar: Callable[[], VersionesTaller]) -> VersionesTaller:
+        if self.max_edad_ms:
+            with self._candado:
+                entrada = self._memoria.get(id_taller)
+                if entrada is not None and (time.monotonic() - entrada[0]) * 1000 <= self.max_edad_ms:
+                    self._aciertos += 1
+                    return entrada[1]
+                generacion = self._generacion
+
+        versiones = consultar()
+        with self._candado:
+            self._lecturas_bd += 1
+            if self.max_edad_ms and generacion == self._generacion:
+                self._memoria[id_taller] = (time.monotonic(), versiones)
+        return versiones
+
+    def olvidar(self, id_taller: str) -> None:
+        with self._candado:
+            self._incrementos += 1
+            self._generacion += 1
+            self._memoria.pop(id_taller, None)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._candado:
+            return {
+                "max_edad_ms": self.max_edad_ms,
+                "talleres_en_memoria": len(self._memoria),
+                "lecturas_bd": self._lecturas_bd,
+                "aciertos_memoria": self._aciertos,
+                "incrementos": self._incrementos,
+            }
+
+lector_versiones = LectorVersiones(settings.VERSIONES_MAX_EDAD_MS)
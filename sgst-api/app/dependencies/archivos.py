@@ -0,0 +1,16 @@
+from fastapi import Request
+from app.dependencies.database import pool_conexiones
+from app.dependencies.auth import obtener_contexto_auth, verificar_acceso
+from app.dependencies.suscripciones import verificar_suscripcion_taller
+from app.models.auth import ContextoAuthDTO
+
+# Las rutas que suben o descargan archivos no usan obtener_conexion_bd: esa conexión quedaría prestada
+# mientras llega o se envía el cuerpo, que con una foto de 10 MB en una red móvil puede tardar varios
+# segundos. Aquí la conexión se toma solo para validar el acceso y se devuelve de inmediato.
+def verificar_acceso_archivos(roles_permitidos: list[str]):
+    def _verificar_acceso_archivos(request: Request) -> ContextoAuthDTO:
+        with pool_conexiones.conexion() as db:
+            verificar_acceso(roles_permitidos)(request, db)
+            verificar_suscripcion_taller(request, db)
+            return obtener_contexto_auth(request, db)
+    return _verificar_acceso_archivos
@@ -3,58 +3,55 @@ from app.core.exceptions import UsuarioNoEncontradoException, UsuarioNoPertenece
 from app.core.security import decodificar_token
 from app.dependencies.database import obtener_conexion_bd
 from app.models.usuarios import UsuarioDTO
+from app.models.auth import ContextoAuthDTO
 from app.core.exceptions import TokenInvalidoException, TokenException
 from app.repositories.usuarios_repository import UsuariosRepository
 from app.models.taller import TallerDTO
-from app.repositories.usuarios_talleres_repository import UsuariosTalleresRepository
 from app.constants.roles import Roles
 
-def obtener_usuario_actual(request: Request, db = Depends(obtener_conexion_bd)) -> UsuarioDTO:
+# El contexto se resuelve una sola vez por petición (un solo decode del token y una sola consulta) y se guarda
+# en request.state, así todas las dependencias de autenticación y suscripción comparten el mismo resultado.
+def obtener_contexto_auth(request: Request, db) -> ContextoAuthDTO:
+    contexto = getattr(request.state, "contexto_auth", None)
+    if contexto is not None:
+        return contexto
+
     token = request.cookies.get("access_token")
-    
+
     if not token:
         raise TokenException()
 
     payload = decodificar_token(token)
     id_usuario = payload.get("id_usuario")
-    
+
     if not id_usuario:
         raise TokenInvalidoException()
 
-    usuarios_repository = UsuariosRepository(db)
-    usuario = usuarios_repository.obtener_usuario_por_id(id_usuario)
+    id_taller_actual = request.cookies.get("id_taller_actual")
+    contexto = UsuariosRepository(db).obtener_contexto_auth(id_usuario, id_taller_actual)
 
-    if not usuario:
+    # La consulta solo regresa usuarios activos, así que un usuario desactivado tampoco tiene contexto.
+    if not contexto:
         raise UsuarioNoEncontradoException()
 
-    if not usuario.activo:
-        raise UsuarioNoEncontradoException()
+    request.state.contexto_auth = contexto
+    return contexto
 
-    return usuario
+def obtener_usuario_actual(request: Request, db = Depends(obtener_conexion_bd)) -> UsuarioDTO:
+    return obtener_contexto_auth(request, db).usuario
 
 def obtener_taller_actual(request: Request, db = Depends(obtener_conexion_bd)) -> TallerDTO | None:
-    token = request.cookies.get("access_token")
     id_taller_actual = request.cookies.get("id_taller_actual")
     
     if not id_taller_actual:
         return None
 
-    if not token:
-        raise TokenException()
-
-    payload = decodificar_token(token)
-    id_usuario = payload.get("id_usuario")
-
-    if not id_usuario:
-        raise TokenInvalidoException()
-
-    usuarios_talleres_repository = UsuariosTalleresRepository(db)
-    usuario_taller = usuarios_talleres_repository.obtener_rol_por_usuario_y_taller(id_usuario, id_taller_actual)
+    contexto = obtener_contexto_auth(request, db)
 
-    if not usuario_taller:
+    if not contexto.taller:
         raise UsuarioNoPerteneceAlTallerException()
     
-    return TallerDTO(id_taller=usuario_taller.id_taller, rol_taller=usuario_taller.rol_taller)
+    return contexto.taller
 
 # Se cambió para consumir la función obtener_taller_actual obteniendo el id del taller y el rol del usuario. Verificando que el usuario si pertenezca al taller.
 # Después simplemente se verifica que el rol del usuario ea uno de los roles permitidos que pueda acceder al recurso.
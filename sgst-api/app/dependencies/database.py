@@ -2,6 +2,9 @@ import os
 from dotenv import load_dotenv
 from typing import Generator
 import mysql.connector
+from app.core.config import settings
+from app.core.pool_conexiones import PoolConexiones
+from app.core.transacciones import confirmar, revertir
 
 load_dotenv()
 
@@ -10,20 +13,36 @@ DB_CONFIG = {
     "port": os.getenv("DB_PORT"),
     "user": os.getenv("DB_USER"),
     "password": os.getenv("DB_PASSWORD"),
-    "database": os.getenv("DB_NAME")
+    "database": os.getenv("DB_NAME"),
+    # Todas las sesiones trabajan en UTC: NOW(), CURRENT_TIMESTAMP y las columnas TIMESTAMP se leen y escriben
+    # en la misma zona que BaseRepository._ahora(), sin depender de la zona del servidor ni de la del host.
+    # CURRENT_DATE y DATE() de un TIMESTAMP darían el día de UTC, así que las fechas sin hora que se agrupan
+    # por día las envía la aplicación en la zona del negocio (app.core.fechas.hoy()).
+    "time_zone": "+00:00",
 }
 
 def conectar_bd() -> mysql.connector.connection.MySQLConnection:
     conexion = mysql.connector.connect(**DB_CONFIG)
     return conexion
 
+# Las conexiones se abren bajo demanda, así que crear el pool al importar no toca la base de datos.
+pool_conexiones = PoolConexiones(
+    crear_conexion=conectar_bd,
+    tamano=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+    timeout=settings.DB_POOL_TIMEOUT,
+    reciclar_segundos=settings.DB_POOL_RECYCLE,
+    pre_ping=settings.DB_POOL_PRE_PING,
+    ping_inactividad=settings.DB_POOL_PING_INACTIVIDAD,
+)
+
 def obtener_conexion_bd() -> Generator[mysql.connector.connection.MySQLConnection, None, None]:
-    conexion = conectar_bd()
+    conexion = pool_conexiones.obtener_conexion()
     try:
         yield conexion
-        conexion.commit()
+        confirmar(conexion)
     except Exception:
-        conexion.rollback()
+        revertir(conexion)
         raise
     finally:
-        conexion.close()
\ No newline at end of file
+        pool_conexiones.liberar_conexion(conexion)
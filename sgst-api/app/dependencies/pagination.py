@@ -5,8 +5,11 @@ def pagination_params(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     order_by: str | None = Query(None),
-    order_dir: str = Query("ASC", regex="^(ASC|DESC)$"),
-    search: str | None = Query(None)
+    order_dir: str = Query("ASC", pattern="^(ASC|DESC)$"),
+    search: str | None = Query(None),
+    paginacion: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: str | None = Query(None, description="Valor next_cursor de la página anterior (solo en modo cursor)."),
+    conteo: str = Query("exacto", pattern="^(exacto|estimado|omitir)$", description="Cómo calcular el total cuando hay más de una página: exacto (COUNT adicional), estimado por el optimizador u omitirlo. Con estimado u omitir use hay_mas para saber si hay página siguiente.")
 ) -> PaginationParams:
 
     offset = (page - 1) * limit
@@ -17,5 +20,8 @@ def pagination_params(
         offset=offset,
         order_by=order_by,
         order_dir=order_dir,
-        search=search
+        search=search,
+        modo_cursor=paginacion == "cursor" or bool(cursor),
+        cursor=cursor or None,
+        conteo=conteo
     )
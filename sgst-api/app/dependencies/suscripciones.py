@@ -1,18 +1,19 @@
 from fastapi import Depends, Request
 from app.dependencies.database import obtener_conexion_bd
 from app.core.exceptions import EmpresaSinSuscripcionException, EmpresaYaTieneMaxTalleresException, NoHayTallerActivoException, TallerNoTieneEmpresaAsociadaException
-from app.repositories.suscripciones_repository import SuscripcionesRepository
 from app.repositories.talleres_repository import TalleresRepository
-from app.dependencies.auth import obtener_usuario_actual
+from app.dependencies.auth import obtener_usuario_actual, obtener_contexto_auth
 from app.models.usuarios import UsuarioDTO
 
 def verificar_suscripcion_y_max_talleres(request: Request, db = Depends(obtener_conexion_bd), usuario: UsuarioDTO = Depends(obtener_usuario_actual)):
+    # La suscripción y el máximo de talleres ya vienen en el contexto de autenticación de la petición.
+    contexto = obtener_contexto_auth(request, db)
+
     # Verificamos que su suscripción activa tenga talleres disponibles para agregar.
-    suscripcion_activa = SuscripcionesRepository(db).obtener_suscripcion_activa_por_empresa(usuario.id_empresa)
-    if not suscripcion_activa:
+    if not contexto.suscripcion_empresa:
         raise EmpresaSinSuscripcionException()
     
-    max_talleres = SuscripcionesRepository(db).obtener_max_talleres_por_suscripcion(usuario.id_empresa)
+    max_talleres = contexto.max_talleres
     cantidad_talleres = len(TalleresRepository(db).listar_por_empresa(usuario.id_empresa))
     if max_talleres > 0 and cantidad_talleres >= max_talleres:
         raise EmpresaYaTieneMaxTalleresException()
@@ -24,14 +25,14 @@ def verificar_suscripcion_taller(request: Request, db = Depends(obtener_conexion
     if not id_taller_actual:
         raise NoHayTallerActivoException()
     
-    # Se obtiene la id_empresa del taller actual.
-    id_empresa = TalleresRepository(db).obtener_id_empresa_por_taller(id_taller_actual)
-    if not id_empresa:
+    contexto = obtener_contexto_auth(request, db)
+
+    # Se verifica que el taller actual tenga una empresa asociada.
+    if not contexto.id_empresa_taller:
         raise TallerNoTieneEmpresaAsociadaException()
     
     # Se verifica que la suscripción de la empresa esté activa.
-    suscripcion_activa = SuscripcionesRepository(db).obtener_suscripcion_activa_por_empresa(id_empresa)
-    if not suscripcion_activa:
+    if not contexto.suscripcion_taller:
         raise EmpresaSinSuscripcionException()
     
     # Es una verificación solamente, no se devuelve ningun valor.
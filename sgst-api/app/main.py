@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -6,9 +8,15 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from app.core.config import settings
 from app.core.rate_limit import limiter
-from app.routes import auth, empresas, suscripciones, talleres, clientes, equipos
+from app.routes import auth, empresas, suscripciones, talleres, clientes, equipos, ordenes, archivos, pagos, ventas, compras, finanzas, inventario, sincronizacion, sistema
 from app.core.exceptions import AppException
+from app.dependencies.database import pool_conexiones
+from app.core.hashing import pool_hashing
+from app.services.mantenimiento_service import ejecutor_tareas
+from app.services.secuencias_service import bloques_secuencias
+from app.core.almacenamiento import almacenamiento
 
+logger = logging.getLogger(__name__)
 
 async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
     return JSONResponse(
@@ -21,11 +29,36 @@ async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded)
         },
     )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.WEB_CONCURRENCY > 1 and (
+        settings.CACHE_SUSCRIPCIONES_TTL > 0 or settings.CACHE_CATALOGOS_TTL > 0 or settings.CACHE_CONTEXTO_AUTH_TTL > 0
+    ):
+        logger.warning(
+            "Con %s workers las cachés en memoria solo se invalidan en el worker que escribe; los demás pueden "
+            "servir datos de hasta CACHE_SUSCRIPCIONES_TTL=%ss y roles de hasta CACHE_CONTEXTO_AUTH_TTL=%ss de antigüedad",
+            settings.WEB_CONCURRENCY, settings.CACHE_SUSCRIPCIONES_TTL, settings.CACHE_CONTEXTO_AUTH_TTL,
+        )
+    if settings.WEB_CONCURRENCY > 1 and settings.RATE_LIMIT_STORAGE.startswith("memory://"):
+        logger.warning(
+            "Con %s workers y RATE_LIMIT_STORAGE=memory:// cada worker cuenta por separado; use Redis para "
+            "compartir los límites", settings.WEB_CONCURRENCY,
+        )
+    if settings.TAREAS_ACTIVAS:
+        ejecutor_tareas.iniciar()
+    yield
+    ejecutor_tareas.detener()
+    almacenamiento.cerrar()
+    pool_hashing.cerrar()
+    bloques_secuencias.cerrar()
+    pool_conexiones.cerrar()
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.PROJECT_NAME,
         version="1.0.0",
-        description="API para el sistema SGST (Sistema de Gestión de Servicios Técnicos)"
+        description="API para el sistema SGST (Sistema de Gestión de Servicios Técnicos)",
+        lifespan=lifespan,
     )
 
     app.state.limiter = limiter
@@ -52,6 +85,15 @@ def include_routers(app: FastAPI) -> None:
     app.include_router(talleres.router, prefix=settings.API_V1_PREFIX)
     app.include_router(clientes.router, prefix=settings.API_V1_PREFIX)
     app.include_router(equipos.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(ordenes.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(archivos.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(pagos.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(ventas.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(compras.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(finanzas.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(inventario.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(sincronizacion.router, prefix=settings.API_V1_PREFIX)
+    app.include_router(sistema.router, prefix=settings.API_V1_PREFIX)
 
 app = create_app()
 
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class ImagenRecepcionDTO(BaseModel):
+    id_imagen: int
+    id_orden: int
+    orden_imagen: int
+    tipo_contenido: str | None = None
+    tamano_bytes: int | None = None
+    subido_por: str | None = None
+    fecha_subida: datetime
+
+
+class ArchivoDTO(BaseModel):
+    id_archivo: int
+    id_orden: int
+    tipo_archivo: str | None = None
+    nombre_original: str | None = None
+    tamano_bytes: int | None = None
+    descripcion: str | None = None
+    subido_por: str | None = None
+    fecha_subida: datetime
@@ -1,6 +1,8 @@
 import re
 from pydantic import BaseModel, Field, field_validator, EmailStr
 from app.models.usuarios import UsuarioDTO
+from app.models.taller import TallerDTO
+from app.models.suscripcion import SuscripcionConDetalleDTO
 from datetime import datetime
 from app.core.exceptions import ContrasenaDebilException, FormatoTelefonoInvalidoException
 
@@ -33,9 +35,22 @@ class LoginResponseDTO(BaseModel):
     tokens: TokensDTO
 
 class RefreshTokenBdDTO(BaseModel):
-    id_token: int
+    selector: bytes
     id_usuario: str
+    hash_validador: bytes
+    hash_anterior: bytes | None = None
+    rotado_en: datetime | None = None
     expira_en: datetime
+    valido: int
+
+class ContextoAuthDTO(BaseModel):
+    usuario: UsuarioDTO
+    id_taller_actual: str | None = None
+    taller: TallerDTO | None = None # Solo existe si el usuario pertenece al taller actual.
+    id_empresa_taller: str | None = None
+    suscripcion_taller: SuscripcionConDetalleDTO | None = None # Suscripción activa de la empresa dueña del taller actual.
+    suscripcion_empresa: SuscripcionConDetalleDTO | None = None # Suscripción activa de la empresa del usuario (administradores).
+    max_talleres: int = 0
 
 class RegistroDTO(BaseModel):
     nombre_usuario: str = Field(..., max_length=100, min_length=1)
@@ -0,0 +1,48 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Literal
+from pydantic import BaseModel, Field, field_validator
+
+class LineaCompraDTO(BaseModel):
+    tipo_item: Literal["refaccion", "producto_venta"]
+    id_item: int
+    cantidad: int = Field(..., ge=1)
+    precio_unitario: Decimal = Field(..., ge=0, max_digits=12, decimal_places=2)
+
+class CrearCompraDTO(BaseModel):
+    id_proveedor: int | None = None
+    proveedor: str | None = Field(None, max_length=150)
+    num_factura: str | None = Field(None, max_length=100)
+    fecha_compra: date | None = None
+    confirmar: bool = True # Si es False la compra queda pendiente y se confirma después.
+    lineas: List[LineaCompraDTO] = Field(..., min_length=1, max_length=200)
+
+    @field_validator("proveedor", "num_factura")
+    @classmethod
+    def texto_trim(cls, v: str | None) -> str | None:
+        if v is None or (isinstance(v, str) and v.strip() == ""):
+            return None
+        return v.strip() if isinstance(v, str) else v
+
+class DetalleCompraDTO(BaseModel):
+    tipo_item: str
+    id_refaccion: int | None = None
+    id_producto_venta: int | None = None
+    cantidad: int
+    precio_unitario: Decimal
+    subtotal: Decimal
+
+class CompraDTO(BaseModel):
+    id_compra: int
+    id_taller: str
+    num_factura: str | None = None
+    id_proveedor: int | None = None
+    proveedor: str | None = None
+    fecha_compra: date
+    total: Decimal
+    estado: str
+    creado_por: str | None = None
+    confirmado_por: str | None = None
+    fecha_confirmacion: datetime | None = None
+    fecha_creacion: datetime
+    detalle: List[DetalleCompraDTO] = Field(default_factory=list)
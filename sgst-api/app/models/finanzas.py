@@ -0,0 +1,22 @@
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List
+from pydantic import BaseModel, Field
+
+class PeriodoFinanzasDTO(BaseModel):
+    periodo: date # Día, o primer día del mes al agrupar por mes.
+    ingresos: Decimal = Decimal("0.00")
+    egresos: Decimal = Decimal("0.00")
+    balance: Decimal = Decimal("0.00")
+
+class ResumenFinanzasDTO(BaseModel):
+    desde: date
+    hasta: date
+    agrupar: str
+    ingresos: Decimal = Decimal("0.00")
+    egresos: Decimal = Decimal("0.00")
+    balance: Decimal = Decimal("0.00")
+    movimientos: int = 0
+    # Total por tipo de movimiento y categoría, p. ej. {"ingreso": {"venta": 1500.00}}.
+    por_categoria: Dict[str, Dict[str, Decimal]] = Field(default_factory=dict)
+    periodos: List[PeriodoFinanzasDTO] = Field(default_factory=list)
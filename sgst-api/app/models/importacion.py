@@ -0,0 +1,13 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+class ErrorFilaImportacionDTO(BaseModel):
+    fila: int
+    errores: List[str]
+
+class ResultadoImportacionDTO(BaseModel):
+    total_filas: int = 0
+    insertadas: int = 0
+    con_errores: int = 0
+    errores: List[ErrorFilaImportacionDTO] = Field(default_factory=list)
+    errores_omitidos: int = 0 # Filas con error que no se detallan por superar IMPORTACION_MAX_ERRORES.
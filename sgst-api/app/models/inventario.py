@@ -0,0 +1,12 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+class ArticuloBajoStockDTO(BaseModel):
+    tipo_item: str # refaccion | producto_venta
+    id_item: int
+    nombre: str
+    codigo_barras: str | None = None
+    stock_actual: int
+    stock_minimo: int
+    faltante: int # Unidades necesarias para volver al stock mínimo.
+    fecha_alerta: datetime
@@ -0,0 +1,85 @@
+from datetime import date, datetime
+from decimal import Decimal
+from pydantic import BaseModel, Field, field_validator
+
+
+class OrdenDTO(BaseModel):
+    id_orden: int
+    id_taller: str
+    num_orden: int
+    id_cliente: int
+    id_equipo: int
+    accesorios: str | None = None
+    falla: str | None = None
+    diagnostico_inicial: str | None = None
+    solucion_aplicada: str | None = None
+    id_prioridad: int
+    tecnico_asignado: str | None = None
+    fecha_estimada_de_fin: date | None = None
+    fecha_entrega: date | None = None
+    id_estado: int
+    costo_total: Decimal = Decimal("0.00")
+    monto_pagado: Decimal = Decimal("0.00")
+    saldo_pendiente: Decimal = Decimal("0.00")
+    meses_garantia: int = 0
+    fecha_fin_garantia: date | None = None
+    es_por_garantia: int = 0
+    id_orden_origen: int | None = None
+    fecha_creacion: datetime
+    ultima_actualizacion: datetime | None = None
+    creado_por: str | None = None
+    cerrado_por: str | None = None
+    visible: int = 1
+    # Datos relacionados que se obtienen con JOIN en la misma consulta.
+    clave_estado: str | None = None
+    estado: str | None = None
+    clave_prioridad: str | None = None
+    prioridad: str | None = None
+    nombre_cliente: str | None = None
+    apellidos_cliente: str | None = None
+    num_serie: str | None = None
+    marca_equipo: str | None = None
+    modelo_equipo: str | None = None
+    nombre_tecnico: str | None = None
+    apellidos_tecnico: str | None = None
+
+
+class CrearOrdenDTO(BaseModel):
+    id_cliente: int
+    id_equipo: int
+    accesorios: str | None = None
+    falla: str | None = None
+    diagnostico_inicial: str | None = None
+    id_prioridad: int = 2
+    tecnico_asignado: str | None = Field(None, max_length=36)
+    fecha_estimada_de_fin: date | None = None
+    costo_total: Decimal = Field(Decimal("0.00"), ge=0, max_digits=12, decimal_places=2)
+    meses_garantia: int = Field(0, ge=0)
+
+    @field_validator("accesorios", "falla", "diagnostico_inicial", "tecnico_asignado")
+    @classmethod
+    def texto_trim(cls, v: str | None) -> str | None:
+        if v is None or (isinstance(v, str) and v.strip() == ""):
+            return None
+        return v.strip() if isinstance(v, str) else v
+
+
+class ActualizarOrdenDTO(BaseModel):
+    accesorios: str | None = None
+    falla: str | None = None
+    diagnostico_inicial: str | None = None
+    solucion_aplicada: str | None = None
+    id_prioridad: int | None = None
+    id_estado: int | None = None
+    tecnico_asignado: str | None = Field(None, max_length=36)
+    fecha_estimada_de_fin: date | None = None
+    fecha_entrega: date | None = None
+    costo_total: Decimal | None = Field(None, ge=0, max_digits=12, decimal_places=2)
+    meses_garantia: int | None = Field(None, ge=0)
+
+    @field_validator("accesorios", "falla", "diagnostico_inicial", "solucion_aplicada", "tecnico_asignado")
+    @classmethod
+    def texto_trim(cls, v: str | None) -> str | None:
+        if v is None or (isinstance(v, str) and v.strip() == ""):
+            return None
+        return v.strip() if isinstance(v, str) else v
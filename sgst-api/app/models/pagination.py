@@ -7,6 +7,9 @@ class PaginationParams(BaseModel):
     order_by: str | None = None
     order_dir: str = "ASC"
     search: str | None = None
+    modo_cursor: bool = False # Paginación por cursor (keyset) en lugar de LIMIT/OFFSET.
+    cursor: str | None = None
+    conteo: str = "exacto" # exacto | estimado | omitir
 
     @model_validator(mode="after")
     def calculate_offset(self):
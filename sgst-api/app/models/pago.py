@@ -0,0 +1,49 @@
+from datetime import date, datetime
+from decimal import Decimal
+from pydantic import BaseModel, Field, field_validator
+
+class CrearPagoDTO(BaseModel):
+    id_orden: int
+    tipo_pago: str = Field(..., min_length=1, max_length=50) # 'anticipo', 'abono', 'liquidacion', 'otros', ...
+    monto: Decimal = Field(..., gt=0, max_digits=12, decimal_places=2)
+    metodo: str | None = Field(None, max_length=100)
+    referencia: str | None = Field(None, max_length=150)
+    comentario_pago: str | None = None
+
+    @field_validator("metodo", "referencia", "comentario_pago")
+    @classmethod
+    def texto_trim(cls, v: str | None) -> str | None:
+        if v is None or (isinstance(v, str) and v.strip() == ""):
+            return None
+        return v.strip() if isinstance(v, str) else v
+
+class AnularPagoDTO(BaseModel):
+    motivo_anulacion: str = Field(..., min_length=1)
+
+class PagoDTO(BaseModel):
+    id_pago: int
+    id_orden: int
+    id_taller: str
+    tipo_pago: str
+    monto: Decimal
+    metodo: str | None = None
+    referencia: str | None = None
+    comentario_pago: str | None = None
+    fecha_pago: datetime
+    fecha_contable: date | None = None
+    creado_por: str | None = None
+    anulado: int = 0
+    motivo_anulacion: str | None = None
+    fecha_anulacion: datetime | None = None
+    fecha_contable_anulacion: date | None = None
+
+class SaldoOrdenDTO(BaseModel):
+    id_orden: int
+    num_orden: int
+    costo_total: Decimal
+    monto_pagado: Decimal
+    saldo_pendiente: Decimal
+
+class MovimientoPagoDTO(BaseModel):
+    pago: PagoDTO
+    saldo: SaldoOrdenDTO
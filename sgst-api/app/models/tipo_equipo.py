@@ -8,6 +8,7 @@ class TipoEquipoDTO(BaseModel):
     nombre_tipo: str
     activo: int = 1
     fecha_creacion: datetime
+    ultima_actualizacion: datetime | None = None
 
 
 class CrearTipoEquipoDTO(BaseModel):
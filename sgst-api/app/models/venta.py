@@ -0,0 +1,33 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List
+from pydantic import BaseModel, Field
+
+class LineaVentaDTO(BaseModel):
+    id_producto: int
+    cantidad: int = Field(..., ge=1)
+
+class CrearVentaDTO(BaseModel):
+    id_cliente: int | None = None
+    id_metodo_pago: int | None = None
+    lineas: List[LineaVentaDTO] = Field(..., min_length=1, max_length=200)
+
+class DetalleVentaDTO(BaseModel):
+    id_producto_venta: int
+    nombre_producto: str | None = None
+    cantidad: int
+    precio_unitario: Decimal
+    subtotal: Decimal
+
+class VentaDTO(BaseModel):
+    id_venta: int
+    id_taller: str
+    num_venta: int
+    id_cliente: int | None = None
+    fecha_venta: date
+    total: Decimal
+    id_metodo_pago: int | None = None
+    metodo_pago: str | None = None
+    creado_por: str | None = None
+    fecha_creacion: datetime
+    detalle: List[DetalleVentaDTO] = Field(default_factory=list)
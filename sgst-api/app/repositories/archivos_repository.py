@@ -0,0 +1,22 @@
+from typing import Any, Dict, List
+from app.repositories.base_repository import BaseRepository
+
+class ArchivosRepository(BaseRepository):
+    table_name = "archivos"
+    created_at_column = "fecha_subida"
+    server_defaults = {"activo": 1}
+
+    def listar_por_orden(self, id_orden: int) -> List[Dict[str, Any]]:
+        query = f"""SELECT * FROM {self.table_name}
+                    WHERE id_orden = %s AND activo = 1
+                    ORDER BY fecha_subida, id_archivo"""
+        self.execute(query, (id_orden,))
+        return self.cursor.fetchall()
+
+    def obtener_por_id(self, id_archivo: int, id_orden: int, id_taller: str) -> Dict[str, Any] | None:
+        query = f"""SELECT a.* FROM {self.table_name} a
+                    JOIN ordenes o ON o.id_orden = a.id_orden
+                    WHERE a.id_archivo = %s AND a.id_orden = %s AND a.activo = 1
+                      AND o.id_taller = %s AND o.visible = 1"""
+        self.execute(query, (id_archivo, id_orden, id_taller))
+        return self.cursor.fetchone()
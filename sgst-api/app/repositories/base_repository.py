@@ -1,7 +1,15 @@
-from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
 from app.models.pagination import PaginationParams
+from app.core.busqueda import preparar_busqueda, expresion_booleana
+from app.core.cursores import codificar_cursor, decodificar_cursor, serializar_valor, deserializar_valor
+from app.core.exceptions import AppException, CursorInvalidoException, RegistroDuplicadoException
+from app.core.transacciones import al_confirmar
+from app.core.versiones import lector_versiones
+from mysql.connector import errorcode
 import mysql.connector
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -17,18 +25,39 @@ class BaseRepository:
                           Debe ser definido en las clases hijas.
         searchable_fields (List[str]): Lista de campos de la tabla que se pueden buscar
                                        en operaciones de búsqueda global.
+        fulltext_search (bool): Si es True, la búsqueda usa MATCH ... AGAINST sobre searchable_fields.
+                                Requiere un índice FULLTEXT con exactamente esas columnas y en ese orden.
+        like_search_fields (List[str]): Campos de identificadores (teléfono, número de serie) que se buscan
+                                        por subcadena con LIKE, fuera del índice FULLTEXT (ver _build_fulltext_clause).
+        created_at_column (str | None): Columna TIMESTAMP de creación que llenan create_returning.
+        updated_at_column (str | None): Columna TIMESTAMP de última modificación que llena update_returning.
+        server_defaults (Dict[str, Any]): Valores por defecto de la tabla para columnas que no se envían
+                                          en el INSERT (ej. activo = 1), usados por create_returning.
+        unique_constraints (Dict[str, Callable[[], AppException]]): Nombre de cada restricción UNIQUE de la
+                                          tabla y la excepción que se lanza cuando un INSERT o UPDATE la viola.
+        versionada (bool): Si es True, create, create_many, update, soft_delete y delete incrementan la versión
+                           (taller, table_name) en taller_versiones dentro de la misma transacción. La tabla
+                           debe tener columna id_taller.
     
     Atributos de instancia:
         db: Conexión activa a la base de datos MySQL.
         cursor: Cursor configurado para retornar resultados como diccionarios.
+        next_cursor: Cursor de la siguiente página tras una llamada a paginate en modo cursor
+                     (None si no hay más resultados o si se usó LIMIT/OFFSET).
+        hay_mas: Si existe una página siguiente, tras una llamada a paginate_con_total.
     
     Métodos principales:
         - execute: Ejecuta una consulta SQL sin retornar resultados.
         - create: Inserta un nuevo registro en la tabla.
+        - create_many: Inserta varios registros con un solo INSERT de múltiples filas.
         - update: Actualiza un registro existente.
+        - increment_many: Suma una cantidad distinta a una columna de varios registros con un solo UPDATE.
+        - create_returning / update_returning: Escriben y retornan la fila resultante sin volver a leerla.
         - soft_delete: Realiza borrado lógico estableciendo el campo activo a 0.
         - _build_search_clause: Construye la cláusula WHERE para búsqueda global.
-        - paginate: Ejecuta una consulta con paginación (LIMIT/OFFSET) y ordenamiento seguro.
+        - paginate: Ejecuta una consulta con paginación (LIMIT/OFFSET o por cursor) y ordenamiento seguro.
+        - paginate_con_total: Igual que paginate, pero indica si hay más páginas y obtiene el total (exacto, estimado u omitido).
+        - iterate: Recorre el resultado de una consulta por bloques con un cursor sin buffer.
         - list: Lista registros con paginación y búsqueda básica (SELECT *).
         - count: Cuenta el total de registros que coinciden con la búsqueda.
     
@@ -36,6 +65,13 @@ class BaseRepository:
     """
     table_name: str = ""
     searchable_fields: List[str] = []
+    fulltext_search: bool = False
+    like_search_fields: List[str] = []
+    created_at_column: Optional[str] = None
+    updated_at_column: Optional[str] = None
+    server_defaults: Dict[str, Any] = {}
+    unique_constraints: Dict[str, Callable[[], AppException]] = {}
+    versionada: bool = False
     
     def __init__(self, db: mysql.connector.connection.MySQLConnection):
         """
@@ -46,6 +82,8 @@ class BaseRepository:
         """
         self.db = db
         self.cursor = self.db.cursor(dictionary=True)
+        self.next_cursor: Optional[str] = None
+        self.hay_mas = False
     
     def execute(self, query: str, params: tuple = ()) -> None:
         """
@@ -81,11 +119,44 @@ class BaseRepository:
 
         try:
             self.cursor.execute(query, values)
-            return self.cursor.lastrowid if returning else None
         except Exception as e:
+            self._lanzar_si_duplicado(e)
             logger.error(f"Error en create: {e} | Data: {data}")
             raise
+        if self.versionada:
+            self._incrementar_version(data["id_taller"])
+        return self.cursor.lastrowid if returning else None
     
+    def create_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Inserta varios registros en un solo viaje a la base de datos.
+        mysql.connector convierte el executemany de un INSERT ... VALUES en un único INSERT de
+        múltiples filas, que MySQL aplica completo o no aplica (si una fila falla, ninguna se inserta).
+        
+        :param rows: Lista de diccionarios columna -> valor. Todos deben tener las mismas columnas.
+        :return: Número de filas insertadas.
+        :raises Exception: Si ocurre un error durante la inserción (las violaciones de UNIQUE
+                           registradas en unique_constraints se traducen a su excepción).
+        """
+        if not rows:
+            return 0
+
+        columns = list(rows[0].keys())
+        placeholders = ", ".join(["%s"] * len(columns))
+        query = f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        values = [tuple(row[column] for column in columns) for row in rows]
+
+        try:
+            self.cursor.executemany(query, values)
+        except Exception as e:
+            self._lanzar_si_duplicado(e)
+            logger.error(f"Error en create_many: {e} | Filas: {len(rows)}")
+            raise
+        if self.versionada:
+            for id_taller in sorted({row["id_taller"] for row in rows}): # Orden fijo de bloqueo entre talleres.
+                self._incrementar_version(id_taller)
+        return self.cursor.rowcount
+
     def update(self, id_value: Any, id_column: str, data: Dict[str, Any]) -> int:
         """
         Actualiza un registro existente en la tabla.
@@ -105,11 +176,110 @@ class BaseRepository:
 
         try:
             self.cursor.execute(query, values)
-            return self.cursor.rowcount
         except Exception as e:
+            self._lanzar_si_duplicado(e)
             logger.error(f"Error en update: {e} | ID: {id_value} | Data: {data}")
             raise
+        if self.versionada and self.cursor.rowcount:
+            self._incrementar_version_de(id_column, id_value)
+        return self.cursor.rowcount
     
+    def increment_many(self, column: str, deltas: Dict[Any, Any], id_column: str) -> int:
+        """
+        Suma a `column` un valor distinto por registro con un solo UPDATE
+        (SET column = column + CASE id WHEN ... END), en lugar de un UPDATE por registro.
+
+        :param column: Columna numérica a modificar (ej. stock_actual).
+        :param deltas: Diccionario ID -> cantidad a sumar (negativa para restar).
+        :param id_column: Columna identificadora de los registros.
+        :return: Número de filas afectadas.
+        """
+        if not deltas:
+            return 0
+
+        casos = " ".join(["WHEN %s THEN %s"] * len(deltas))
+        placeholders = ", ".join(["%s"] * len(deltas))
+        query = f"""UPDATE {self.table_name}
+                    SET {column} = {column} + CASE {id_column} {casos} END
+                    WHERE {id_column} IN ({placeholders})"""
+        params = tuple(valor for par in deltas.items() for valor in par) + tuple(deltas.keys())
+
+        try:
+            self.cursor.execute(query, params)
+            return self.cursor.rowcount
+        except Exception as e:
+            logger.error(f"Error en increment_many: {e} | Deltas: {deltas}")
+            raise
+
+    def create_returning(self, data: Dict[str, Any], id_column: str) -> Dict[str, Any]:
+        """
+        Inserta un registro y retorna la fila tal como quedó guardada, sin un SELECT posterior.
+        
+        La fila se arma con los datos insertados, el ID autoincremental (lastrowid) y server_defaults.
+        La fecha de creación se envía desde la aplicación en lugar de dejarla al DEFAULT de la tabla,
+        así su valor se conoce sin consultarlo.
+        
+        :param data: Diccionario con columnas y valores a insertar.
+        :param id_column: Columna AUTO_INCREMENT de la tabla.
+        :return: Diccionario con todas las columnas de la fila insertada.
+        """
+        insertar = dict(data)
+        if self.created_at_column and self.created_at_column not in insertar:
+            insertar[self.created_at_column] = self._ahora()
+
+        self.create(insertar)
+        fila = {**self.server_defaults, **insertar}
+        fila[id_column] = self.cursor.lastrowid
+        return fila
+
+    def update_returning(self, actual: Dict[str, Any], id_value: Any, id_column: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Actualiza un registro y retorna la fila resultante combinando la fila actual con los cambios.
+        
+        Para que el resultado sea fiel, `actual` debe haberse leído en la misma transacción con
+        SELECT ... FOR UPDATE. La fecha de modificación se envía desde la aplicación por la misma
+        razón que en create_returning (ON UPDATE CURRENT_TIMESTAMP no se aplica si se asigna explícitamente).
+        
+        :param actual: Fila actual del registro.
+        :param data: Columnas y valores a actualizar. Si está vacío no se ejecuta nada.
+        :return: Diccionario con la fila después de la actualización.
+        """
+        if not data:
+            return dict(actual)
+
+        cambios = dict(data)
+        if self.updated_at_column:
+            cambios[self.updated_at_column] = self._ahora()
+        self.update(id_value, id_column, cambios)
+        return {**actual, **cambios}
+
+    def _lanzar_si_duplicado(self, error: Exception) -> None:
+        """
+        Traduce una violación de UNIQUE (error 1062) a la excepción registrada en unique_constraints.
+        
+        Así las validaciones de duplicados no necesitan consultar antes de escribir: la restricción
+        las resuelve de forma atómica, incluso con inserciones concurrentes. Si la restricción no está
+        registrada (por ejemplo, una base sin la migración 002 que conserva los nombres automáticos) se
+        lanza RegistroDuplicadoException (409). Los errores de otra clase no se tocan y se propagan.
+        """
+        if not isinstance(error, mysql.connector.errors.IntegrityError) or error.errno != errorcode.ER_DUP_ENTRY:
+            return
+        # MySQL 8 reporta la llave como "tabla.restriccion"; versiones anteriores solo como "restriccion".
+        coincidencia = re.search(r"for key '([^']+)'", error.msg or "")
+        restriccion = coincidencia.group(1).split(".")[-1] if coincidencia else None
+        excepcion = self.unique_constraints.get(restriccion) if restriccion else None
+        if excepcion:
+            raise excepcion() from error
+        logger.warning(f"Duplicado en {self.table_name} sin excepción registrada (llave {restriccion})")
+        raise RegistroDuplicadoException() from error
+
+    def _ahora(self) -> datetime:
+        # Hora UTC sin zona, la misma en que trabajan las sesiones (DB_CONFIG["time_zone"]), así las fechas
+        # escritas por la aplicación y las que pone MySQL con NOW()/CURRENT_TIMESTAMP son comparables.
+        # Las columnas TIMESTAMP no guardan fracciones de segundo y MySQL las redondea al insertar,
+        # así que se descartan aquí para retornar exactamente el valor almacenado.
+        return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
     def soft_delete(self, id_value: Any, id_column: str = "id", active_field: str = "activo") -> int:
         """
         Realiza un borrado lógico estableciendo el campo activo a 0.
@@ -124,13 +294,19 @@ class BaseRepository:
         query = f"UPDATE {self.table_name} SET {active_field} = 0 WHERE {id_column} = %s"
         try:
             self.cursor.execute(query, (id_value,))
-            return self.cursor.rowcount
         except Exception as e:
             logger.error(f"Error en soft_delete: {e} | ID: {id_value}")
             raise
+        if self.versionada and self.cursor.rowcount:
+            self._incrementar_version_de(id_column, id_value)
+        return self.cursor.rowcount
     
     def delete(self, id_value: Any, id_column: str = "id") -> int:
         query = f"DELETE FROM {self.table_name} WHERE {id_column} = %s"
+        if self.versionada:
+            # Antes del DELETE, mientras la fila existe para saber su taller. Si el DELETE falla, la
+            # transacción completa se revierte y el incremento con ella.
+            self._incrementar_version_de(id_column, id_value)
         try:
             self.cursor.execute(query, (id_value,))
             return self.cursor.rowcount
@@ -138,10 +314,36 @@ class BaseRepository:
             logger.error(f"Error en delete: {e} | ID: {id_value}")
             raise
     
+    def _incrementar_version(self, id_taller: str) -> None:
+        # Cursor propio para no reemplazar el lastrowid / rowcount de la escritura que se acaba de hacer.
+        # La fila (taller, entidad) queda bloqueada hasta el commit, así que las escrituras de una misma
+        # entidad en un mismo taller se confirman una detrás de otra y la versión nunca se repite.
+        query = """INSERT INTO taller_versiones (id_taller, entidad, version) VALUES (%s, %s, 1)
+                   ON DUPLICATE KEY UPDATE version = version + 1"""
+        cursor = self.db.cursor()
+        try:
+            cursor.execute(query, (id_taller, self.table_name))
+        finally:
+            cursor.close()
+        # Hasta el commit otras conexiones siguen viendo la versión anterior; olvidarla antes permitiría
+        # que una lectura concurrente la volviera a recordar.
+        al_confirmar(self.db, lambda: lector_versiones.olvidar(id_taller))
+
+    def _incrementar_version_de(self, id_column: str, id_value: Any) -> None:
+        cursor = self.db.cursor(buffered=True)
+        try:
+            cursor.execute(f"SELECT id_taller FROM {self.table_name} WHERE {id_column} = %s", (id_value,))
+            fila = cursor.fetchone()
+        finally:
+            cursor.close()
+        if fila:
+            self._incrementar_version(fila[0])
+
     def _build_search_clause(self, search: Optional[str]) -> Tuple[str, List[Any]]:
         """
         Construye la cláusula WHERE para búsqueda global en múltiples campos.
-        Busca el término en todos los campos definidos en searchable_fields usando LIKE.
+        Busca el término en todos los campos definidos en searchable_fields usando LIKE, o con
+        el índice FULLTEXT si fulltext_search está activo (ver _build_fulltext_clause).
         
         :param search: Término de búsqueda opcional. Si es None o vacío, retorna cláusula vacía.
         :return: Tupla con (cláusula SQL, lista de parámetros). 
@@ -150,11 +352,67 @@ class BaseRepository:
         if not search or not self.searchable_fields:
             return "", []
 
+        if self.fulltext_search:
+            return self._build_fulltext_clause(search)
+
         conditions = [f"{field} LIKE %s" for field in self.searchable_fields]
         params = [f"%{search}%" for _ in self.searchable_fields]
 
         clause = " OR ".join(conditions)
         return f" AND ({clause})", params
+
+    def _build_fulltext_clause(self, search: str) -> Tuple[str, List[Any]]:
+        """
+        Búsqueda con el índice FULLTEXT en modo booleano: cada palabra es obligatoria y se
+        compara por prefijo, en cualquiera de los campos. Los acentos se ignoran porque la
+        intercalación utf8mb4_general_ci los trata como iguales.
+        
+        Las palabras más cortas que innodb_ft_min_token_size y las palabras vacías no están
+        indexadas; se exigen con LIKE '%palabra%', que solo se evalúa sobre las filas que ya
+        pasaron el MATCH.
+        
+        El analizador FULLTEXT parte teléfonos y números de serie en fragmentos y no encuentra
+        subcadenas ("5512" dentro de "5255123456"), por eso esos campos van en like_search_fields
+        y no en el índice. Cuando el término contiene algún dígito también se busca completo con
+        LIKE '%termino%' en ellos, como alternativa al MATCH; esa búsqueda recorre las filas del
+        taller, así que solo se agrega para términos que pueden ser un identificador.
+        """
+        palabras, no_indexadas = preparar_busqueda(search)
+        conditions: List[str] = []
+        params: List[Any] = []
+
+        if palabras:
+            conditions.append(f"MATCH({', '.join(self.searchable_fields)}) AGAINST (%s IN BOOLEAN MODE)")
+            params.append(expresion_booleana(palabras))
+
+        for palabra in no_indexadas:
+            conditions.append("(" + " OR ".join(f"{field} LIKE %s" for field in self.searchable_fields) + ")")
+            params.extend(f"%{palabra}%" for _ in self.searchable_fields)
+
+        termino = search.strip()
+        if not self.like_search_fields or not any(c.isdigit() for c in termino):
+            if not conditions:
+                return "", []
+            return " AND " + " AND ".join(conditions), params
+
+        alternativas = [f"{field} LIKE %s" for field in self.like_search_fields]
+        alternativas_params: List[Any] = [f"%{termino}%" for _ in self.like_search_fields]
+        if conditions:
+            alternativas.insert(0, "(" + " AND ".join(conditions) + ")")
+            alternativas_params = params + alternativas_params
+        return " AND (" + " OR ".join(alternativas) + ")", alternativas_params
+
+    def _build_relevance_order(self, search: Optional[str]) -> Tuple[str, List[Any]]:
+        """
+        Expresión ORDER BY por relevancia para búsquedas FULLTEXT (cadena vacía si no aplica).
+        """
+        if not search or not self.fulltext_search or not self.searchable_fields:
+            return "", []
+        palabras, _ = preparar_busqueda(search)
+        if not palabras:
+            return "", []
+        expresion = f"MATCH({', '.join(self.searchable_fields)}) AGAINST (%s IN BOOLEAN MODE) DESC"
+        return expresion, [expresion_booleana(palabras)]
     
     def paginate(
         self,
@@ -162,27 +420,47 @@ class BaseRepository:
         params: tuple,
         pagination: PaginationParams,
         columnas_permitidas: Dict[str, str],
-        default_order: str
+        default_order: str,
+        id_column: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Ejecuta una consulta SQL con paginación (LIMIT/OFFSET) y ordenamiento seguro.
+        Ejecuta una consulta SQL con paginación y ordenamiento seguro.
         Valida que la columna de ordenamiento esté en la lista de columnas permitidas
         para prevenir inyección SQL.
         
-        :param base_query: Consulta SQL base sin ORDER BY ni LIMIT.
+        Si pagination.modo_cursor está activo y se indica id_column, se usa paginación por
+        cursor (keyset): en lugar de OFFSET se filtra a partir de la última fila de la página
+        anterior usando la columna de orden más la llave primaria como desempate, así MySQL no
+        recorre ni descarta las filas de las páginas previas. El cursor de la siguiente página
+        queda en self.next_cursor. El orden por relevancia de las búsquedas FULLTEXT solo aplica
+        en modo LIMIT/OFFSET, ya que la relevancia no sirve como llave de un cursor.
+        
+        :param base_query: Consulta SQL base sin ORDER BY ni LIMIT. Debe incluir una cláusula WHERE.
         :param params: Tupla con los parámetros para la consulta base.
-        :param pagination: Objeto PaginationParams con offset, limit, order_by y order_dir.
+        :param pagination: Objeto PaginationParams con offset, limit, order_by, order_dir y cursor.
         :param columnas_permitidas: Diccionario que mapea nombres de columnas de usuario
                                     a nombres reales de columnas en la base de datos.
-        :param default_order: Nombre de la columna por defecto para ordenar si order_by
+        :param default_order: Columna y dirección por defecto (ej. "fecha_creacion DESC") si order_by
                              no está en columnas_permitidas.
+        :param id_column: (Opcional) Llave primaria usada como desempate en el modo cursor.
         :return: Lista de diccionarios con los resultados de la consulta paginada.
+        :raises CursorInvalidoException: Si el cursor no corresponde al ordenamiento solicitado.
         :raises Exception: Si ocurre un error durante la ejecución de la consulta.
         """
+        self.next_cursor = None
         order_dir = "DESC" if pagination.order_dir.upper() == "DESC" else "ASC"
 
+        if pagination.modo_cursor and id_column:
+            return self._paginate_keyset(base_query, params, pagination, columnas_permitidas, default_order, id_column)
+
+        order_params: tuple = ()
         if pagination.order_by is None or pagination.order_by not in columnas_permitidas:
             order_clause = default_order
+            # Sin un orden explícito, una búsqueda muestra primero los resultados más relevantes.
+            relevancia, relevancia_params = self._build_relevance_order(pagination.search)
+            if relevancia:
+                order_clause = f"{relevancia}, {default_order}"
+                order_params = tuple(relevancia_params)
         else:
             order_column = columnas_permitidas[pagination.order_by]
             order_clause = f"{order_column} {order_dir}"
@@ -194,13 +472,197 @@ class BaseRepository:
         """
 
         try:
-            full_params = params + (pagination.limit, pagination.offset)
+            full_params = params + order_params + (pagination.limit, pagination.offset)
             self.cursor.execute(query, full_params)
             return self.cursor.fetchall()
         except Exception as e:
             logger.error(f"Error en paginate: {e}")
             raise
+
+    def paginate_con_total(
+        self,
+        base_query: str,
+        params: tuple,
+        pagination: PaginationParams,
+        columnas_permitidas: Dict[str, str],
+        default_order: str,
+        id_column: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Obtiene una página, si hay más páginas (self.hay_mas) y el total de registros que cumplen el filtro.
+        
+        La página se pide con una fila extra: esa fila indica si existe una página siguiente sin contar
+        nada, y la consulta conserva el LIMIT (MySQL deja de leer al llenar la página). Si no hay más
+        páginas, el total se deduce de la propia página. Solo cuando hay más, se calcula según pagination.conteo:
+            - "exacto" (por defecto): un COUNT(*) aparte sobre el mismo filtro. Recorre todas las filas que
+                        cumplen el filtro, así que en talleres grandes es la opción cara.
+            - "estimado": estimación de filas del optimizador (EXPLAIN), nunca menor que las filas ya vistas
+                          más la siguiente. Con búsquedas FULLTEXT o filtros suele alejarse mucho del total
+                          real, así que solo lo piden clientes que navegan con hay_mas y no con total_pages.
+            - "omitir": no calcula el total (retorna None).
+        
+        :param base_query: Consulta SQL base sin ORDER BY ni LIMIT.
+        :return: Tupla con (filas de la página, total o None).
+        """
+        if pagination.modo_cursor and id_column:
+            filas = self.paginate(base_query, params, pagination, columnas_permitidas, default_order, id_column)
+            self.hay_mas = self.next_cursor is not None
+            vistas = 0 if pagination.cursor else len(filas)
+        else:
+            pagina = pagination.model_copy(update={"limit": pagination.limit + 1})
+            filas = self.paginate(base_query, params, pagina, columnas_permitidas, default_order, id_column)
+            self.hay_mas = len(filas) > pagination.limit
+            filas = filas[:pagination.limit]
+            vistas = pagination.offset + len(filas)
+
+        # Con un cursor aplicado no se sabe cuántas filas quedaron antes, así que la página no da el total.
+        if not self.hay_mas and not (pagination.modo_cursor and pagination.cursor):
+            return filas, vistas
+
+        if pagination.conteo == "exacto":
+            return filas, self._contar(base_query, params)
+        if pagination.conteo == "estimado":
+            return filas, max(self._estimar(base_query, params), vistas + (1 if self.hay_mas else 0))
+        return filas, None
+
+    def _contar(self, base_query: str, params: tuple) -> int:
+        query = f"SELECT COUNT(*) AS total FROM ({base_query}) AS sub"
+        try:
+            self.cursor.execute(query, params)
+            resultado = self.cursor.fetchone()
+            return resultado["total"] if resultado else 0
+        except Exception as e:
+            logger.error(f"Error en _contar: {e}")
+            raise
+
+    def _estimar(self, base_query: str, params: tuple) -> int:
+        try:
+            self.cursor.execute(f"EXPLAIN {base_query}", params)
+            plan = self.cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error en _estimar: {e}")
+            raise
+        if not plan:
+            return 0
+        # La primera fila del plan es la tabla que dirige la consulta; filtered es el porcentaje que sobrevive al WHERE.
+        filas = plan[0].get("rows") or 0
+        filtrado = plan[0].get("filtered") or 100
+        return int(int(filas) * float(filtrado) / 100)
+
+    def _paginate_keyset(
+        self,
+        base_query: str,
+        params: tuple,
+        pagination: PaginationParams,
+        columnas_permitidas: Dict[str, str],
+        default_order: str,
+        id_column: str
+    ) -> List[Dict[str, Any]]:
+        if pagination.order_by is not None and pagination.order_by in columnas_permitidas:
+            clave_orden = pagination.order_by
+            order_column = columnas_permitidas[pagination.order_by]
+            order_dir = "DESC" if pagination.order_dir.upper() == "DESC" else "ASC"
+        else:
+            clave_orden = "_default"
+            partes = default_order.split()
+            order_column = partes[0]
+            order_dir = "DESC" if len(partes) > 1 and partes[1].upper() == "DESC" else "ASC"
+
+        query = base_query
+        full_params = params
+
+        if pagination.cursor:
+            datos = decodificar_cursor(pagination.cursor)
+            if datos.get("o") != clave_orden or datos.get("d") != order_dir or "id" not in datos:
+                raise CursorInvalidoException()
+
+            valor = deserializar_valor(datos.get("v"), datos.get("t"))
+            keyset_clause, keyset_params = self._build_keyset_clause(order_column, order_dir, id_column, valor, datos["id"])
+            query += keyset_clause
+            full_params = params + tuple(keyset_params)
+
+        # Se pide una fila extra para saber si existe una página siguiente sin hacer otra consulta.
+        query = f"""
+            {query}
+            ORDER BY {order_column} {order_dir}, {id_column} {order_dir}
+            LIMIT %s
+        """
+
+        try:
+            self.cursor.execute(query, full_params + (pagination.limit + 1,))
+            filas = self.cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error en paginate (cursor): {e}")
+            raise
+
+        if len(filas) > pagination.limit:
+            filas = filas[:pagination.limit]
+            ultima = filas[-1]
+            valor, tipo = serializar_valor(ultima[self._nombre_en_fila(order_column)])
+            self.next_cursor = codificar_cursor({
+                "o": clave_orden,
+                "d": order_dir,
+                "v": valor,
+                "t": tipo,
+                "id": ultima[self._nombre_en_fila(id_column)],
+            })
+
+        return filas
+
+    def _build_keyset_clause(
+        self,
+        order_column: str,
+        order_dir: str,
+        id_column: str,
+        valor: Any,
+        ultimo_id: Any
+    ) -> Tuple[str, List[Any]]:
+        """
+        Construye la condición que continúa después de la fila (valor, ultimo_id).
+        MySQL ordena los NULL primero en ASC y al final en DESC, por eso se tratan aparte.
+        """
+        if order_dir == "ASC":
+            if valor is None:
+                return f" AND (({order_column} IS NULL AND {id_column} > %s) OR {order_column} IS NOT NULL)", [ultimo_id]
+            return f" AND ({order_column} > %s OR ({order_column} = %s AND {id_column} > %s))", [valor, valor, ultimo_id]
+
+        if valor is None:
+            return f" AND ({order_column} IS NULL AND {id_column} < %s)", [ultimo_id]
+        return f" AND ({order_column} < %s OR ({order_column} = %s AND {id_column} < %s) OR {order_column} IS NULL)", [valor, valor, ultimo_id]
+
+    @staticmethod
+    def _nombre_en_fila(columna: str) -> str:
+        # "e.fecha_registro" -> "fecha_registro", que es la llave con la que llega en el diccionario de la fila.
+        return columna.split(".")[-1]
     
+    def iterate(self, query: str, params: tuple = (), batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre el resultado de una consulta sin cargarlo completo en memoria.
+        
+        Usa un cursor propio sin buffer: el servidor envía las filas conforme se piden con fetchmany,
+        así que solo hay `batch_size` filas en memoria a la vez. Mientras el iterador no termine, la
+        conexión no puede ejecutar otras consultas; debe usarse con una conexión dedicada.
+        
+        :param query: Consulta SQL completa.
+        :param params: Tupla con los parámetros para la consulta.
+        :param batch_size: Filas leídas del servidor en cada bloque.
+        :return: Iterador de diccionarios, una fila a la vez.
+        """
+        cursor = self.db.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(query, params)
+            while True:
+                filas = cursor.fetchmany(batch_size)
+                if not filas:
+                    break
+                yield from filas
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                # Cerrar con filas pendientes falla; el pool descarta esa conexión al liberarla.
+                pass
+
     def list(
         self,
         pagination: PaginationParams,
@@ -248,4 +710,4 @@ class BaseRepository:
             return result["total"] if result else 0
         except Exception as e:
             logger.error(f"Error en count: {e}")
-            return 0
\ No newline at end of file
+            return 0
@@ -0,0 +1,31 @@
+from typing import Any, Dict
+from app.repositories.base_repository import BaseRepository
+from app.core.cache import cache_catalogos
+
+class CatalogosRepository(BaseRepository):
+    """
+    Catálogos de estados y prioridades de las órdenes y de métodos de pago. Son unas cuantas filas que
+    solo cambian con el script de la base de datos, así que se leen una vez y se sirven desde cache_catalogos.
+    """
+
+    def obtener_estados(self) -> Dict[int, Dict[str, Any]]:
+        return self._obtener_catalogo("cat_estados", "id_estado", "clave, descripcion, orden_int", "orden_int")
+
+    def obtener_prioridades(self) -> Dict[int, Dict[str, Any]]:
+        return self._obtener_catalogo("cat_prioridades", "id_prioridad", "clave, descripcion, orden_int", "orden_int")
+
+    def obtener_metodos_pago(self) -> Dict[int, Dict[str, Any]]:
+        # cat_metodos_pago no tiene orden_int; se conserva el orden de alta.
+        return self._obtener_catalogo("cat_metodos_pago", "id_metodo", "clave, descripcion, activo", "id_metodo")
+
+    def _obtener_catalogo(self, tabla: str, id_column: str, columnas: str, orden: str) -> Dict[int, Dict[str, Any]]:
+        en_cache = cache_catalogos.obtener(tabla)
+        if en_cache is not None:
+            return en_cache
+
+        query = f"""SELECT {id_column}, {columnas} FROM {tabla}
+                    ORDER BY {orden}"""
+        self.execute(query, ())
+        resultado = {fila[id_column]: fila for fila in self.cursor.fetchall()}
+        cache_catalogos.guardar(tabla, resultado)
+        return resultado
@@ -1,13 +1,24 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Set, Tuple
 from app.repositories.base_repository import BaseRepository
 from app.models.pagination import PaginationParams
 from app.models.cliente import ClienteDTO, ClienteListaDTO
+from app.core.exceptions import ClienteDuplicadoException
 
 class ClientesRepository(BaseRepository):
     table_name = "clientes"
-    searchable_fields = ["nombre_cliente", "apellidos_cliente", "correo_cliente", "telefono_cliente"]
+    searchable_fields = ["nombre_cliente", "apellidos_cliente", "correo_cliente"]
+    fulltext_search = True # Índice FULLTEXT ft_clientes_busqueda
+    like_search_fields = ["telefono_cliente"]
+    created_at_column = "fecha_creacion"
+    updated_at_column = "ultima_actualizacion"
+    server_defaults = {"ultima_actualizacion": None}
+    versionada = True
+    unique_constraints = {
+        "uq_clientes_taller_correo": lambda: ClienteDuplicadoException("correo"),
+        "uq_clientes_taller_telefono": lambda: ClienteDuplicadoException("teléfono"),
+    }
 
-    def listar_por_taller(self, id_taller: str, pagination: PaginationParams) -> List[Dict[str, Any]]:
+    def listar_por_taller(self, id_taller: str, pagination: PaginationParams) -> Tuple[List[Dict[str, Any]], int | None]:
         base_query = f"SELECT * FROM {self.table_name} WHERE id_taller = %s"
         search_clause, search_params = self._build_search_clause(pagination.search)
         
@@ -25,12 +36,13 @@ class ClientesRepository(BaseRepository):
         
         params = (id_taller,) + tuple(search_params) if search_params else (id_taller,)
         
-        return self.paginate(
+        return self.paginate_con_total(
             base_query=query,
             params=params,
             pagination=pagination,
             columnas_permitidas=columnas_permitidas,
-            default_order="fecha_creacion DESC"
+            default_order="fecha_creacion DESC",
+            id_column="id_cliente"
         )
 
     def obtener_por_id(self, id_cliente: int, id_taller: str) -> ClienteDTO | None:
@@ -40,51 +52,50 @@ class ClientesRepository(BaseRepository):
         fila = self.cursor.fetchone()
         return ClienteDTO(**fila) if fila else None
 
-    def existe_correo_en_taller(self, id_taller: str, correo: str, excluir_id: int | None = None) -> bool:
-        if not correo:
-            return False
-        
-        if excluir_id is not None:
-            query = f"""SELECT COUNT(*) as total FROM {self.table_name}
-                       WHERE id_taller = %s AND correo_cliente = %s AND correo_cliente IS NOT NULL AND id_cliente != %s"""
-            self.execute(query, (id_taller, correo, excluir_id))
-        else:
-            query = f"""SELECT COUNT(*) as total FROM {self.table_name}
-                       WHERE id_taller = %s AND correo_cliente = %s AND correo_cliente IS NOT NULL"""
-            self.execute(query, (id_taller, correo))
-        
-        resultado = self.cursor.fetchone()
-        return resultado["total"] > 0 if resultado else False
+    def obtener_para_actualizar(self, id_cliente: int, id_taller: str) -> Dict[str, Any] | None:
+        """
+        Lee y bloquea el cliente hasta el final de la transacción, para que update_returning
+        combine los cambios con una fila que nadie más puede modificar mientras tanto.
+        """
+        query = f"""SELECT * FROM {self.table_name}
+                    WHERE id_cliente = %s AND id_taller = %s
+                    FOR UPDATE"""
+        self.execute(query, (id_cliente, id_taller))
+        return self.cursor.fetchone()
 
-    def existe_telefono_en_taller(self, id_taller: str, telefono: str, excluir_id: int | None = None) -> bool:
-        if not telefono:
-            return False
-        
-        if excluir_id is not None:
-            query = f"""SELECT COUNT(*) as total FROM {self.table_name}
-                       WHERE id_taller = %s AND telefono_cliente = %s AND telefono_cliente IS NOT NULL AND id_cliente != %s"""
-            self.execute(query, (id_taller, telefono, excluir_id))
-        else:
-            query = f"""SELECT COUNT(*) as total FROM {self.table_name}
-                       WHERE id_taller = %s AND telefono_cliente = %s AND telefono_cliente IS NOT NULL"""
-            self.execute(query, (id_taller, telefono))
+    def buscar_existentes(self, id_taller: str, correos: Set[str], telefonos: Set[str]) -> Tuple[Set[str], Set[str]]:
+        """
+        De un lote de correos y teléfonos, obtiene los que ya están registrados en el taller.
+        Los correos se retornan en minúsculas, ya que la intercalación de la tabla no distingue mayúsculas.
         
-        resultado = self.cursor.fetchone()
-        return resultado["total"] > 0 if resultado else False
+        :return: Tupla con (correos existentes, teléfonos existentes).
+        """
+        condiciones: List[str] = []
+        params: List[Any] = [id_taller]
+        if correos:
+            condiciones.append(f"correo_cliente IN ({', '.join(['%s'] * len(correos))})")
+            params.extend(correos)
+        if telefonos:
+            condiciones.append(f"telefono_cliente IN ({', '.join(['%s'] * len(telefonos))})")
+            params.extend(telefonos)
+        if not condiciones:
+            return set(), set()
 
-    def contar_por_taller(self, id_taller: str, search: str | None = None) -> int:
-        base = f"SELECT COUNT(*) as total FROM {self.table_name} WHERE id_taller = %s"
-        search_clause, params = self._build_search_clause(search)
-        
-        query = base + search_clause
-        full_params = (id_taller,) + tuple(params) if params else (id_taller,)
-        
-        try:
-            self.cursor.execute(query, full_params)
-            result = self.cursor.fetchone()
-            return result["total"] if result else 0
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error en contar_por_taller: {e}")
-            return 0
+        query = f"""SELECT correo_cliente, telefono_cliente FROM {self.table_name}
+                    WHERE id_taller = %s AND ({' OR '.join(condiciones)})"""
+        self.execute(query, tuple(params))
+        correos_existentes: Set[str] = set()
+        telefonos_existentes: Set[str] = set()
+        for fila in self.cursor.fetchall():
+            if fila["correo_cliente"]:
+                correos_existentes.add(fila["correo_cliente"].lower())
+            if fila["telefono_cliente"]:
+                telefonos_existentes.add(fila["telefono_cliente"])
+        return correos_existentes, telefonos_existentes
+
+    def iterar_por_taller(self, id_taller: str, batch_size: int) -> Iterator[Dict[str, Any]]:
+        # El orden coincide con idx_clientes_taller_fecha_creacion, así MySQL envía filas sin ordenar todo antes.
+        query = f"""SELECT * FROM {self.table_name}
+                    WHERE id_taller = %s
+                    ORDER BY fecha_creacion, id_cliente"""
+        return self.iterate(query, (id_taller,), batch_size)
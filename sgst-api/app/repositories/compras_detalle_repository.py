@@ -0,0 +1,12 @@
+from typing import Any, Dict, List
+from app.repositories.base_repository import BaseRepository
+
+class ComprasDetalleRepository(BaseRepository):
+    table_name = "compras_detalle"
+
+    def listar_por_compra(self, id_compra: int) -> List[Dict[str, Any]]:
+        query = f"""SELECT tipo_item, id_refaccion, id_producto_venta, cantidad, precio_unitario, subtotal
+                    FROM {self.table_name}
+                    WHERE id_compra = %s"""
+        self.execute(query, (id_compra,))
+        return self.cursor.fetchall()
@@ -0,0 +1,14 @@
+from typing import Any, Dict
+from app.repositories.base_repository import BaseRepository
+
+class ComprasRepository(BaseRepository):
+    table_name = "compras"
+    created_at_column = "fecha_creacion"
+    server_defaults = {"confirmado_por": None, "fecha_confirmacion": None}
+
+    def obtener_para_actualizar(self, id_compra: int, id_taller: str) -> Dict[str, Any] | None:
+        query = f"""SELECT * FROM {self.table_name}
+                    WHERE id_compra = %s AND id_taller = %s
+                    FOR UPDATE"""
+        self.execute(query, (id_compra, id_taller))
+        return self.cursor.fetchone()
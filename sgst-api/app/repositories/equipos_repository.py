@@ -1,19 +1,29 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Set, Tuple
 from app.repositories.base_repository import BaseRepository
 from app.models.pagination import PaginationParams
 from app.models.equipo import EquipoDTO
+from app.core.exceptions import EquipoDuplicadoException
 
 
 class EquiposRepository(BaseRepository):
     table_name = "equipos"
-    searchable_fields = ["num_serie", "marca_equipo", "modelo_equipo", "descripcion_equipo"]
+    searchable_fields = ["marca_equipo", "modelo_equipo", "descripcion_equipo"]
+    fulltext_search = True # Índice FULLTEXT ft_equipos_busqueda
+    like_search_fields = ["num_serie"]
+    created_at_column = "fecha_registro"
+    updated_at_column = "ultima_actualizacion"
+    server_defaults = {"activo": 1, "ultima_actualizacion": None}
+    versionada = True
+    unique_constraints = {
+        "uq_equipos_taller_num_serie": lambda: EquipoDuplicadoException("número de serie"),
+    }
 
     def listar_por_taller(
         self,
         id_taller: str,
         pagination: PaginationParams,
         id_tipo_filtro: int | None = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> Tuple[List[Dict[str, Any]], int | None]:
         base_query = f"""SELECT e.*, t.nombre_tipo FROM {self.table_name} e
                         LEFT JOIN tipo_equipos t ON e.id_tipo = t.id_tipo
                         WHERE e.id_taller = %s"""
@@ -34,12 +44,13 @@ class EquiposRepository(BaseRepository):
             "fecha_registro": "e.fecha_registro",
             "ultima_actualizacion": "e.ultima_actualizacion",
         }
-        return self.paginate(
+        return self.paginate_con_total(
             base_query=base_query,
             params=params,
             pagination=pagination,
             columnas_permitidas=columnas_permitidas,
             default_order="e.fecha_registro DESC",
+            id_column="e.id_equipo",
         )
 
     def obtener_por_id(self, id_equipo: int, id_taller: str) -> EquipoDTO | None:
@@ -50,45 +61,42 @@ class EquiposRepository(BaseRepository):
         fila = self.cursor.fetchone()
         return EquipoDTO(**fila) if fila else None
 
-    def existe_num_serie_en_taller(
-        self, id_taller: str, num_serie: str, excluir_id_equipo: int | None = None
-    ) -> bool:
-        num_trim = num_serie.strip() if num_serie else ""
-        if not num_trim:
-            return False
-        if excluir_id_equipo is not None:
-            query = f"""SELECT COUNT(*) as total FROM {self.table_name}
-                       WHERE id_taller = %s AND num_serie = %s AND id_equipo != %s"""
-            self.execute(query, (id_taller, num_trim, excluir_id_equipo))
-        else:
-            query = f"""SELECT COUNT(*) as total FROM {self.table_name}
-                       WHERE id_taller = %s AND num_serie = %s"""
-            self.execute(query, (id_taller, num_trim))
-        resultado = self.cursor.fetchone()
-        return resultado["total"] > 0 if resultado else False
+    def obtener_para_actualizar(
+        self, id_equipo: int, id_taller: str, id_tipo: int | None
+    ) -> Tuple[Dict[str, Any] | None, str | None]:
+        """
+        Lee y bloquea el equipo (con el nombre de su tipo) y, si se cambia el tipo, obtiene en la
+        misma consulta el nombre del nuevo tipo (None si no pertenece al taller).
+        
+        :return: Tupla con (fila del equipo o None si no existe, nombre del nuevo tipo).
+        """
+        query = f"""SELECT e.*, t.nombre_tipo,
+                        (SELECT nombre_tipo FROM tipo_equipos WHERE id_tipo = %s AND id_taller = %s) AS nombre_tipo_nuevo
+                    FROM {self.table_name} e
+                    LEFT JOIN tipo_equipos t ON e.id_tipo = t.id_tipo
+                    WHERE e.id_equipo = %s AND e.id_taller = %s
+                    FOR UPDATE OF e"""
+        self.execute(query, (id_tipo, id_taller, id_equipo, id_taller))
+        fila = self.cursor.fetchone()
+        if not fila:
+            return None, None
+        return fila, fila.pop("nombre_tipo_nuevo")
 
-    def contar_por_taller(
-        self,
-        id_taller: str,
-        search: str | None = None,
-        id_tipo_filtro: int | None = None,
-    ) -> int:
-        base = f"SELECT COUNT(*) as total FROM {self.table_name} WHERE id_taller = %s"
-        params_list: List[Any] = [id_taller]
-        if id_tipo_filtro is not None:
-            base += " AND id_tipo = %s"
-            params_list.append(id_tipo_filtro)
-        search_clause, search_params = self._build_search_clause(search)
-        base += search_clause
-        if search_params:
-            params_list.extend(search_params)
-        full_params = tuple(params_list)
-        try:
-            self.cursor.execute(base, full_params)
-            result = self.cursor.fetchone()
-            return result["total"] if result else 0
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error en contar_por_taller: {e}")
-            return 0
+    def buscar_num_series_existentes(self, id_taller: str, num_series: Set[str]) -> Set[str]:
+        """
+        De un lote de números de serie, obtiene (en minúsculas) los que ya están registrados en el taller.
+        """
+        if not num_series:
+            return set()
+        query = f"""SELECT num_serie FROM {self.table_name}
+                    WHERE id_taller = %s AND num_serie IN ({', '.join(['%s'] * len(num_series))})"""
+        self.execute(query, (id_taller, *num_series))
+        return {fila["num_serie"].lower() for fila in self.cursor.fetchall()}
+
+    def iterar_por_taller(self, id_taller: str, batch_size: int) -> Iterator[Dict[str, Any]]:
+        # El orden coincide con idx_equipos_taller_fecha_registro, así MySQL envía filas sin ordenar todo antes.
+        query = f"""SELECT e.*, t.nombre_tipo FROM {self.table_name} e
+                    LEFT JOIN tipo_equipos t ON e.id_tipo = t.id_tipo
+                    WHERE e.id_taller = %s
+                    ORDER BY e.fecha_registro, e.id_equipo"""
+        return self.iterate(query, (id_taller,), batch_size)
@@ -0,0 +1,41 @@
+from datetime import date
+from typing import Any, Dict, List
+from app.repositories.base_repository import BaseRepository
+
+class FinanzasRepository(BaseRepository):
+    """
+    Lectura de finanzas_resumen_diario, los totales diarios que los triggers mantienen por cada
+    movimiento de finanzas_movimientos. Un rango de fechas lee como máximo un renglón por día, tipo y
+    categoría (llave primaria id_taller, fecha, ...), sin importar cuántos movimientos haya en el historial.
+    """
+    table_name = "finanzas_resumen_diario"
+
+    def resumen_por_dia(self, id_taller: str, desde: date, hasta: date) -> List[Dict[str, Any]]:
+        query = f"""SELECT fecha, tipo_movimiento, categoria, total, movimientos
+                    FROM {self.table_name}
+                    WHERE id_taller = %s AND fecha BETWEEN %s AND %s
+                    ORDER BY fecha"""
+        self.execute(query, (id_taller, desde, hasta))
+        return self.cursor.fetchall()
+
+    def reconstruir(self, id_taller: str) -> int:
+        """
+        Recalcula desde cero los totales del taller a partir de finanzas_movimientos.
+        Debe ejecutarse en una transacción propia: el DELETE y el INSERT ... SELECT bloquean los
+        renglones del taller, así los movimientos que lleguen mientras tanto esperan y no se pierden.
+
+        :return: Número de renglones diarios generados.
+        """
+        self.execute(f"DELETE FROM {self.table_name} WHERE id_taller = %s", (id_taller,))
+        query = f"""INSERT INTO {self.table_name} (id_taller, fecha, tipo_movimiento, categoria, total, movimientos)
+                    SELECT id_taller, fecha_movimiento, tipo_movimiento, categoria, SUM(monto), COUNT(*)
+                    FROM finanzas_movimientos
+                    WHERE id_taller = %s
+                    GROUP BY id_taller, fecha_movimiento, tipo_movimiento, categoria"""
+        self.execute(query, (id_taller,))
+        return self.cursor.rowcount
+
+    def listar_talleres_con_movimientos(self) -> List[str]:
+        # DISTINCT sobre el primer campo de idx_finanzas_taller_fecha se resuelve saltando por el índice.
+        self.execute("SELECT DISTINCT id_taller FROM finanzas_movimientos", ())
+        return [fila["id_taller"] for fila in self.cursor.fetchall()]
@@ -0,0 +1,26 @@
+from typing import Any, Dict, List
+from app.repositories.base_repository import BaseRepository
+
+class ImagenesRecepcionRepository(BaseRepository):
+    table_name = "ordenes_imagenes_recepcion"
+    created_at_column = "fecha_subida"
+
+    def listar_por_orden(self, id_orden: int) -> List[Dict[str, Any]]:
+        query = f"""SELECT * FROM {self.table_name}
+                    WHERE id_orden = %s
+                    ORDER BY orden_imagen"""
+        self.execute(query, (id_orden,))
+        return self.cursor.fetchall()
+
+    def obtener_por_id(self, id_imagen: int, id_orden: int, id_taller: str) -> Dict[str, Any] | None:
+        # La tabla no guarda el taller; se comprueba a través de la orden.
+        query = f"""SELECT i.* FROM {self.table_name} i
+                    JOIN ordenes o ON o.id_orden = i.id_orden
+                    WHERE i.id_imagen = %s AND i.id_orden = %s AND o.id_taller = %s AND o.visible = 1"""
+        self.execute(query, (id_imagen, id_orden, id_taller))
+        return self.cursor.fetchone()
+
+    def lugares_ocupados(self, id_orden: int) -> List[int]:
+        query = f"SELECT orden_imagen FROM {self.table_name} WHERE id_orden = %s"
+        self.execute(query, (id_orden,))
+        return [fila["orden_imagen"] for fila in self.cursor.fetchall()]
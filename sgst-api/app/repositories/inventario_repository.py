@@ -0,0 +1,60 @@
+from typing import Any, Dict, List
+from app.repositories.base_repository import BaseRepository
+
+class InventarioRepository(BaseRepository):
+    table_name = "inventario_bajo_stock"
+
+    def listar_bajo_stock(self, id_taller: str, tipo_item: str | None = None) -> List[Dict[str, Any]]:
+        """
+        Artículos del taller con stock en o por debajo del mínimo. inventario_bajo_stock solo contiene
+        esos artículos (lo mantienen los triggers trg_bajo_stock_*), así que la consulta recorre
+        únicamente el resultado y no las tablas de inventario completas.
+        """
+        query = f"""SELECT b.tipo_item, b.id_item, b.fecha_alerta,
+                           COALESCE(r.nombre_refaccion, p.nombre_producto) AS nombre,
+                           COALESCE(r.codigo_barras, p.codigo_barras) AS codigo_barras,
+                           COALESCE(r.stock_actual, p.stock_actual) AS stock_actual,
+                           COALESCE(r.stock_minimo, p.stock_minimo) AS stock_minimo
+                    FROM {self.table_name} b
+                    LEFT JOIN refacciones r ON b.tipo_item = 'refaccion' AND r.id_refaccion = b.id_item
+                    LEFT JOIN productos_venta p ON b.tipo_item = 'producto_venta' AND p.id_producto = b.id_item
+                    WHERE b.id_taller = %s"""
+        params: List[Any] = [id_taller]
+        if tipo_item is not None:
+            query += " AND b.tipo_item = %s"
+            params.append(tipo_item)
+        query += " ORDER BY b.fecha_alerta DESC"
+        self.execute(query, tuple(params))
+        return self.cursor.fetchall()
+
+    def reconstruir(self, id_taller: str) -> tuple[int, int]:
+        """
+        Recalcula el conjunto de artículos bajo mínimo del taller desde refacciones y productos_venta, con
+        el mismo criterio que sp_actualizar_bajo_stock. Sirve para llenar la tabla en una base que ya tenía
+        inventario antes de los triggers, o si se cargaron datos con los triggers desactivados.
+        Los artículos que ya estaban conservan su fecha_alerta y no se envían notificaciones. Debe
+        ejecutarse en una transacción propia; se puede repetir sin efectos adicionales.
+
+        :return: Tupla con (artículos agregados, artículos quitados).
+        """
+        query = f"""DELETE b FROM {self.table_name} b
+                    LEFT JOIN refacciones r ON b.tipo_item = 'refaccion' AND r.id_refaccion = b.id_item
+                    LEFT JOIN productos_venta p ON b.tipo_item = 'producto_venta' AND p.id_producto = b.id_item
+                    WHERE b.id_taller = %s
+                      AND NOT (r.id_refaccion IS NOT NULL AND r.activo <=> 1 AND r.stock_minimo > 0 AND r.stock_actual <= r.stock_minimo)
+                      AND NOT (p.id_producto IS NOT NULL AND p.activo <=> 1 AND p.stock_minimo > 0 AND p.stock_actual <= p.stock_minimo)"""
+        self.execute(query, (id_taller,))
+        quitados = self.cursor.rowcount
+
+        query = f"""INSERT IGNORE INTO {self.table_name} (id_taller, tipo_item, id_item)
+                    SELECT id_taller, 'refaccion', id_refaccion FROM refacciones
+                    WHERE id_taller = %s AND activo <=> 1 AND stock_minimo > 0 AND stock_actual <= stock_minimo
+                    UNION ALL
+                    SELECT id_taller, 'producto_venta', id_producto FROM productos_venta
+                    WHERE id_taller = %s AND activo <=> 1 AND stock_minimo > 0 AND stock_actual <= stock_minimo"""
+        self.execute(query, (id_taller, id_taller))
+        return self.cursor.rowcount, quitados
+
+    def listar_talleres(self) -> List[str]:
+        self.execute("SELECT id_taller FROM talleres", ())
+        return [fila["id_taller"] for fila in self.cursor.fetchall()]
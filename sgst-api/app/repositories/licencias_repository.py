@@ -2,18 +2,23 @@ from decimal import Decimal
 from typing import List
 from app.repositories.base_repository import BaseRepository
 from app.models.suscripcion import LicenciaDTO
+from app.core.cache import cache_catalogos
 
 class LicenciasRepository(BaseRepository):
     table_name = "licencias"
 
     def listar_licencias_activas(self) -> List[LicenciaDTO]:
+        en_cache = cache_catalogos.obtener("licencias_activas")
+        if en_cache is not None:
+            return list(en_cache)
+
         query = f"""SELECT nombre_licencia, descripcion,
                            precio_mensual, precio_anual, max_talleres, max_usuarios
                     FROM {self.table_name}
                     WHERE activo = 1"""
         self.execute(query, ())
         licencias = self.cursor.fetchall()
-        return [
+        resultado = [
             LicenciaDTO(
                 nombre_licencia=lic["nombre_licencia"],
                 descripcion=lic.get("descripcion"),
@@ -24,6 +29,8 @@ class LicenciasRepository(BaseRepository):
             )
             for lic in licencias
         ]
+        cache_catalogos.guardar("licencias_activas", resultado)
+        return list(resultado)
 
     def obtener_id_licencia_por_precio_mensual(self, precio_mensual: str) -> str | None:
         query = f"""SELECT id_licencia FROM {self.table_name}
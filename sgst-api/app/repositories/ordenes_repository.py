@@ -0,0 +1,187 @@
+from decimal import Decimal
+from typing import List, Dict, Any, Tuple
+from app.repositories.base_repository import BaseRepository
+from app.models.pagination import PaginationParams
+from app.models.orden import OrdenDTO
+
+# Etiquetas del estado y la prioridad, y los datos del cliente, equipo y técnico que muestra el listado.
+# Todos los JOIN son por llave primaria, así que cuestan una búsqueda por fila de la página.
+_COLUMNAS_RELACIONADAS = """es.clave AS clave_estado, es.descripcion AS estado,
+                            pr.clave AS clave_prioridad, pr.descripcion AS prioridad,
+                            c.nombre_cliente, c.apellidos_cliente,
+                            e.num_serie, e.marca_equipo, e.modelo_equipo,
+                            u.nombre_usuario AS nombre_tecnico, u.apellidos_usuario AS apellidos_tecnico"""
+
+_JOINS_RELACIONADOS = """JOIN cat_estados es ON es.id_estado = o.id_estado
+                         JOIN cat_prioridades pr ON pr.id_prioridad = o.id_prioridad
+                         JOIN clientes c ON c.id_cliente = o.id_cliente
+                         JOIN equipos e ON e.id_equipo = o.id_equipo
+                         LEFT JOIN usuarios u ON u.id_usuario = o.tecnico_asignado"""
+
+class OrdenesRepository(BaseRepository):
+    table_name = "ordenes"
+    created_at_column = "fecha_creacion"
+    updated_at_column = "ultima_actualizacion"
+    server_defaults = {
+        "solucion_aplicada": None,
+        "fecha_entrega": None,
+        "id_estado": 1,
+        "monto_pagado": Decimal("0.00"),
+        "fecha_fin_garantia": None,
+        "es_por_garantia": 0,
+        "id_orden_origen": None,
+        "ultima_actualizacion": None,
+        "cerrado_por": None,
+        "visible": 1,
+    }
+
+    def listar_por_taller(
+        self,
+        id_taller: str,
+        pagination: PaginationParams,
+        id_estado: int | None = None,
+        id_prioridad: int | None = None,
+        tecnico_asignado: str | None = None,
+    ) -> Tuple[List[Dict[str, Any]], int | None]:
+        # Cada filtro coincide con un índice (id_taller, <filtro>, fecha_creacion), y sin filtros se usa
+        # idx_ordenes_taller_fecha_creacion. Las columnas de texto largo (diagnóstico, solución) solo
+        # se leen en el detalle de la orden.
+        base_query = f"""SELECT o.id_orden, o.num_orden, o.id_cliente, o.id_equipo, o.falla,
+                                o.id_prioridad, o.tecnico_asignado, o.id_estado,
+                                o.fecha_estimada_de_fin, o.fecha_entrega, o.costo_total, o.monto_pagado,
+                                o.saldo_pendiente, o.es_por_garantia,
+                                o.fecha_creacion, o.ultima_actualizacion,
+                                {_COLUMNAS_RELACIONADAS}
+                         FROM {self.table_name} o
+                         {_JOINS_RELACIONADOS}
+                         WHERE o.id_taller = %s AND o.visible = 1"""
+        params_list: List[Any] = [id_taller]
+        if id_estado is not None:
+            base_query += " AND o.id_estado = %s"
+            params_list.append(id_estado)
+        if id_prioridad is not None:
+            base_query += " AND o.id_prioridad = %s"
+            params_list.append(id_prioridad)
+        if tecnico_asignado is not None:
+            base_query += " AND o.tecnico_asignado = %s"
+            params_list.append(tecnico_asignado)
+        # En recepción se busca la orden por su número (usa uq_ordenes_taller_num_orden).
+        if pagination.search and pagination.search.strip().isdigit():
+            base_query += " AND o.num_orden = %s"
+            params_list.append(int(pagination.search.strip()))
+
+        columnas_permitidas = {
+            "id_orden": "o.id_orden",
+            "num_orden": "o.num_orden",
+            "id_prioridad": "o.id_prioridad",
+            "fecha_estimada_de_fin": "o.fecha_estimada_de_fin",
+            "fecha_creacion": "o.fecha_creacion",
+            "ultima_actualizacion": "o.ultima_actualizacion",
+        }
+        return self.paginate_con_total(
+            base_query=base_query,
+            params=tuple(params_list),
+            pagination=pagination,
+            columnas_permitidas=columnas_permitidas,
+            default_order="o.fecha_creacion DESC",
+            id_column="o.id_orden",
+        )
+
+    def obtener_por_id(self, id_orden: int, id_taller: str) -> OrdenDTO | None:
+        query = f"""SELECT o.*, {_COLUMNAS_RELACIONADAS}
+                    FROM {self.table_name} o
+                    {_JOINS_RELACIONADOS}
+                    WHERE o.id_orden = %s AND o.id_taller = %s AND o.visible = 1"""
+        self.execute(query, (id_orden, id_taller))
+        fila = self.cursor.fetchone()
+        return OrdenDTO(**fila) if fila else None
+
+    def obtener_para_actualizar(self, id_orden: int, id_taller: str) -> Dict[str, Any] | None:
+        """
+        Lee la orden con sus datos relacionados y la bloquea hasta el final de la transacción
+        (solo la fila de ordenes, los catálogos y el cliente no se bloquean).
+        """
+        query = f"""SELECT o.*, {_COLUMNAS_RELACIONADAS}
+                    FROM {self.table_name} o
+                    {_JOINS_RELACIONADOS}
+                    WHERE o.id_orden = %s AND o.id_taller = %s AND o.visible = 1
+                    FOR UPDATE OF o"""
+        self.execute(query, (id_orden, id_taller))
+        return self.cursor.fetchone()
+
+    def obtener_referencias(
+        self,
+        id_taller: str,
+        id_cliente: int | None = None,
+        id_equipo: int | None = None,
+        tecnico_asignado: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Comprueba en una sola consulta que el cliente, el equipo y el técnico pertenezcan al taller,
+        y obtiene los datos que se muestran junto a la orden. Los que no se indican o no pertenecen
+        al taller llegan como None (id_cliente, id_equipo, id_tecnico).
+        """
+        query = """SELECT c.id_cliente, c.nombre_cliente, c.apellidos_cliente,
+                          e.id_equipo, e.num_serie, e.marca_equipo, e.modelo_equipo,
+                          u.id_usuario AS id_tecnico, u.nombre_usuario AS nombre_tecnico,
+                          u.apellidos_usuario AS apellidos_tecnico
+                   FROM (SELECT 1) AS r
+                   LEFT JOIN clientes c ON c.id_cliente = %s AND c.id_taller = %s
+                   LEFT JOIN equipos e ON e.id_equipo = %s AND e.id_taller = %s
+                   LEFT JOIN usuarios_talleres ut ON ut.id_usuario = %s AND ut.id_taller = %s AND ut.activo = 1
+                   LEFT JOIN usuarios u ON u.id_usuario = ut.id_usuario AND u.activo = 1"""
+        self.execute(query, (id_cliente, id_taller, id_equipo, id_taller, tecnico_asignado, id_taller))
+        return self.cursor.fetchone()
+
+    def existe(self, id_orden: int, id_taller: str, bloquear: bool = False) -> bool:
+        # Con bloquear=True la fila de la orden queda bloqueada hasta el final de la transacción.
+        query = f"SELECT 1 FROM {self.table_name} WHERE id_orden = %s AND id_taller = %s AND visible = 1"
+        if bloquear:
+            query += " FOR UPDATE"
+        self.execute(query, (id_orden, id_taller))
+        return self.cursor.fetchone() is not None
+
+    def obtener_saldo(self, id_orden: int, id_taller: str, bloquear: bool = False) -> Dict[str, Any] | None:
+        # Con bloquear=True los pagos de una misma orden se registran uno detrás del otro.
+        query = f"""SELECT id_orden, num_orden, costo_total, monto_pagado, saldo_pendiente
+                    FROM {self.table_name}
+                    WHERE id_orden = %s AND id_taller = %s AND visible = 1"""
+        if bloquear:
+            query += " FOR UPDATE"
+        self.execute(query, (id_orden, id_taller))
+        return self.cursor.fetchone()
+
+    def sumar_pagado(self, id_orden: int, monto: Decimal) -> None:
+        # Mover monto_pagado no es una edición de la orden, así que ultima_actualizacion se conserva.
+        query = f"""UPDATE {self.table_name}
+                    SET monto_pagado = monto_pagado + %s, ultima_actualizacion = ultima_actualizacion
+                    WHERE id_orden = %s"""
+        self.execute(query, (monto, id_orden))
+
+    def diferencias_saldo(self, id_taller: str) -> List[Dict[str, Any]]:
+        """Órdenes cuyo monto_pagado no coincide con la suma de sus pagos no anulados."""
+        query = f"""SELECT o.id_orden, o.num_orden, o.monto_pagado, COALESCE(p.total, 0) AS pagado_real
+                    FROM {self.table_name} o
+                    LEFT JOIN (SELECT id_orden, SUM(monto) AS total FROM pagos
+                               WHERE id_taller = %s AND anulado = 0 GROUP BY id_orden) p ON p.id_orden = o.id_orden
+                    WHERE o.id_taller = %s AND o.monto_pagado <> COALESCE(p.total, 0)
+                    ORDER BY o.id_orden"""
+        self.execute(query, (id_taller, id_taller))
+        return self.cursor.fetchall()
+
+    def reconciliar_saldos(self, id_taller: str) -> int:
+        """
+        Recalcula monto_pagado (y con él saldo_pendiente) de todas las órdenes del taller a partir de pagos.
+        Solo escribe las órdenes que no cuadran. :return: Número de órdenes corregidas.
+        """
+        query = f"""UPDATE {self.table_name} o
+                    LEFT JOIN (SELECT id_orden, SUM(monto) AS total FROM pagos
+                               WHERE id_taller = %s AND anulado = 0 GROUP BY id_orden) p ON p.id_orden = o.id_orden
+                    SET o.monto_pagado = COALESCE(p.total, 0), o.ultima_actualizacion = o.ultima_actualizacion
+                    WHERE o.id_taller = %s AND o.monto_pagado <> COALESCE(p.total, 0)"""
+        self.execute(query, (id_taller, id_taller))
+        return self.cursor.rowcount
+
+    def listar_talleres_con_ordenes(self) -> List[str]:
+        self.execute(f"SELECT DISTINCT id_taller FROM {self.table_name}", ())
+        return [fila["id_taller"] for fila in self.cursor.fetchall()]
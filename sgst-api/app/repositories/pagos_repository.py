@@ -0,0 +1,27 @@
+from typing import Any, Dict, List
+from app.repositories.base_repository import BaseRepository
+
+class PagosRepository(BaseRepository):
+    table_name = "pagos"
+    created_at_column = "fecha_pago"
+    server_defaults = {"anulado": 0, "motivo_anulacion": None, "fecha_anulacion": None, "fecha_contable_anulacion": None}
+
+    def obtener_por_id(self, id_pago: int, id_taller: str) -> Dict[str, Any] | None:
+        query = f"SELECT * FROM {self.table_name} WHERE id_pago = %s AND id_taller = %s"
+        self.execute(query, (id_pago, id_taller))
+        return self.cursor.fetchone()
+
+    def listar_por_orden(self, id_orden: int, id_taller: str) -> List[Dict[str, Any]]:
+        query = f"""SELECT * FROM {self.table_name}
+                    WHERE id_orden = %s AND id_taller = %s
+                    ORDER BY fecha_pago, id_pago"""
+        self.execute(query, (id_orden, id_taller))
+        return self.cursor.fetchall()
+
+    def anular(self, id_pago: int, motivo: str, fecha_anulacion, fecha_contable_anulacion) -> int:
+        # La condición anulado = 0 hace que, de dos anulaciones simultáneas, solo una afecte la fila.
+        query = f"""UPDATE {self.table_name}
+                    SET anulado = 1, motivo_anulacion = %s, fecha_anulacion = %s, fecha_contable_anulacion = %s
+                    WHERE id_pago = %s AND anulado = 0"""
+        self.execute(query, (motivo, fecha_anulacion, fecha_contable_anulacion, id_pago))
+        return self.cursor.rowcount
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Iterable
+from app.repositories.base_repository import BaseRepository
+
+class ProductosVentaRepository(BaseRepository):
+    table_name = "productos_venta"
+
+    def bloquear_para_movimiento(self, id_taller: str, ids_producto: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Lee y bloquea (FOR UPDATE) los productos activos indicados hasta el final de la transacción.
+
+        Las filas se bloquean en orden de llave primaria: dos ventas o compras simultáneas con los mismos
+        productos los bloquean en el mismo orden, así una espera a la otra en lugar de caer en un deadlock.
+
+        :return: Diccionario id_producto -> fila. Los productos que no existen no aparecen.
+        """
+        ids = sorted(set(ids_producto))
+        if not ids:
+            return {}
+        query = f"""SELECT id_producto, nombre_producto, stock_actual, precio_venta
+                    FROM {self.table_name}
+                    WHERE id_taller = %s AND activo = 1 AND id_producto IN ({', '.join(['%s'] * len(ids))})
+                    ORDER BY id_producto
+                    FOR UPDATE"""
+        self.execute(query, (id_taller, *ids))
+        return {fila["id_producto"]: fila for fila in self.cursor.fetchall()}
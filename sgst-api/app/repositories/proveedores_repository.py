@@ -0,0 +1,11 @@
+from typing import Any, Dict
+from app.repositories.base_repository import BaseRepository
+
+class ProveedoresRepository(BaseRepository):
+    table_name = "proveedores"
+
+    def obtener_por_id(self, id_proveedor: int, id_taller: str) -> Dict[str, Any] | None:
+        query = f"""SELECT id_proveedor, nombre_proveedor FROM {self.table_name}
+                    WHERE id_proveedor = %s AND id_taller = %s AND activo = 1"""
+        self.execute(query, (id_proveedor, id_taller))
+        return self.cursor.fetchone()
@@ -0,0 +1,23 @@
+from typing import Any, Dict, Iterable
+from app.repositories.base_repository import BaseRepository
+
+class RefaccionesRepository(BaseRepository):
+    table_name = "refacciones"
+
+    def bloquear_para_movimiento(self, id_taller: str, ids_refaccion: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Lee y bloquea (FOR UPDATE) las refacciones activas indicadas, en orden de llave primaria
+        (ver ProductosVentaRepository.bloquear_para_movimiento).
+
+        :return: Diccionario id_refaccion -> fila. Las refacciones que no existen no aparecen.
+        """
+        ids = sorted(set(ids_refaccion))
+        if not ids:
+            return {}
+        query = f"""SELECT id_refaccion, nombre_refaccion, stock_actual, precio_unitario
+                    FROM {self.table_name}
+                    WHERE id_taller = %s AND activo = 1 AND id_refaccion IN ({', '.join(['%s'] * len(ids))})
+                    ORDER BY id_refaccion
+                    FOR UPDATE"""
+        self.execute(query, (id_taller, *ids))
+        return {fila["id_refaccion"]: fila for fila in self.cursor.fetchall()}
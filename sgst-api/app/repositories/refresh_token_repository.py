@@ -1,25 +1,60 @@
+from datetime import datetime
 from app.repositories.base_repository import BaseRepository
-from app.models.usuarios import UsuarioDTO
-from app.models.auth import TokensDTO, RefreshTokenBdDTO
+from app.models.auth import RefreshTokenBdDTO
 
 class RefreshTokenRepository(BaseRepository):
+    """
+    Cada fila es una sesión (familia de refresh tokens): nace en el login y cada /auth/refresh la rota en
+    el mismo lugar, reemplazando el hash del validador y guardando el anterior para detectar reúso. La
+    tabla crece con los logins, no con los refresh, y se busca siempre por su llave primaria (selector).
+    """
     table_name = "refresh_tokens"
-    
-    def existe_refresh_token(self, refresh_token: str)  -> RefreshTokenBdDTO | None:
-        query = f"""SELECT id_token, id_usuario, expira_en FROM {self.table_name} WHERE token = %s AND valido = 1"""
-        self.execute(query, (refresh_token, ))
+
+    def obtener_por_selector(self, selector: bytes) -> RefreshTokenBdDTO | None:
+        # FOR UPDATE: dos refresh simultáneos con el mismo token se atienden uno detrás del otro, así solo uno rota.
+        query = f"""SELECT selector, id_usuario, hash_validador, hash_anterior, rotado_en, expira_en, valido
+                    FROM {self.table_name}
+                    WHERE selector = %s
+                    FOR UPDATE"""
+        self.execute(query, (selector, ))
         token_bd = self.cursor.fetchone()
-        
+
         return RefreshTokenBdDTO(**token_bd) if token_bd else None
 
-    def revocar_refresh_token(self, r_token: RefreshTokenBdDTO) -> None:
-        self.update(
-            id_value=r_token.id_token,
-            id_column="id_token",
-            data={
-                "valido": 0
-            })
-        self.db.commit() # Se hace commit aqui ya que se está usando un soft delete y después tiraremos una 
-                         # excepción, al tirar una excepción se hace un rollback en la dependencia de la base de datos, 
-                         # así que confirmamos solamente esta acción.
-        
\ No newline at end of file
+    def rotar(self, selector: bytes, hash_nuevo: bytes, expira_en: datetime) -> None:
+        # MySQL aplica las asignaciones de izquierda a derecha: hash_anterior recibe el hash que se reemplaza.
+        query = f"""UPDATE {self.table_name}
+                    SET hash_anterior = hash_validador, hash_validador = %s, rotado_en = UTC_TIMESTAMP(), expira_en = %s
+                    WHERE selector = %s"""
+        self.execute(query, (hash_nuevo, expira_en, selector))
+
+    def revocar_sesion(self, selector: bytes, hash_validador: bytes | None = None) -> int:
+        # Con hash_validador solo se revoca si el validador es el vigente (cierre de sesión con la cookie del usuario).
+        query = f"UPDATE {self.table_name} SET valido = 0 WHERE selector = %s AND valido = 1"
+        params: tuple = (selector, )
+        if hash_validador is not None:
+            query += " AND hash_validador = %s"
+            params += (hash_validador, )
+        self.execute(query, params)
+        return self.cursor.rowcount
+
+    def revocar_por_usuario(self, id_usuario: str) -> int:
+        """Revoca todas las sesiones del usuario con un solo UPDATE. :return: Número de sesiones revocadas."""
+        query = f"UPDATE {self.table_name} SET valido = 0 WHERE id_usuario = %s AND valido = 1"
+        self.execute(query, (id_usuario, ))
+        return self.cursor.rowcount
+
+    def purgar_lote(self, limite: int) -> int:
+        """
+        Elimina hasta `limite` tokens revocados o expirados. Se llama en un ciclo, con un commit entre lotes,
+        para que cada DELETE bloquee pocas filas y no detenga los logins y refresh concurrentes.
+        :return: Número de filas eliminadas.
+        """
+        eliminadas = 0
+        for condicion in ("valido = 0", "expira_en < UTC_TIMESTAMP()"):
+            query = f"DELETE FROM {self.table_name} WHERE {condicion} LIMIT %s"
+            self.execute(query, (limite - eliminadas,))
+            eliminadas += self.cursor.rowcount
+            if eliminadas >= limite:
+                break
+        return eliminadas
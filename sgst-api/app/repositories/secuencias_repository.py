@@ -0,0 +1,49 @@
+from typing import Dict, Tuple
+from app.repositories.base_repository import BaseRepository
+
+class SecuenciasRepository(BaseRepository):
+    """
+    Consecutivos por taller (num_orden, num_venta) guardados en secuencias_taller.
+
+    Cada reserva es un UPDATE sobre la fila (taller, secuencia): solo se bloquea esa fila hasta el
+    commit de la transacción que la hizo, así que los talleres no se esperan entre sí. A diferencia
+    de SELECT MAX() + 1, dos transacciones simultáneas nunca obtienen el mismo número.
+    """
+    table_name = "secuencias_taller"
+
+    # Tabla y columna de cada consecutivo, usadas para continuar la numeración existente
+    # la primera vez que un taller pide un número.
+    secuencias: Dict[str, Tuple[str, str]] = {
+        "ordenes": ("ordenes", "num_orden"),
+        "ventas": ("ventas", "num_venta"),
+    }
+
+    def siguiente(self, id_taller: str, secuencia: str) -> int:
+        return self.reservar(id_taller, secuencia, 1)
+
+    def reservar(self, id_taller: str, secuencia: str, cantidad: int) -> int:
+        """
+        Reserva `cantidad` números consecutivos de la secuencia para el taller.
+
+        :return: El último número reservado; el bloque va de (ultimo - cantidad + 1) a ultimo.
+        :raises KeyError: Si la secuencia no está registrada en `secuencias`.
+        """
+        tabla, columna = self.secuencias[secuencia]
+
+        # LAST_INSERT_ID(expr) deja el nuevo valor en el paquete de respuesta del UPDATE (lastrowid),
+        # así no hace falta un SELECT adicional.
+        query = f"""UPDATE {self.table_name}
+                    SET ultimo_valor = LAST_INSERT_ID(ultimo_valor + %s)
+                    WHERE id_taller = %s AND secuencia = %s"""
+        self.execute(query, (cantidad, id_taller, secuencia))
+        if self.cursor.rowcount:
+            return self.cursor.lastrowid
+
+        # Primer número del taller. Si otra petición crea la fila al mismo tiempo, el INSERT cae en
+        # ON DUPLICATE KEY y se comporta igual que el UPDATE anterior.
+        query = f"""INSERT INTO {self.table_name} (id_taller, secuencia, ultimo_valor)
+                    SELECT %s, %s, LAST_INSERT_ID(COALESCE(MAX({columna}), 0) + %s)
+                    FROM {tabla} WHERE id_taller = %s
+                    ON DUPLICATE KEY UPDATE ultimo_valor = LAST_INSERT_ID({self.table_name}.ultimo_valor + %s)"""
+        self.execute(query, (id_taller, secuencia, cantidad, id_taller, cantidad))
+        return self.cursor.lastrowid
@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from app.repositories.base_repository import BaseRepository
+
+class EntidadSincronizable:
+    def __init__(self, tabla: str, id_column: str, columnas: List[str]):
+        self.tabla = tabla
+        self.id_column = id_column
+        self.columnas = columnas # Lo que se envía de cada fila, en este orden; la primera es el ID.
+
+# El orden importa: los tipos van antes que los equipos que los referencian.
+ENTIDADES_SINCRONIZABLES: Dict[str, EntidadSincronizable] = {
+    "tipo_equipos": EntidadSincronizable(
+        "tipo_equipos", "id_tipo",
+        ["id_tipo", "nombre_tipo", "activo", "fecha_creacion", "ultima_actualizacion"],
+    ),
+    "clientes": EntidadSincronizable(
+        "clientes", "id_cliente",
+        ["id_cliente", "nombre_cliente", "apellidos_cliente", "correo_cliente", "telefono_cliente",
+         "direccion_cliente", "notas_cliente", "fecha_creacion", "ultima_actualizacion"],
+    ),
+    "equipos": EntidadSincronizable(
+        "equipos", "id_equipo",
+        ["id_equipo", "id_tipo", "num_serie", "marca_equipo", "modelo_equipo", "descripcion_equipo",
+         "activo", "fecha_registro", "ultima_actualizacion"],
+    ),
+}
+
+class SincronizacionRepository(BaseRepository):
+    """
+    Consultas de GET /sync y registro de eliminaciones (sync_eliminaciones).
+
+    Los cambios de cada entidad se recorren por (cambio_en, id) con el índice (id_taller, cambio_en, id), así
+    cada lote es un recorrido de rango sin ordenar en memoria y continúa exactamente donde terminó el
+    anterior aunque varias filas compartan el mismo instante. MySQL llena cambio_en en cada INSERT y UPDATE
+    (DEFAULT / ON UPDATE CURRENT_TIMESTAMP(6)), igual que sync_eliminaciones.eliminado_en, así que la marca,
+    los cambios y las eliminaciones se miden con un solo reloj: el del servidor de base de datos.
+    """
+    table_name = "sync_eliminaciones"
+
+    def ahora(self) -> datetime:
+        # Reloj de MySQL, el mismo que llena cambio_en y eliminado_en (no el de la aplicación, que usa _ahora()).
+        self.execute("SELECT NOW(6) AS ahora", ())
+        return self.cursor.fetchone()["ahora"]
+
+    def cambios(self, entidad: EntidadSincronizable, id_taller: str, desde: Tuple[datetime, int], limite: int) -> List[Tuple[Any, ...]]:
+        """
+        Filas de la entidad cambiadas después de `desde` (cambio_en, id), ordenadas. Cada fila es una tupla con
+        `entidad.columnas` seguidas de cambio_en.
+        """
+        query = f"""SELECT {', '.join(entidad.columnas)}, cambio_en
+                    FROM {entidad.tabla}
+                    WHERE id_taller = %s
+                      AND (cambio_en > %s OR (cambio_en = %s AND {entidad.id_column} > %s))
+                    ORDER BY cambio_en, {entidad.id_column}
+                    LIMIT %s"""
+        momento, id_desde = desde
+        cursor = self.db.cursor() # Tuplas en lugar de diccionarios: la respuesta se arma por columnas.
+        try:
+            cursor.execute(query, (id_taller, momento, momento, id_desde, limite))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def eliminaciones(self, id_taller: str, desde: Tuple[datetime, int], limite: int) -> List[Dict[str, Any]]:
+        momento, id_desde = desde
+        query = f"""SELECT id_eliminacion, entidad, id_registro, eliminado_en
+                    FROM {self.table_name}
+                    WHERE id_taller = %s
+                      AND (eliminado_en > %s OR (eliminado_en = %s AND id_eliminacion > %s))
+                    ORDER BY eliminado_en, id_eliminacion
+                    LIMIT %s"""
+        self.execute(query, (id_taller, momento, momento, id_desde, limite))
+        return self.cursor.fetchall()
+
+    def registrar_eliminacion(self, id_taller: str, entidad: str, id_registro: int) -> None:
+        query = f"INSERT INTO {self.table_name} (id_taller, entidad, id_registro) VALUES (%s, %s, %s)"
+        self.execute(query, (id_taller, entidad, id_registro))
+
+    def purgar_lote(self, retencion_dias: int, limite: int) -> int:
+        """Elimina hasta `limite` registros de eliminación más viejos que la retención. :return: Filas eliminadas."""
+        query = f"""DELETE FROM {self.table_name}
+                    WHERE eliminado_en < NOW() - INTERVAL %s DAY
+                    ORDER BY eliminado_en
+                    LIMIT %s"""
+        self.execute(query, (retencion_dias, limite))
+        return self.cursor.rowcount
@@ -1,19 +1,42 @@
+from typing import List
 from app.repositories.base_repository import BaseRepository
 from app.models.suscripcion import SuscripcionConDetalleDTO
+from app.core.cache import cache_contexto_auth, cache_suscripciones
+from app.core.transacciones import al_confirmar
+from app.core.fechas import hoy
 
 class SuscripcionesRepository(BaseRepository):
     table_name = "suscripciones"
 
+    # Solo se guardan en caché los resultados positivos: una empresa sin suscripción puede contratarla en
+    # cualquier momento y no debe quedarse bloqueada hasta que expire el TTL.
     def obtener_suscripcion_activa_por_empresa(self, id_empresa: str) -> SuscripcionConDetalleDTO | None:
+        clave = ("suscripcion_activa", id_empresa)
+        en_cache = cache_suscripciones.obtener(clave)
+        if en_cache is not None:
+            return en_cache
+
+        generacion = cache_suscripciones.generacion()
         query = f"""SELECT id_suscripcion, id_empresa, id_licencia, fecha_inicio, fecha_fin, activa
                     FROM {self.table_name} 
                     WHERE id_empresa = %s AND activa = 1 
                     LIMIT 1"""
         self.execute(query, (id_empresa,))
         suscripcion = self.cursor.fetchone()
-        return SuscripcionConDetalleDTO(**suscripcion) if suscripcion else None
+        if not suscripcion:
+            return None
+
+        suscripcion_dto = SuscripcionConDetalleDTO(**suscripcion)
+        cache_suscripciones.guardar(clave, suscripcion_dto, generacion)
+        return suscripcion_dto
     
     def obtener_max_talleres_por_suscripcion(self, id_empresa: str) -> int:
+        clave = ("max_talleres", id_empresa)
+        en_cache = cache_suscripciones.obtener(clave)
+        if en_cache is not None:
+            return en_cache
+
+        generacion = cache_suscripciones.generacion()
         query = f"""SELECT max_talleres FROM licencias 
                     WHERE id_licencia = (SELECT id_licencia FROM {self.table_name} 
                     WHERE id_empresa = %s AND activa = 1 
@@ -21,4 +44,36 @@ class SuscripcionesRepository(BaseRepository):
         self.execute(query, (id_empresa,))
         resultado = self.cursor.fetchone()
         
-        return resultado["max_talleres"] if resultado else 0
\ No newline at end of file
+        if not resultado:
+            return 0
+
+        cache_suscripciones.guardar(clave, resultado["max_talleres"], generacion)
+        return resultado["max_talleres"]
+
+    def invalidar_cache_empresa(self, id_empresa: str) -> None:
+        """
+        Invalida la caché de la empresa cuando se confirme la transacción actual. Los contextos de autenticación
+        incluyen la suscripción de la empresa del usuario y la del taller, así que también se limpian.
+        """
+        al_confirmar(self.db, lambda: cache_suscripciones.invalidar(("suscripcion_activa", id_empresa), ("max_talleres", id_empresa)))
+        al_confirmar(self.db, cache_contexto_auth.limpiar)
+
+    def expirar_vencidas(self) -> List[str]:
+        """
+        Desactiva las suscripciones activas cuya fecha_fin ya pasó (fecha_fin es el último día válido).
+        La fecha de hoy es la del negocio, igual que al calcular fecha_fin; CURRENT_DATE sería la de UTC.
+        :return: Empresas afectadas, para invalidar su caché.
+        """
+        query = f"""SELECT id_suscripcion, id_empresa FROM {self.table_name}
+                    WHERE activa = 1 AND fecha_fin < %s
+                    FOR UPDATE"""
+        self.execute(query, (hoy(),))
+        vencidas = self.cursor.fetchall()
+        if not vencidas:
+            return []
+
+        ids = [fila["id_suscripcion"] for fila in vencidas]
+        query = f"""UPDATE {self.table_name} SET activa = 0
+                    WHERE id_suscripcion IN ({', '.join(['%s'] * len(ids))})"""
+        self.execute(query, tuple(ids))
+        return sorted({fila["id_empresa"] for fila in vencidas})
@@ -2,9 +2,17 @@ from typing import List
 from app.repositories.base_repository import BaseRepository
 from app.models.taller import TallerListaDTO
 from app.constants.roles import Roles
+from app.core.exceptions import NombreTallerRepetidoException
+from app.core.cache import cache_contexto_auth
+from app.core.transacciones import al_confirmar
 
 class TalleresRepository(BaseRepository):
     table_name = "talleres"
+    # Cubre (id_empresa, nombre_taller_activo), así que solo choca con talleres activos: el nombre de uno
+    # desactivado se puede reutilizar, igual que con la verificación previa que filtraba activo = 1.
+    unique_constraints = {
+        "uq_talleres_empresa_nombre": NombreTallerRepetidoException,
+    }
 
     def obtener_id_empresa_por_taller(self, id_taller: str) -> str | None:
         query = f"""SELECT id_empresa FROM {self.table_name} 
@@ -23,12 +31,6 @@ class TalleresRepository(BaseRepository):
         filas = self.cursor.fetchall()
         return [TallerListaDTO(**fila) for fila in filas]
 
-    def existe_nombre_taller_en_empresa(self, id_empresa: str, nombre_taller: str) -> bool:
-        query = f"""SELECT COUNT(*) as total FROM {self.table_name}
-                    WHERE id_empresa = %s AND nombre_taller = %s AND activo = 1"""
-        self.execute(query, (id_empresa, nombre_taller.strip()))
-        return self.cursor.fetchone()["total"] > 0
-
     def obtener_por_id(self, id_taller: str, id_empresa: str) -> TallerListaDTO | None:
         query = f"""SELECT id_taller, id_empresa, nombre_taller, telefono_taller,
                            correo_taller, direccion_taller, rfc_taller, ruta_logo
@@ -52,4 +54,6 @@ class TalleresUsuariosRepository(BaseRepository):
 
     def añadir_usuario_admin_al_taller(self, id_usuario: str, id_taller: str) -> None:
         query = f"""INSERT INTO {self.table_name} (id_usuario, id_taller, rol_taller) VALUES (%s, %s, %s)"""
-        self.execute(query, (id_usuario, id_taller, Roles.ADMIN))
\ No newline at end of file
+        self.execute(query, (id_usuario, id_taller, Roles.ADMIN))
+        # El usuario pudo consultar el taller antes de pertenecer a él; su contexto en caché no tendría rol.
+        al_confirmar(self.db, cache_contexto_auth.limpiar)
\ No newline at end of file
@@ -1,11 +1,19 @@
 from typing import List, Dict, Any
 from app.repositories.base_repository import BaseRepository
 from app.models.tipo_equipo import TipoEquipoDTO
+from app.core.exceptions import TipoEquipoDuplicadoException
 
 
 class TipoEquiposRepository(BaseRepository):
     table_name = "tipo_equipos"
     searchable_fields: List[str] = []
+    created_at_column = "fecha_creacion"
+    # En bases anteriores a GET /sync la agrega la migración 005_sync_cambio_en.
+    updated_at_column = "ultima_actualizacion"
+    versionada = True
+    unique_constraints = {
+        "uq_tipo_equipos_taller_nombre": lambda: TipoEquipoDuplicadoException("nombre"),
+    }
 
     def listar_por_taller(self, id_taller: str) -> List[Dict[str, Any]]:
         query = f"""SELECT * FROM {self.table_name}
@@ -20,20 +28,3 @@ class TipoEquiposRepository(BaseRepository):
         self.execute(query, (id_tipo, id_taller))
         fila = self.cursor.fetchone()
         return TipoEquipoDTO(**fila) if fila else None
-
-    def existe_nombre_en_taller(
-        self, id_taller: str, nombre_tipo: str, excluir_id_tipo: int | None = None
-    ) -> bool:
-        nombre_trim = nombre_tipo.strip() if nombre_tipo else ""
-        if not nombre_trim:
-            return False
-        if excluir_id_tipo is not None:
-            query = f"""SELECT COUNT(*) as total FROM {self.table_name}
-                       WHERE id_taller = %s AND nombre_tipo = %s AND id_tipo != %s"""
-            self.execute(query, (id_taller, nombre_trim, excluir_id_tipo))
-        else:
-            query = f"""SELECT COUNT(*) as total FROM {self.table_name}
-                       WHERE id_taller = %s AND nombre_tipo = %s"""
-            self.execute(query, (id_taller, nombre_trim))
-        resultado = self.cursor.fetchone()
-        return resultado["total"] > 0 if resultado else False
@@ -1,5 +1,10 @@
 from app.repositories.base_repository import BaseRepository
 from app.models.usuarios import UsuarioDTO
+from app.models.auth import ContextoAuthDTO
+from app.models.taller import TallerDTO
+from app.models.suscripcion import SuscripcionConDetalleDTO
+from app.core.cache import cache_contexto_auth
+from app.core.transacciones import al_confirmar
 
 class UsuariosRepository(BaseRepository):
     table_name = "usuarios"
@@ -40,6 +45,100 @@ class UsuariosRepository(BaseRepository):
         
         return UsuarioDTO(**usuario) if usuario else None
     
+    # Solo se guardan en caché los usuarios encontrados: uno inexistente o inactivo responde 401 y no debe
+    # ocupar entradas con tokens de usuarios que ya no existen.
+    def obtener_contexto_auth(self, id_usuario: str, id_taller: str | None) -> ContextoAuthDTO | None:
+        clave = (id_usuario, id_taller)
+        en_cache = cache_contexto_auth.obtener(clave)
+        if en_cache is not None:
+            return en_cache
+
+        generacion = cache_contexto_auth.generacion()
+        contexto = self._consultar_contexto_auth(id_usuario, id_taller)
+        if contexto:
+            cache_contexto_auth.guardar(clave, contexto, generacion)
+        return contexto
+
+    def invalidar_cache_contexto_auth(self) -> None:
+        """Limpia la caché de contextos de autenticación cuando se confirme la transacción actual."""
+        al_confirmar(self.db, cache_contexto_auth.limpiar)
+
+    def _consultar_contexto_auth(self, id_usuario: str, id_taller: str | None) -> ContextoAuthDTO | None:
+        # En una sola consulta se obtiene el usuario, su rol en el taller actual, la empresa dueña del taller
+        # y las suscripciones activas tanto de esa empresa como de la empresa del usuario.
+        query = f"""SELECT 
+                        u.id_usuario,
+                        u.id_empresa,
+                        u.nombre_usuario,
+                        u.apellidos_usuario,
+                        u.correo_usuario,
+                        u.telefono_usuario,
+                        u.hash_password,
+                        u.activo,
+                        ut.rol_taller,
+                        t.id_empresa AS id_empresa_taller,
+                        st.id_suscripcion AS st_id_suscripcion,
+                        st.id_licencia AS st_id_licencia,
+                        st.fecha_inicio AS st_fecha_inicio,
+                        st.fecha_fin AS st_fecha_fin,
+                        se.id_suscripcion AS se_id_suscripcion,
+                        se.id_licencia AS se_id_licencia,
+                        se.fecha_inicio AS se_fecha_inicio,
+                        se.fecha_fin AS se_fecha_fin,
+                        l.max_talleres
+                    FROM {self.table_name} u
+                    LEFT JOIN usuarios_talleres ut
+                        ON ut.id_usuario = u.id_usuario AND ut.id_taller = %s AND ut.activo = 1
+                    LEFT JOIN talleres t
+                        ON t.id_taller = %s AND t.activo = 1
+                    LEFT JOIN suscripciones st
+                        ON st.id_empresa = t.id_empresa AND st.activa = 1
+                    LEFT JOIN suscripciones se
+                        ON se.id_empresa = u.id_empresa AND se.activa = 1
+                    LEFT JOIN licencias l
+                        ON l.id_licencia = se.id_licencia
+                    WHERE u.id_usuario = %s
+                    AND u.activo = 1
+                    LIMIT 1"""
+        self.cursor.execute(query, (id_taller, id_taller, id_usuario))
+        fila = self.cursor.fetchone()
+
+        if not fila:
+            return None
+
+        usuario = UsuarioDTO(
+            id_usuario=fila["id_usuario"],
+            id_empresa=fila["id_empresa"],
+            nombre_usuario=fila["nombre_usuario"],
+            apellidos_usuario=fila["apellidos_usuario"],
+            correo_usuario=fila["correo_usuario"],
+            telefono_usuario=fila["telefono_usuario"],
+            hash_password=fila["hash_password"],
+            activo=fila["activo"],
+        )
+
+        return ContextoAuthDTO(
+            usuario=usuario,
+            id_taller_actual=id_taller,
+            taller=TallerDTO(id_taller=id_taller, rol_taller=fila["rol_taller"]) if fila["rol_taller"] else None,
+            id_empresa_taller=fila["id_empresa_taller"],
+            suscripcion_taller=self._suscripcion_desde_fila(fila, "st_", fila["id_empresa_taller"]),
+            suscripcion_empresa=self._suscripcion_desde_fila(fila, "se_", fila["id_empresa"]),
+            max_talleres=fila["max_talleres"] or 0,
+        )
+
+    def _suscripcion_desde_fila(self, fila: dict, prefijo: str, id_empresa: str | None) -> SuscripcionConDetalleDTO | None:
+        if not fila[f"{prefijo}id_suscripcion"]:
+            return None
+        return SuscripcionConDetalleDTO(
+            id_suscripcion=fila[f"{prefijo}id_suscripcion"],
+            id_empresa=id_empresa,
+            id_licencia=fila[f"{prefijo}id_licencia"],
+            fecha_inicio=fila[f"{prefijo}fecha_inicio"],
+            fecha_fin=fila[f"{prefijo}fecha_fin"],
+            activa=True,
+        )
+
     def hay_correo_repetido(self, correo_usuario: str) -> bool:
         query = f"""SELECT COUNT(*) as total FROM {self.table_name} WHERE correo_usuario = %s AND activo = 1"""
         self.execute(query, (correo_usuario,))
@@ -57,4 +156,13 @@ class UsuariosRepository(BaseRepository):
             id_value=id_usuario,
             id_column="id_usuario",
             data={"id_empresa": id_empresa}
-        )
\ No newline at end of file
+        )
+        self.invalidar_cache_contexto_auth()
+
+    def actualizar_hash_password(self, id_usuario: str, hash_password: str) -> None:
+        self.update(
+            id_value=id_usuario,
+            id_column="id_usuario",
+            data={"hash_password": hash_password}
+        )
+        self.invalidar_cache_contexto_auth()
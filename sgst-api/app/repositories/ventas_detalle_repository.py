@@ -0,0 +1,4 @@
+from app.repositories.base_repository import BaseRepository
+
+class VentasDetalleRepository(BaseRepository):
+    table_name = "ventas_detalle"
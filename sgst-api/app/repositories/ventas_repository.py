@@ -0,0 +1,5 @@
+from app.repositories.base_repository import BaseRepository
+
+class VentasRepository(BaseRepository):
+    table_name = "ventas"
+    created_at_column = "fecha_creacion"
@@ -0,0 +1,19 @@
+from typing import List
+from app.repositories.base_repository import BaseRepository
+from app.core.versiones import VersionesTaller, lector_versiones
+
+class VersionesRepository(BaseRepository):
+    """
+    Lectura de taller_versiones. Los incrementos los hace BaseRepository al escribir en una tabla versionada.
+    Una entidad sin fila todavía no ha tenido escrituras y su versión es 0.
+    """
+    table_name = "taller_versiones"
+
+    def obtener(self, id_taller: str, entidades: List[str]) -> VersionesTaller:
+        versiones = lector_versiones.leer(id_taller, lambda: self._consultar(id_taller))
+        return {entidad: versiones.get(entidad, (0, None)) for entidad in entidades}
+
+    def _consultar(self, id_taller: str) -> VersionesTaller:
+        query = f"SELECT entidad, version, actualizado_en FROM {self.table_name} WHERE id_taller = %s"
+        self.execute(query, (id_taller,))
+        return {fila["entidad"]: (fila["version"], fila["actualizado_en"]) for fila in self.cursor.fetchall()}
@@ -0,0 +1,142 @@
+from typing import Callable, TypeVar
+from anyio.to_thread import run_sync
+from fastapi import APIRouter, status, Depends, Query, Request
+from fastapi.responses import FileResponse, Response
+from app.core.almacenamiento import TIPOS_ARCHIVO, TIPOS_IMAGEN, almacenamiento
+from app.core.concurrencia import ejecutar_en_hilo
+from app.core.config import settings
+from app.core.rate_limit import clave_por_usuario, limiter
+from app.core.exceptions import LimiteImagenesRecepcionException, MiniaturaNoDisponibleException
+from app.dependencies.archivos import verificar_acceso_archivos
+from app.dependencies.database import pool_conexiones
+from app.models.auth import ContextoAuthDTO
+from app.services.archivos_service import ArchivosService
+from app.constants.roles import Roles
+
+router = APIRouter(
+    prefix="/ordenes/{id_orden}",
+    tags=["archivos"],
+)
+
+ROLES_ARCHIVOS = [Roles.ADMIN, Roles.TECNICO, Roles.RECEPCIONISTA]
+
+# El contenido nunca cambia para una misma ruta (su nombre es el hash), así que el navegador puede guardarlo sin revalidar.
+_CACHE_CONTENIDO = "private, max-age=31536000, immutable"
+
+T = TypeVar("T")
+
+def _con_servicio(operacion: Callable[[ArchivosService], T]) -> T:
+    # Conexión corta por operación, igual que en verificar_acceso_archivos.
+    with pool_conexiones.conexion() as bd:
+        return operacion(ArchivosService(bd))
+
+async def _servir(request: Request, ruta: str, tipo_contenido: str | None, miniatura: bool) -> Response:
+    if miniatura:
+        ruta_miniatura = None
+        if tipo_contenido in TIPOS_IMAGEN:
+            ruta_miniatura = await run_sync(almacenamiento.obtener_miniatura, ruta, settings.MINIATURAS_TIMEOUT)
+        if ruta_miniatura is None:
+            raise MiniaturaNoDisponibleException()
+        ruta, tipo_contenido = ruta_miniatura, "image/jpeg"
+
+    etag = almacenamiento.etag(ruta)
+    encabezados = {"etag": etag, "cache-control": _CACHE_CONTENIDO}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etiquetas = {etiqueta.strip().removeprefix("W/") for etiqueta in if_none_match.split(",")}
+        if etag in etiquetas or "*" in etiquetas:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=encabezados)
+
+    # FileResponse envía el archivo por bloques y atiende Range / If-Range (reanudar descargas, visores de PDF).
+    return FileResponse(
+        almacenamiento.ruta_absoluta(ruta),
+        media_type=tipo_contenido or "application/octet-stream",
+        headers=encabezados,
+    )
+
+@router.post("/imagenes", status_code=status.HTTP_201_CREATED)
+@limiter.limit("30/minute", key_func=clave_por_usuario)
+async def subir_imagenes_recepcion(
+    id_orden: int,
+    request: Request,
+    contexto: ContextoAuthDTO = Depends(verificar_acceso_archivos(roles_permitidos=ROLES_ARCHIVOS)),
+):
+    id_taller = contexto.taller.id_taller
+    # Se revisa antes de recibir el cuerpo, así una orden llena rechaza la subida sin leer los archivos.
+    lugares = await ejecutar_en_hilo(_con_servicio, lambda servicio: servicio.lugares_imagenes(id_orden, id_taller))
+    if lugares <= 0:
+        raise LimiteImagenesRecepcionException(0)
+
+    archivos, _ = await almacenamiento.recibir(request, {"imagenes": lugares}, TIPOS_IMAGEN)
+    imagenes = await ejecutar_en_hilo(
+        _con_servicio,
+        lambda servicio: servicio.registrar_imagenes(id_orden, archivos, id_taller, contexto.usuario.id_usuario),
+    )
+    for archivo in archivos:
+        almacenamiento.programar_miniatura(archivo.ruta)
+    return {
+        "message": f"Se han guardado {len(imagenes)} imágenes de recepción",
+        "data": imagenes,
+    }
+
+@router.get("/imagenes", status_code=status.HTTP_200_OK)
+async def listar_imagenes_recepcion(
+    id_orden: int,
+    contexto: ContextoAuthDTO = Depends(verificar_acceso_archivos(roles_permitidos=ROLES_ARCHIVOS)),
+):
+    id_taller = contexto.taller.id_taller
+    return await ejecutar_en_hilo(_con_servicio, lambda servicio: servicio.listar_imagenes(id_orden, id_taller))
+
+@router.get("/imagenes/{id_imagen}/contenido", status_code=status.HTTP_200_OK)
+async def descargar_imagen_recepcion(
+    id_orden: int,
+    id_imagen: int,
+    request: Request,
+    miniatura: bool = Query(False, description="Regresar la miniatura en lugar de la imagen original"),
+    contexto: ContextoAuthDTO = Depends(verificar_acceso_archivos(roles_permitidos=ROLES_ARCHIVOS)),
+):
+    id_taller = contexto.taller.id_taller
+    imagen = await ejecutar_en_hilo(_con_servicio, lambda servicio: servicio.obtener_imagen(id_orden, id_imagen, id_taller))
+    return await _servir(request, imagen["ruta"], imagen["tipo_contenido"], miniatura)
+
+@router.post("/archivos", status_code=status.HTTP_201_CREATED)
+@limiter.limit("30/minute", key_func=clave_por_usuario)
+async def subir_archivo(
+    id_orden: int,
+    request: Request,
+    contexto: ContextoAuthDTO = Depends(verificar_acceso_archivos(roles_permitidos=ROLES_ARCHIVOS)),
+):
+    id_taller = contexto.taller.id_taller
+    await ejecutar_en_hilo(_con_servicio, lambda servicio: servicio.verificar_orden(id_orden, id_taller))
+
+    archivos, textos = await almacenamiento.recibir(request, {"archivo": 1}, TIPOS_ARCHIVO)
+    archivo = await ejecutar_en_hilo(
+        _con_servicio,
+        lambda servicio: servicio.registrar_archivo(id_orden, archivos[0], textos.get("descripcion"), id_taller, contexto.usuario.id_usuario),
+    )
+    if archivos[0].tipo_contenido in TIPOS_IMAGEN:
+        almacenamiento.programar_miniatura(archivos[0].ruta)
+    return {
+        "message": "El archivo se ha guardado correctamente",
+        "data": archivo,
+    }
+
+@router.get("/archivos", status_code=status.HTTP_200_OK)
+async def listar_archivos(
+    id_orden: int,
+    contexto: ContextoAuthDTO = Depends(verificar_acceso_archivos(roles_permitidos=ROLES_ARCHIVOS)),
+):
+    id_taller = contexto.taller.id_taller
+    return await ejecutar_en_hilo(_con_servicio, lambda servicio: servicio.listar_archivos(id_orden, id_taller))
+
+@router.get("/archivos/{id_archivo}/contenido", status_code=status.HTTP_200_OK)
+async def descargar_archivo(
+    id_orden: int,
+    id_archivo: int,
+    request: Request,
+    miniatura: bool = Query(False, description="Regresar la miniatura (solo imágenes) en lugar del archivo"),
+    contexto: ContextoAuthDTO = Depends(verificar_acceso_archivos(roles_permitidos=ROLES_ARCHIVOS)),
+):
+    id_taller = contexto.taller.id_taller
+    archivo = await ejecutar_en_hilo(_con_servicio, lambda servicio: servicio.obtener_archivo(id_orden, id_archivo, id_taller))
+    return await _servir(request, archivo["ruta"], archivo["tipo_contenido"], miniatura)
@@ -5,6 +5,7 @@ from app.core.config import settings
 from app.core.rate_limit import limiter
 from app.models.auth import LoginDTO, RegistroDTO
 from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
 from app.services.auth_service import AuthService
 from app.services.tokens_service import TokensService
 from app.models.usuarios import UsuarioDTO
@@ -52,7 +53,7 @@ async def me(usuario: UsuarioDTO = Depends(obtener_usuario_actual)):
 async def refresh_token(request: Request, bd=Depends(obtener_conexion_bd)):
     refresh_token_cookie = request.cookies.get("refresh_token")
     tokens_service = TokensService(bd)
-    tokens = tokens_service.refresh_token(refresh_token_cookie)
+    tokens = await ejecutar_en_hilo(tokens_service.refresh_token, refresh_token_cookie)
     response = JSONResponse(content = {"message": "Token actualizado correctamente"})
 
     response.set_cookie(
@@ -73,7 +74,7 @@ async def refresh_token(request: Request, bd=Depends(obtener_conexion_bd)):
 @limiter.limit("10/minute")
 async def login(request: Request, credenciales: LoginDTO, bd=Depends(obtener_conexion_bd)):
     auth_service = AuthService(bd)
-    login_response = auth_service.login(credenciales.correo_usuario, credenciales.password_usuario)
+    login_response = await ejecutar_en_hilo(auth_service.login, credenciales.correo_usuario, credenciales.password_usuario)
     
     response = JSONResponse(
         content={
@@ -109,7 +110,7 @@ async def cerrar_sesion(request: Request, usuario: UsuarioDTO = Depends(obtener_
         response.delete_cookie("refresh_token", **cookie_params)
         
         tokens_service = TokensService(bd)
-        tokens_service.revocar_refresh_token(request.cookies.get("refresh_token"))
+        await ejecutar_en_hilo(tokens_service.revocar_refresh_token, request.cookies.get("refresh_token"))
         
     id_taller_cookie = request.cookies.get("id_taller_actual")
     # Si el usuario es administrador y no tiene un taller activo, 
@@ -121,7 +122,22 @@ async def cerrar_sesion(request: Request, usuario: UsuarioDTO = Depends(obtener_
         response.delete_cookie("refresh_token", **cookie_params)
         
         tokens_service = TokensService(bd)
-        tokens_service.revocar_refresh_token(request.cookies.get("refresh_token"))
+        await ejecutar_en_hilo(tokens_service.revocar_refresh_token, request.cookies.get("refresh_token"))
+    response.delete_cookie("id_taller_actual", **cookie_params)
+    return response
+
+@router.post("/cerrar_sesiones", status_code=status.HTTP_200_OK)
+async def cerrar_sesiones(usuario: UsuarioDTO = Depends(obtener_usuario_actual), bd=Depends(obtener_conexion_bd)):
+    # Cierra la sesión en todos los dispositivos: los access token vigentes caducan solos en 10 minutos.
+    tokens_service = TokensService(bd)
+    sesiones = await ejecutar_en_hilo(tokens_service.revocar_sesiones_usuario, usuario.id_usuario)
+    response = JSONResponse(
+        content={"message": "Se cerró la sesión en todos los dispositivos", "data": {"sesiones": sesiones}},
+        status_code=status.HTTP_200_OK,
+    )
+    cookie_params = _cookie_params()
+    response.delete_cookie("access_token", **cookie_params)
+    response.delete_cookie("refresh_token", **cookie_params)
     response.delete_cookie("id_taller_actual", **cookie_params)
     return response
 
@@ -134,7 +150,7 @@ async def elegir_taller(
     if usuario.id_empresa is None:
         raise NoEsAdministradorException()
     talleres_repository = TalleresRepository(bd)
-    id_empresa_taller = talleres_repository.obtener_id_empresa_por_taller(datos.id_taller)
+    id_empresa_taller = await ejecutar_en_hilo(talleres_repository.obtener_id_empresa_por_taller, datos.id_taller)
     if id_empresa_taller is None:
         raise TallerNoEncontradoException()
     if id_empresa_taller != usuario.id_empresa:
@@ -151,7 +167,7 @@ async def elegir_taller(
 @router.post("/login/taller", status_code=status.HTTP_200_OK)
 async def login_taller(request: Request, bd = Depends(obtener_conexion_bd)):
     auth_service = AuthService(bd)
-    taller_rol = auth_service.login_taller(request.cookies.get("access_token"))
+    taller_rol = await ejecutar_en_hilo(auth_service.login_taller, request.cookies.get("access_token"))
     
     response = JSONResponse(
         content={
@@ -172,7 +188,7 @@ async def login_taller(request: Request, bd = Depends(obtener_conexion_bd)):
 @limiter.limit("5/minute")
 async def registro(request: Request, datos: RegistroDTO, bd=Depends(obtener_conexion_bd)):
     auth_service = AuthService(bd)
-    auth_service.registro(datos)
+    await ejecutar_en_hilo(auth_service.registro, datos)
     
     return {
         "message": f"{datos.nombre_usuario} ha sido registrado correctamente"
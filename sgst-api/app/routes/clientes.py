@@ -1,5 +1,8 @@
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, File, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
+from app.core.condicional import encabezados_validacion, no_modificado, respuesta_no_modificado
 from app.dependencies.auth import obtener_usuario_actual, verificar_acceso
 from app.dependencies.pagination import pagination_params
 from app.models.usuarios import UsuarioDTO
@@ -7,6 +10,10 @@ from app.models.taller import TallerDTO
 from app.models.cliente import CrearClienteDTO, ActualizarClienteDTO
 from app.models.pagination import PaginationParams
 from app.services.clientes_service import ClientesService
+from app.services.importacion_service import ImportacionService
+from app.services.exportacion_service import ExportacionService
+from app.core.exportacion import FORMATOS_EXPORTACION
+from app.core.rate_limit import clave_por_usuario, limiter
 from app.dependencies.suscripciones import verificar_suscripcion_taller
 from app.constants.roles import Roles
 
@@ -17,6 +24,8 @@ router = APIRouter(
 
 @router.get("", status_code=status.HTTP_200_OK)
 async def listar_clientes(
+    request: Request,
+    response: Response,
     usuario: UsuarioDTO = Depends(obtener_usuario_actual), # Se verifica que el usuario tenga un access_token válido y que el usuario exista y esté activo.
     taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN, Roles.RECEPCIONISTA])), # Se verifica que el usuario pertenezca al taller actual y que sea administrador.
     _ = Depends(verificar_suscripcion_taller), # Se verifica que la suscripción del taller actual esté activa
@@ -24,9 +33,35 @@ async def listar_clientes(
     bd=Depends(obtener_conexion_bd),
 ):
     clientes_service = ClientesService(bd)
-    resultado = clientes_service.listar_clientes(taller_actual.id_taller, pagination)
+    # La versión se lee antes que las filas: si alguien escribe entre ambas consultas, el ETag queda viejo y la
+    # siguiente petición se responde completa, nunca al revés.
+    version = await ejecutar_en_hilo(clientes_service.version_clientes, taller_actual.id_taller)
+    etag = version.etag(taller_actual.id_taller, request.url.query)
+    if no_modificado(request, version, etag):
+        return respuesta_no_modificado(version, etag)
+
+    resultado = await ejecutar_en_hilo(clientes_service.listar_clientes, taller_actual.id_taller, pagination)
+    response.headers.update(encabezados_validacion(version, etag))
     return resultado
 
+# Debe declararse antes de /{id_cliente} para que "exportar" no se interprete como un ID.
+@router.get("/exportar", status_code=status.HTTP_200_OK)
+@limiter.limit("10/minute", key_func=clave_por_usuario)
+async def exportar_clientes(
+    request: Request,
+    formato: str = Query("csv", pattern="^(csv|ndjson)$"),
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN, Roles.RECEPCIONISTA])),
+    _ = Depends(verificar_suscripcion_taller),
+):
+    exportacion_service = ExportacionService()
+    contenido = exportacion_service.exportar_clientes(taller_actual.id_taller, formato)
+    return StreamingResponse(
+        contenido,
+        media_type=FORMATOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="clientes.{formato}"'},
+    )
+
 @router.get("/{id_cliente}", status_code=status.HTTP_200_OK)
 async def obtener_cliente(
     id_cliente: int,
@@ -36,7 +71,7 @@ async def obtener_cliente(
     bd=Depends(obtener_conexion_bd),
 ):
     clientes_service = ClientesService(bd)
-    cliente = clientes_service.obtener_cliente(id_cliente, taller_actual.id_taller)
+    cliente = await ejecutar_en_hilo(clientes_service.obtener_cliente, id_cliente, taller_actual.id_taller)
     return cliente
 
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -48,11 +83,24 @@ async def crear_cliente(
     bd=Depends(obtener_conexion_bd),
 ):
     clientes_service = ClientesService(bd)
-    clientes_service.crear_cliente(datos, taller_actual.id_taller)
+    await ejecutar_en_hilo(clientes_service.crear_cliente, datos, taller_actual.id_taller)
     return {
         "message": f"El cliente {datos.nombre_cliente} {datos.apellidos_cliente} se ha creado correctamente",
     }
 
+@router.post("/importar", status_code=status.HTTP_200_OK)
+@limiter.limit("10/minute", key_func=clave_por_usuario)
+async def importar_clientes(
+    request: Request,
+    archivo: UploadFile = File(..., description="Archivo .csv o .xlsx con una fila de encabezados (nombre_cliente, apellidos_cliente, correo_cliente, ...)."),
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN, Roles.RECEPCIONISTA])),
+    _ = Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    importacion_service = ImportacionService(bd)
+    return await ejecutar_en_hilo(importacion_service.importar_clientes, archivo.file, archivo.filename, taller_actual.id_taller)
+
 @router.put("/{id_cliente}", status_code=status.HTTP_200_OK)
 async def actualizar_cliente(
     id_cliente: int,
@@ -63,7 +111,7 @@ async def actualizar_cliente(
     bd=Depends(obtener_conexion_bd),
 ):
     clientes_service = ClientesService(bd)
-    clientes_service.actualizar_cliente(id_cliente, datos, taller_actual.id_taller)
+    await ejecutar_en_hilo(clientes_service.actualizar_cliente, id_cliente, datos, taller_actual.id_taller)
     return {
         "message": f"El cliente se ha actualizado correctamente"
     }
@@ -77,5 +125,5 @@ async def eliminar_cliente(
     bd=Depends(obtener_conexion_bd),
 ):
     clientes_service = ClientesService(bd)
-    clientes_service.eliminar_cliente(id_cliente, taller_actual.id_taller)
+    await ejecutar_en_hilo(clientes_service.eliminar_cliente, id_cliente, taller_actual.id_taller)
     return {"message": "El cliente se ha eliminado correctamente"}
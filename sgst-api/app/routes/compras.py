@@ -0,0 +1,45 @@
+from fastapi import APIRouter, status, Depends
+from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
+from app.dependencies.auth import obtener_usuario_actual, verificar_acceso
+from app.models.usuarios import UsuarioDTO
+from app.models.taller import TallerDTO
+from app.models.compra import CrearCompraDTO
+from app.services.compras_service import ComprasService
+from app.dependencies.suscripciones import verificar_suscripcion_taller
+from app.constants.roles import Roles
+
+router = APIRouter(
+    prefix="/compras",
+    tags=["compras"],
+)
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def registrar_compra(
+    datos: CrearCompraDTO,
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN])),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    compras_service = ComprasService(bd)
+    compra = await ejecutar_en_hilo(compras_service.registrar_compra, datos, taller_actual.id_taller, usuario.id_usuario)
+    return {
+        "message": "La compra se ha registrado correctamente",
+        "data": compra,
+    }
+
+@router.post("/{id_compra}/confirmar", status_code=status.HTTP_200_OK)
+async def confirmar_compra(
+    id_compra: int,
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN])),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    compras_service = ComprasService(bd)
+    compra = await ejecutar_en_hilo(compras_service.confirmar_compra, id_compra, taller_actual.id_taller, usuario.id_usuario)
+    return {
+        "message": "La compra se ha confirmado correctamente",
+        "data": compra,
+    }
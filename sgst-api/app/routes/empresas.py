@@ -2,6 +2,7 @@ from fastapi import APIRouter, status, Depends
 from fastapi.responses import JSONResponse
 from app.core.config import settings
 from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
 from app.dependencies.auth import obtener_usuario_actual
 from app.models.usuarios import UsuarioDTO
 from app.models.empresa import CrearEmpresaDTO
@@ -27,7 +28,7 @@ async def crear_empresa(
     bd = Depends(obtener_conexion_bd),
 ):
     empresas_service = EmpresasService(bd)
-    tokens = empresas_service.crear_empresa(datos, usuario)
+    tokens = await ejecutar_en_hilo(empresas_service.crear_empresa, datos, usuario)
 
     response = JSONResponse(
         status_code=status.HTTP_201_CREATED,
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, status, Depends, Query
+from fastapi import APIRouter, status, Depends, Query, File, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
+from app.core.condicional import encabezados_validacion, no_modificado, respuesta_no_modificado
 from app.dependencies.auth import obtener_usuario_actual, verificar_acceso
 from app.dependencies.pagination import pagination_params
 from app.models.usuarios import UsuarioDTO
@@ -9,6 +12,10 @@ from app.models.tipo_equipo import CrearTipoEquipoDTO, ActualizarTipoEquipoDTO
 from app.models.pagination import PaginationParams
 from app.services.equipos_service import EquiposService
 from app.services.tipo_equipos_service import TipoEquiposService
+from app.services.importacion_service import ImportacionService
+from app.services.exportacion_service import ExportacionService
+from app.core.exportacion import FORMATOS_EXPORTACION
+from app.core.rate_limit import clave_por_usuario, limiter
 from app.dependencies.suscripciones import verificar_suscripcion_taller
 from app.constants.roles import Roles
 
@@ -21,13 +28,22 @@ router = APIRouter(
 
 @router.get("/tipos", status_code=status.HTTP_200_OK)
 async def listar_tipos_equipo(
+    request: Request,
+    response: Response,
     usuario: UsuarioDTO = Depends(obtener_usuario_actual),
     taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN])),
     _=Depends(verificar_suscripcion_taller),
     bd=Depends(obtener_conexion_bd),
 ):
     tipo_equipos_service = TipoEquiposService(bd)
-    return tipo_equipos_service.listar_tipos(taller_actual.id_taller)
+    version = await ejecutar_en_hilo(tipo_equipos_service.version_tipos, taller_actual.id_taller)
+    etag = version.etag(taller_actual.id_taller)
+    if no_modificado(request, version, etag):
+        return respuesta_no_modificado(version, etag)
+
+    tipos = await ejecutar_en_hilo(tipo_equipos_service.listar_tipos, taller_actual.id_taller)
+    response.headers.update(encabezados_validacion(version, etag))
+    return tipos
 
 @router.post("/tipos", status_code=status.HTTP_201_CREATED)
 async def crear_tipo_equipo(
@@ -38,7 +54,7 @@ async def crear_tipo_equipo(
     bd=Depends(obtener_conexion_bd),
 ):
     tipo_equipos_service = TipoEquiposService(bd)
-    tipo_equipos_service.crear_tipo(datos, taller_actual.id_taller)
+    await ejecutar_en_hilo(tipo_equipos_service.crear_tipo, datos, taller_actual.id_taller)
     return {"message": f"Tipo de equipo {datos.nombre_tipo} creado correctamente"}
 
 @router.put("/tipos/{id_tipo}", status_code=status.HTTP_200_OK)
@@ -51,7 +67,7 @@ async def actualizar_tipo_equipo(
     bd=Depends(obtener_conexion_bd),
 ):
     tipo_equipos_service = TipoEquiposService(bd)
-    tipo_equipos_service.actualizar_tipo(id_tipo, datos, taller_actual.id_taller)
+    await ejecutar_en_hilo(tipo_equipos_service.actualizar_tipo, id_tipo, datos, taller_actual.id_taller)
     return {"message": f"Tipo de equipo {datos.nombre_tipo} actualizado correctamente"}
 
 @router.delete("/tipos/{id_tipo}", status_code=status.HTTP_200_OK)
@@ -63,13 +79,15 @@ async def eliminar_tipo_equipo(
     bd=Depends(obtener_conexion_bd),
 ):
     tipo_equipos_service = TipoEquiposService(bd)
-    tipo_equipos_service.eliminar_tipo(id_tipo, taller_actual.id_taller)
+    await ejecutar_en_hilo(tipo_equipos_service.eliminar_tipo, id_tipo, taller_actual.id_taller)
     return {"message": "Tipo de equipo eliminado correctamente"}
 
 # ----- Equipos -----
 
 @router.get("", status_code=status.HTTP_200_OK)
 async def listar_equipos(
+    request: Request,
+    response: Response,
     usuario: UsuarioDTO = Depends(obtener_usuario_actual),
     taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN])),
     _=Depends(verificar_suscripcion_taller),
@@ -78,11 +96,36 @@ async def listar_equipos(
     bd=Depends(obtener_conexion_bd),
 ):
     equipos_service = EquiposService(bd)
-    resultado = equipos_service.listar_equipos(
-        taller_actual.id_taller, pagination, id_tipo=id_tipo
+    # Igual que en /clientes: la versión se lee antes que las filas.
+    version = await ejecutar_en_hilo(equipos_service.version_equipos, taller_actual.id_taller)
+    etag = version.etag(taller_actual.id_taller, request.url.query)
+    if no_modificado(request, version, etag):
+        return respuesta_no_modificado(version, etag)
+
+    resultado = await ejecutar_en_hilo(
+        equipos_service.listar_equipos, taller_actual.id_taller, pagination, id_tipo=id_tipo
     )
+    response.headers.update(encabezados_validacion(version, etag))
     return resultado
 
+# Debe declararse antes de /{id_equipo} para que "exportar" no se interprete como un ID.
+@router.get("/exportar", status_code=status.HTTP_200_OK)
+@limiter.limit("10/minute", key_func=clave_por_usuario)
+async def exportar_equipos(
+    request: Request,
+    formato: str = Query("csv", pattern="^(csv|ndjson)$"),
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN])),
+    _=Depends(verificar_suscripcion_taller),
+):
+    exportacion_service = ExportacionService()
+    contenido = exportacion_service.exportar_equipos(taller_actual.id_taller, formato)
+    return StreamingResponse(
+        contenido,
+        media_type=FORMATOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="equipos.{formato}"'},
+    )
+
 @router.get("/{id_equipo}", status_code=status.HTTP_200_OK)
 async def obtener_equipo(
     id_equipo: int,
@@ -92,7 +135,7 @@ async def obtener_equipo(
     bd=Depends(obtener_conexion_bd),
 ):
     equipos_service = EquiposService(bd)
-    equipo = equipos_service.obtener_equipo(id_equipo, taller_actual.id_taller)
+    equipo = await ejecutar_en_hilo(equipos_service.obtener_equipo, id_equipo, taller_actual.id_taller)
     return equipo
 
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -104,9 +147,22 @@ async def crear_equipo(
     bd=Depends(obtener_conexion_bd),
 ):
     equipos_service = EquiposService(bd)
-    equipos_service.crear_equipo(datos, taller_actual.id_taller)
+    await ejecutar_en_hilo(equipos_service.crear_equipo, datos, taller_actual.id_taller)
     return {"message": f"Equipo {datos.num_serie} creado correctamente"}
 
+@router.post("/importar", status_code=status.HTTP_200_OK)
+@limiter.limit("10/minute", key_func=clave_por_usuario)
+async def importar_equipos(
+    request: Request,
+    archivo: UploadFile = File(..., description="Archivo .csv o .xlsx con una fila de encabezados (num_serie, id_tipo o nombre_tipo, marca_equipo, ...)."),
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN])),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    importacion_service = ImportacionService(bd)
+    return await ejecutar_en_hilo(importacion_service.importar_equipos, archivo.file, archivo.filename, taller_actual.id_taller)
+
 @router.put("/{id_equipo}", status_code=status.HTTP_200_OK)
 async def actualizar_equipo(
     id_equipo: int,
@@ -117,7 +173,7 @@ async def actualizar_equipo(
     bd=Depends(obtener_conexion_bd),
 ):
     equipos_service = EquiposService(bd)
-    equipos_service.actualizar_equipo(id_equipo, datos, taller_actual.id_taller)
+    await ejecutar_en_hilo(equipos_service.actualizar_equipo, id_equipo, datos, taller_actual.id_taller)
     return {"message": f"Equipo {datos.num_serie} actualizado correctamente"}
 
 @router.delete("/{id_equipo}", status_code=status.HTTP_200_OK)
@@ -129,5 +185,5 @@ async def eliminar_equipo(
     bd=Depends(obtener_conexion_bd),
 ):
     equipos_service = EquiposService(bd)
-    equipos_service.eliminar_equipo(id_equipo, taller_actual.id_taller)
+    await ejecutar_en_hilo(equipos_service.eliminar_equipo, id_equipo, taller_actual.id_taller)
     return {"message": "Equipo eliminado correctamente"}
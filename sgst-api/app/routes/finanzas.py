@@ -0,0 +1,28 @@
+from datetime import date
+from fastapi import APIRouter, status, Depends, Query
+from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
+from app.dependencies.auth import obtener_usuario_actual, verificar_acceso
+from app.models.usuarios import UsuarioDTO
+from app.models.taller import TallerDTO
+from app.services.finanzas_service import FinanzasService
+from app.dependencies.suscripciones import verificar_suscripcion_taller
+from app.constants.roles import Roles
+
+router = APIRouter(
+    prefix="/finanzas",
+    tags=["finanzas"],
+)
+
+@router.get("/resumen", status_code=status.HTTP_200_OK)
+async def obtener_resumen(
+    desde: date = Query(..., description="Fecha inicial (incluida)"),
+    hasta: date = Query(..., description="Fecha final (incluida)"),
+    agrupar: str = Query("dia", pattern="^(dia|mes)$"),
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN])),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    finanzas_service = FinanzasService(bd)
+    return await ejecutar_en_hilo(finanzas_service.obtener_resumen, taller_actual.id_taller, desde, hasta, agrupar)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, status, Depends, Query
+from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
+from app.dependencies.auth import obtener_usuario_actual, verificar_acceso
+from app.models.usuarios import UsuarioDTO
+from app.models.taller import TallerDTO
+from app.services.inventario_service import InventarioService
+from app.dependencies.suscripciones import verificar_suscripcion_taller
+from app.constants.roles import Roles
+
+router = APIRouter(
+    prefix="/inventario",
+    tags=["inventario"],
+)
+
+@router.get("/bajo-stock", status_code=status.HTTP_200_OK)
+async def listar_bajo_stock(
+    tipo: str | None = Query(None, pattern="^(refaccion|producto_venta)$", description="Filtrar por tipo de artículo"),
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN, Roles.TECNICO])),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    inventario_service = InventarioService(bd)
+    return await ejecutar_en_hilo(inventario_service.listar_bajo_stock, taller_actual.id_taller, tipo)
@@ -0,0 +1,98 @@
+from fastapi import APIRouter, status, Depends, Query
+from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
+from app.dependencies.auth import obtener_usuario_actual, verificar_acceso
+from app.dependencies.pagination import pagination_params
+from app.models.usuarios import UsuarioDTO
+from app.models.taller import TallerDTO
+from app.models.orden import CrearOrdenDTO, ActualizarOrdenDTO
+from app.models.pagination import PaginationParams
+from app.services.ordenes_service import OrdenesService
+from app.dependencies.suscripciones import verificar_suscripcion_taller
+from app.constants.roles import Roles
+
+router = APIRouter(
+    prefix="/ordenes",
+    tags=["ordenes"],
+)
+
+ROLES_ORDENES = [Roles.ADMIN, Roles.TECNICO, Roles.RECEPCIONISTA]
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def listar_ordenes(
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=ROLES_ORDENES)),
+    _=Depends(verificar_suscripcion_taller),
+    pagination: PaginationParams = Depends(pagination_params),
+    id_estado: int | None = Query(None, description="Filtrar por estado de la orden"),
+    id_prioridad: int | None = Query(None, description="Filtrar por prioridad"),
+    tecnico: str | None = Query(None, description="Filtrar por técnico asignado (id_usuario)"),
+    bd=Depends(obtener_conexion_bd),
+):
+    ordenes_service = OrdenesService(bd)
+    resultado = await ejecutar_en_hilo(
+        ordenes_service.listar_ordenes,
+        taller_actual.id_taller,
+        pagination,
+        id_estado=id_estado,
+        id_prioridad=id_prioridad,
+        tecnico_asignado=tecnico,
+    )
+    return resultado
+
+@router.get("/{id_orden}", status_code=status.HTTP_200_OK)
+async def obtener_orden(
+    id_orden: int,
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=ROLES_ORDENES)),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    ordenes_service = OrdenesService(bd)
+    orden = await ejecutar_en_hilo(ordenes_service.obtener_orden, id_orden, taller_actual.id_taller)
+    return orden
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def crear_orden(
+    datos: CrearOrdenDTO,
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=ROLES_ORDENES)),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    ordenes_service = OrdenesService(bd)
+    orden = await ejecutar_en_hilo(ordenes_service.crear_orden, datos, taller_actual.id_taller, usuario.id_usuario)
+    return {
+        "message": f"La orden {orden.num_orden} se ha creado correctamente",
+        "data": orden,
+    }
+
+@router.put("/{id_orden}", status_code=status.HTTP_200_OK)
+async def actualizar_orden(
+    id_orden: int,
+    datos: ActualizarOrdenDTO,
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=ROLES_ORDENES)),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    ordenes_service = OrdenesService(bd)
+    orden = await ejecutar_en_hilo(
+        ordenes_service.actualizar_orden, id_orden, datos, taller_actual.id_taller, usuario.id_usuario
+    )
+    return {
+        "message": f"La orden {orden.num_orden} se ha actualizado correctamente",
+        "data": orden,
+    }
+
+@router.delete("/{id_orden}", status_code=status.HTTP_200_OK)
+async def eliminar_orden(
+    id_orden: int,
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN])),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    ordenes_service = OrdenesService(bd)
+    await ejecutar_en_hilo(ordenes_service.eliminar_orden, id_orden, taller_actual.id_taller)
+    return {"message": "La orden se ha eliminado correctamente"}
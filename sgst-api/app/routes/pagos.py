@@ -0,0 +1,59 @@
+from fastapi import APIRouter, status, Depends, Query
+from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
+from app.dependencies.auth import obtener_usuario_actual, verificar_acceso
+from app.models.usuarios import UsuarioDTO
+from app.models.taller import TallerDTO
+from app.models.pago import AnularPagoDTO, CrearPagoDTO
+from app.services.pagos_service import PagosService
+from app.dependencies.suscripciones import verificar_suscripcion_taller
+from app.constants.roles import Roles
+
+router = APIRouter(
+    prefix="/pagos",
+    tags=["pagos"],
+)
+
+ROLES_PAGOS = [Roles.ADMIN, Roles.RECEPCIONISTA]
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def listar_pagos(
+    id_orden: int = Query(..., description="Orden de la que se listan los pagos"),
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=ROLES_PAGOS)),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    pagos_service = PagosService(bd)
+    return await ejecutar_en_hilo(pagos_service.listar_pagos, id_orden, taller_actual.id_taller)
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def registrar_pago(
+    datos: CrearPagoDTO,
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=ROLES_PAGOS)),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    pagos_service = PagosService(bd)
+    resultado = await ejecutar_en_hilo(pagos_service.registrar_pago, datos, taller_actual.id_taller, usuario.id_usuario)
+    return {
+        "message": f"El pago se ha registrado en la orden {resultado.saldo.num_orden}",
+        "data": resultado,
+    }
+
+@router.post("/{id_pago}/anular", status_code=status.HTTP_200_OK)
+async def anular_pago(
+    id_pago: int,
+    datos: AnularPagoDTO,
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN])),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    pagos_service = PagosService(bd)
+    resultado = await ejecutar_en_hilo(pagos_service.anular_pago, id_pago, datos, taller_actual.id_taller)
+    return {
+        "message": "El pago se ha anulado correctamente",
+        "data": resultado,
+    }
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, status, Depends, Query, Request
+from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
+from app.core.rate_limit import clave_por_usuario, limiter
+from app.dependencies.auth import obtener_usuario_actual, verificar_acceso
+from app.models.usuarios import UsuarioDTO
+from app.models.taller import TallerDTO
+from app.services.sincronizacion_service import SincronizacionService
+from app.dependencies.suscripciones import verificar_suscripcion_taller
+from app.constants.roles import Roles
+
+router = APIRouter(
+    prefix="/sync",
+    tags=["sincronizacion"],
+)
+
+@router.get("", status_code=status.HTTP_200_OK)
+@limiter.limit("120/minute", key_func=clave_por_usuario)
+async def sincronizar(
+    request: Request,
+    since: str | None = Query(None, description="Marca recibida en la sincronización anterior; sin ella se envía todo."),
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN, Roles.RECEPCIONISTA])),
+    _ = Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    # Mientras "hay_mas" sea verdadero, el cliente vuelve a llamar con la marca recibida. Con "reiniciar" debe
+    # descartar su copia local antes de aplicar la respuesta.
+    sincronizacion_service = SincronizacionService(bd)
+    return await ejecutar_en_hilo(sincronizacion_service.sincronizar, taller_actual.id_taller, since)
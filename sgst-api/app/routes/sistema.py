@@ -0,0 +1,34 @@
+import hmac
+from fastapi import APIRouter, Header, status
+from app.core.config import settings
+from app.dependencies.database import pool_conexiones
+from app.core.concurrencia import estadisticas_hilos
+from app.core.cache import estadisticas_caches
+from app.core.hashing import pool_hashing
+from app.services.secuencias_service import bloques_secuencias
+from app.services.mantenimiento_service import ejecutor_tareas
+from app.core.almacenamiento import almacenamiento
+from app.core.versiones import lector_versiones
+
+router = APIRouter(
+    prefix="/sistema",
+    tags=["sistema"],
+)
+
+@router.get("/salud", status_code=status.HTTP_200_OK)
+async def salud(x_token_salud: str | None = Header(None)):
+    # Sin autenticación solo se confirma que el proceso responde (balanceadores, monitoreo básico). Las
+    # estadísticas internas requieren SALUD_TOKEN; si no está configurado nunca se exponen.
+    if not settings.SALUD_TOKEN or not x_token_salud or not hmac.compare_digest(x_token_salud, settings.SALUD_TOKEN):
+        return {"estado": "ok"}
+    return {
+        "estado": "ok",
+        "pool_conexiones": pool_conexiones.estadisticas(),
+        "hilos_bd": estadisticas_hilos(),
+        "caches": estadisticas_caches(),
+        "hashing": pool_hashing.estadisticas(),
+        "secuencias": bloques_secuencias.estadisticas(),
+        "tareas": ejecutor_tareas.estadisticas(),
+        "almacenamiento": almacenamiento.estadisticas(),
+        "versiones": lector_versiones.estadisticas(),
+    }
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, status, Depends, Request
+from fastapi import APIRouter, status, Depends, Request, Response
 from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
+from app.core.condicional import encabezados_validacion, no_modificado, respuesta_no_modificado
 from app.dependencies.auth import obtener_usuario_actual
 from app.models.usuarios import UsuarioDTO
 from app.models.suscripcion import CrearSuscripcionDTO
@@ -18,17 +20,25 @@ async def verificar_suscripcion(
 ):
     id_taller_actual = request.cookies.get("id_taller_actual")
     suscripciones_service = SuscripcionesService(bd)
-    verificacion = suscripciones_service.verificar_suscripcion(usuario, id_taller_actual)
+    verificacion = await ejecutar_en_hilo(suscripciones_service.verificar_suscripcion, usuario, id_taller_actual)
 
     return verificacion
 
 @router.get("/licencias", status_code=status.HTTP_200_OK)
 async def listar_licencias(
+    request: Request,
+    response: Response,
     usuario: UsuarioDTO = Depends(obtener_usuario_actual),
     bd = Depends(obtener_conexion_bd),
 ):
     suscripciones_service = SuscripcionesService(bd)
-    licencias = suscripciones_service.listar_licencias()
+    version = await ejecutar_en_hilo(suscripciones_service.version_licencias)
+    etag = version.etag()
+    if no_modificado(request, version, etag):
+        return respuesta_no_modificado(version, etag)
+
+    licencias = await ejecutar_en_hilo(suscripciones_service.listar_licencias)
+    response.headers.update(encabezados_validacion(version, etag))
 
     return licencias
 
@@ -39,6 +49,6 @@ async def crear_suscripcion(
     bd = Depends(obtener_conexion_bd),
 ):
     suscripciones_service = SuscripcionesService(bd)
-    suscripcion = suscripciones_service.crear_suscripcion(usuario, datos.precio_mensual)
+    suscripcion = await ejecutar_en_hilo(suscripciones_service.crear_suscripcion, usuario, datos.precio_mensual)
 
     return {"message": "Se ha activado tu suscripción correctamente, ¡Te agradecemos por confiar en nosotros! Disfruta de SGST."}
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, status, Depends
 from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
 from app.dependencies.auth import obtener_usuario_actual, obtener_taller_actual
 from app.models.usuarios import UsuarioDTO
 from app.models.taller import CrearTallerDTO, TallerDTO
@@ -18,7 +19,7 @@ async def listar_talleres_de_empresa(
     bd=Depends(obtener_conexion_bd),
 ):
     talleres_service = TalleresService(bd)
-    talleres = talleres_service.listar_por_empresa(usuario)
+    talleres = await ejecutar_en_hilo(talleres_service.listar_por_empresa, usuario)
     return talleres
 
 @router.get("/{id_taller}", status_code=status.HTTP_200_OK)
@@ -34,7 +35,7 @@ async def obtener_taller_por_id(
         raise UsuarioNoPerteneceAlTallerException()
     
     talleres_service = TalleresService(bd)
-    taller = talleres_service.obtener_taller_por_id(id_taller)
+    taller = await ejecutar_en_hilo(talleres_service.obtener_taller_por_id, id_taller)
     return taller
 
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -44,5 +45,5 @@ async def crear_taller(
     bd=Depends(obtener_conexion_bd),
 ):
     talleres_service = TalleresService(bd)
-    talleres_service.crear_taller(datos, usuario)
+    await ejecutar_en_hilo(talleres_service.crear_taller, datos, usuario)
     return {"message": f"El taller {datos.nombre_taller} se ha creado correctamente"}
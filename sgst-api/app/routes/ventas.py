@@ -0,0 +1,30 @@
+from fastapi import APIRouter, status, Depends
+from app.dependencies.database import obtener_conexion_bd
+from app.core.concurrencia import ejecutar_en_hilo
+from app.dependencies.auth import obtener_usuario_actual, verificar_acceso
+from app.models.usuarios import UsuarioDTO
+from app.models.taller import TallerDTO
+from app.models.venta import CrearVentaDTO
+from app.services.ventas_service import VentasService
+from app.dependencies.suscripciones import verificar_suscripcion_taller
+from app.constants.roles import Roles
+
+router = APIRouter(
+    prefix="/ventas",
+    tags=["ventas"],
+)
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def registrar_venta(
+    datos: CrearVentaDTO,
+    usuario: UsuarioDTO = Depends(obtener_usuario_actual),
+    taller_actual: TallerDTO = Depends(verificar_acceso(roles_permitidos=[Roles.ADMIN, Roles.RECEPCIONISTA])),
+    _=Depends(verificar_suscripcion_taller),
+    bd=Depends(obtener_conexion_bd),
+):
+    ventas_service = VentasService(bd)
+    venta = await ejecutar_en_hilo(ventas_service.registrar_venta, datos, taller_actual.id_taller, usuario.id_usuario)
+    return {
+        "message": f"La venta {venta.num_venta} se ha registrado correctamente",
+        "data": venta,
+    }
@@ -0,0 +1,101 @@
+from typing import Any, Dict, List
+from app.core.almacenamiento import ArchivoSubido
+from app.models.archivo import ArchivoDTO, ImagenRecepcionDTO
+from app.repositories.archivos_repository import ArchivosRepository
+from app.repositories.imagenes_recepcion_repository import ImagenesRecepcionRepository
+from app.repositories.ordenes_repository import OrdenesRepository
+from app.core.exceptions import (
+    ArchivoNoEncontradoException,
+    LimiteImagenesRecepcionException,
+    OrdenNoEncontradaException,
+    TallerNoEspecificadoException,
+)
+
+# Coincide con el CHECK de orden_imagen y con trg_validar_max_imagenes_recepcion.
+MAX_IMAGENES_RECEPCION = 3
+
+class ArchivosService:
+    """
+    Registros de archivos e imágenes de recepción de las órdenes.
+
+    Los bytes ya están en el almacenamiento cuando se llama a este servicio (ver app/core/almacenamiento.py);
+    aquí solo se guardan las filas que los ligan a la orden. Si la transacción falla, el archivo queda en disco
+    sin registro, lo cual es inofensivo: está direccionado por contenido y la siguiente subida igual lo reutiliza.
+    """
+
+    def __init__(self, bd):
+        self.bd = bd
+        self.archivos_repository = ArchivosRepository(self.bd)
+        self.imagenes_repository = ImagenesRecepcionRepository(self.bd)
+        self.ordenes_repository = OrdenesRepository(self.bd)
+
+    def lugares_imagenes(self, id_orden: int, id_taller: str) -> int:
+        """Cuántas imágenes de recepción admite todavía la orden. Se consulta antes de recibir la subida."""
+        self.verificar_orden(id_orden, id_taller)
+        return MAX_IMAGENES_RECEPCION - len(self.imagenes_repository.lugares_ocupados(id_orden))
+
+    def verificar_orden(self, id_orden: int, id_taller: str, bloquear: bool = False) -> None:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        if not self.ordenes_repository.existe(id_orden, id_taller, bloquear=bloquear):
+            raise OrdenNoEncontradaException()
+
+    def registrar_imagenes(self, id_orden: int, archivos: List[ArchivoSubido], id_taller: str, id_usuario: str) -> List[ImagenRecepcionDTO]:
+        # La orden se bloquea para que dos subidas simultáneas no tomen el mismo lugar (UNIQUE id_orden, orden_imagen).
+        self.verificar_orden(id_orden, id_taller, bloquear=True)
+        ocupados = set(self.imagenes_repository.lugares_ocupados(id_orden))
+        libres = [lugar for lugar in range(1, MAX_IMAGENES_RECEPCION + 1) if lugar not in ocupados]
+        if len(archivos) > len(libres):
+            raise LimiteImagenesRecepcionException(len(libres))
+
+        imagenes = []
+        for lugar, archivo in zip(libres, archivos):
+            imagen = self.imagenes_repository.create_returning({
+                "id_orden": id_orden,
+                "ruta_imagen": archivo.ruta,
+                "tipo_contenido": archivo.tipo_contenido,
+                "tamano_bytes": archivo.tamano,
+                "orden_imagen": lugar,
+                "subido_por": id_usuario,
+            }, "id_imagen")
+            imagenes.append(ImagenRecepcionDTO(**imagen))
+        return imagenes
+
+    def listar_imagenes(self, id_orden: int, id_taller: str) -> List[ImagenRecepcionDTO]:
+        self.verificar_orden(id_orden, id_taller)
+        return [ImagenRecepcionDTO(**imagen) for imagen in self.imagenes_repository.listar_por_orden(id_orden)]
+
+    def obtener_imagen(self, id_orden: int, id_imagen: int, id_taller: str) -> Dict[str, Any]:
+        """:return: Ruta en el almacenamiento y tipo de contenido de la imagen."""
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        imagen = self.imagenes_repository.obtener_por_id(id_imagen, id_orden, id_taller)
+        if not imagen:
+            raise ArchivoNoEncontradoException()
+        return {"ruta": imagen["ruta_imagen"], "tipo_contenido": imagen["tipo_contenido"]}
+
+    def registrar_archivo(self, id_orden: int, archivo: ArchivoSubido, descripcion: str | None, id_taller: str, id_usuario: str) -> ArchivoDTO:
+        self.verificar_orden(id_orden, id_taller)
+        fila = self.archivos_repository.create_returning({
+            "id_orden": id_orden,
+            "ruta_archivo": archivo.ruta,
+            "tipo_archivo": archivo.tipo_contenido,
+            "nombre_original": (archivo.nombre_original or "")[:255] or None,
+            "tamano_bytes": archivo.tamano,
+            "descripcion": descripcion.strip() if descripcion and descripcion.strip() else None,
+            "subido_por": id_usuario,
+        }, "id_archivo")
+        return ArchivoDTO(**fila)
+
+    def listar_archivos(self, id_orden: int, id_taller: str) -> List[ArchivoDTO]:
+        self.verificar_orden(id_orden, id_taller)
+        return [ArchivoDTO(**archivo) for archivo in self.archivos_repository.listar_por_orden(id_orden)]
+
+    def obtener_archivo(self, id_orden: int, id_archivo: int, id_taller: str) -> Dict[str, Any]:
+        """:return: Ruta en el almacenamiento y tipo de contenido del archivo."""
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        archivo = self.archivos_repository.obtener_por_id(id_archivo, id_orden, id_taller)
+        if not archivo:
+            raise ArchivoNoEncontradoException()
+        return {"ruta": archivo["ruta_archivo"], "tipo_contenido": archivo["tipo_archivo"]}
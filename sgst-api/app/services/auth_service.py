@@ -6,9 +6,12 @@ from app.models.auth import LoginResponseDTO, RegistroDTO
 from app.core.security import decodificar_token
 from app.repositories.usuarios_talleres_repository import UsuariosTalleresRepository
 from app.models.taller import TallerRolDTO
-import bcrypt
+from app.core.hashing import hashear_password, verificar_password, necesita_rehash, pool_hashing
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 class AuthService:
     def __init__(self, bd):
         self.bd = bd
@@ -26,11 +29,24 @@ class AuthService:
             # no debe de saber que está desactivado, solamente hay que decirle que no existe.
             raise UsuarioNoEncontradoException() 
         
-        if not bcrypt.checkpw(password_usuario.encode('utf-8'), usuario.hash_password.encode('utf-8')):
+        if not verificar_password(password_usuario, usuario.hash_password):
             raise CredencialesIncorrectasException()
         
+        if necesita_rehash(usuario.hash_password):
+            self.actualizar_costo_hash(usuario, password_usuario)
+        
         return usuario
     
+    def actualizar_costo_hash(self, usuario: UsuarioDTO, password_usuario: str) -> None:
+        # La contraseña en claro solo está disponible al iniciar sesión, así que es el único momento
+        # en que se puede regenerar un hash creado con un costo anterior. Si falla, el login sigue.
+        try:
+            nuevo_hash = hashear_password(password_usuario)
+            self.usuarios_repository.actualizar_hash_password(usuario.id_usuario, nuevo_hash)
+            pool_hashing.registrar_rehash()
+        except Exception as e:
+            logger.warning(f"No se pudo actualizar el hash del usuario {usuario.id_usuario}: {e}")
+    
     def login(self, correo_usuario: str, password_usuario: str) -> LoginResponseDTO:
         if not correo_usuario or not password_usuario:
             raise CamposIncompletosException()
@@ -75,7 +91,7 @@ class AuthService:
     
     def registro(self, datos: RegistroDTO) -> None:
         self.verificar_datos_registro(datos)
-        hash_password = bcrypt.hashpw(datos.password_usuario.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hash_password = hashear_password(datos.password_usuario)
         id_usuario = str(uuid.uuid4())
 
         self.usuarios_repository.create(data={
@@ -2,19 +2,23 @@ from typing import Dict, Any
 from app.models.cliente import CrearClienteDTO, ActualizarClienteDTO, ClienteDTO
 from app.models.pagination import PaginationParams
 from app.repositories.clientes_repository import ClientesRepository
-from app.core.exceptions import ClienteNoEncontradoException, ClienteDuplicadoException, TallerNoEspecificadoException
+from app.repositories.sincronizacion_repository import SincronizacionRepository
+from app.repositories.versiones_repository import VersionesRepository
+from app.core.condicional import VersionDatos, version_de_contadores
+from app.core.exceptions import ClienteNoEncontradoException, TallerNoEspecificadoException
 
 class ClientesService:
     def __init__(self, bd):
         self.bd = bd
         self.clientes_repository = ClientesRepository(self.bd)
+        self.versiones_repository = VersionesRepository(self.bd)
+        self.sincronizacion_repository = SincronizacionRepository(self.bd)
 
     def listar_clientes(self, id_taller: str, pagination: PaginationParams) -> Dict[str, Any]:
         if not id_taller:
             raise TallerNoEspecificadoException()
 
-        clientes = self.clientes_repository.listar_por_taller(id_taller, pagination)
-        total = self.clientes_repository.contar_por_taller(id_taller, pagination.search)
+        clientes, total = self.clientes_repository.listar_por_taller(id_taller, pagination)
 
         return {
             "data": clientes,
@@ -22,10 +26,17 @@ class ClientesService:
                 "page": pagination.page,
                 "limit": pagination.limit,
                 "total": total,
-                "total_pages": (total + pagination.limit - 1) // pagination.limit if pagination.limit > 0 else 0
+                "total_pages": (total + pagination.limit - 1) // pagination.limit if total is not None and pagination.limit > 0 else None,
+                "next_cursor": self.clientes_repository.next_cursor,
+                "hay_mas": self.clientes_repository.hay_mas
             }
         }
 
+    def version_clientes(self, id_taller: str) -> VersionDatos:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        return version_de_contadores(self.versiones_repository.obtener(id_taller, [ClientesRepository.table_name]))
+
     def obtener_cliente(self, id_cliente: int, id_taller: str) -> ClienteDTO:
         if not id_taller:
             raise TallerNoEspecificadoException()
@@ -41,14 +52,6 @@ class ClientesService:
         if not id_taller:
             raise TallerNoEspecificadoException()
 
-        if datos.correo_cliente:
-            if self.clientes_repository.existe_correo_en_taller(id_taller, datos.correo_cliente):
-                raise ClienteDuplicadoException("correo")
-
-        if datos.telefono_cliente:
-            if self.clientes_repository.existe_telefono_en_taller(id_taller, datos.telefono_cliente):
-                raise ClienteDuplicadoException("teléfono")
-
         data_insert = {
             "id_taller": id_taller,
             "nombre_cliente": datos.nombre_cliente,
@@ -59,20 +62,15 @@ class ClientesService:
             "notas_cliente": datos.notas_cliente,
         }
 
-        id_cliente = self.clientes_repository.create(data_insert, returning="id_cliente")
-        
-        cliente_creado = self.clientes_repository.obtener_por_id(int(id_cliente), id_taller)
+        cliente_creado = self.clientes_repository.create_returning(data_insert, "id_cliente")
         
-        if not cliente_creado:
-            raise ClienteNoEncontradoException()
-        
-        return cliente_creado
+        return ClienteDTO(**cliente_creado)
 
     def actualizar_cliente(self, id_cliente: int, datos: ActualizarClienteDTO, id_taller: str) -> ClienteDTO:
         if not id_taller:
             raise TallerNoEspecificadoException()
 
-        cliente_existente = self.clientes_repository.obtener_por_id(id_cliente, id_taller)
+        cliente_existente = self.clientes_repository.obtener_para_actualizar(id_cliente, id_taller)
         
         if not cliente_existente:
             raise ClienteNoEncontradoException()
@@ -86,13 +84,9 @@ class ClientesService:
             data_update["apellidos_cliente"] = datos.apellidos_cliente
         
         if datos.correo_cliente is not None:
-            if self.clientes_repository.existe_correo_en_taller(id_taller, datos.correo_cliente, excluir_id=id_cliente):
-                raise ClienteDuplicadoException("correo")
             data_update["correo_cliente"] = datos.correo_cliente
         
         if datos.telefono_cliente is not None:
-            if self.clientes_repository.existe_telefono_en_taller(id_taller, datos.telefono_cliente, excluir_id=id_cliente):
-                raise ClienteDuplicadoException("teléfono")
             data_update["telefono_cliente"] = datos.telefono_cliente
         
         if datos.direccion_cliente is not None:
@@ -101,15 +95,11 @@ class ClientesService:
         if datos.notas_cliente is not None:
             data_update["notas_cliente"] = datos.notas_cliente
 
-        if data_update:
-            self.clientes_repository.update(id_cliente, "id_cliente", data_update)
-
-        cliente_actualizado = self.clientes_repository.obtener_por_id(id_cliente, id_taller)
-        
-        if not cliente_actualizado:
-            raise ClienteNoEncontradoException()
+        cliente_actualizado = self.clientes_repository.update_returning(
+            cliente_existente, id_cliente, "id_cliente", data_update
+        )
         
-        return cliente_actualizado
+        return ClienteDTO(**cliente_actualizado)
 
     def eliminar_cliente(self, id_cliente: int, id_taller: str) -> None:
         if not id_taller:
@@ -121,3 +111,5 @@ class ClientesService:
             raise ClienteNoEncontradoException()
 
         self.clientes_repository.delete(id_cliente, "id_cliente")
+        # Los clientes sin conexión (GET /sync) se enteran del borrado por este registro.
+        self.sincronizacion_repository.registrar_eliminacion(id_taller, "clientes", id_cliente)
@@ -0,0 +1,114 @@
+from decimal import Decimal
+from typing import Dict, Tuple
+from app.models.compra import CompraDTO, CrearCompraDTO, DetalleCompraDTO
+from app.repositories.compras_repository import ComprasRepository
+from app.repositories.compras_detalle_repository import ComprasDetalleRepository
+from app.repositories.productos_venta_repository import ProductosVentaRepository
+from app.repositories.proveedores_repository import ProveedoresRepository
+from app.repositories.refacciones_repository import RefaccionesRepository
+from app.core.fechas import hoy
+from app.core.exceptions import (
+    CompraNoEncontradaException,
+    CompraNoPendienteException,
+    ProductoNoEncontradoException,
+    ProveedorNoEncontradoException,
+    RefaccionNoEncontradaException,
+    TallerNoEspecificadoException,
+)
+
+class ComprasService:
+    """
+    Registro de compras a proveedores.
+
+    Igual que en VentasService, la compra completa se escribe en una transacción con un número fijo
+    de consultas: el stock entra al registrar la compra (con un UPDATE por tabla de inventario) y el
+    movimiento de finanzas se genera al confirmarla (trigger trg_finanzas_compra_confirmada).
+    """
+
+    def __init__(self, bd):
+        self.bd = bd
+        self.compras_repository = ComprasRepository(self.bd)
+        self.compras_detalle_repository = ComprasDetalleRepository(self.bd)
+        self.productos_venta_repository = ProductosVentaRepository(self.bd)
+        self.refacciones_repository = RefaccionesRepository(self.bd)
+        self.proveedores_repository = ProveedoresRepository(self.bd)
+
+    def registrar_compra(self, datos: CrearCompraDTO, id_taller: str, id_usuario: str) -> CompraDTO:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+
+        nombre_proveedor = datos.proveedor
+        if datos.id_proveedor is not None:
+            proveedor = self.proveedores_repository.obtener_por_id(datos.id_proveedor, id_taller)
+            if not proveedor:
+                raise ProveedorNoEncontradoException()
+            nombre_proveedor = nombre_proveedor or proveedor["nombre_proveedor"]
+
+        # Líneas agrupadas por artículo y precio; el stock se suma por artículo.
+        lineas: Dict[Tuple[str, int, Decimal], int] = {}
+        entradas: Dict[str, Dict[int, int]] = {"refaccion": {}, "producto_venta": {}}
+        for linea in datos.lineas:
+            clave = (linea.tipo_item, linea.id_item, linea.precio_unitario)
+            lineas[clave] = lineas.get(clave, 0) + linea.cantidad
+            entradas[linea.tipo_item][linea.id_item] = entradas[linea.tipo_item].get(linea.id_item, 0) + linea.cantidad
+
+        # Siempre productos y luego refacciones, cada tabla en orden de llave primaria (ver bloquear_para_movimiento).
+        productos = self.productos_venta_repository.bloquear_para_movimiento(id_taller, entradas["producto_venta"].keys())
+        faltantes = [id_item for id_item in entradas["producto_venta"] if id_item not in productos]
+        if faltantes:
+            raise ProductoNoEncontradoException(faltantes)
+        refacciones = self.refacciones_repository.bloquear_para_movimiento(id_taller, entradas["refaccion"].keys())
+        faltantes = [id_item for id_item in entradas["refaccion"] if id_item not in refacciones]
+        if faltantes:
+            raise RefaccionNoEncontradaException(faltantes)
+
+        detalle = [
+            DetalleCompraDTO(
+                tipo_item=tipo_item,
+                id_refaccion=id_item if tipo_item == "refaccion" else None,
+                id_producto_venta=id_item if tipo_item == "producto_venta" else None,
+                cantidad=cantidad,
+                precio_unitario=precio_unitario,
+                subtotal=precio_unitario * cantidad,
+            )
+            for (tipo_item, id_item, precio_unitario), cantidad in lineas.items()
+        ]
+
+        compra = self.compras_repository.create_returning({
+            "id_taller": id_taller,
+            "num_factura": datos.num_factura,
+            "id_proveedor": datos.id_proveedor,
+            "proveedor": nombre_proveedor,
+            "fecha_compra": datos.fecha_compra or hoy(),
+            "total": sum((linea.subtotal for linea in detalle), Decimal("0.00")),
+            "estado": "pendiente",
+            "creado_por": id_usuario,
+        }, "id_compra")
+
+        self.compras_detalle_repository.create_many([
+            {"id_compra": compra["id_compra"], **linea.model_dump()} for linea in detalle
+        ])
+        self.productos_venta_repository.increment_many("stock_actual", entradas["producto_venta"], "id_producto")
+        self.refacciones_repository.increment_many("stock_actual", entradas["refaccion"], "id_refaccion")
+
+        if datos.confirmar:
+            compra = self._confirmar(compra, id_usuario)
+        return CompraDTO(**compra, detalle=detalle)
+
+    def confirmar_compra(self, id_compra: int, id_taller: str, id_usuario: str) -> CompraDTO:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        compra = self.compras_repository.obtener_para_actualizar(id_compra, id_taller)
+        if not compra:
+            raise CompraNoEncontradaException()
+        if compra["estado"] != "pendiente":
+            raise CompraNoPendienteException(compra["estado"])
+        compra = self._confirmar(compra, id_usuario)
+        return CompraDTO(**compra, detalle=self.compras_detalle_repository.listar_por_compra(id_compra))
+
+    def _confirmar(self, compra: Dict, id_usuario: str) -> Dict:
+        return self.compras_repository.update_returning(compra, compra["id_compra"], "id_compra", {
+            "estado": "confirmada",
+            "confirmado_por": id_usuario,
+            "fecha_confirmacion": self.compras_repository._ahora(),
+        })
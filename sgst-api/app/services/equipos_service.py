@@ -3,9 +3,11 @@ from app.models.equipo import EquipoDTO, CrearEquipoDTO, ActualizarEquipoDTO
 from app.models.pagination import PaginationParams
 from app.repositories.equipos_repository import EquiposRepository
 from app.repositories.tipo_equipos_repository import TipoEquiposRepository
+from app.repositories.sincronizacion_repository import SincronizacionRepository
+from app.repositories.versiones_repository import VersionesRepository
+from app.core.condicional import VersionDatos, version_de_contadores
 from app.core.exceptions import (
     EquipoNoEncontradoException,
-    EquipoDuplicadoException,
     TipoEquipoNoEncontradoException,
     TallerNoEspecificadoException,
 )
@@ -15,6 +17,8 @@ class EquiposService:
         self.bd = bd
         self.equipos_repository = EquiposRepository(self.bd)
         self.tipo_equipos_repository = TipoEquiposRepository(self.bd)
+        self.versiones_repository = VersionesRepository(self.bd)
+        self.sincronizacion_repository = SincronizacionRepository(self.bd)
 
     def listar_equipos(
         self,
@@ -28,12 +32,9 @@ class EquiposService:
             tipo = self.tipo_equipos_repository.obtener_por_id(id_tipo, id_taller)
             if not tipo:
                 raise TipoEquipoNoEncontradoException()
-        equipos = self.equipos_repository.listar_por_taller(
+        equipos, total = self.equipos_repository.listar_por_taller(
             id_taller, pagination, id_tipo_filtro=id_tipo
         )
-        total = self.equipos_repository.contar_por_taller(
-            id_taller, pagination.search, id_tipo_filtro=id_tipo
-        )
         return {
             "data": equipos,
             "pagination": {
@@ -41,11 +42,21 @@ class EquiposService:
                 "limit": pagination.limit,
                 "total": total,
                 "total_pages": (total + pagination.limit - 1) // pagination.limit
-                if pagination.limit > 0
-                else 0,
+                if total is not None and pagination.limit > 0
+                else None,
+                "next_cursor": self.equipos_repository.next_cursor,
+                "hay_mas": self.equipos_repository.hay_mas,
             },
         }
 
+    def version_equipos(self, id_taller: str) -> VersionDatos:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        # El listado incluye nombre_tipo, así que renombrar un tipo también cambia la versión.
+        return version_de_contadores(self.versiones_repository.obtener(
+            id_taller, [EquiposRepository.table_name, TipoEquiposRepository.table_name]
+        ))
+
     def obtener_equipo(self, id_equipo: int, id_taller: str) -> EquipoDTO:
         if not id_taller:
             raise TallerNoEspecificadoException()
@@ -60,8 +71,6 @@ class EquiposService:
         tipo = self.tipo_equipos_repository.obtener_por_id(datos.id_tipo, id_taller)
         if not tipo:
             raise TipoEquipoNoEncontradoException()
-        if self.equipos_repository.existe_num_serie_en_taller(id_taller, datos.num_serie):
-            raise EquipoDuplicadoException("número de serie")
         data_insert = {
             "id_taller": id_taller,
             "id_tipo": datos.id_tipo,
@@ -70,32 +79,25 @@ class EquiposService:
             "modelo_equipo": datos.modelo_equipo,
             "descripcion_equipo": datos.descripcion_equipo,
         }
-        id_equipo = self.equipos_repository.create(data_insert, returning="id_equipo")
-        equipo_creado = self.equipos_repository.obtener_por_id(int(id_equipo), id_taller)
-        if not equipo_creado:
-            raise EquipoNoEncontradoException()
-        return equipo_creado
+        equipo_creado = self.equipos_repository.create_returning(data_insert, "id_equipo")
+        return EquipoDTO(**equipo_creado, nombre_tipo=tipo.nombre_tipo)
 
     def actualizar_equipo(
         self, id_equipo: int, datos: ActualizarEquipoDTO, id_taller: str
     ) -> EquipoDTO:
         if not id_taller:
             raise TallerNoEspecificadoException()
-        equipo_existente = self.equipos_repository.obtener_por_id(id_equipo, id_taller)
+        equipo_existente, nombre_tipo_nuevo = self.equipos_repository.obtener_para_actualizar(
+            id_equipo, id_taller, datos.id_tipo
+        )
         if not equipo_existente:
             raise EquipoNoEncontradoException()
-        if datos.id_tipo is not None:
-            tipo = self.tipo_equipos_repository.obtener_por_id(datos.id_tipo, id_taller)
-            if not tipo:
-                raise TipoEquipoNoEncontradoException()
+        if datos.id_tipo is not None and nombre_tipo_nuevo is None:
+            raise TipoEquipoNoEncontradoException()
         data_update = {}
         if datos.id_tipo is not None:
             data_update["id_tipo"] = datos.id_tipo
         if datos.num_serie is not None:
-            if self.equipos_repository.existe_num_serie_en_taller(
-                id_taller, datos.num_serie, excluir_id_equipo=id_equipo
-            ):
-                raise EquipoDuplicadoException("número de serie")
             data_update["num_serie"] = datos.num_serie
         if datos.marca_equipo is not None:
             data_update["marca_equipo"] = datos.marca_equipo
@@ -103,12 +105,12 @@ class EquiposService:
             data_update["modelo_equipo"] = datos.modelo_equipo
         if datos.descripcion_equipo is not None:
             data_update["descripcion_equipo"] = datos.descripcion_equipo
-        if data_update:
-            self.equipos_repository.update(id_equipo, "id_equipo", data_update)
-        equipo_actualizado = self.equipos_repository.obtener_por_id(id_equipo, id_taller)
-        if not equipo_actualizado:
-            raise EquipoNoEncontradoException()
-        return equipo_actualizado
+        nombre_tipo = nombre_tipo_nuevo if datos.id_tipo is not None else equipo_existente["nombre_tipo"]
+        equipo_actualizado = self.equipos_repository.update_returning(
+            equipo_existente, id_equipo, "id_equipo", data_update
+        )
+        equipo_actualizado["nombre_tipo"] = nombre_tipo
+        return EquipoDTO(**equipo_actualizado)
 
     def eliminar_equipo(self, id_equipo: int, id_taller: str) -> None:
         if not id_taller:
@@ -117,3 +119,4 @@ class EquiposService:
         if not equipo:
             raise EquipoNoEncontradoException()
         self.equipos_repository.delete(id_equipo, "id_equipo")
+        self.sincronizacion_repository.registrar_eliminacion(id_taller, "equipos", id_equipo)
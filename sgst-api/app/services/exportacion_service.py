@@ -0,0 +1,97 @@
+from typing import Callable, Dict, Iterator, List
+import threading
+import weakref
+from app.core.config import settings
+from app.core.exceptions import ExportacionesOcupadasException, TallerNoEspecificadoException
+from app.core.exportacion import generar_csv, generar_ndjson
+from app.dependencies.database import conectar_bd
+from app.repositories.clientes_repository import ClientesRepository
+from app.repositories.equipos_repository import EquiposRepository
+
+COLUMNAS_CLIENTES = [
+    "id_cliente", "nombre_cliente", "apellidos_cliente", "correo_cliente", "telefono_cliente",
+    "direccion_cliente", "notas_cliente", "fecha_creacion", "ultima_actualizacion",
+]
+COLUMNAS_EQUIPOS = [
+    "id_equipo", "id_tipo", "nombre_tipo", "num_serie", "marca_equipo", "modelo_equipo",
+    "descripcion_equipo", "activo", "fecha_registro", "ultima_actualizacion",
+]
+
+_GENERADORES: Dict[str, Callable] = {
+    "csv": generar_csv,
+    "ndjson": generar_ndjson,
+}
+
+_candado = threading.Lock()
+_en_curso = 0
+
+def _reservar_lugar() -> Callable[[], None]:
+    """
+    Reserva uno de los EXPORTACION_MAX_CONCURRENTES lugares o lanza ExportacionesOcupadasException.
+    :return: Función que libera el lugar; se puede llamar más de una vez.
+    """
+    global _en_curso
+    with _candado:
+        if _en_curso >= settings.EXPORTACION_MAX_CONCURRENTES:
+            raise ExportacionesOcupadasException(settings.EXPORTACION_MAX_CONCURRENTES)
+        _en_curso += 1
+    liberado = False
+
+    def _liberar() -> None:
+        global _en_curso
+        nonlocal liberado
+        with _candado:
+            if not liberado:
+                liberado = True
+                _en_curso -= 1
+    return _liberar
+
+class ExportacionService:
+    """
+    Exportación completa de los clientes y equipos de un taller.
+
+    A diferencia del resto de servicios no recibe la conexión de la petición: la respuesta se envía
+    después de que la petición termina y una descarga lenta puede durar minutos, así que cada exportación
+    abre su propia conexión fuera del pool (no le quita conexiones a las demás peticiones) y la cierra al
+    terminar o cuando el cliente se desconecta. Como esas conexiones no tienen el límite del pool, el
+    número de exportaciones simultáneas se acota con EXPORTACION_MAX_CONCURRENTES. Las filas se leen por
+    bloques con un cursor sin buffer y se escriben conforme llegan, así la memoria no crece con el número de filas.
+    """
+
+    def exportar_clientes(self, id_taller: str, formato: str) -> Iterator[bytes]:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        return self._exportar(
+            lambda conexion: ClientesRepository(conexion).iterar_por_taller(id_taller, settings.EXPORTACION_TAMANO_LOTE),
+            COLUMNAS_CLIENTES,
+            formato,
+        )
+
+    def exportar_equipos(self, id_taller: str, formato: str) -> Iterator[bytes]:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        return self._exportar(
+            lambda conexion: EquiposRepository(conexion).iterar_por_taller(id_taller, settings.EXPORTACION_TAMANO_LOTE),
+            COLUMNAS_EQUIPOS,
+            formato,
+        )
+
+    def _exportar(self, leer_filas: Callable, columnas: List[str], formato: str) -> Iterator[bytes]:
+        # El lugar se reserva al llamar al método, así el 503 se responde antes de enviar encabezados. El
+        # generador no corre (ni abre la conexión) hasta que StreamingResponse empieza a enviar el cuerpo; si
+        # nunca empieza, el lugar se libera cuando el generador se descarta.
+        liberar = _reservar_lugar()
+        contenido = self._generar(leer_filas, columnas, formato, liberar)
+        weakref.finalize(contenido, liberar)
+        return contenido
+
+    def _generar(self, leer_filas: Callable, columnas: List[str], formato: str, liberar: Callable[[], None]) -> Iterator[bytes]:
+        generar = _GENERADORES[formato]
+        try:
+            conexion = conectar_bd()
+            try:
+                yield from generar(columnas, leer_filas(conexion), settings.EXPORTACION_TAMANO_LOTE)
+            finally:
+                conexion.close()
+        finally:
+            liberar()
@@ -0,0 +1,52 @@
+from datetime import date
+from decimal import Decimal
+from typing import Dict
+from app.core.config import settings
+from app.core.exceptions import RangoFechasInvalidoException, TallerNoEspecificadoException
+from app.models.finanzas import PeriodoFinanzasDTO, ResumenFinanzasDTO
+from app.repositories.finanzas_repository import FinanzasRepository
+
+class FinanzasService:
+    def __init__(self, bd):
+        self.bd = bd
+        self.finanzas_repository = FinanzasRepository(self.bd)
+
+    def obtener_resumen(self, id_taller: str, desde: date, hasta: date, agrupar: str = "dia") -> ResumenFinanzasDTO:
+        """
+        Ingresos, egresos y balance del rango (incluye ambos extremos), por categoría y por día o mes.
+        Se calcula a partir de finanzas_resumen_diario, así el costo depende de los días del rango y no
+        del número de movimientos registrados.
+        """
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        if desde > hasta:
+            raise RangoFechasInvalidoException()
+        if (hasta - desde).days + 1 > settings.FINANZAS_RESUMEN_MAX_DIAS:
+            raise RangoFechasInvalidoException(f"el rango no puede ser mayor a {settings.FINANZAS_RESUMEN_MAX_DIAS} días.")
+
+        resumen = ResumenFinanzasDTO(desde=desde, hasta=hasta, agrupar=agrupar)
+        periodos: Dict[date, PeriodoFinanzasDTO] = {}
+
+        for fila in self.finanzas_repository.resumen_por_dia(id_taller, desde, hasta):
+            total = Decimal(fila["total"])
+            tipo = fila["tipo_movimiento"]
+            periodo = fila["fecha"] if agrupar == "dia" else fila["fecha"].replace(day=1)
+            destino = periodos.setdefault(periodo, PeriodoFinanzasDTO(periodo=periodo))
+
+            if tipo == "ingreso":
+                resumen.ingresos += total
+                destino.ingresos += total
+            else:
+                resumen.egresos += total
+                destino.egresos += total
+            resumen.movimientos += fila["movimientos"]
+
+            categorias = resumen.por_categoria.setdefault(tipo, {})
+            categorias[fila["categoria"]] = categorias.get(fila["categoria"], Decimal("0.00")) + total
+
+        for periodo in periodos.values():
+            periodo.balance = periodo.ingresos - periodo.egresos
+        resumen.balance = resumen.ingresos - resumen.egresos
+        # Las filas llegan ordenadas por fecha, así que los periodos ya quedan en orden.
+        resumen.periodos = list(periodos.values())
+        return resumen
@@ -0,0 +1,181 @@
+from typing import Any, BinaryIO, Dict, List, Tuple
+from pydantic import ValidationError
+from app.core.config import settings
+from app.core.exceptions import (
+    AppException,
+    ClienteDuplicadoException,
+    EquipoDuplicadoException,
+    TallerNoEspecificadoException,
+    TipoEquipoNoEncontradoException,
+)
+from app.core.importacion import FilaImportacion, leer_filas
+from app.models.cliente import CrearClienteDTO
+from app.models.equipo import CrearEquipoDTO
+from app.models.importacion import ErrorFilaImportacionDTO, ResultadoImportacionDTO
+from app.repositories.base_repository import BaseRepository
+from app.repositories.clientes_repository import ClientesRepository
+from app.repositories.equipos_repository import EquiposRepository
+from app.repositories.tipo_equipos_repository import TipoEquiposRepository
+
+COLUMNAS_CLIENTES = ["nombre_cliente", "apellidos_cliente", "correo_cliente", "telefono_cliente", "direccion_cliente", "notas_cliente"]
+COLUMNAS_EQUIPOS = ["num_serie", "marca_equipo", "modelo_equipo", "descripcion_equipo"]
+
+class ImportacionService:
+    """
+    Importación masiva de clientes y equipos desde CSV o XLSX.
+
+    El archivo se recorre fila por fila y las filas válidas se insertan en lotes de
+    IMPORTACION_TAMANO_LOTE con un INSERT de múltiples filas, así la memoria usada depende del
+    tamaño del lote y no del archivo. Todo ocurre en la transacción de la petición. Las filas
+    inválidas o duplicadas no detienen la importación, se reportan con su número de fila.
+    """
+
+    def __init__(self, bd):
+        self.bd = bd
+        self.clientes_repository = ClientesRepository(self.bd)
+        self.equipos_repository = EquiposRepository(self.bd)
+        self.tipo_equipos_repository = TipoEquiposRepository(self.bd)
+
+    def importar_clientes(self, archivo: BinaryIO, nombre_archivo: str | None, id_taller: str) -> ResultadoImportacionDTO:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+
+        resultado = ResultadoImportacionDTO()
+        lote: List[Tuple[int, Dict[str, Any]]] = []
+
+        for numero_fila, fila in leer_filas(archivo, nombre_archivo):
+            resultado.total_filas += 1
+            try:
+                datos = CrearClienteDTO(**{columna: fila.get(columna) for columna in COLUMNAS_CLIENTES})
+            except (ValidationError, AppException) as e:
+                self._agregar_error(resultado, numero_fila, self._mensajes(e))
+                continue
+
+            lote.append((numero_fila, {"id_taller": id_taller, **datos.model_dump()}))
+            if len(lote) >= settings.IMPORTACION_TAMANO_LOTE:
+                self._insertar_lote_clientes(lote, id_taller, resultado)
+                lote = []
+
+        self._insertar_lote_clientes(lote, id_taller, resultado)
+        return resultado
+
+    def importar_equipos(self, archivo: BinaryIO, nombre_archivo: str | None, id_taller: str) -> ResultadoImportacionDTO:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+
+        # El tipo puede venir como id_tipo o por su nombre (más cómodo al migrar desde otra hoja de cálculo).
+        tipos = self.tipo_equipos_repository.listar_por_taller(id_taller)
+        ids_tipo = {tipo["id_tipo"] for tipo in tipos}
+        tipos_por_nombre = {tipo["nombre_tipo"].lower(): tipo["id_tipo"] for tipo in tipos}
+
+        resultado = ResultadoImportacionDTO()
+        lote: List[Tuple[int, Dict[str, Any]]] = []
+
+        for numero_fila, fila in leer_filas(archivo, nombre_archivo):
+            resultado.total_filas += 1
+            id_tipo = self._resolver_tipo(fila, ids_tipo, tipos_por_nombre)
+            if id_tipo is None:
+                self._agregar_error(resultado, numero_fila, [TipoEquipoNoEncontradoException().message])
+                continue
+            try:
+                datos = CrearEquipoDTO(id_tipo=id_tipo, **{columna: fila.get(columna) for columna in COLUMNAS_EQUIPOS})
+            except (ValidationError, AppException) as e:
+                self._agregar_error(resultado, numero_fila, self._mensajes(e))
+                continue
+
+            lote.append((numero_fila, {"id_taller": id_taller, **datos.model_dump()}))
+            if len(lote) >= settings.IMPORTACION_TAMANO_LOTE:
+                self._insertar_lote_equipos(lote, id_taller, resultado)
+                lote = []
+
+        self._insertar_lote_equipos(lote, id_taller, resultado)
+        return resultado
+
+    def _insertar_lote_clientes(self, lote: List[FilaImportacion], id_taller: str, resultado: ResultadoImportacionDTO) -> None:
+        if not lote:
+            return
+
+        # Una sola consulta por lote detecta los duplicados contra la base de datos, incluidas las filas
+        # de lotes anteriores de este mismo archivo (ya insertadas en la transacción).
+        correos_existentes, telefonos_existentes = self.clientes_repository.buscar_existentes(
+            id_taller,
+            {fila["correo_cliente"] for _, fila in lote if fila["correo_cliente"]},
+            {fila["telefono_cliente"] for _, fila in lote if fila["telefono_cliente"]},
+        )
+
+        validas: List[FilaImportacion] = []
+        for numero_fila, fila in lote:
+            correo = fila["correo_cliente"].lower() if fila["correo_cliente"] else None
+            telefono = fila["telefono_cliente"]
+            if correo and correo in correos_existentes:
+                self._agregar_error(resultado, numero_fila, [ClienteDuplicadoException("correo").message])
+                continue
+            if telefono and telefono in telefonos_existentes:
+                self._agregar_error(resultado, numero_fila, [ClienteDuplicadoException("teléfono").message])
+                continue
+            # Lo que entra en este lote también cuenta como existente para las filas siguientes.
+            if correo:
+                correos_existentes.add(correo)
+            if telefono:
+                telefonos_existentes.add(telefono)
+            validas.append((numero_fila, fila))
+
+        self._insertar(self.clientes_repository, validas, resultado)
+
+    def _insertar_lote_equipos(self, lote: List[FilaImportacion], id_taller: str, resultado: ResultadoImportacionDTO) -> None:
+        if not lote:
+            return
+
+        existentes = self.equipos_repository.buscar_num_series_existentes(
+            id_taller, {fila["num_serie"] for _, fila in lote}
+        )
+
+        validas: List[FilaImportacion] = []
+        for numero_fila, fila in lote:
+            num_serie = fila["num_serie"].lower()
+            if num_serie in existentes:
+                self._agregar_error(resultado, numero_fila, [EquipoDuplicadoException("número de serie").message])
+                continue
+            existentes.add(num_serie)
+            validas.append((numero_fila, fila))
+
+        self._insertar(self.equipos_repository, validas, resultado)
+
+    def _insertar(self, repositorio: BaseRepository, filas: List[FilaImportacion], resultado: ResultadoImportacionDTO) -> None:
+        if not filas:
+            return
+        try:
+            resultado.insertadas += repositorio.create_many([fila for _, fila in filas])
+        except AppException:
+            # Otra petición insertó un duplicado entre la revisión y el INSERT (o la intercalación considera
+            # iguales dos valores distintos). Como el INSERT múltiple no aplicó ninguna fila, se repite
+            # fila por fila para insertar las válidas y reportar solo las que chocan.
+            for numero_fila, fila in filas:
+                try:
+                    repositorio.create(fila)
+                    resultado.insertadas += 1
+                except AppException as e:
+                    self._agregar_error(resultado, numero_fila, [e.message])
+
+    def _resolver_tipo(self, fila: Dict[str, Any], ids_tipo: set, tipos_por_nombre: Dict[str, int]) -> int | None:
+        if fila.get("id_tipo"):
+            try:
+                id_tipo = int(fila["id_tipo"])
+            except ValueError:
+                return None
+            return id_tipo if id_tipo in ids_tipo else None
+        if fila.get("nombre_tipo"):
+            return tipos_por_nombre.get(fila["nombre_tipo"].lower())
+        return None
+
+    def _mensajes(self, error: Exception) -> List[str]:
+        if isinstance(error, AppException):
+            return [error.message]
+        return [f"{'.'.join(str(parte) for parte in detalle['loc'])}: {detalle['msg']}" for detalle in error.errors()]
+
+    def _agregar_error(self, resultado: ResultadoImportacionDTO, numero_fila: int, errores: List[str]) -> None:
+        resultado.con_errores += 1
+        if len(resultado.errores) < settings.IMPORTACION_MAX_ERRORES:
+            resultado.errores.append(ErrorFilaImportacionDTO(fila=numero_fila, errores=errores))
+        else:
+            resultado.errores_omitidos += 1
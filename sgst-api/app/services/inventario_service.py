@@ -0,0 +1,17 @@
+from typing import List
+from app.core.exceptions import TallerNoEspecificadoException
+from app.models.inventario import ArticuloBajoStockDTO
+from app.repositories.inventario_repository import InventarioRepository
+
+class InventarioService:
+    def __init__(self, bd):
+        self.bd = bd
+        self.inventario_repository = InventarioRepository(self.bd)
+
+    def listar_bajo_stock(self, id_taller: str, tipo_item: str | None = None) -> List[ArticuloBajoStockDTO]:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        return [
+            ArticuloBajoStockDTO(**fila, faltante=max(fila["stock_minimo"] - fila["stock_actual"], 0))
+            for fila in self.inventario_repository.listar_bajo_stock(id_taller, tipo_item)
+        ]
@@ -0,0 +1,81 @@
+import time
+import logging
+from app.core.config import settings
+from app.core.tareas import EjecutorTareas
+from app.core.transacciones import confirmar
+from app.dependencies.database import conectar_bd, pool_conexiones
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.suscripciones_repository import SuscripcionesRepository
+from app.repositories.sincronizacion_repository import SincronizacionRepository
+
+logger = logging.getLogger(__name__)
+
+class MantenimientoService:
+    """
+    Tareas de limpieza que no pertenecen a ninguna petición. Las ejecuta ejecutor_tareas en segundo
+    plano o el comando app.comandos.ejecutar_tareas.
+    """
+
+    def __init__(self, bd):
+        self.bd = bd
+        self.refresh_token_repository = RefreshTokenRepository(self.bd)
+        self.suscripciones_repository = SuscripcionesRepository(self.bd)
+        self.sincronizacion_repository = SincronizacionRepository(self.bd)
+
+    def purgar_refresh_tokens(self, lote: int, pausa_ms: int) -> int:
+        # Cada lote se confirma por separado: los bloqueos duran poco y lo ya purgado no se pierde si algo falla.
+        total = 0
+        while True:
+            eliminadas = self.refresh_token_repository.purgar_lote(lote)
+            confirmar(self.bd)
+            total += eliminadas
+            if eliminadas < lote:
+                return total
+            time.sleep(pausa_ms / 1000)
+
+    def purgar_eliminaciones(self, retencion_dias: int, lote: int, pausa_ms: int) -> int:
+        # Una marca de sincronización más vieja que la retención recibe "reiniciar", así que ya nadie lee estos registros.
+        total = 0
+        while True:
+            eliminadas = self.sincronizacion_repository.purgar_lote(retencion_dias, lote)
+            confirmar(self.bd)
+            total += eliminadas
+            if eliminadas < lote:
+                return total
+            time.sleep(pausa_ms / 1000)
+
+    def expirar_suscripciones(self) -> int:
+        empresas = self.suscripciones_repository.expirar_vencidas()
+        # Solo se invalida la caché de este proceso; los demás workers dejan de ver la suscripción al
+        # vencer su CACHE_SUSCRIPCIONES_TTL (el contexto de autenticación ya la consulta en la base de datos).
+        for id_empresa in empresas:
+            self.suscripciones_repository.invalidar_cache_empresa(id_empresa)
+        confirmar(self.bd)
+        if empresas:
+            logger.info(f"Suscripciones vencidas desactivadas para {len(empresas)} empresas")
+        return len(empresas)
+
+def _purgar_refresh_tokens() -> int:
+    with pool_conexiones.conexion() as conexion:
+        return MantenimientoService(conexion).purgar_refresh_tokens(settings.TAREA_PURGA_TOKENS_LOTE, settings.TAREA_PURGA_TOKENS_PAUSA_MS)
+
+def _purgar_eliminaciones() -> int:
+    with pool_conexiones.conexion() as conexion:
+        return MantenimientoService(conexion).purgar_eliminaciones(
+            settings.SYNC_RETENCION_DIAS, settings.TAREA_PURGA_ELIMINACIONES_LOTE, settings.TAREA_PURGA_ELIMINACIONES_PAUSA_MS
+        )
+
+def _verificar_pool_conexiones() -> int:
+    return pool_conexiones.verificar_salud()
+
+def _expirar_suscripciones() -> int:
+    with pool_conexiones.conexion() as conexion:
+        return MantenimientoService(conexion).expirar_suscripciones()
+
+# El candado se pide en una conexión propia, fuera del pool, porque se mantiene abierta mientras el proceso sea el líder.
+ejecutor_tareas = EjecutorTareas(crear_conexion=conectar_bd, nombre_candado="sgst_tareas", revision_segundos=settings.TAREAS_REVISION_SEGUNDOS)
+ejecutor_tareas.registrar("purgar_refresh_tokens", settings.TAREA_PURGA_TOKENS_INTERVALO, _purgar_refresh_tokens)
+ejecutor_tareas.registrar("expirar_suscripciones", settings.TAREA_SUSCRIPCIONES_INTERVALO, _expirar_suscripciones)
+ejecutor_tareas.registrar("purgar_eliminaciones", settings.TAREA_PURGA_ELIMINACIONES_INTERVALO, _purgar_eliminaciones)
+# Cada worker tiene su propio pool, así que esta tarea no depende del candado.
+ejecutor_tareas.registrar("verificar_pool_conexiones", settings.DB_POOL_VERIFICACION_INTERVALO, _verificar_pool_conexiones, local=True)
@@ -0,0 +1,184 @@
+from typing import Dict, Any
+from app.models.orden import OrdenDTO, CrearOrdenDTO, ActualizarOrdenDTO
+from app.models.pagination import PaginationParams
+from app.repositories.ordenes_repository import OrdenesRepository
+from app.repositories.catalogos_repository import CatalogosRepository
+from app.services.secuencias_service import SecuenciasService
+from app.core.exceptions import (
+    OrdenNoEncontradaException,
+    ClienteNoEncontradoException,
+    EquipoNoEncontradoException,
+    TecnicoNoEncontradoException,
+    EstadoOrdenNoEncontradoException,
+    PrioridadNoEncontradaException,
+    TallerNoEspecificadoException,
+)
+
+# Estados que cierran la orden; al pasar a uno de ellos se registra quién la cerró.
+ESTADOS_CIERRE = {"finalizado", "cancelado"}
+
+class OrdenesService:
+    def __init__(self, bd):
+        self.bd = bd
+        self.ordenes_repository = OrdenesRepository(self.bd)
+        self.catalogos_repository = CatalogosRepository(self.bd)
+        self.secuencias_service = SecuenciasService(self.bd)
+
+    def listar_ordenes(
+        self,
+        id_taller: str,
+        pagination: PaginationParams,
+        id_estado: int | None = None,
+        id_prioridad: int | None = None,
+        tecnico_asignado: str | None = None,
+    ) -> Dict[str, Any]:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        ordenes, total = self.ordenes_repository.listar_por_taller(
+            id_taller,
+            pagination,
+            id_estado=id_estado,
+            id_prioridad=id_prioridad,
+            tecnico_asignado=tecnico_asignado,
+        )
+        return {
+            "data": ordenes,
+            "pagination": {
+                "page": pagination.page,
+                "limit": pagination.limit,
+                "total": total,
+                "total_pages": (total + pagination.limit - 1) // pagination.limit
+                if total is not None and pagination.limit > 0
+                else None,
+                "next_cursor": self.ordenes_repository.next_cursor,
+                "hay_mas": self.ordenes_repository.hay_mas,
+            },
+        }
+
+    def obtener_orden(self, id_orden: int, id_taller: str) -> OrdenDTO:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        orden = self.ordenes_repository.obtener_por_id(id_orden, id_taller)
+        if not orden:
+            raise OrdenNoEncontradaException()
+        return orden
+
+    def crear_orden(self, datos: CrearOrdenDTO, id_taller: str, id_usuario: str) -> OrdenDTO:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+
+        prioridad = self._obtener_prioridad(datos.id_prioridad)
+        estado = self._obtener_estado(1)
+        referencias = self.ordenes_repository.obtener_referencias(
+            id_taller, datos.id_cliente, datos.id_equipo, datos.tecnico_asignado
+        )
+        if referencias["id_cliente"] is None:
+            raise ClienteNoEncontradoException()
+        if referencias["id_equipo"] is None:
+            raise EquipoNoEncontradoException()
+        if datos.tecnico_asignado is not None and referencias["id_tecnico"] is None:
+            raise TecnicoNoEncontradoException()
+
+        # El número se pide al final para mantener bloqueada la fila del consecutivo el menor tiempo posible.
+        data_insert = {
+            "id_taller": id_taller,
+            "num_orden": self.secuencias_service.siguiente(id_taller, "ordenes"),
+            "id_cliente": datos.id_cliente,
+            "id_equipo": datos.id_equipo,
+            "accesorios": datos.accesorios,
+            "falla": datos.falla,
+            "diagnostico_inicial": datos.diagnostico_inicial,
+            "id_prioridad": datos.id_prioridad,
+            "tecnico_asignado": datos.tecnico_asignado,
+            "fecha_estimada_de_fin": datos.fecha_estimada_de_fin,
+            "costo_total": datos.costo_total,
+            "meses_garantia": datos.meses_garantia,
+            "creado_por": id_usuario,
+        }
+        orden_creada = self.ordenes_repository.create_returning(data_insert, "id_orden")
+        referencias.pop("id_tecnico")
+        return OrdenDTO(**{
+            **orden_creada,
+            "saldo_pendiente": datos.costo_total,
+            **referencias,
+            "clave_estado": estado["clave"],
+            "estado": estado["descripcion"],
+            "clave_prioridad": prioridad["clave"],
+            "prioridad": prioridad["descripcion"],
+        })
+
+    def actualizar_orden(self, id_orden: int, datos: ActualizarOrdenDTO, id_taller: str, id_usuario: str) -> OrdenDTO:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+
+        orden_existente = self.ordenes_repository.obtener_para_actualizar(id_orden, id_taller)
+        if not orden_existente:
+            raise OrdenNoEncontradaException()
+
+        data_update = {}
+        etiquetas = {}
+
+        if datos.id_prioridad is not None and datos.id_prioridad != orden_existente["id_prioridad"]:
+            prioridad = self._obtener_prioridad(datos.id_prioridad)
+            data_update["id_prioridad"] = datos.id_prioridad
+            etiquetas["clave_prioridad"] = prioridad["clave"]
+            etiquetas["prioridad"] = prioridad["descripcion"]
+
+        if datos.id_estado is not None and datos.id_estado != orden_existente["id_estado"]:
+            estado = self._obtener_estado(datos.id_estado)
+            data_update["id_estado"] = datos.id_estado
+            etiquetas["clave_estado"] = estado["clave"]
+            etiquetas["estado"] = estado["descripcion"]
+            if estado["clave"] in ESTADOS_CIERRE:
+                data_update["cerrado_por"] = id_usuario
+
+        if datos.tecnico_asignado is not None and datos.tecnico_asignado != orden_existente["tecnico_asignado"]:
+            referencias = self.ordenes_repository.obtener_referencias(id_taller, tecnico_asignado=datos.tecnico_asignado)
+            if referencias["id_tecnico"] is None:
+                raise TecnicoNoEncontradoException()
+            data_update["tecnico_asignado"] = datos.tecnico_asignado
+            etiquetas["nombre_tecnico"] = referencias["nombre_tecnico"]
+            etiquetas["apellidos_tecnico"] = referencias["apellidos_tecnico"]
+
+        for campo in (
+            "accesorios",
+            "falla",
+            "diagnostico_inicial",
+            "solucion_aplicada",
+            "fecha_estimada_de_fin",
+            "fecha_entrega",
+            "costo_total",
+            "meses_garantia",
+        ):
+            valor = getattr(datos, campo)
+            if valor is not None:
+                data_update[campo] = valor
+
+        orden_actualizada = self.ordenes_repository.update_returning(
+            orden_existente, id_orden, "id_orden", data_update
+        )
+        if "costo_total" in data_update:
+            # saldo_pendiente es una columna generada; se recalcula igual que en la tabla.
+            orden_actualizada["saldo_pendiente"] = data_update["costo_total"] - orden_existente["monto_pagado"]
+        return OrdenDTO(**{**orden_actualizada, **etiquetas})
+
+    def eliminar_orden(self, id_orden: int, id_taller: str) -> None:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        orden = self.ordenes_repository.obtener_por_id(id_orden, id_taller)
+        if not orden:
+            raise OrdenNoEncontradaException()
+        # Las órdenes se ocultan en lugar de borrarse porque pagos e historial las referencian.
+        self.ordenes_repository.soft_delete(id_orden, "id_orden", "visible")
+
+    def _obtener_estado(self, id_estado: int) -> Dict[str, Any]:
+        estado = self.catalogos_repository.obtener_estados().get(id_estado)
+        if not estado:
+            raise EstadoOrdenNoEncontradoException()
+        return estado
+
+    def _obtener_prioridad(self, id_prioridad: int) -> Dict[str, Any]:
+        prioridad = self.catalogos_repository.obtener_prioridades().get(id_prioridad)
+        if not prioridad:
+            raise PrioridadNoEncontradaException()
+        return prioridad
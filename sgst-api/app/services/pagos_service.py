@@ -0,0 +1,94 @@
+from typing import Any, Dict
+from app.models.pago import AnularPagoDTO, CrearPagoDTO, MovimientoPagoDTO, PagoDTO, SaldoOrdenDTO
+from app.repositories.ordenes_repository import OrdenesRepository
+from app.repositories.pagos_repository import PagosRepository
+from app.core.fechas import hoy
+from app.core.exceptions import (
+    OrdenNoEncontradaException,
+    PagoNoEncontradoException,
+    PagoYaAnuladoException,
+    TallerNoEspecificadoException,
+)
+
+class PagosService:
+    """
+    Pagos de órdenes de servicio.
+
+    Cada pago o anulación ajusta ordenes.monto_pagado en la misma transacción, así que el saldo de
+    cualquier orden se lee de su propia fila (saldo_pendiente) sin sumar la tabla de pagos. La fila de
+    la orden se bloquea antes de tocar pagos para que los movimientos de una orden no se encimen.
+    """
+
+    def __init__(self, bd):
+        self.bd = bd
+        self.pagos_repository = PagosRepository(self.bd)
+        self.ordenes_repository = OrdenesRepository(self.bd)
+
+    def listar_pagos(self, id_orden: int, id_taller: str) -> Dict[str, Any]:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        orden = self.ordenes_repository.obtener_saldo(id_orden, id_taller)
+        if not orden:
+            raise OrdenNoEncontradaException()
+        return {
+            "data": [PagoDTO(**pago) for pago in self.pagos_repository.listar_por_orden(id_orden, id_taller)],
+            "saldo": SaldoOrdenDTO(**orden),
+        }
+
+    def registrar_pago(self, datos: CrearPagoDTO, id_taller: str, id_usuario: str) -> MovimientoPagoDTO:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        orden = self.ordenes_repository.obtener_saldo(datos.id_orden, id_taller, bloquear=True)
+        if not orden:
+            raise OrdenNoEncontradaException()
+
+        pago = self.pagos_repository.create_returning({
+            "id_orden": datos.id_orden,
+            "id_taller": id_taller,
+            "tipo_pago": datos.tipo_pago,
+            "monto": datos.monto,
+            "metodo": datos.metodo,
+            "referencia": datos.referencia,
+            "comentario_pago": datos.comentario_pago,
+            # Día con el que el trigger lo registra en finanzas, en la zona del negocio y no en la de la sesión (UTC).
+            "fecha_contable": hoy(),
+            "creado_por": id_usuario,
+        }, "id_pago")
+        self.ordenes_repository.sumar_pagado(datos.id_orden, datos.monto)
+
+        return MovimientoPagoDTO(pago=PagoDTO(**pago), saldo=self._saldo_con(orden, datos.monto))
+
+    def anular_pago(self, id_pago: int, datos: AnularPagoDTO, id_taller: str) -> MovimientoPagoDTO:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        pago = self.pagos_repository.obtener_por_id(id_pago, id_taller)
+        if not pago:
+            raise PagoNoEncontradoException()
+        if pago["anulado"]:
+            raise PagoYaAnuladoException()
+
+        # Mismo orden de bloqueo que registrar_pago: primero la orden y después el pago.
+        orden = self.ordenes_repository.obtener_saldo(pago["id_orden"], id_taller, bloquear=True)
+        if not orden:
+            raise OrdenNoEncontradaException()
+        fecha_anulacion = self.pagos_repository._ahora()
+        fecha_contable_anulacion = hoy()
+        if not self.pagos_repository.anular(id_pago, datos.motivo_anulacion, fecha_anulacion, fecha_contable_anulacion):
+            raise PagoYaAnuladoException()
+        self.ordenes_repository.sumar_pagado(pago["id_orden"], -pago["monto"])
+
+        pago.update(
+            anulado=1, motivo_anulacion=datos.motivo_anulacion, fecha_anulacion=fecha_anulacion,
+            fecha_contable_anulacion=fecha_contable_anulacion,
+        )
+        return MovimientoPagoDTO(pago=PagoDTO(**pago), saldo=self._saldo_con(orden, -pago["monto"]))
+
+    def _saldo_con(self, orden: Dict[str, Any], monto: Any) -> SaldoOrdenDTO:
+        monto_pagado = orden["monto_pagado"] + monto
+        return SaldoOrdenDTO(
+            id_orden=orden["id_orden"],
+            num_orden=orden["num_orden"],
+            costo_total=orden["costo_total"] or 0,
+            monto_pagado=monto_pagado,
+            saldo_pendiente=(orden["costo_total"] or 0) - monto_pagado,
+        )
@@ -0,0 +1,99 @@
+from typing import Any, Dict, Tuple
+import threading
+from app.core.config import settings
+from app.core.pool_conexiones import PoolConexiones
+from app.dependencies.database import conectar_bd
+from app.repositories.secuencias_repository import SecuenciasRepository
+
+class BloquesSecuencias:
+    """
+    Bloques de números reservados por adelantado y repartidos desde la memoria del proceso.
+
+    Cuando el bloque de un (taller, secuencia) se agota, se reserva el siguiente en una transacción
+    propia y muy corta (un UPDATE y commit), en lugar de mantener bloqueada la fila del consecutivo
+    durante toda la petición. Los números son crecientes dentro de cada proceso, pero con varios
+    workers se intercalan y los que no se usen antes de reiniciar se pierden (quedan huecos).
+
+    La reserva usa su propio pool pequeño, no pool_conexiones: quien pide el número ya tiene una
+    conexión del pool de peticiones, y si todas las peticiones en curso esperaran una segunda conexión
+    de ese mismo pool ninguna la obtendría hasta el timeout.
+    """
+
+    def __init__(self, pool: PoolConexiones):
+        self._pool = pool
+        self._bloques: Dict[Tuple[str, str], list[int]] = {}
+        self._candados: Dict[Tuple[str, str], threading.Lock] = {}
+        self._candado = threading.Lock()
+        self._entregados = 0
+        self._reservas = 0
+
+    def siguiente(self, id_taller: str, secuencia: str, tamano_bloque: int) -> int:
+        clave = (id_taller, secuencia)
+        with self._candado:
+            candado = self._candados.setdefault(clave, threading.Lock())
+
+        # Un candado por clave: solo esperan las peticiones del mismo taller y solo mientras se reserva.
+        with candado:
+            bloque = self._bloques.get(clave)
+            if bloque is None or bloque[0] > bloque[1]:
+                with self._pool.conexion() as conexion:
+                    ultimo = SecuenciasRepository(conexion).reservar(id_taller, secuencia, tamano_bloque)
+                bloque = [ultimo - tamano_bloque + 1, ultimo]
+                self._bloques[clave] = bloque
+                with self._candado:
+                    self._reservas += 1
+
+            numero = bloque[0]
+            bloque[0] += 1
+
+        with self._candado:
+            self._entregados += 1
+        return numero
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._candado:
+            return {
+                "bloques_en_memoria": len(self._bloques),
+                "reservas": self._reservas,
+                "entregados": self._entregados,
+                "pool": self._pool.estadisticas(),
+            }
+
+    def cerrar(self) -> None:
+        self._pool.cerrar()
+
+bloques_secuencias = BloquesSecuencias(PoolConexiones(
+    crear_conexion=conectar_bd,
+    tamano=settings.SECUENCIA_POOL_SIZE,
+    max_overflow=0,
+    timeout=settings.DB_POOL_TIMEOUT,
+    reciclar_segundos=settings.DB_POOL_RECYCLE,
+    pre_ping=settings.DB_POOL_PRE_PING,
+    ping_inactividad=settings.DB_POOL_PING_INACTIVIDAD,
+))
+
+class SecuenciasService:
+    """
+    Punto único para obtener num_orden, num_venta, etc.
+
+    Con un tamaño de bloque de 1 (por defecto) el número se reserva en la transacción de la petición:
+    no quedan huecos porque un rollback también deshace la reserva, a cambio de que las creaciones
+    del mismo taller esperen a que termine la anterior. Con un bloque mayor se usa BloquesSecuencias.
+    """
+
+    def __init__(self, bd):
+        self.bd = bd
+        self.secuencias_repository = SecuenciasRepository(self.bd)
+
+    def siguiente(self, id_taller: str, secuencia: str) -> int:
+        tamano_bloque = self._tamano_bloque(secuencia)
+        if tamano_bloque > 1:
+            return bloques_secuencias.siguiente(id_taller, secuencia, tamano_bloque)
+        return self.secuencias_repository.siguiente(id_taller, secuencia)
+
+    def _tamano_bloque(self, secuencia: str) -> int:
+        if secuencia == "ordenes":
+            return settings.SECUENCIA_BLOQUE_ORDENES
+        if secuencia == "ventas":
+            return settings.SECUENCIA_BLOQUE_VENTAS
+        return 1
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+from app.core.config import settings
+from app.core.cursores import codificar_cursor, decodificar_cursor
+from app.repositories.sincronizacion_repository import ENTIDADES_SINCRONIZABLES, SincronizacionRepository
+from app.repositories.versiones_repository import VersionesRepository
+from app.core.exceptions import CursorInvalidoException, MarcaSincronizacionInvalidaException, TallerNoEspecificadoException
+
+_INICIO = (datetime(1970, 1, 1), 0)
+
+class SincronizacionService:
+    """
+    Sincronización incremental de clientes, equipos y tipos de equipo para clientes sin conexión.
+
+    La marca que recibe y regresa GET /sync es opaca para el cliente y guarda, por entidad, hasta dónde se
+    enviaron los cambios (momento, id), lo mismo para las eliminaciones, y las versiones de taller_versiones
+    cuando la respuesta quedó completa. Con esas versiones, una sincronización sin cambios se responde con una
+    sola lectura por llave primaria.
+
+    Una escritura puede confirmarse después de que otra con un momento posterior ya se envió. Para no perderla,
+    la posición final nunca avanza más allá de ahora - SYNC_MARGEN_SEGUNDOS: los cambios de ese lapso se
+    reenvían en la siguiente sincronización, y el cliente los aplica como upsert por ID sin efecto.
+    """
+
+    def __init__(self, bd):
+        self.bd = bd
+        self.sincronizacion_repository = SincronizacionRepository(self.bd)
+        self.versiones_repository = VersionesRepository(self.bd)
+
+    def sincronizar(self, id_taller: str, marca: str | None) -> Dict[str, Any]:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+
+        ahora = self.sincronizacion_repository.ahora()
+        limite_seguro = (ahora - timedelta(seconds=settings.SYNC_MARGEN_SEGUNDOS), 0)
+        posiciones, versiones_marca = self._leer_marca(marca) if marca else (None, None)
+        versiones = {
+            entidad: version
+            for entidad, (version, _) in self.versiones_repository.obtener(id_taller, list(ENTIDADES_SINCRONIZABLES)).items()
+        }
+
+        # Las eliminaciones se conservan un tiempo limitado: con una marca más vieja ya no se puede saber qué se
+        # borró y el cliente debe reemplazar su copia completa.
+        reiniciar = posiciones is not None and posiciones["eliminaciones"][0] < ahora - timedelta(days=settings.SYNC_RETENCION_DIAS)
+        if posiciones is None or reiniciar:
+            posiciones = {entidad: _INICIO for entidad in ENTIDADES_SINCRONIZABLES}
+            # En una descarga completa no hacen falta las eliminaciones anteriores, solo las que ocurran mientras tanto.
+            posiciones["eliminaciones"] = limite_seguro
+        elif versiones_marca == versiones:
+            # Nada se confirmó desde la marca anterior, así que lo que quedaba dentro del margen ya se envió: las
+            # posiciones avanzan hasta el límite seguro. Sin esto la de eliminaciones nunca se movería y el cliente
+            # recibiría "reiniciar" al pasar SYNC_RETENCION_DIAS.
+            posiciones = {nombre: self._posicion_final(posicion, None, limite_seguro) for nombre, posicion in posiciones.items()}
+            nueva_marca = self._crear_marca(posiciones, versiones)
+            return self._respuesta(nueva_marca, False, False, {entidad: ([], []) for entidad in ENTIDADES_SINCRONIZABLES})
+
+        datos: Dict[str, Tuple[List[List[Any]], List[int]]] = {}
+        hay_mas = False
+        for nombre, entidad in ENTIDADES_SINCRONIZABLES.items():
+            filas = self.sincronizacion_repository.cambios(entidad, id_taller, posiciones[nombre], settings.SYNC_LOTE + 1)
+            if len(filas) > settings.SYNC_LOTE:
+                filas = filas[:settings.SYNC_LOTE]
+                hay_mas = True
+                posiciones[nombre] = (filas[-1][-1], filas[-1][0])
+            else:
+                posiciones[nombre] = self._posicion_final(posiciones[nombre], (filas[-1][-1], filas[-1][0]) if filas else None, limite_seguro)
+            datos[nombre] = ([list(fila[:-1]) for fila in filas], [])
+
+        eliminaciones = self.sincronizacion_repository.eliminaciones(id_taller, posiciones["eliminaciones"], settings.SYNC_LOTE + 1)
+        if len(eliminaciones) > settings.SYNC_LOTE:
+            eliminaciones = eliminaciones[:settings.SYNC_LOTE]
+            hay_mas = True
+            posiciones["eliminaciones"] = (eliminaciones[-1]["eliminado_en"], eliminaciones[-1]["id_eliminacion"])
+        else:
+            ultima = (eliminaciones[-1]["eliminado_en"], eliminaciones[-1]["id_eliminacion"]) if eliminaciones else None
+            posiciones["eliminaciones"] = self._posicion_final(posiciones["eliminaciones"], ultima, limite_seguro)
+        for eliminacion in eliminaciones:
+            if eliminacion["entidad"] in datos:
+                datos[eliminacion["entidad"]][1].append(eliminacion["id_registro"])
+
+        # Las versiones solo se guardan si la respuesta quedó completa; con más lotes pendientes no se puede
+        # responder "sin cambios" aunque las versiones no se muevan.
+        nueva_marca = self._crear_marca(posiciones, None if hay_mas else versiones)
+        return self._respuesta(nueva_marca, hay_mas, reiniciar, datos)
+
+    def _posicion_final(self, desde: Tuple[datetime, int], ultima: Tuple[datetime, int] | None, limite_seguro: Tuple[datetime, int]) -> Tuple[datetime, int]:
+        # Sin más lotes: se avanza hasta la última fila enviada, pero no más allá del margen, y nunca hacia atrás.
+        if ultima is None:
+            return max(desde, limite_seguro)
+        return max(desde, min(ultima, limite_seguro))
+
+    def _respuesta(self, marca: str, hay_mas: bool, reiniciar: bool, datos: Dict[str, Tuple[List[List[Any]], List[int]]]) -> Dict[str, Any]:
+        # Formato por columnas: los nombres van una vez por entidad y cada fila es solo la lista de valores.
+        respuesta: Dict[str, Any] = {"marca": marca, "hay_mas": hay_mas, "reiniciar": reiniciar}
+        for nombre, entidad in ENTIDADES_SINCRONIZABLES.items():
+            filas, eliminados = datos[nombre]
+            respuesta[nombre] = {"columnas": entidad.columnas, "filas": filas, "eliminados": eliminados}
+        return respuesta
+
+    def _crear_marca(self, posiciones: Dict[str, Tuple[datetime, int]], versiones: Dict[str, int] | None) -> str:
+        datos: Dict[str, Any] = {"p": {nombre: [momento.isoformat(), id_fila] for nombre, (momento, id_fila) in posiciones.items()}}
+        if versiones is not None:
+            datos["v"] = versiones
+        return codificar_cursor(datos)
+
+    def _leer_marca(self, marca: str) -> Tuple[Dict[str, Tuple[datetime, int]], Dict[str, int] | None]:
+        try:
+            datos = decodificar_cursor(marca)
+            posiciones = {
+                nombre: (datetime.fromisoformat(datos["p"][nombre][0]), int(datos["p"][nombre][1]))
+                for nombre in [*ENTIDADES_SINCRONIZABLES, "eliminaciones"]
+            }
+        except (CursorInvalidoException, KeyError, IndexError, TypeError, ValueError):
+            raise MarcaSincronizacionInvalidaException()
+        return posiciones, datos.get("v")
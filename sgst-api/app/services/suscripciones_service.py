@@ -1,10 +1,11 @@
 from typing import List
-from datetime import date
 from app.models.suscripcion import LicenciaDTO, SuscripcionDTO, VerificacionSuscripcionDTO
 from app.models.usuarios import UsuarioDTO
 from app.repositories.suscripciones_repository import SuscripcionesRepository
 from app.repositories.licencias_repository import LicenciasRepository
 from app.repositories.talleres_repository import TalleresRepository
+from app.core.condicional import VersionDatos
+from app.core.fechas import hoy
 from app.core.exceptions import (
     LicenciaNoEncontradaException,
     EmpresaYaTieneSuscripcionActivaException,
@@ -41,6 +42,10 @@ class SuscripcionesService:
     def listar_licencias(self) -> List[LicenciaDTO]:
         return self.licencias_repository.listar_licencias_activas()
 
+    def version_licencias(self) -> VersionDatos:
+        # El catálogo es pequeño y viene de cache_catalogos, así que su versión es su propio contenido.
+        return VersionDatos(tuple(tuple(licencia.model_dump().values()) for licencia in self.listar_licencias()))
+
     def crear_suscripcion(self, usuario: UsuarioDTO, precio_mensual: str) -> SuscripcionDTO:
         if not usuario.id_empresa:
             raise EmpresaSinSuscripcionException()
@@ -53,13 +58,18 @@ class SuscripcionesService:
         if suscripcion_existente:
             raise EmpresaYaTieneSuscripcionActivaException()
 
-        fecha_fin = date.today() + timedelta(days=365)
+        # fecha_inicio se envía en lugar de usar DEFAULT (CURRENT_DATE), que en la sesión UTC sería la fecha de UTC.
+        fecha_inicio = hoy()
+        fecha_fin = fecha_inicio + timedelta(days=365)
         
         self.suscripciones_repository.create(
             data={
                 "id_empresa": usuario.id_empresa,
                 "id_licencia": id_licencia,
+                "fecha_inicio": fecha_inicio,
                 "fecha_fin": fecha_fin,
                 "activa": 1,
             },
         )
+
+        self.suscripciones_repository.invalidar_cache_empresa(usuario.id_empresa)
@@ -2,7 +2,7 @@ from typing import List
 from app.models.taller import CrearTallerDTO, TallerListaDTO
 from app.models.usuarios import UsuarioDTO
 from app.repositories.talleres_repository import TalleresRepository, TalleresUsuariosRepository
-from app.core.exceptions import EmpresaSinSuscripcionException, EmpresaYaTieneMaxTalleresException, NoEsAdministradorException, NombreTallerRepetidoException
+from app.core.exceptions import EmpresaSinSuscripcionException, EmpresaYaTieneMaxTalleresException, NoEsAdministradorException
 from app.repositories.suscripciones_repository import SuscripcionesRepository
 import uuid
 
@@ -21,9 +21,6 @@ class TalleresService:
         if not usuario.id_empresa:
             raise NoEsAdministradorException()
 
-        if self.talleres_repository.existe_nombre_taller_en_empresa(usuario.id_empresa, datos.nombre_taller):
-            raise NombreTallerRepetidoException()
-
         id_taller = str(uuid.uuid4())
         self.talleres_repository.create(
             data={
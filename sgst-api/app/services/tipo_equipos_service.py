@@ -1,9 +1,11 @@
 from typing import List, Dict, Any
 from app.models.tipo_equipo import TipoEquipoDTO, CrearTipoEquipoDTO, ActualizarTipoEquipoDTO
 from app.repositories.tipo_equipos_repository import TipoEquiposRepository
+from app.repositories.sincronizacion_repository import SincronizacionRepository
+from app.repositories.versiones_repository import VersionesRepository
+from app.core.condicional import VersionDatos, version_de_contadores
 from app.core.exceptions import (
     TipoEquipoNoEncontradoException,
-    TipoEquipoDuplicadoException,
     TallerNoEspecificadoException,
 )
 
@@ -11,12 +13,19 @@ class TipoEquiposService:
     def __init__(self, bd):
         self.bd = bd
         self.tipo_equipos_repository = TipoEquiposRepository(self.bd)
+        self.versiones_repository = VersionesRepository(self.bd)
+        self.sincronizacion_repository = SincronizacionRepository(self.bd)
 
     def listar_tipos(self, id_taller: str) -> List[Dict[str, Any]]:
         if not id_taller:
             raise TallerNoEspecificadoException()
         return self.tipo_equipos_repository.listar_por_taller(id_taller)
 
+    def version_tipos(self, id_taller: str) -> VersionDatos:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+        return version_de_contadores(self.versiones_repository.obtener(id_taller, [TipoEquiposRepository.table_name]))
+
     def obtener_tipo(self, id_tipo: int, id_taller: str) -> TipoEquipoDTO:
         if not id_taller:
             raise TallerNoEspecificadoException()
@@ -28,8 +37,6 @@ class TipoEquiposService:
     def crear_tipo(self, datos: CrearTipoEquipoDTO, id_taller: str) -> TipoEquipoDTO:
         if not id_taller:
             raise TallerNoEspecificadoException()
-        if self.tipo_equipos_repository.existe_nombre_en_taller(id_taller, datos.nombre_tipo):
-            raise TipoEquipoDuplicadoException("nombre")
         data_insert = {
             "id_taller": id_taller,
             "nombre_tipo": datos.nombre_tipo.strip(),
@@ -49,10 +56,6 @@ class TipoEquiposService:
         if not tipo_existente:
             raise TipoEquipoNoEncontradoException()
         if datos.nombre_tipo is not None:
-            if self.tipo_equipos_repository.existe_nombre_en_taller(
-                id_taller, datos.nombre_tipo, excluir_id_tipo=id_tipo
-            ):
-                raise TipoEquipoDuplicadoException("nombre")
             self.tipo_equipos_repository.update(
                 id_tipo, "id_tipo", {"nombre_tipo": datos.nombre_tipo.strip()}
             )
@@ -68,3 +71,4 @@ class TipoEquiposService:
         if not tipo:
             raise TipoEquipoNoEncontradoException()
         self.tipo_equipos_repository.delete(id_tipo, "id_tipo")
+        self.sincronizacion_repository.registrar_eliminacion(id_taller, "tipo_equipos", id_tipo)
@@ -1,11 +1,19 @@
-from app.core.security import crear_token
+from app.core.config import settings
+from app.core.security import crear_token, generar_refresh_token, separar_refresh_token
+from app.core.transacciones import confirmar
 from app.models.usuarios import UsuarioDTO
 from app.models.auth import TokensDTO, RefreshTokenBdDTO
 from app.repositories.refresh_token_repository import RefreshTokenRepository
 from datetime import datetime, timedelta, timezone
 from app.core.exceptions import TokenException, TokenRevocadoException, TokenExpiradoException, UsuarioNoEncontradoException, UsuarioDesactivadoException
 from app.repositories.usuarios_repository import UsuariosRepository
-import secrets
+import hmac
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _como_utc(fecha: datetime) -> datetime:
+    return fecha.replace(tzinfo=timezone.utc) if fecha.tzinfo is None else fecha
 
 class TokensService:
     def __init__(self, bd):
@@ -15,58 +23,83 @@ class TokensService:
 
     def crear_tokens(self, usuario: UsuarioDTO) -> TokensDTO:
         access_token = crear_token(usuario)
-        refresh_token = secrets.token_urlsafe(64)
+        refresh_token, selector, hash_validador = generar_refresh_token()
         expira_en = datetime.now(timezone.utc) + timedelta(days=1)
-        
+
         self.refresh_token_repository.create(data={
+            "selector": selector,
             "id_usuario": usuario.id_usuario,
-            "token": refresh_token,
+            "hash_validador": hash_validador,
             "expira_en": expira_en,
             "valido": 1
         })
-        
+
         return TokensDTO(access_token=access_token, refresh_token=refresh_token)
-    
+
     def refresh_token_expirado(self, r_token: RefreshTokenBdDTO) -> bool:
-        expira = r_token.expira_en
-
-        if expira.tzinfo is None:
-            expira = expira.replace(tzinfo=timezone.utc)
-            
-        if expira < datetime.now(timezone.utc):
-            self.refresh_token_repository.revocar_refresh_token(r_token=r_token)
-            return True
-        return False
-    
+        return _como_utc(r_token.expira_en) < datetime.now(timezone.utc)
+
     def refresh_token(self, refresh_token: str) -> TokensDTO:
         if not refresh_token:
             raise TokenException()
-        
-        token_bd = self.refresh_token_repository.existe_refresh_token(refresh_token)
-        
-        if not token_bd:
+
+        partes = separar_refresh_token(refresh_token)
+        if not partes:
+            raise TokenRevocadoException()
+        selector, hash_validador = partes
+
+        token_bd = self.refresh_token_repository.obtener_por_selector(selector)
+        if not token_bd or not token_bd.valido:
             raise TokenRevocadoException()
-        
+
+        if not hmac.compare_digest(token_bd.hash_validador, hash_validador):
+            self._rechazar_validador_anterior(token_bd, hash_validador)
+
         if self.refresh_token_expirado(token_bd):
+            self.refresh_token_repository.revocar_sesion(selector)
+            confirmar(self.bd) # Se confirma la revocación antes de lanzar la excepción, que revierte la transacción.
             raise TokenExpiradoException()
-        
-        self.refresh_token_repository.revocar_refresh_token(token_bd)
+
         usuario = self.usuarios_repository.obtener_usuario_por_id(token_bd.id_usuario)
-        
+
         if not usuario:
             raise UsuarioNoEncontradoException()
 
         if not usuario.activo:
+            self.refresh_token_repository.revocar_por_usuario(usuario.id_usuario)
+            confirmar(self.bd)
             raise UsuarioDesactivadoException()
 
-        tokens = self.crear_tokens(usuario=usuario)
-        
-        return tokens
-    
+        # La sesión se rota en su misma fila: mismo selector, validador nuevo. No hay INSERT ni commit intermedio;
+        # la rotación se confirma junto con el resto de la petición.
+        nuevo_refresh_token, _, nuevo_hash = generar_refresh_token(selector)
+        self.refresh_token_repository.rotar(selector, nuevo_hash, datetime.now(timezone.utc) + timedelta(days=1))
+
+        return TokensDTO(access_token=crear_token(usuario), refresh_token=nuevo_refresh_token)
+
+    def _rechazar_validador_anterior(self, token_bd: RefreshTokenBdDTO, hash_validador: bytes) -> None:
+        """
+        El selector existe pero el validador no es el vigente. Si es el inmediatamente anterior y la rotación
+        acaba de ocurrir, es otra pestaña que pidió refresh al mismo tiempo y solo se rechaza. En cualquier otro
+        caso alguien está reutilizando un token ya rotado (posible robo), así que se revoca toda la sesión.
+        """
+        if token_bd.hash_anterior is not None and token_bd.rotado_en is not None \
+                and hmac.compare_digest(token_bd.hash_anterior, hash_validador) \
+                and datetime.now(timezone.utc) - _como_utc(token_bd.rotado_en) <= timedelta(seconds=settings.REFRESH_TOKEN_GRACIA_SEGUNDOS):
+            raise TokenRevocadoException()
+
+        logger.warning(f"Reúso de refresh token detectado para el usuario {token_bd.id_usuario}; se revoca la sesión")
+        self.refresh_token_repository.revocar_sesion(token_bd.selector)
+        confirmar(self.bd) # Se confirma la revocación antes de lanzar la excepción, que revierte la transacción.
+        raise TokenRevocadoException()
+
     def revocar_refresh_token(self, refresh_token: str):
-        token = self.refresh_token_repository.existe_refresh_token(refresh_token)
-        
-        if not token:
+        partes = separar_refresh_token(refresh_token) if refresh_token else None
+
+        if not partes:
             return
-        
-        self.refresh_token_repository.revocar_refresh_token(token)
\ No newline at end of file
+
+        self.refresh_token_repository.revocar_sesion(*partes)
+
+    def revocar_sesiones_usuario(self, id_usuario: str) -> int:
+        return self.refresh_token_repository.revocar_por_usuario(id_usuario)
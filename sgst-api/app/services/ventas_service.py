@@ -0,0 +1,111 @@
+from decimal import Decimal
+from typing import Dict
+from app.models.venta import CrearVentaDTO, DetalleVentaDTO, VentaDTO
+from app.repositories.catalogos_repository import CatalogosRepository
+from app.repositories.clientes_repository import ClientesRepository
+from app.repositories.productos_venta_repository import ProductosVentaRepository
+from app.repositories.ventas_repository import VentasRepository
+from app.repositories.ventas_detalle_repository import VentasDetalleRepository
+from app.services.secuencias_service import SecuenciasService
+from app.core.fechas import hoy
+from app.core.exceptions import (
+    ClienteNoEncontradoException,
+    MetodoPagoNoEncontradoException,
+    ProductoNoEncontradoException,
+    StockInsuficienteException,
+    TallerNoEspecificadoException,
+)
+
+class VentasService:
+    """
+    Registro de ventas de mostrador.
+
+    Toda la venta se escribe en la transacción de la petición con un número fijo de consultas, sin
+    importar cuántas líneas tenga: bloqueo de los productos, encabezado, un INSERT de múltiples filas
+    para el detalle y un solo UPDATE para descontar el stock de todos los productos. Si algún
+    producto no alcanza, se rechaza la venta completa antes de escribir nada.
+    """
+
+    def __init__(self, bd):
+        self.bd = bd
+        self.ventas_repository = VentasRepository(self.bd)
+        self.ventas_detalle_repository = VentasDetalleRepository(self.bd)
+        self.productos_venta_repository = ProductosVentaRepository(self.bd)
+        self.clientes_repository = ClientesRepository(self.bd)
+        self.catalogos_repository = CatalogosRepository(self.bd)
+        self.secuencias_service = SecuenciasService(self.bd)
+
+    def registrar_venta(self, datos: CrearVentaDTO, id_taller: str, id_usuario: str) -> VentaDTO:
+        if not id_taller:
+            raise TallerNoEspecificadoException()
+
+        metodo_pago = None
+        if datos.id_metodo_pago is not None:
+            metodo_pago = self.catalogos_repository.obtener_metodos_pago().get(datos.id_metodo_pago)
+            if not metodo_pago or not metodo_pago.get("activo", 1):
+                raise MetodoPagoNoEncontradoException()
+        if datos.id_cliente is not None and not self.clientes_repository.obtener_por_id(datos.id_cliente, id_taller):
+            raise ClienteNoEncontradoException()
+
+        # Las líneas repetidas del mismo producto se suman para descontar y validar el stock una sola vez.
+        cantidades: Dict[int, int] = {}
+        for linea in datos.lineas:
+            cantidades[linea.id_producto] = cantidades.get(linea.id_producto, 0) + linea.cantidad
+
+        productos = self.productos_venta_repository.bloquear_para_movimiento(id_taller, cantidades.keys())
+        faltantes = [id_producto for id_producto in cantidades if id_producto not in productos]
+        if faltantes:
+            raise ProductoNoEncontradoException(faltantes)
+        insuficientes = [
+            {
+                "id_producto": id_producto,
+                "nombre_producto": productos[id_producto]["nombre_producto"],
+                "disponible": productos[id_producto]["stock_actual"],
+                "solicitado": cantidad,
+            }
+            for id_producto, cantidad in cantidades.items()
+            if productos[id_producto]["stock_actual"] < cantidad
+        ]
+        if insuficientes:
+            raise StockInsuficienteException(insuficientes)
+
+        detalle = [
+            DetalleVentaDTO(
+                id_producto_venta=id_producto,
+                nombre_producto=productos[id_producto]["nombre_producto"],
+                cantidad=cantidad,
+                precio_unitario=productos[id_producto]["precio_venta"],
+                subtotal=productos[id_producto]["precio_venta"] * cantidad,
+            )
+            for id_producto, cantidad in cantidades.items()
+        ]
+        total = sum((linea.subtotal for linea in detalle), Decimal("0.00"))
+
+        # El número se pide después de bloquear los productos: todas las ventas toman los bloqueos en
+        # el mismo orden (productos y luego consecutivo) y la fila del consecutivo se retiene menos tiempo.
+        venta = self.ventas_repository.create_returning({
+            "id_taller": id_taller,
+            "num_venta": self.secuencias_service.siguiente(id_taller, "ventas"),
+            "id_cliente": datos.id_cliente,
+            "fecha_venta": hoy(),
+            "total": total,
+            "id_metodo_pago": datos.id_metodo_pago,
+            "metodo_pago": metodo_pago["descripcion"] if metodo_pago else None,
+            "creado_por": id_usuario,
+        }, "id_venta")
+
+        self.ventas_detalle_repository.create_many([
+            {
+                "id_venta": venta["id_venta"],
+                "id_producto_venta": linea.id_producto_venta,
+                "cantidad": linea.cantidad,
+                "precio_unitario": linea.precio_unitario,
+                "subtotal": linea.subtotal,
+            }
+            for linea in detalle
+        ])
+        self.productos_venta_repository.increment_many(
+            "stock_actual", {id_producto: -cantidad for id_producto, cantidad in cantidades.items()}, "id_producto"
+        )
+
+        return VentaDTO(**venta, detalle=detalle)
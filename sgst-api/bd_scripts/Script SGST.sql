@@ -96,7 +96,8 @@ CREATE TABLE suscripciones (
   fecha_fin DATE NULL,
   activa TINYINT DEFAULT 1,
   FOREIGN KEY (id_empresa) REFERENCES empresas(id_empresa) ON DELETE CASCADE,
-  FOREIGN KEY (id_licencia) REFERENCES licencias(id_licencia) ON DELETE RESTRICT
+  FOREIGN KEY (id_licencia) REFERENCES licencias(id_licencia) ON DELETE RESTRICT,
+  INDEX idx_suscripciones_activa_fin (activa, fecha_fin) -- Tarea expirar_suscripciones
 ) ENGINE=InnoDB;
 
 -- =========================
@@ -113,7 +114,10 @@ CREATE TABLE talleres (
   ruta_logo VARCHAR(255),
   activo TINYINT DEFAULT 1,
   fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  UNIQUE (id_empresa, nombre_taller),
+  -- El nombre solo mientras el taller está activo: NULL no choca en un índice UNIQUE, así que el nombre de un
+  -- taller desactivado se puede volver a usar en la misma empresa.
+  nombre_taller_activo VARCHAR(150) AS (CASE WHEN activo = 1 THEN nombre_taller END) VIRTUAL INVISIBLE,
+  CONSTRAINT uq_talleres_empresa_nombre UNIQUE (id_empresa, nombre_taller_activo),
   FOREIGN KEY (id_empresa) REFERENCES empresas(id_empresa) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
@@ -144,10 +148,16 @@ CREATE TABLE clientes (
   notas_cliente TEXT,
   fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   ultima_actualizacion TIMESTAMP NULL ON UPDATE CURRENT_TIMESTAMP,
+  -- Momento de la última alta o cambio según el reloj de MySQL, para GET /sync; INVISIBLE no aparece en SELECT *.
+  cambio_en TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) INVISIBLE,
   FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE RESTRICT,
-  UNIQUE (id_taller, correo_cliente),
-  UNIQUE (id_taller, telefono_cliente),
-  INDEX idx_clientes_taller_nombre (id_taller, nombre_cliente)
+  CONSTRAINT uq_clientes_taller_correo UNIQUE (id_taller, correo_cliente),
+  CONSTRAINT uq_clientes_taller_telefono UNIQUE (id_taller, telefono_cliente),
+  INDEX idx_clientes_taller_nombre (id_taller, nombre_cliente),
+  INDEX idx_clientes_taller_fecha_creacion (id_taller, fecha_creacion), -- Paginación por cursor del listado por defecto
+  INDEX idx_clientes_taller_actualizacion (id_taller, ultima_actualizacion), -- Filas modificadas desde una fecha
+  INDEX idx_clientes_taller_cambio (id_taller, cambio_en, id_cliente), -- Recorrido de GET /sync
+  FULLTEXT INDEX ft_clientes_busqueda (nombre_cliente, apellidos_cliente, correo_cliente) -- Mismo orden que searchable_fields; telefono_cliente se busca con LIKE
 ) ENGINE=InnoDB;
 
 -- =========================
@@ -159,8 +169,11 @@ CREATE TABLE tipo_equipos (
   nombre_tipo VARCHAR(100) NOT NULL,
   activo TINYINT DEFAULT 1,
   fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  ultima_actualizacion TIMESTAMP NULL ON UPDATE CURRENT_TIMESTAMP,
+  cambio_en TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) INVISIBLE, -- Ver clientes.cambio_en
   FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE RESTRICT,
-  UNIQUE (id_taller, nombre_tipo)
+  CONSTRAINT uq_tipo_equipos_taller_nombre UNIQUE (id_taller, nombre_tipo),
+  INDEX idx_tipo_equipos_taller_cambio (id_taller, cambio_en, id_tipo) -- Recorrido de GET /sync
 ) ENGINE=InnoDB;
 
 -- =========================
@@ -177,10 +190,59 @@ CREATE TABLE equipos (
   activo TINYINT DEFAULT 1,
   fecha_registro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   ultima_actualizacion TIMESTAMP NULL ON UPDATE CURRENT_TIMESTAMP,
+  cambio_en TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) INVISIBLE, -- Ver clientes.cambio_en
   FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE RESTRICT,
   FOREIGN KEY (id_tipo) REFERENCES tipo_equipos(id_tipo) ON DELETE RESTRICT,
-  UNIQUE (id_taller, num_serie),
-  INDEX idx_equipos_taller_tipo (id_taller, id_tipo)
+  CONSTRAINT uq_equipos_taller_num_serie UNIQUE (id_taller, num_serie),
+  INDEX idx_equipos_taller_tipo (id_taller, id_tipo),
+  INDEX idx_equipos_taller_fecha_registro (id_taller, fecha_registro), -- Paginación por cursor del listado por defecto
+  INDEX idx_equipos_taller_actualizacion (id_taller, ultima_actualizacion), -- Filas modificadas desde una fecha
+  INDEX idx_equipos_taller_cambio (id_taller, cambio_en, id_equipo), -- Recorrido de GET /sync
+  FULLTEXT INDEX ft_equipos_busqueda (marca_equipo, modelo_equipo, descripcion_equipo) -- Mismo orden que searchable_fields; num_serie se busca con LIKE
+) ENGINE=InnoDB;
+
+-- =========================
+-- CONSECUTIVOS POR TALLER
+-- =========================
+-- Último número asignado de cada consecutivo (num_orden, ...) por taller. Se incrementa dentro de la
+-- transacción que crea el registro, así solo se bloquea la fila de ese taller y un rollback no deja huecos.
+CREATE TABLE secuencias_taller (
+  id_taller CHAR(36) NOT NULL,
+  secuencia VARCHAR(30) NOT NULL,
+  ultimo_valor INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (id_taller, secuencia),
+  FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- =========================
+-- VERSIONES DE DATOS POR TALLER
+-- =========================
+-- Contador por taller y entidad (clientes, equipos, tipo_equipos) que BaseRepository incrementa en la
+-- misma transacción de cada alta, cambio o baja. Es la clave de invalidación de cachés, ETags y
+-- sincronización: si la versión no cambió, los datos tampoco.
+CREATE TABLE taller_versiones (
+  id_taller CHAR(36) NOT NULL,
+  entidad VARCHAR(50) NOT NULL,
+  version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  actualizado_en TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+  PRIMARY KEY (id_taller, entidad),
+  FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- =========================
+-- ELIMINACIONES PARA SINCRONIZACIÓN
+-- =========================
+-- Registro de los borrados físicos de clientes, equipos y tipo_equipos, para que GET /sync pueda avisar a
+-- los clientes sin conexión que deben quitarlos de su copia local. Se purgan pasados SYNC_RETENCION_DIAS.
+CREATE TABLE sync_eliminaciones (
+  id_eliminacion BIGINT AUTO_INCREMENT PRIMARY KEY,
+  id_taller CHAR(36) NOT NULL,
+  entidad VARCHAR(50) NOT NULL,
+  id_registro INT NOT NULL,
+  eliminado_en TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE CASCADE,
+  INDEX idx_sync_eliminaciones_taller_fecha (id_taller, eliminado_en, id_eliminacion),
+  INDEX idx_sync_eliminaciones_fecha (eliminado_en)
 ) ENGINE=InnoDB;
 
 -- =========================
@@ -202,6 +264,10 @@ CREATE TABLE ordenes (
   fecha_entrega DATE NULL, -- AL MOMENTO DE YA ENTREGAR LA ORDEN
   id_estado TINYINT UNSIGNED NOT NULL DEFAULT 1, -- referencia cat_estados
   costo_total DECIMAL(12,2) DEFAULT 0.00,
+  -- Suma de los pagos no anulados. PagosService la actualiza en la misma transacción que cada pago o anulación
+  -- (app.comandos.reconciliar_saldos la recalcula desde pagos); el saldo se deriva sin consultar pagos.
+  monto_pagado DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+  saldo_pendiente DECIMAL(12,2) AS (COALESCE(costo_total, 0) - monto_pagado) STORED,
   meses_garantia INT NOT NULL DEFAULT 0,
   fecha_fin_garantia DATE NULL,
   es_por_garantia TINYINT DEFAULT 0,
@@ -220,9 +286,12 @@ CREATE TABLE ordenes (
   FOREIGN KEY (id_prioridad) REFERENCES cat_prioridades(id_prioridad) ON DELETE RESTRICT,
   FOREIGN KEY (id_estado) REFERENCES cat_estados(id_estado) ON DELETE RESTRICT,
   FOREIGN KEY (id_orden_origen) REFERENCES ordenes(id_orden) ON DELETE SET NULL,
-  UNIQUE (id_taller, num_orden),
-  INDEX idx_ordenes_taller (id_taller),
-  INDEX idx_ordenes_taller_estado (id_taller, id_estado),
+  CONSTRAINT uq_ordenes_taller_num_orden UNIQUE (id_taller, num_orden),
+  -- Los listados filtran por taller (y opcionalmente estado, prioridad o técnico) y se ordenan por fecha de
+  -- creación; con la fecha al final de cada índice MySQL lee las filas ya ordenadas y se detiene en el LIMIT.
+  INDEX idx_ordenes_taller_estado (id_taller, id_estado, fecha_creacion),
+  INDEX idx_ordenes_taller_prioridad (id_taller, id_prioridad, fecha_creacion),
+  INDEX idx_ordenes_taller_tecnico (id_taller, tecnico_asignado, fecha_creacion),
   INDEX idx_ordenes_taller_fecha_creacion (id_taller, fecha_creacion),
   INDEX idx_ordenes_cliente (id_cliente),
   INDEX idx_ordenes_fecha_creacion (fecha_creacion),
@@ -242,10 +311,15 @@ CREATE TABLE pagos (
   referencia VARCHAR(150),
   comentario_pago TEXT,
   fecha_pago TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  -- Día del pago y de su anulación en la zona horaria del negocio (ZONA_HORARIA), que envía la aplicación.
+  -- Las sesiones trabajan en UTC, así que DATE(fecha_pago) daría el día de UTC; los triggers de finanzas
+  -- usan estas columnas y solo recurren a DATE() si vienen vacías.
+  fecha_contable DATE NULL,
   creado_por CHAR(36) NULL,
   anulado TINYINT DEFAULT 0,
   motivo_anulacion TEXT NULL,
   fecha_anulacion TIMESTAMP NULL,
+  fecha_contable_anulacion DATE NULL,
   FOREIGN KEY (id_orden) REFERENCES ordenes(id_orden) ON DELETE RESTRICT,
   FOREIGN KEY (creado_por) REFERENCES usuarios(id_usuario) ON DELETE SET NULL,
   FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE RESTRICT,
@@ -277,6 +351,8 @@ CREATE TABLE archivos (
   id_orden INT NOT NULL,
   ruta_archivo VARCHAR(255) NOT NULL,
   tipo_archivo VARCHAR(50),
+  nombre_original VARCHAR(255) NULL,
+  tamano_bytes BIGINT NULL,
   descripcion TEXT,
   subido_por CHAR(36) NULL,
   fecha_subida TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -305,15 +381,24 @@ CREATE TABLE notificaciones (
 -- TOKENS
 -- =========================
 
+-- Una fila por sesión. El refresh token es "<selector>.<validador>": el selector es la llave primaria y del
+-- validador solo se guarda su SHA-256. Cada /auth/refresh rota el validador en la misma fila y deja el hash
+-- anterior en hash_anterior para detectar el reúso de un token ya rotado.
 CREATE TABLE refresh_tokens (
-    id_token INT AUTO_INCREMENT PRIMARY KEY,
+    selector BINARY(16) PRIMARY KEY,
     id_usuario CHAR(36) NOT NULL,
-    token VARCHAR(255) NOT NULL UNIQUE,
+    hash_validador BINARY(32) NOT NULL,
+    hash_anterior BINARY(32) NULL,
+    rotado_en DATETIME NULL,
     expira_en DATETIME NOT NULL,
     creado_en DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     valido TINYINT NOT NULL DEFAULT 1,
     FOREIGN KEY (id_usuario) REFERENCES usuarios(id_usuario)
-        ON DELETE CASCADE
+        ON DELETE CASCADE,
+    INDEX idx_refresh_tokens_usuario_valido (id_usuario, valido), -- Revocar todas las sesiones de un usuario
+    -- Para que la tarea purgar_refresh_tokens borre por lotes sin recorrer toda la tabla.
+    INDEX idx_refresh_tokens_valido (valido),
+    INDEX idx_refresh_tokens_expira (expira_en)
 ) ENGINE=InnoDB;
 
 -- ============================================
@@ -447,6 +532,21 @@ CREATE TABLE productos_venta (
   INDEX idx_productos_venta_taller_stock (id_taller, stock_actual)
 ) ENGINE=InnoDB;
 
+-- =========================
+-- INVENTARIO BAJO STOCK
+-- =========================
+-- Refacciones y productos activos con stock_actual <= stock_minimo (un mínimo de 0 desactiva la alerta).
+-- Lo mantienen los triggers trg_bajo_stock_*: solo se escribe cuando un artículo cruza el mínimo, y en ese
+-- momento se notifica a los administradores del taller. Los datos del artículo se leen de su tabla.
+CREATE TABLE inventario_bajo_stock (
+  id_taller CHAR(36) NOT NULL,
+  tipo_item ENUM('refaccion', 'producto_venta') NOT NULL,
+  id_item INT NOT NULL,
+  fecha_alerta TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (id_taller, tipo_item, id_item),
+  FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE RESTRICT
+) ENGINE=InnoDB;
+
 -- =========================
 -- COMPRAS
 -- =========================
@@ -549,6 +649,8 @@ CREATE TABLE ordenes_imagenes_recepcion (
   id_imagen INT AUTO_INCREMENT PRIMARY KEY,
   id_orden INT NOT NULL,
   ruta_imagen VARCHAR(255) NOT NULL,
+  tipo_contenido VARCHAR(50) NULL,
+  tamano_bytes BIGINT NULL,
   orden_imagen TINYINT NOT NULL CHECK (orden_imagen BETWEEN 1 AND 3),
   subido_por CHAR(36) NULL,
   fecha_subida TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -582,6 +684,21 @@ CREATE TABLE finanzas_movimientos (
   INDEX idx_finanzas_taller_fecha_tipo (id_taller, fecha_movimiento, tipo_movimiento)
 ) ENGINE=InnoDB;
 
+-- Totales diarios de finanzas_movimientos por taller, tipo y categoría. Los mantienen los triggers
+-- trg_finanzas_resumen_* en la misma transacción que cada movimiento, así los reportes leen un renglón
+-- por día del rango en lugar de sumar todo el historial. Se reconstruyen con
+-- python -m app.comandos.reconstruir_resumen_finanzas.
+CREATE TABLE finanzas_resumen_diario (
+  id_taller CHAR(36) NOT NULL,
+  fecha DATE NOT NULL,
+  tipo_movimiento ENUM('ingreso', 'egreso') NOT NULL,
+  categoria ENUM('compra', 'venta', 'pago_orden', 'gasto', 'ingreso_otro') NOT NULL,
+  total DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+  movimientos INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (id_taller, fecha, tipo_movimiento, categoria),
+  FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE RESTRICT
+) ENGINE=InnoDB;
+
 -- =========================
 -- GASTOS OPERATIVOS
 -- =========================
@@ -640,48 +757,124 @@ BEGIN
   END IF;
 END;
 
--- Trigger: Actualizar stock al confirmar compra de refacciones
-CREATE TRIGGER trg_actualizar_stock_refacciones_compra
-AFTER INSERT ON compras_detalle
+-- El stock de compras y ventas ya no se mueve con triggers por fila sobre compras_detalle y
+-- ventas_detalle: ComprasService y VentasService bloquean los artículos, validan existencias y
+-- aplican todas las líneas con un solo UPDATE por tabla dentro de la misma transacción. Los triggers
+-- anteriores se eliminan aquí y en migraciones/003_triggers_stock_compras_ventas.sql para bases existentes;
+-- si siguieran activos el stock se descontaría dos veces.
+DROP TRIGGER IF EXISTS trg_actualizar_stock_refacciones_compra;
+DROP TRIGGER IF EXISTS trg_actualizar_stock_productos_compra;
+DROP TRIGGER IF EXISTS trg_reducir_stock_venta;
+
+-- Trigger: Reducir stock al usar refacción en orden
+CREATE TRIGGER trg_reducir_stock_refacciones_orden
+AFTER INSERT ON ordenes_refacciones
 FOR EACH ROW
 BEGIN
-  IF NEW.tipo_item = 'refaccion' AND NEW.id_refaccion IS NOT NULL THEN
-    UPDATE refacciones
-    SET stock_actual = stock_actual + NEW.cantidad
-    WHERE id_refaccion = NEW.id_refaccion;
+  UPDATE refacciones
+  SET stock_actual = stock_actual - NEW.cantidad
+  WHERE id_refaccion = NEW.id_refaccion;
+END;
+
+-- Procedimiento: Agregar o quitar un artículo de inventario_bajo_stock cuando cruza su stock mínimo.
+-- Al entrar al conjunto se notifica una sola vez a los administradores del taller; la siguiente
+-- notificación llega solo si el artículo se resurte por encima del mínimo y vuelve a bajar.
+CREATE PROCEDURE sp_actualizar_bajo_stock(
+  IN p_id_taller CHAR(36),
+  IN p_tipo_item VARCHAR(20),
+  IN p_id_item INT,
+  IN p_nombre VARCHAR(150),
+  IN p_stock_actual INT,
+  IN p_estaba_bajo TINYINT,
+  IN p_esta_bajo TINYINT
+)
+BEGIN
+  IF p_esta_bajo = 1 AND p_estaba_bajo = 0 THEN
+    INSERT IGNORE INTO inventario_bajo_stock (id_taller, tipo_item, id_item)
+    VALUES (p_id_taller, p_tipo_item, p_id_item);
+
+    IF ROW_COUNT() > 0 THEN
+      INSERT INTO notificaciones (id_usuario, mensaje, direccion_url)
+      SELECT ut.id_usuario,
+             CONCAT('Stock bajo: ', p_nombre, ' (quedan ', p_stock_actual, ')'),
+             '/inventario/bajo-stock'
+      FROM usuarios_talleres ut
+      WHERE ut.id_taller = p_id_taller AND ut.rol_taller = 'ADMIN' AND ut.activo = 1;
+    END IF;
+  ELSEIF p_esta_bajo = 0 AND p_estaba_bajo = 1 THEN
+    DELETE FROM inventario_bajo_stock
+    WHERE id_taller = p_id_taller AND tipo_item = p_tipo_item AND id_item = p_id_item;
   END IF;
 END;
 
--- Trigger: Actualizar stock al confirmar compra de productos venta
-CREATE TRIGGER trg_actualizar_stock_productos_compra
-AFTER INSERT ON compras_detalle
+-- Triggers: Revisar el stock mínimo en cada alta, cambio o baja de refacciones y productos de venta.
+-- Se disparan también con los cambios de stock que hacen los triggers de compras, ventas y órdenes.
+-- No revisan el inventario que ya existía: migraciones/011_inventario_bajo_stock.sql lo agrega al instalarlos,
+-- y python -m app.comandos.reconstruir_bajo_stock lo recalcula si se cargan datos con los triggers desactivados.
+CREATE TRIGGER trg_bajo_stock_refacciones_insert
+AFTER INSERT ON refacciones
 FOR EACH ROW
 BEGIN
-  IF NEW.tipo_item = 'producto_venta' AND NEW.id_producto_venta IS NOT NULL THEN
-    UPDATE productos_venta
-    SET stock_actual = stock_actual + NEW.cantidad
-    WHERE id_producto = NEW.id_producto_venta;
-  END IF;
+  CALL sp_actualizar_bajo_stock(
+    NEW.id_taller, 'refaccion', NEW.id_refaccion, NEW.nombre_refaccion, NEW.stock_actual,
+    0,
+    NEW.activo <=> 1 AND NEW.stock_minimo > 0 AND NEW.stock_actual <= NEW.stock_minimo
+  );
 END;
 
--- Trigger: Reducir stock al usar refacción en orden
-CREATE TRIGGER trg_reducir_stock_refacciones_orden
-AFTER INSERT ON ordenes_refacciones
+CREATE TRIGGER trg_bajo_stock_refacciones_update
+AFTER UPDATE ON refacciones
 FOR EACH ROW
 BEGIN
-  UPDATE refacciones
-  SET stock_actual = stock_actual - NEW.cantidad
-  WHERE id_refaccion = NEW.id_refaccion;
+  CALL sp_actualizar_bajo_stock(
+    NEW.id_taller, 'refaccion', NEW.id_refaccion, NEW.nombre_refaccion, NEW.stock_actual,
+    OLD.activo <=> 1 AND OLD.stock_minimo > 0 AND OLD.stock_actual <= OLD.stock_minimo,
+    NEW.activo <=> 1 AND NEW.stock_minimo > 0 AND NEW.stock_actual <= NEW.stock_minimo
+  );
 END;
 
--- Trigger: Reducir stock al realizar venta
-CREATE TRIGGER trg_reducir_stock_venta
-AFTER INSERT ON ventas_detalle
+CREATE TRIGGER trg_bajo_stock_refacciones_delete
+AFTER DELETE ON refacciones
 FOR EACH ROW
 BEGIN
-  UPDATE productos_venta
-  SET stock_actual = stock_actual - NEW.cantidad
-  WHERE id_producto = NEW.id_producto_venta;
+  CALL sp_actualizar_bajo_stock(
+    OLD.id_taller, 'refaccion', OLD.id_refaccion, OLD.nombre_refaccion, OLD.stock_actual,
+    1,
+    0
+  );
+END;
+
+CREATE TRIGGER trg_bajo_stock_productos_insert
+AFTER INSERT ON productos_venta
+FOR EACH ROW
+BEGIN
+  CALL sp_actualizar_bajo_stock(
+    NEW.id_taller, 'producto_venta', NEW.id_producto, NEW.nombre_producto, NEW.stock_actual,
+    0,
+    NEW.activo <=> 1 AND NEW.stock_minimo > 0 AND NEW.stock_actual <= NEW.stock_minimo
+  );
+END;
+
+CREATE TRIGGER trg_bajo_stock_productos_update
+AFTER UPDATE ON productos_venta
+FOR EACH ROW
+BEGIN
+  CALL sp_actualizar_bajo_stock(
+    NEW.id_taller, 'producto_venta', NEW.id_producto, NEW.nombre_producto, NEW.stock_actual,
+    OLD.activo <=> 1 AND OLD.stock_minimo > 0 AND OLD.stock_actual <= OLD.stock_minimo,
+    NEW.activo <=> 1 AND NEW.stock_minimo > 0 AND NEW.stock_actual <= NEW.stock_minimo
+  );
+END;
+
+CREATE TRIGGER trg_bajo_stock_productos_delete
+AFTER DELETE ON productos_venta
+FOR EACH ROW
+BEGIN
+  CALL sp_actualizar_bajo_stock(
+    OLD.id_taller, 'producto_venta', OLD.id_producto, OLD.nombre_producto, OLD.stock_actual,
+    1,
+    0
+  );
 END;
 
 -- Trigger: Registrar movimiento financiero al confirmar compra
@@ -728,7 +921,7 @@ BEGIN
     ) VALUES (
       NEW.id_taller, 'ingreso', 'pago_orden',
       CONCAT('Pago orden #', (SELECT num_orden FROM ordenes WHERE id_orden = NEW.id_orden)),
-      NEW.monto, DATE(NEW.fecha_pago), NEW.id_pago, 'pago', NEW.creado_por
+      NEW.monto, COALESCE(NEW.fecha_contable, DATE(NEW.fecha_pago)), NEW.id_pago, 'pago', NEW.creado_por
     );
   END IF;
 END;
@@ -745,7 +938,7 @@ BEGIN
     ) VALUES (
       NEW.id_taller, 'egreso', 'pago_orden',
       CONCAT('Anulación pago orden #', (SELECT num_orden FROM ordenes WHERE id_orden = NEW.id_orden)),
-      -NEW.monto, DATE(NEW.fecha_anulacion), NEW.id_pago, 'pago_anulado', NEW.creado_por
+      -NEW.monto, COALESCE(NEW.fecha_contable_anulacion, DATE(NEW.fecha_anulacion)), NEW.id_pago, 'pago_anulado', NEW.creado_por
     );
   END IF;
 END;
@@ -764,6 +957,44 @@ BEGIN
   );
 END;
 
+-- Triggers: Mantener finanzas_resumen_diario al día con cada movimiento
+CREATE TRIGGER trg_finanzas_resumen_insert
+AFTER INSERT ON finanzas_movimientos
+FOR EACH ROW
+BEGIN
+  INSERT INTO finanzas_resumen_diario (id_taller, fecha, tipo_movimiento, categoria, total, movimientos)
+  VALUES (NEW.id_taller, NEW.fecha_movimiento, NEW.tipo_movimiento, NEW.categoria, NEW.monto, 1)
+  ON DUPLICATE KEY UPDATE total = total + NEW.monto, movimientos = movimientos + 1;
+END;
+
+CREATE TRIGGER trg_finanzas_resumen_update
+AFTER UPDATE ON finanzas_movimientos
+FOR EACH ROW
+BEGIN
+  IF NEW.monto != OLD.monto OR NEW.fecha_movimiento != OLD.fecha_movimiento
+     OR NEW.tipo_movimiento != OLD.tipo_movimiento OR NEW.categoria != OLD.categoria
+     OR NEW.id_taller != OLD.id_taller THEN
+    UPDATE finanzas_resumen_diario
+    SET total = total - OLD.monto, movimientos = movimientos - 1
+    WHERE id_taller = OLD.id_taller AND fecha = OLD.fecha_movimiento
+      AND tipo_movimiento = OLD.tipo_movimiento AND categoria = OLD.categoria;
+
+    INSERT INTO finanzas_resumen_diario (id_taller, fecha, tipo_movimiento, categoria, total, movimientos)
+    VALUES (NEW.id_taller, NEW.fecha_movimiento, NEW.tipo_movimiento, NEW.categoria, NEW.monto, 1)
+    ON DUPLICATE KEY UPDATE total = total + NEW.monto, movimientos = movimientos + 1;
+  END IF;
+END;
+
+CREATE TRIGGER trg_finanzas_resumen_delete
+AFTER DELETE ON finanzas_movimientos
+FOR EACH ROW
+BEGIN
+  UPDATE finanzas_resumen_diario
+  SET total = total - OLD.monto, movimientos = movimientos - 1
+  WHERE id_taller = OLD.id_taller AND fecha = OLD.fecha_movimiento
+    AND tipo_movimiento = OLD.tipo_movimiento AND categoria = OLD.categoria;
+END;
+
 -- Trigger: Registrar historial de cambios de precio en refacciones
 CREATE TRIGGER trg_historial_precio_refaccion
 AFTER UPDATE ON refacciones
@@ -0,0 +1,41 @@
+-- ============================================
+-- Migración 001: teléfono y número de serie fuera de los índices FULLTEXT
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- telefono_cliente y num_serie se buscan por subcadena con LIKE (like_search_fields); el índice
+-- FULLTEXT queda solo con nombres y descripciones, en el mismo orden que searchable_fields.
+-- Nota: Se crea sin DELIMITER, igual que Script SGST.sql; desde la línea de comandos use DELIMITER $$
+USE sgst;
+
+DROP PROCEDURE IF EXISTS sp_migracion_001_fulltext;
+
+CREATE PROCEDURE sp_migracion_001_fulltext(
+  IN p_tabla VARCHAR(64),
+  IN p_indice VARCHAR(64),
+  IN p_columnas VARCHAR(255)
+)
+BEGIN
+  DECLARE v_actuales VARCHAR(255);
+
+  SELECT GROUP_CONCAT(column_name ORDER BY seq_in_index SEPARATOR ', ') INTO v_actuales
+  FROM information_schema.statistics
+  WHERE table_schema = DATABASE() AND table_name = p_tabla AND index_name = p_indice;
+
+  IF v_actuales IS NULL OR v_actuales <> p_columnas THEN
+    IF v_actuales IS NOT NULL THEN
+      SET @sql_migracion = CONCAT('ALTER TABLE ', p_tabla, ' DROP INDEX ', p_indice);
+      PREPARE sentencia FROM @sql_migracion;
+      EXECUTE sentencia;
+      DEALLOCATE PREPARE sentencia;
+    END IF;
+    SET @sql_migracion = CONCAT('ALTER TABLE ', p_tabla, ' ADD FULLTEXT INDEX ', p_indice, ' (', p_columnas, ')');
+    PREPARE sentencia FROM @sql_migracion;
+    EXECUTE sentencia;
+    DEALLOCATE PREPARE sentencia;
+  END IF;
+END;
+
+CALL sp_migracion_001_fulltext('clientes', 'ft_clientes_busqueda', 'nombre_cliente, apellidos_cliente, correo_cliente');
+CALL sp_migracion_001_fulltext('equipos', 'ft_equipos_busqueda', 'marca_equipo, modelo_equipo, descripcion_equipo');
+
+DROP PROCEDURE IF EXISTS sp_migracion_001_fulltext;
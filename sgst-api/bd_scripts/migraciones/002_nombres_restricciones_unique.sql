@@ -0,0 +1,51 @@
+-- ============================================
+-- Migración 002: nombres de las restricciones UNIQUE
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- BaseRepository traduce el error 1062 a la excepción de cada dominio por el nombre de la restricción
+-- (unique_constraints). Las bases creadas antes de Script SGST.sql con nombres tienen los nombres
+-- automáticos de MySQL (id_taller, id_taller_2, ...): el índice UNIQUE con las mismas columnas se
+-- renombra y, si no existe, se crea. Sin esta migración los duplicados responden 409 genérico.
+-- Nota: Se crea sin DELIMITER, igual que Script SGST.sql; desde la línea de comandos use DELIMITER $$
+USE sgst;
+
+DROP PROCEDURE IF EXISTS sp_migracion_002_unique;
+
+CREATE PROCEDURE sp_migracion_002_unique(
+  IN p_tabla VARCHAR(64),
+  IN p_nombre VARCHAR(64),
+  IN p_columnas VARCHAR(255)
+)
+BEGIN
+  DECLARE v_actual VARCHAR(64);
+
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.statistics
+    WHERE table_schema = DATABASE() AND table_name = p_tabla AND index_name = p_nombre
+  ) THEN
+    SELECT index_name INTO v_actual
+    FROM information_schema.statistics
+    WHERE table_schema = DATABASE() AND table_name = p_tabla AND non_unique = 0 AND index_name <> 'PRIMARY'
+    GROUP BY index_name
+    HAVING GROUP_CONCAT(column_name ORDER BY seq_in_index SEPARATOR ', ') = p_columnas
+    LIMIT 1;
+
+    IF v_actual IS NOT NULL THEN
+      SET @sql_migracion = CONCAT('ALTER TABLE ', p_tabla, ' RENAME INDEX `', v_actual, '` TO ', p_nombre);
+    ELSE
+      SET @sql_migracion = CONCAT('ALTER TABLE ', p_tabla, ' ADD CONSTRAINT ', p_nombre, ' UNIQUE (', p_columnas, ')');
+    END IF;
+    PREPARE sentencia FROM @sql_migracion;
+    EXECUTE sentencia;
+    DEALLOCATE PREPARE sentencia;
+  END IF;
+END;
+
+CALL sp_migracion_002_unique('talleres', 'uq_talleres_empresa_nombre', 'id_empresa, nombre_taller');
+CALL sp_migracion_002_unique('clientes', 'uq_clientes_taller_correo', 'id_taller, correo_cliente');
+CALL sp_migracion_002_unique('clientes', 'uq_clientes_taller_telefono', 'id_taller, telefono_cliente');
+CALL sp_migracion_002_unique('tipo_equipos', 'uq_tipo_equipos_taller_nombre', 'id_taller, nombre_tipo');
+CALL sp_migracion_002_unique('equipos', 'uq_equipos_taller_num_serie', 'id_taller, num_serie');
+CALL sp_migracion_002_unique('ordenes', 'uq_ordenes_taller_num_orden', 'id_taller, num_orden');
+
+DROP PROCEDURE IF EXISTS sp_migracion_002_unique;
@@ -0,0 +1,12 @@
+-- ============================================
+-- Migración 003: stock de compras y ventas sin triggers por fila
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- ComprasService y VentasService aplican el stock de todas las líneas con un solo UPDATE por tabla.
+-- Si estos triggers siguen activos, cada compra o venta mueve el stock dos veces. Elimínelos antes
+-- de desplegar la versión de la API que ya no depende de ellos.
+USE sgst;
+
+DROP TRIGGER IF EXISTS trg_actualizar_stock_refacciones_compra;
+DROP TRIGGER IF EXISTS trg_actualizar_stock_productos_compra;
+DROP TRIGGER IF EXISTS trg_reducir_stock_venta;
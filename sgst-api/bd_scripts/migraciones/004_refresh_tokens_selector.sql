@@ -0,0 +1,43 @@
+-- ============================================
+-- Migración 004: refresh_tokens con selector y hash del validador
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- La tabla anterior guardaba el refresh token completo en la columna `token`. El formato nuevo es
+-- "<selector>.<validador>" y solo se guarda el SHA-256 del validador, así que los tokens existentes
+-- no se pueden convertir: si la tabla todavía tiene el esquema anterior se elimina y se crea de nuevo,
+-- lo que invalida todas las sesiones. Cada usuario vuelve a iniciar sesión; /auth/refresh rechaza
+-- un token con el formato anterior (TOKEN_REVOCADO) y borra sus cookies.
+-- Nota: Se crea sin DELIMITER, igual que Script SGST.sql; desde la línea de comandos use DELIMITER $$
+USE sgst;
+
+DROP PROCEDURE IF EXISTS sp_migracion_004_refresh_tokens;
+
+CREATE PROCEDURE sp_migracion_004_refresh_tokens()
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = DATABASE() AND table_name = 'refresh_tokens' AND column_name = 'token'
+  ) THEN
+    DROP TABLE refresh_tokens;
+  END IF;
+END;
+
+CALL sp_migracion_004_refresh_tokens();
+DROP PROCEDURE IF EXISTS sp_migracion_004_refresh_tokens;
+
+-- Misma definición que Script SGST.sql.
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    selector BINARY(16) PRIMARY KEY,
+    id_usuario CHAR(36) NOT NULL,
+    hash_validador BINARY(32) NOT NULL,
+    hash_anterior BINARY(32) NULL,
+    rotado_en DATETIME NULL,
+    expira_en DATETIME NOT NULL,
+    creado_en DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    valido TINYINT NOT NULL DEFAULT 1,
+    FOREIGN KEY (id_usuario) REFERENCES usuarios(id_usuario)
+        ON DELETE CASCADE,
+    INDEX idx_refresh_tokens_usuario_valido (id_usuario, valido),
+    INDEX idx_refresh_tokens_valido (valido),
+    INDEX idx_refresh_tokens_expira (expira_en)
+) ENGINE=InnoDB;
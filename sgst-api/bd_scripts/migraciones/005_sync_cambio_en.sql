@@ -0,0 +1,80 @@
+-- ============================================
+-- Migración 005: columna cambio_en para GET /sync
+-- MySQL 8.0.23+ (columnas INVISIBLE). Se puede ejecutar varias veces.
+-- ============================================
+-- GET /sync recorre clientes, equipos y tipo_equipos por (cambio_en, id) con el índice
+-- (id_taller, cambio_en, id). MySQL llena cambio_en en cada INSERT y UPDATE, así que usa el mismo
+-- reloj que NOW() y que sync_eliminaciones.eliminado_en. En las filas existentes se copia la fecha de
+-- modificación o, si nunca se modificaron, la de creación; ultima_actualizacion se asigna a sí misma
+-- para que su ON UPDATE no la cambie. tipo_equipos no tenía ultima_actualizacion (TipoEquiposRepository
+-- la llena como updated_at_column), así que se agrega antes del relleno. Una ejecución anterior de esta
+-- migración que falló por esa columna dejó cambio_en sin rellenar; en ese caso también se rellena.
+-- Nota: Se crea sin DELIMITER, igual que Script SGST.sql; desde la línea de comandos use DELIMITER $$
+USE sgst;
+
+DROP PROCEDURE IF EXISTS sp_migracion_005_cambio_en;
+
+CREATE PROCEDURE sp_migracion_005_cambio_en(
+  IN p_tabla VARCHAR(64),
+  IN p_id_column VARCHAR(64),
+  IN p_created_at_column VARCHAR(64)
+)
+BEGIN
+  DECLARE v_rellenar TINYINT DEFAULT 0;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = DATABASE() AND table_name = p_tabla AND column_name = 'ultima_actualizacion'
+  ) THEN
+    SET @sql_migracion = CONCAT(
+      'ALTER TABLE ', p_tabla, ' ADD COLUMN ultima_actualizacion TIMESTAMP NULL ON UPDATE CURRENT_TIMESTAMP ',
+      'AFTER ', p_created_at_column
+    );
+    PREPARE sentencia FROM @sql_migracion;
+    EXECUTE sentencia;
+    DEALLOCATE PREPARE sentencia;
+    SET v_rellenar = 1;
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = DATABASE() AND table_name = p_tabla AND column_name = 'cambio_en'
+  ) THEN
+    SET @sql_migracion = CONCAT(
+      'ALTER TABLE ', p_tabla, ' ADD COLUMN cambio_en TIMESTAMP(6) NOT NULL ',
+      'DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) INVISIBLE'
+    );
+    PREPARE sentencia FROM @sql_migracion;
+    EXECUTE sentencia;
+    DEALLOCATE PREPARE sentencia;
+    SET v_rellenar = 1;
+  END IF;
+
+  IF v_rellenar = 1 THEN
+    SET @sql_migracion = CONCAT(
+      'UPDATE ', p_tabla, ' SET ultima_actualizacion = ultima_actualizacion, ',
+      'cambio_en = COALESCE(GREATEST(', p_created_at_column, ', COALESCE(ultima_actualizacion, ', p_created_at_column, ')), cambio_en)'
+    );
+    PREPARE sentencia FROM @sql_migracion;
+    EXECUTE sentencia;
+    DEALLOCATE PREPARE sentencia;
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.statistics
+    WHERE table_schema = DATABASE() AND table_name = p_tabla AND index_name = CONCAT('idx_', p_tabla, '_taller_cambio')
+  ) THEN
+    SET @sql_migracion = CONCAT(
+      'ALTER TABLE ', p_tabla, ' ADD INDEX idx_', p_tabla, '_taller_cambio (id_taller, cambio_en, ', p_id_column, ')'
+    );
+    PREPARE sentencia FROM @sql_migracion;
+    EXECUTE sentencia;
+    DEALLOCATE PREPARE sentencia;
+  END IF;
+END;
+
+CALL sp_migracion_005_cambio_en('tipo_equipos', 'id_tipo', 'fecha_creacion');
+CALL sp_migracion_005_cambio_en('clientes', 'id_cliente', 'fecha_creacion');
+CALL sp_migracion_005_cambio_en('equipos', 'id_equipo', 'fecha_registro');
+
+DROP PROCEDURE IF EXISTS sp_migracion_005_cambio_en;
@@ -0,0 +1,70 @@
+-- ============================================
+-- Migración 006: día contable de pagos en la zona horaria del negocio
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- Las sesiones de la API trabajan en UTC (time_zone = '+00:00'), así que DATE(fecha_pago) en los triggers
+-- de finanzas da el día de UTC y un pago de la noche se registraría en el día siguiente. La aplicación envía
+-- fecha_contable y fecha_contable_anulacion con el día de ZONA_HORARIA y los triggers las usan; si vienen
+-- vacías (filas insertadas fuera de la API) se conserva DATE() como antes. Los movimientos ya registrados
+-- no cambian.
+-- Nota: Se crea sin DELIMITER, igual que Script SGST.sql; desde la línea de comandos use DELIMITER $$
+USE sgst;
+
+DROP PROCEDURE IF EXISTS sp_migracion_006_pagos;
+
+CREATE PROCEDURE sp_migracion_006_pagos()
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = DATABASE() AND table_name = 'pagos' AND column_name = 'fecha_contable'
+  ) THEN
+    ALTER TABLE pagos ADD COLUMN fecha_contable DATE NULL AFTER fecha_pago;
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = DATABASE() AND table_name = 'pagos' AND column_name = 'fecha_contable_anulacion'
+  ) THEN
+    ALTER TABLE pagos ADD COLUMN fecha_contable_anulacion DATE NULL AFTER fecha_anulacion;
+  END IF;
+END;
+
+CALL sp_migracion_006_pagos();
+DROP PROCEDURE IF EXISTS sp_migracion_006_pagos;
+
+-- Misma definición que Script SGST.sql.
+DROP TRIGGER IF EXISTS trg_finanzas_pago_orden;
+
+CREATE TRIGGER trg_finanzas_pago_orden
+AFTER INSERT ON pagos
+FOR EACH ROW
+BEGIN
+  IF NEW.anulado = 0 THEN
+    INSERT INTO finanzas_movimientos (
+      id_taller, tipo_movimiento, categoria, concepto, monto,
+      fecha_movimiento, id_relacionado, tipo_relacionado, creado_por
+    ) VALUES (
+      NEW.id_taller, 'ingreso', 'pago_orden',
+      CONCAT('Pago orden #', (SELECT num_orden FROM ordenes WHERE id_orden = NEW.id_orden)),
+      NEW.monto, COALESCE(NEW.fecha_contable, DATE(NEW.fecha_pago)), NEW.id_pago, 'pago', NEW.creado_por
+    );
+  END IF;
+END;
+
+DROP TRIGGER IF EXISTS trg_finanzas_pago_anulado;
+
+CREATE TRIGGER trg_finanzas_pago_anulado
+AFTER UPDATE ON pagos
+FOR EACH ROW
+BEGIN
+  IF NEW.anulado = 1 AND OLD.anulado = 0 THEN
+    INSERT INTO finanzas_movimientos (
+      id_taller, tipo_movimiento, categoria, concepto, monto,
+      fecha_movimiento, id_relacionado, tipo_relacionado, creado_por
+    ) VALUES (
+      NEW.id_taller, 'egreso', 'pago_orden',
+      CONCAT('Anulación pago orden #', (SELECT num_orden FROM ordenes WHERE id_orden = NEW.id_orden)),
+      -NEW.monto, COALESCE(NEW.fecha_contable_anulacion, DATE(NEW.fecha_anulacion)), NEW.id_pago, 'pago_anulado', NEW.creado_por
+    );
+  END IF;
+END;
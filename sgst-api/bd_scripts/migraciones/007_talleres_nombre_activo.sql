@@ -0,0 +1,56 @@
+-- ============================================
+-- Migración 007: nombre de taller único solo entre talleres activos
+-- MySQL 8.0.23+ (columnas INVISIBLE). Se puede ejecutar varias veces; ejecútela después de la 002.
+-- ============================================
+-- uq_talleres_empresa_nombre cubría (id_empresa, nombre_taller) y contaba también los talleres
+-- desactivados, así que su nombre no se podía volver a usar. La restricción pasa a la columna generada
+-- nombre_taller_activo, que es NULL cuando activo <> 1. El nombre de la restricción no cambia
+-- (TalleresRepository.unique_constraints lo traduce a NombreTallerRepetidoException). El índice anterior
+-- se elimina después de crear el nuevo: la llave foránea de id_empresa siempre tiene un índice que usar.
+-- Nota: Se crea sin DELIMITER, igual que Script SGST.sql; desde la línea de comandos use DELIMITER $$
+USE sgst;
+
+DROP PROCEDURE IF EXISTS sp_migracion_007_talleres;
+
+CREATE PROCEDURE sp_migracion_007_talleres()
+BEGIN
+  DECLARE v_anterior VARCHAR(64);
+
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = DATABASE() AND table_name = 'talleres' AND column_name = 'nombre_taller_activo'
+  ) THEN
+    ALTER TABLE talleres
+      ADD COLUMN nombre_taller_activo VARCHAR(150) AS (CASE WHEN activo = 1 THEN nombre_taller END) VIRTUAL INVISIBLE
+      AFTER fecha_creacion;
+  END IF;
+
+  SELECT index_name INTO v_anterior
+  FROM information_schema.statistics
+  WHERE table_schema = DATABASE() AND table_name = 'talleres' AND non_unique = 0 AND index_name <> 'PRIMARY'
+  GROUP BY index_name
+  HAVING GROUP_CONCAT(column_name ORDER BY seq_in_index SEPARATOR ', ') = 'id_empresa, nombre_taller'
+  LIMIT 1;
+
+  IF v_anterior = 'uq_talleres_empresa_nombre' THEN
+    ALTER TABLE talleres RENAME INDEX uq_talleres_empresa_nombre TO uq_talleres_empresa_nombre_anterior;
+    SET v_anterior = 'uq_talleres_empresa_nombre_anterior';
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.statistics
+    WHERE table_schema = DATABASE() AND table_name = 'talleres' AND index_name = 'uq_talleres_empresa_nombre'
+  ) THEN
+    ALTER TABLE talleres ADD CONSTRAINT uq_talleres_empresa_nombre UNIQUE (id_empresa, nombre_taller_activo);
+  END IF;
+
+  IF v_anterior IS NOT NULL THEN
+    SET @sql_migracion = CONCAT('ALTER TABLE talleres DROP INDEX `', v_anterior, '`');
+    PREPARE sentencia FROM @sql_migracion;
+    EXECUTE sentencia;
+    DEALLOCATE PREPARE sentencia;
+  END IF;
+END;
+
+CALL sp_migracion_007_talleres();
+DROP PROCEDURE IF EXISTS sp_migracion_007_talleres;
@@ -0,0 +1,65 @@
+-- ============================================
+-- Migración 008: índices de los listados de órdenes
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- GET /ordenes filtra por taller (y opcionalmente estado, prioridad o técnico) y ordena por fecha_creacion.
+-- Con la fecha al final de cada índice MySQL lee las filas ya ordenadas y se detiene en el LIMIT; sin estos
+-- índices ordena en memoria todas las órdenes del taller. idx_ordenes_taller_estado cambia de columnas y
+-- idx_ordenes_taller (solo id_taller) sobra, porque todos los índices nuevos empiezan por id_taller.
+-- Mismas definiciones que Script SGST.sql.
+-- Nota: Se crea sin DELIMITER, igual que Script SGST.sql; desde la línea de comandos use DELIMITER $$
+USE sgst;
+
+DROP PROCEDURE IF EXISTS sp_migracion_008_indice;
+
+CREATE PROCEDURE sp_migracion_008_indice(
+  IN p_tabla VARCHAR(64),
+  IN p_indice VARCHAR(64),
+  IN p_columnas VARCHAR(255)
+)
+BEGIN
+  DECLARE v_columnas VARCHAR(255);
+
+  SELECT GROUP_CONCAT(column_name ORDER BY seq_in_index SEPARATOR ', ') INTO v_columnas
+  FROM information_schema.statistics
+  WHERE table_schema = DATABASE() AND table_name = p_tabla AND index_name = p_indice;
+
+  IF v_columnas IS NULL THEN
+    SET @sql_migracion = CONCAT('ALTER TABLE ', p_tabla, ' ADD INDEX ', p_indice, ' (', p_columnas, ')');
+  ELSEIF v_columnas <> p_columnas THEN
+    -- En una sola sentencia, para que las llaves foráneas nunca se queden sin índice.
+    SET @sql_migracion = CONCAT(
+      'ALTER TABLE ', p_tabla, ' DROP INDEX ', p_indice, ', ADD INDEX ', p_indice, ' (', p_columnas, ')'
+    );
+  ELSE
+    SET @sql_migracion = NULL;
+  END IF;
+
+  IF @sql_migracion IS NOT NULL THEN
+    PREPARE sentencia FROM @sql_migracion;
+    EXECUTE sentencia;
+    DEALLOCATE PREPARE sentencia;
+  END IF;
+END;
+
+CALL sp_migracion_008_indice('ordenes', 'idx_ordenes_taller_estado', 'id_taller, id_estado, fecha_creacion');
+CALL sp_migracion_008_indice('ordenes', 'idx_ordenes_taller_prioridad', 'id_taller, id_prioridad, fecha_creacion');
+CALL sp_migracion_008_indice('ordenes', 'idx_ordenes_taller_tecnico', 'id_taller, tecnico_asignado, fecha_creacion');
+CALL sp_migracion_008_indice('ordenes', 'idx_ordenes_taller_fecha_creacion', 'id_taller, fecha_creacion');
+
+DROP PROCEDURE IF EXISTS sp_migracion_008_indice;
+
+DROP PROCEDURE IF EXISTS sp_migracion_008_sobrante;
+
+CREATE PROCEDURE sp_migracion_008_sobrante()
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.statistics
+    WHERE table_schema = DATABASE() AND table_name = 'ordenes' AND index_name = 'idx_ordenes_taller'
+  ) THEN
+    ALTER TABLE ordenes DROP INDEX idx_ordenes_taller;
+  END IF;
+END;
+
+CALL sp_migracion_008_sobrante();
+DROP PROCEDURE IF EXISTS sp_migracion_008_sobrante;
@@ -0,0 +1,36 @@
+-- ============================================
+-- Migración 009: consecutivos por taller (secuencias_taller)
+-- MySQL 8.0.19+. Se puede ejecutar varias veces.
+-- ============================================
+-- SecuenciasRepository reserva num_orden y num_venta con un UPDATE sobre la fila (taller, secuencia) de
+-- esta tabla; sin ella no se pueden crear órdenes ni ventas. Cada taller arranca en el mayor número que ya
+-- tiene, así la numeración continúa donde quedó. Al volver a ejecutarla nunca baja un consecutivo.
+-- Ejecútela con la API detenida o antes de desplegar la versión que usa la tabla: un número asignado con
+-- MAX() + 1 mientras corre la migración podría repetirse.
+USE sgst;
+
+-- Misma definición que Script SGST.sql.
+CREATE TABLE IF NOT EXISTS secuencias_taller (
+  id_taller CHAR(36) NOT NULL,
+  secuencia VARCHAR(30) NOT NULL,
+  ultimo_valor INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (id_taller, secuencia),
+  FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- Los nombres de secuencia son los de SecuenciasRepository.secuencias.
+INSERT INTO secuencias_taller (id_taller, secuencia, ultimo_valor)
+SELECT * FROM (
+  SELECT id_taller, 'ordenes' AS secuencia, MAX(num_orden) AS ultimo
+  FROM ordenes
+  GROUP BY id_taller
+) AS existentes
+ON DUPLICATE KEY UPDATE ultimo_valor = GREATEST(secuencias_taller.ultimo_valor, existentes.ultimo);
+
+INSERT INTO secuencias_taller (id_taller, secuencia, ultimo_valor)
+SELECT * FROM (
+  SELECT id_taller, 'ventas' AS secuencia, MAX(num_venta) AS ultimo
+  FROM ventas
+  GROUP BY id_taller
+) AS existentes
+ON DUPLICATE KEY UPDATE ultimo_valor = GREATEST(secuencias_taller.ultimo_valor, existentes.ultimo);
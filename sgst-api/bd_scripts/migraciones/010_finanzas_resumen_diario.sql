@@ -0,0 +1,76 @@
+-- ============================================
+-- Migración 010: totales diarios de finanzas (finanzas_resumen_diario)
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- GET /finanzas/resumen lee finanzas_resumen_diario, que los triggers trg_finanzas_resumen_* mantienen en la
+-- misma transacción que cada movimiento. Esta migración crea la tabla, instala los triggers y recalcula los
+-- totales desde finanzas_movimientos. El recálculo es el mismo que
+-- python -m app.comandos.reconstruir_resumen_finanzas: borra y vuelve a sumar, así que se puede repetir.
+-- Ejecútela con la API detenida; los pagos, ventas, compras y gastos que lleguen mientras se reemplazan los
+-- triggers no se suman. Si no es posible, ejecute después el comando anterior.
+-- Nota: Se crea sin DELIMITER, igual que Script SGST.sql; desde la línea de comandos use DELIMITER $$
+USE sgst;
+
+-- Misma definición que Script SGST.sql.
+CREATE TABLE IF NOT EXISTS finanzas_resumen_diario (
+  id_taller CHAR(36) NOT NULL,
+  fecha DATE NOT NULL,
+  tipo_movimiento ENUM('ingreso', 'egreso') NOT NULL,
+  categoria ENUM('compra', 'venta', 'pago_orden', 'gasto', 'ingreso_otro') NOT NULL,
+  total DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+  movimientos INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (id_taller, fecha, tipo_movimiento, categoria),
+  FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE RESTRICT
+) ENGINE=InnoDB;
+
+DROP TRIGGER IF EXISTS trg_finanzas_resumen_insert;
+DROP TRIGGER IF EXISTS trg_finanzas_resumen_update;
+DROP TRIGGER IF EXISTS trg_finanzas_resumen_delete;
+
+CREATE TRIGGER trg_finanzas_resumen_insert
+AFTER INSERT ON finanzas_movimientos
+FOR EACH ROW
+BEGIN
+  INSERT INTO finanzas_resumen_diario (id_taller, fecha, tipo_movimiento, categoria, total, movimientos)
+  VALUES (NEW.id_taller, NEW.fecha_movimiento, NEW.tipo_movimiento, NEW.categoria, NEW.monto, 1)
+  ON DUPLICATE KEY UPDATE total = total + NEW.monto, movimientos = movimientos + 1;
+END;
+
+CREATE TRIGGER trg_finanzas_resumen_update
+AFTER UPDATE ON finanzas_movimientos
+FOR EACH ROW
+BEGIN
+  IF NEW.monto != OLD.monto OR NEW.fecha_movimiento != OLD.fecha_movimiento
+     OR NEW.tipo_movimiento != OLD.tipo_movimiento OR NEW.categoria != OLD.categoria
+     OR NEW.id_taller != OLD.id_taller THEN
+    UPDATE finanzas_resumen_diario
+    SET total = total - OLD.monto, movimientos = movimientos - 1
+    WHERE id_taller = OLD.id_taller AND fecha = OLD.fecha_movimiento
+      AND tipo_movimiento = OLD.tipo_movimiento AND categoria = OLD.categoria;
+
+    INSERT INTO finanzas_resumen_diario (id_taller, fecha, tipo_movimiento, categoria, total, movimientos)
+    VALUES (NEW.id_taller, NEW.fecha_movimiento, NEW.tipo_movimiento, NEW.categoria, NEW.monto, 1)
+    ON DUPLICATE KEY UPDATE total = total + NEW.monto, movimientos = movimientos + 1;
+  END IF;
+END;
+
+CREATE TRIGGER trg_finanzas_resumen_delete
+AFTER DELETE ON finanzas_movimientos
+FOR EACH ROW
+BEGIN
+  UPDATE finanzas_resumen_diario
+  SET total = total - OLD.monto, movimientos = movimientos - 1
+  WHERE id_taller = OLD.id_taller AND fecha = OLD.fecha_movimiento
+    AND tipo_movimiento = OLD.tipo_movimiento AND categoria = OLD.categoria;
+END;
+
+START TRANSACTION;
+
+DELETE FROM finanzas_resumen_diario;
+
+INSERT INTO finanzas_resumen_diario (id_taller, fecha, tipo_movimiento, categoria, total, movimientos)
+SELECT id_taller, fecha_movimiento, tipo_movimiento, categoria, SUM(monto), COUNT(*)
+FROM finanzas_movimientos
+GROUP BY id_taller, fecha_movimiento, tipo_movimiento, categoria;
+
+COMMIT;
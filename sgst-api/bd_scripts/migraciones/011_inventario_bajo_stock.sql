@@ -0,0 +1,130 @@
+-- ============================================
+-- Migración 011: inventario bajo stock (tabla, procedimiento y triggers)
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- GET /inventario/bajo-stock lee inventario_bajo_stock, que mantienen los triggers trg_bajo_stock_* con
+-- sp_actualizar_bajo_stock cuando un artículo cruza su stock mínimo (y en ese momento notifican a los
+-- administradores). La migración 003 solo elimina los triggers de stock anteriores; esta crea la tabla, el
+-- procedimiento y los triggers, y al final agrega los artículos que ya estaban bajo mínimo con el mismo
+-- criterio que python -m app.comandos.reconstruir_bajo_stock, sin enviar notificaciones.
+-- Nota: Se crea sin DELIMITER, igual que Script SGST.sql; desde la línea de comandos use DELIMITER $$
+USE sgst;
+
+-- Mismas definiciones que Script SGST.sql.
+CREATE TABLE IF NOT EXISTS inventario_bajo_stock (
+  id_taller CHAR(36) NOT NULL,
+  tipo_item ENUM('refaccion', 'producto_venta') NOT NULL,
+  id_item INT NOT NULL,
+  fecha_alerta TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (id_taller, tipo_item, id_item),
+  FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE RESTRICT
+) ENGINE=InnoDB;
+
+DROP TRIGGER IF EXISTS trg_bajo_stock_refacciones_insert;
+DROP TRIGGER IF EXISTS trg_bajo_stock_refacciones_update;
+DROP TRIGGER IF EXISTS trg_bajo_stock_refacciones_delete;
+DROP TRIGGER IF EXISTS trg_bajo_stock_productos_insert;
+DROP TRIGGER IF EXISTS trg_bajo_stock_productos_update;
+DROP TRIGGER IF EXISTS trg_bajo_stock_productos_delete;
+DROP PROCEDURE IF EXISTS sp_actualizar_bajo_stock;
+
+CREATE PROCEDURE sp_actualizar_bajo_stock(
+  IN p_id_taller CHAR(36),
+  IN p_tipo_item VARCHAR(20),
+  IN p_id_item INT,
+  IN p_nombre VARCHAR(150),
+  IN p_stock_actual INT,
+  IN p_estaba_bajo TINYINT,
+  IN p_esta_bajo TINYINT
+)
+BEGIN
+  IF p_esta_bajo = 1 AND p_estaba_bajo = 0 THEN
+    INSERT IGNORE INTO inventario_bajo_stock (id_taller, tipo_item, id_item)
+    VALUES (p_id_taller, p_tipo_item, p_id_item);
+
+    IF ROW_COUNT() > 0 THEN
+      INSERT INTO notificaciones (id_usuario, mensaje, direccion_url)
+      SELECT ut.id_usuario,
+             CONCAT('Stock bajo: ', p_nombre, ' (quedan ', p_stock_actual, ')'),
+             '/inventario/bajo-stock'
+      FROM usuarios_talleres ut
+      WHERE ut.id_taller = p_id_taller AND ut.rol_taller = 'ADMIN' AND ut.activo = 1;
+    END IF;
+  ELSEIF p_esta_bajo = 0 AND p_estaba_bajo = 1 THEN
+    DELETE FROM inventario_bajo_stock
+    WHERE id_taller = p_id_taller AND tipo_item = p_tipo_item AND id_item = p_id_item;
+  END IF;
+END;
+
+CREATE TRIGGER trg_bajo_stock_refacciones_insert
+AFTER INSERT ON refacciones
+FOR EACH ROW
+BEGIN
+  CALL sp_actualizar_bajo_stock(
+    NEW.id_taller, 'refaccion', NEW.id_refaccion, NEW.nombre_refaccion, NEW.stock_actual,
+    0,
+    NEW.activo <=> 1 AND NEW.stock_minimo > 0 AND NEW.stock_actual <= NEW.stock_minimo
+  );
+END;
+
+CREATE TRIGGER trg_bajo_stock_refacciones_update
+AFTER UPDATE ON refacciones
+FOR EACH ROW
+BEGIN
+  CALL sp_actualizar_bajo_stock(
+    NEW.id_taller, 'refaccion', NEW.id_refaccion, NEW.nombre_refaccion, NEW.stock_actual,
+    OLD.activo <=> 1 AND OLD.stock_minimo > 0 AND OLD.stock_actual <= OLD.stock_minimo,
+    NEW.activo <=> 1 AND NEW.stock_minimo > 0 AND NEW.stock_actual <= NEW.stock_minimo
+  );
+END;
+
+CREATE TRIGGER trg_bajo_stock_refacciones_delete
+AFTER DELETE ON refacciones
+FOR EACH ROW
+BEGIN
+  CALL sp_actualizar_bajo_stock(
+    OLD.id_taller, 'refaccion', OLD.id_refaccion, OLD.nombre_refaccion, OLD.stock_actual,
+    1,
+    0
+  );
+END;
+
+CREATE TRIGGER trg_bajo_stock_productos_insert
+AFTER INSERT ON productos_venta
+FOR EACH ROW
+BEGIN
+  CALL sp_actualizar_bajo_stock(
+    NEW.id_taller, 'producto_venta', NEW.id_producto, NEW.nombre_producto, NEW.stock_actual,
+    0,
+    NEW.activo <=> 1 AND NEW.stock_minimo > 0 AND NEW.stock_actual <= NEW.stock_minimo
+  );
+END;
+
+CREATE TRIGGER trg_bajo_stock_productos_update
+AFTER UPDATE ON productos_venta
+FOR EACH ROW
+BEGIN
+  CALL sp_actualizar_bajo_stock(
+    NEW.id_taller, 'producto_venta', NEW.id_producto, NEW.nombre_producto, NEW.stock_actual,
+    OLD.activo <=> 1 AND OLD.stock_minimo > 0 AND OLD.stock_actual <= OLD.stock_minimo,
+    NEW.activo <=> 1 AND NEW.stock_minimo > 0 AND NEW.stock_actual <= NEW.stock_minimo
+  );
+END;
+
+CREATE TRIGGER trg_bajo_stock_productos_delete
+AFTER DELETE ON productos_venta
+FOR EACH ROW
+BEGIN
+  CALL sp_actualizar_bajo_stock(
+    OLD.id_taller, 'producto_venta', OLD.id_producto, OLD.nombre_producto, OLD.stock_actual,
+    1,
+    0
+  );
+END;
+
+INSERT IGNORE INTO inventario_bajo_stock (id_taller, tipo_item, id_item)
+SELECT id_taller, 'refaccion', id_refaccion FROM refacciones
+WHERE activo <=> 1 AND stock_minimo > 0 AND stock_actual <= stock_minimo
+UNION ALL
+SELECT id_taller, 'producto_venta', id_producto FROM productos_venta
+WHERE activo <=> 1 AND stock_minimo > 0 AND stock_actual <= stock_minimo;
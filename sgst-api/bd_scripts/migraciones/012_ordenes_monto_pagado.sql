@@ -0,0 +1,40 @@
+-- ============================================
+-- Migración 012: monto pagado y saldo de cada orden
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- PagosService suma o resta cada pago en ordenes.monto_pagado en la misma transacción, y los listados y el
+-- saldo leen monto_pagado y saldo_pendiente de la propia orden. Esta migración agrega ambas columnas y llena
+-- monto_pagado con la suma de los pagos no anulados, igual que python -m app.comandos.reconciliar_saldos
+-- (solo escribe las órdenes que no cuadran, así que se puede repetir). ultima_actualizacion se asigna a sí
+-- misma para que su ON UPDATE no marque las órdenes como editadas.
+-- Nota: Se crea sin DELIMITER, igual que Script SGST.sql; desde la línea de comandos use DELIMITER $$
+USE sgst;
+
+DROP PROCEDURE IF EXISTS sp_migracion_012_ordenes;
+
+CREATE PROCEDURE sp_migracion_012_ordenes()
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = DATABASE() AND table_name = 'ordenes' AND column_name = 'monto_pagado'
+  ) THEN
+    ALTER TABLE ordenes ADD COLUMN monto_pagado DECIMAL(12,2) NOT NULL DEFAULT 0.00 AFTER costo_total;
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = DATABASE() AND table_name = 'ordenes' AND column_name = 'saldo_pendiente'
+  ) THEN
+    ALTER TABLE ordenes
+      ADD COLUMN saldo_pendiente DECIMAL(12,2) AS (COALESCE(costo_total, 0) - monto_pagado) STORED AFTER monto_pagado;
+  END IF;
+END;
+
+CALL sp_migracion_012_ordenes();
+DROP PROCEDURE IF EXISTS sp_migracion_012_ordenes;
+
+UPDATE ordenes o
+LEFT JOIN (SELECT id_orden, SUM(monto) AS total FROM pagos WHERE anulado = 0 GROUP BY id_orden) p
+  ON p.id_orden = o.id_orden
+SET o.monto_pagado = COALESCE(p.total, 0), o.ultima_actualizacion = o.ultima_actualizacion
+WHERE o.monto_pagado <> COALESCE(p.total, 0);
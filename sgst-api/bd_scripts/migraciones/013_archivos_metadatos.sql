@@ -0,0 +1,36 @@
+-- ============================================
+-- Migración 013: metadatos de archivos e imágenes de recepción
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- El almacenamiento por contenido guarda cada archivo con el nombre de su hash, así que el nombre original,
+-- el tipo de contenido y el tamaño se guardan en la fila. Las filas existentes quedan con NULL: los archivos
+-- conservan su tipo_archivo y las imágenes anteriores se sirven como application/octet-stream.
+-- Nota: Se crea sin DELIMITER, igual que Script SGST.sql; desde la línea de comandos use DELIMITER $$
+USE sgst;
+
+DROP PROCEDURE IF EXISTS sp_migracion_013_columna;
+
+CREATE PROCEDURE sp_migracion_013_columna(
+  IN p_tabla VARCHAR(64),
+  IN p_columna VARCHAR(64),
+  IN p_definicion VARCHAR(255)
+)
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = DATABASE() AND table_name = p_tabla AND column_name = p_columna
+  ) THEN
+    SET @sql_migracion = CONCAT('ALTER TABLE ', p_tabla, ' ADD COLUMN ', p_columna, ' ', p_definicion);
+    PREPARE sentencia FROM @sql_migracion;
+    EXECUTE sentencia;
+    DEALLOCATE PREPARE sentencia;
+  END IF;
+END;
+
+-- Mismas definiciones que Script SGST.sql.
+CALL sp_migracion_013_columna('archivos', 'nombre_original', 'VARCHAR(255) NULL AFTER tipo_archivo');
+CALL sp_migracion_013_columna('archivos', 'tamano_bytes', 'BIGINT NULL AFTER nombre_original');
+CALL sp_migracion_013_columna('ordenes_imagenes_recepcion', 'tipo_contenido', 'VARCHAR(50) NULL AFTER ruta_imagen');
+CALL sp_migracion_013_columna('ordenes_imagenes_recepcion', 'tamano_bytes', 'BIGINT NULL AFTER tipo_contenido');
+
+DROP PROCEDURE IF EXISTS sp_migracion_013_columna;
@@ -0,0 +1,20 @@
+-- ============================================
+-- Migración 014: contadores de versión por taller (taller_versiones)
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- BaseRepository incrementa (taller, entidad) en esta tabla dentro de la misma transacción de cada alta,
+-- cambio o baja de clientes, equipos y tipo_equipos; sin ella fallan esas escrituras, los ETags de los
+-- listados y GET /sync. No hace falta llenarla: una entidad sin fila tiene versión 0, y la primera
+-- escritura tras desplegar la crea con versión 1, así que los ETags cambian y los clientes vuelven a pedir
+-- sus datos una vez.
+USE sgst;
+
+-- Misma definición que Script SGST.sql.
+CREATE TABLE IF NOT EXISTS taller_versiones (
+  id_taller CHAR(36) NOT NULL,
+  entidad VARCHAR(50) NOT NULL,
+  version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  actualizado_en TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+  PRIMARY KEY (id_taller, entidad),
+  FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE CASCADE
+) ENGINE=InnoDB;
@@ -0,0 +1,21 @@
+-- ============================================
+-- Migración 015: registro de eliminaciones para GET /sync (sync_eliminaciones)
+-- MySQL 8+. Se puede ejecutar varias veces.
+-- ============================================
+-- SincronizacionRepository registra aquí cada borrado físico de clientes, equipos y tipo_equipos, en la
+-- misma transacción del DELETE, y GET /sync lo lee para avisar a los clientes sin conexión; sin la tabla
+-- fallan esos borrados y la sincronización. No se llena: antes de GET /sync ningún cliente tenía una marca
+-- desde la cual pedir eliminaciones.
+USE sgst;
+
+-- Misma definición que Script SGST.sql.
+CREATE TABLE IF NOT EXISTS sync_eliminaciones (
+  id_eliminacion BIGINT AUTO_INCREMENT PRIMARY KEY,
+  id_taller CHAR(36) NOT NULL,
+  entidad VARCHAR(50) NOT NULL,
+  id_registro INT NOT NULL,
+  eliminado_en TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (id_taller) REFERENCES talleres(id_taller) ON DELETE CASCADE,
+  INDEX idx_sync_eliminaciones_taller_fecha (id_taller, eliminado_en, id_eliminacion),
+  INDEX idx_sync_eliminaciones_fecha (eliminado_en)
+) ENGINE=InnoDB;